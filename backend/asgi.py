@@ -0,0 +1,769 @@
+"""
+Student Dropout Risk Prediction System - ASGI Server
+====================================================
+
+asyncio-native variant of the API in server.py. The routes, handlers and
+response bodies are the same; the difference is how work is scheduled:
+
+    - the event loop only parses requests and writes responses, so idle
+      keep-alive connections (e.g. open dashboards) cost a coroutine each
+    - blocking work - store access, model inference, admin reports - runs in
+      a bounded thread pool (ASGI_THREADS threads, ASGI_QUEUE_SIZE queued)
+    - CPU-bound batch scoring runs in a process pool (ASGI_BATCH_PROCESSES)
+
+Usage:
+    python asgi.py --port 8000              # built-in asyncio HTTP server
+    uvicorn asgi:app --port 8000            # or any other ASGI server
+
+Request profiling (X-Profile) is only available on the Flask server:
+cProfile follows one thread, while here requests interleave on the loop.
+"""
+
+import argparse
+import asyncio
+import hmac
+import os
+import re
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from routes.student_routes.student_routes_server import student_handler
+from routes.prediction_routes.prediction_routes_server import prediction_handler
+from services.prediction_service.prediction_service_server import prediction_service_server
+from services.prediction_service.prediction_service import BATCH_INFERENCE_SECONDS, BATCH_SIZE
+from routes.admin_routes.admin_routes_server import admin_handler
+from routes.dashboard_routes.dashboard_routes_server import dashboard_handler
+from routes.job_routes.job_routes_server import job_handler
+from routes.health_routes.health_routes_server import health_handler
+from services.job_service.job_service_server import job_service_server
+from services.startup_service.startup_service_server import startup_service_server
+from config import (
+    ADMIN_TOKEN,
+    ASGI_BATCH_PROCESSES,
+    ASGI_KEEPALIVE,
+    ASGI_QUEUE_SIZE,
+    ASGI_THREADS,
+    CORS_ORIGINS,
+    HOST,
+    PORT,
+    STARTUP_WARMUP,
+)
+from utils.executors import BatchProcessPool, BoundedExecutor
+from utils.admission import Overloaded, prediction_admission
+from utils.http_cache import Validators, gzip_etag
+from utils.metrics import metrics, StageTimer, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from utils.response_cache import CachedResponse
+from utils.serialization import accepts_gzip, gzip_body, gzip_stream, json_encoder, should_compress
+
+
+# ============================================================================
+# EXECUTORS
+# ============================================================================
+
+blocking_executor = BoundedExecutor(ASGI_THREADS, ASGI_QUEUE_SIZE, name='asgi-blocking')
+batch_pool = BatchProcessPool(ASGI_BATCH_PROCESSES)
+
+
+def score_students(students: List[Dict]) -> List[Dict]:
+    """
+    Score a batch of students (runs in a batch pool process)
+
+    Args:
+        students: Student records
+
+    Returns:
+        One prediction per student, in order
+    """
+    return prediction_service_server.service.predict_batch(students)
+
+
+def score_in_batch_pool(students: List[Dict]) -> List[Dict]:
+    """Score a batch of students in the process pool (called from a blocking thread)"""
+    # Metrics observed in the pool process never reach this process's registry
+    start = time.perf_counter()
+    predictions = batch_pool.call(score_students, students)
+    BATCH_INFERENCE_SECONDS.observe(time.perf_counter() - start)
+    BATCH_SIZE.observe(len(students))
+    return predictions
+
+
+def load_model_in_batch_worker() -> bool:
+    """Load the model in a batch pool process (forked before the parent loaded it)"""
+    return prediction_service_server.service.ensure_model()
+
+
+def warm_batch_pool():
+    """
+    Load the model in every batch pool process, so the first batch does not
+    wait for it; the processes load alongside the warm-up, and a final
+    warm-up step waits for them
+    """
+    futures = batch_pool.submit_each(load_model_in_batch_worker)
+    startup_service_server.service.add_step('batch_pool', lambda: [future.result() for future in futures])
+
+
+async def run_blocking(func: Callable, *args, **kwargs):
+    """Run a blocking call in the bounded thread pool"""
+    return await blocking_executor.run(func, *args, **kwargs)
+
+
+# ============================================================================
+# METRICS AND MEMORY ACCOUNTING
+# ============================================================================
+
+REQUEST_DURATION = metrics.histogram(
+    'http_request_duration_seconds',
+    'HTTP request latency by route, method and status code',
+    ['route', 'method', 'status']
+)
+REQUESTS_IN_FLIGHT = metrics.gauge(
+    'http_requests_in_flight',
+    'HTTP requests currently being served'
+)
+BLOCKING_IN_USE = metrics.gauge(
+    'asgi_blocking_calls_in_use',
+    'Blocking calls running or queued in the ASGI thread pool',
+    function=lambda: {(): blocking_executor.in_use}
+)
+
+admin_handler.register_memory_components()
+
+
+# ============================================================================
+# REQUEST / RESPONSE
+# ============================================================================
+
+class Request:
+    """Parsed view of an ASGI http scope and body"""
+
+    def __init__(self, scope: Dict, body: bytes):
+        """Wrap a scope and its request body"""
+        self.method = scope['method']
+        self.path = scope['path']
+        self.args = dict(parse_qsl(scope.get('query_string', b'').decode('latin-1')))
+        self.headers = {
+            name.decode('latin-1').lower(): value.decode('latin-1')
+            for name, value in scope.get('headers', [])
+        }
+        self.body = body
+
+    def get_json(self) -> Optional[Dict]:
+        """Parse the body as JSON, returning None if it is empty or invalid"""
+        if not self.body:
+            return None
+        try:
+            return json_encoder.loads(self.body)
+        except ValueError:
+            return None
+
+
+class Response:
+    """Response body with status and content type"""
+
+    def __init__(self, body: bytes, status: int = 200,
+                 content_type: str = 'application/json', headers: Optional[List] = None):
+        """Create a response"""
+        self.body = body
+        self.status = status
+        self.content_type = content_type
+        self.headers = headers or []
+
+
+class StreamingResponse(Response):
+    """Response whose body is produced by a blocking iterator of byte chunks"""
+
+    def __init__(self, chunks, status: int = 200,
+                 content_type: str = 'application/octet-stream', headers: Optional[List] = None):
+        """Create a streaming response; each chunk is pulled in the thread pool"""
+        super().__init__(b'', status, content_type, headers)
+        self.chunks = iter(chunks)
+
+
+def jsonify(data, status: int = 200) -> Response:
+    """Serialize with the same encoder as the Flask app (identical bytes)"""
+    return Response(json_encoder.dumps_line(data), status)
+
+
+def cached_response(request: Request, entry: CachedResponse) -> Response:
+    """Build a response from encoded bytes, using the cached gzip variant when accepted"""
+    gzipped = entry.gzipped() if accepts_gzip(request.headers.get('accept-encoding')) else None
+    if gzipped is None:
+        return Response(entry.body, entry.status)
+    return Response(gzipped, entry.status, headers=[('Content-Encoding', 'gzip'), ('Vary', 'Accept-Encoding')])
+
+
+async def conditional_response(request: Request, validators: Optional[Validators], build) -> Response:
+    """Answer a conditional GET with 304 from its validators, or await build() for the response"""
+    if validators is None:
+        return await build()
+
+    if_none_match = request.headers.get('if-none-match')
+    if request.method == 'GET' and validators.not_modified(if_none_match, request.headers.get('if-modified-since')):
+        # Echo the ETag of the variant the client revalidated
+        gzipped = bool(if_none_match) and gzip_etag(validators.etag) in if_none_match
+        return Response(b'', 304, headers=[('Vary', 'Accept-Encoding')] + validators.headers('gzip' if gzipped else None))
+
+    response = await build()
+    if response.status == 200:
+        encoding = next((value for name, value in response.headers if name.lower() == 'content-encoding'), None)
+        response.headers.extend(validators.headers(encoding))
+    return response
+
+
+# ============================================================================
+# APPLICATION
+# ============================================================================
+
+class AsyncAPI:
+    """Minimal ASGI application with Flask-style route registration"""
+
+    def __init__(self):
+        """Initialize route table"""
+        self.routes: List[Tuple[re.Pattern, str, Tuple[str, ...], Callable]] = []
+
+    def route(self, rule: str, methods: Tuple[str, ...] = ('GET',)):
+        """Register an async view for a rule such as '/api/student/<roll_no>'"""
+        pattern = re.compile('^' + re.sub(r'<(\w+)>', r'(?P<\1>[^/]+)', rule) + '$')
+
+        def decorator(view):
+            self.routes.append((pattern, rule, tuple(methods), view))
+            return view
+
+        return decorator
+
+    def match(self, method: str, path: str):
+        """
+        Find the view for a request
+
+        Returns:
+            Tuple of (view, rule, params, allowed_methods)
+        """
+        allowed = set()
+        for pattern, rule, methods, view in self.routes:
+            found = pattern.match(path)
+            if found is None:
+                continue
+            if method in methods:
+                return view, rule, found.groupdict(), methods
+            allowed.update(methods)
+        return None, None, {}, tuple(sorted(allowed))
+
+    async def __call__(self, scope, receive, send):
+        """ASGI entry point"""
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        """Start and stop the executors (and the startup warm-up) with the server"""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                # Fork batch workers before the thread pool exists
+                batch_pool.start()
+                blocking_executor.start()
+                if STARTUP_WARMUP:
+                    warm_batch_pool()
+                # Store, model and caches load in the background; /api/ready gates traffic
+                startup_service_server.start()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                job_service_server.service.shutdown()
+                blocking_executor.shutdown()
+                batch_pool.shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope, receive, send):
+        """Serve one HTTP request"""
+        start = time.perf_counter()
+        REQUESTS_IN_FLIGHT.inc()
+        rule = '<unmatched>'
+        try:
+            body = b''
+            while True:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    return
+                body += message.get('body', b'')
+                if not message.get('more_body', False):
+                    break
+
+            request = Request(scope, body)
+            origin = request.headers.get('origin')
+
+            if request.method == 'OPTIONS' and origin:
+                response = Response(b'', 200, 'text/plain', [
+                    ('Access-Control-Allow-Methods', 'GET, POST, DELETE, OPTIONS'),
+                    ('Access-Control-Allow-Headers', request.headers.get('access-control-request-headers', '')),
+                ])
+            else:
+                view, matched_rule, params, allowed = self.match(request.method, request.path)
+                if view is not None:
+                    rule = matched_rule
+                    response = await self._call_view(view, request, params)
+                elif allowed:
+                    response = jsonify({
+                        'error': 'Method not allowed',
+                        'message': f"Allowed methods: {', '.join(allowed)}"
+                    }, 405)
+                else:
+                    response = not_found()
+
+            if origin and origin in CORS_ORIGINS:
+                response.headers.append(('Access-Control-Allow-Origin', origin))
+                response.headers.append(('Vary', 'Origin'))
+
+            self._compress(request, response)
+
+            await send({
+                'type': 'http.response.start',
+                'status': response.status,
+                'headers': [(b'content-type', response.content_type.encode('latin-1'))] + [
+                    (name.lower().encode('latin-1'), str(value).encode('latin-1'))
+                    for name, value in response.headers
+                ],
+            })
+            if isinstance(response, StreamingResponse):
+                await self._stream_body(response, send)
+            else:
+                await send({'type': 'http.response.body', 'body': response.body})
+
+            REQUEST_DURATION.observe(time.perf_counter() - start, (rule, scope['method'], response.status))
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+
+    @staticmethod
+    def _compress(request: Request, response: Response):
+        """gzip-encode the body in place when worthwhile and accepted"""
+        if response.status < 200 or response.status in (204, 304):
+            return
+        streamed = isinstance(response, StreamingResponse)
+        headers = {name.lower(): value for name, value in response.headers}
+        if not should_compress(response.content_type, None if streamed else len(response.body), headers):
+            return
+
+        response.headers.append(('Vary', 'Accept-Encoding'))
+        if not accepts_gzip(request.headers.get('accept-encoding')):
+            return
+
+        if streamed:
+            response.chunks = gzip_stream(response.chunks)
+        else:
+            response.body = gzip_body(response.body)
+        response.headers.append(('Content-Encoding', 'gzip'))
+        response.headers = [(name, gzip_etag(value) if name.lower() == 'etag' else value)
+                            for name, value in response.headers]
+
+    @staticmethod
+    async def _stream_body(response: StreamingResponse, send):
+        """Send a streaming body chunk by chunk as the iterator produces it"""
+        try:
+            while True:
+                chunk = await run_blocking(next, response.chunks, None)
+                if chunk is None:
+                    break
+                if chunk:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            close = getattr(response.chunks, 'close', None)
+            if close is not None:
+                close()
+
+    @staticmethod
+    async def _call_view(view, request: Request, params: Dict) -> Response:
+        """Run a view, turning (data, status) tuples into JSON responses"""
+        try:
+            result = await view(request, **params)
+        except Overloaded as e:
+            return overloaded(e)
+        except Exception:
+            return internal_error()
+        if isinstance(result, Response):
+            return result
+        data, status = result
+        return jsonify(data, status)
+
+
+app = AsyncAPI()
+
+
+def admin_authorized(request: Request) -> bool:
+    """Check the X-Admin-Token header against the configured admin token"""
+    if not ADMIN_TOKEN:
+        return False
+    token = request.headers.get('x-admin-token', '')
+    return hmac.compare_digest(token.encode('utf-8'), ADMIN_TOKEN.encode('utf-8'))
+
+
+def admin_forbidden_response() -> Tuple[Dict, int]:
+    """Response for requests to admin endpoints without a valid token"""
+    message = 'Admin token required' if ADMIN_TOKEN else 'Admin endpoints are disabled (ADMIN_TOKEN not configured)'
+    return {'error': 'Forbidden', 'message': message}, 403
+
+
+# ============================================================================
+# API ROUTES
+# ============================================================================
+
+@app.route('/api/health', methods=('GET',))
+async def health_check(request: Request):
+    """Health check endpoint (reads precomputed flags, so it runs on the event loop)"""
+    return health_handler.health_handler()
+
+
+@app.route('/api/live', methods=('GET',))
+async def liveness(request: Request):
+    """Liveness probe: the event loop is serving requests"""
+    return health_handler.live_handler()
+
+
+@app.route('/api/ready', methods=('GET',))
+async def readiness_check(request: Request):
+    """Readiness probe: 503 until the model and student store are loaded and caches warm"""
+    return health_handler.ready_handler()
+
+
+@app.route('/api/diagnostics', methods=('GET',))
+async def diagnostics(request: Request):
+    """Full service status (may stat the store, so it runs in the thread pool)"""
+    return await run_blocking(health_handler.diagnostics_handler)
+
+
+@app.route('/api/student/<roll_no>', methods=('GET',))
+async def get_student(request: Request, roll_no: str):
+    """Get student data by roll number, prefetching its prediction (unless ?prefetch=0) when it is sent"""
+    try:
+        async def build():
+            encoded = await run_blocking(student_handler.get_student_response, roll_no)
+            if encoded.status == 200 and request.args.get('prefetch') != '0':
+                await run_blocking(student_handler.prefetch_prediction, roll_no)
+            return cached_response(request, encoded)
+
+        validators = await run_blocking(student_handler.student_validators, roll_no)
+        return await conditional_response(request, validators, build)
+    except Exception as e:
+        return {'error': f'Server error: {str(e)}'}, 500
+
+
+@app.route('/api/dashboard/<roll_no>', methods=('GET',))
+async def get_dashboard(request: Request, roll_no: str):
+    """Get a student's profile and dropout prediction in one call"""
+    try:
+        return await run_blocking(dashboard_handler.get_dashboard_handler, roll_no, request_deadline(request))
+    except Overloaded:
+        raise
+    except Exception as e:
+        return {'error': f'Server error: {str(e)}'}, 500
+
+
+@app.route('/api/students', methods=('GET',))
+async def list_students(request: Request):
+    """List all students, or search them with ?search="""
+    try:
+        search_query = request.args.get('search')
+
+        async def build():
+            if search_query:
+                return jsonify(*await run_blocking(student_handler.search_students_handler, search_query))
+            return jsonify(*await run_blocking(student_handler.list_students_handler))
+
+        validators = await run_blocking(student_handler.students_validators, search_query)
+        return await conditional_response(request, validators, build)
+
+    except Exception as e:
+        return {'error': f'Server error: {str(e)}'}, 500
+
+
+def request_deadline(request: Request) -> float:
+    """Deadline for prediction work; X-Request-Timeout-Ms can shorten the default budget"""
+    try:
+        budget_ms = float(request.headers.get('x-request-timeout-ms', ''))
+    except ValueError:
+        budget_ms = None
+    return prediction_admission.deadline(budget_ms)
+
+
+def timings_requested(request: Request) -> bool:
+    """Check whether the client opted into per-stage prediction timings"""
+    flag = request.headers.get('x-prediction-timings') or request.args.get('timings')
+    return flag is not None and flag.lower() in ('1', 'true', 'yes')
+
+
+@app.route('/api/predict/batch', methods=('POST',))
+async def predict_dropout_batch(request: Request):
+    """Predict dropout risk for many students; cache misses are scored in the batch pool"""
+    try:
+        return await run_blocking(prediction_handler.batch_predict_handler, request.get_json(),
+                                  score_in_batch_pool)
+
+    except Exception as e:
+        import traceback
+        return {
+            'error': f'Batch prediction failed: {str(e)}',
+            'traceback': traceback.format_exc()
+        }, 500
+
+
+@app.route('/api/predict/export', methods=('GET',))
+async def export_predictions(request: Request):
+    """Stream predictions for a cohort as NDJSON; chunks are scored in the batch pool"""
+    try:
+        filters = {key: request.args.get(key) for key in ('course', 'year', 'roll_prefix')}
+        try:
+            chunk_size = int(request.args['chunk_size']) if 'chunk_size' in request.args else None
+        except ValueError:
+            chunk_size = None
+
+        response_data, status_code = prediction_handler.export_predictions_handler(
+            filters, chunk_size, score_in_batch_pool)
+        if status_code != 200:
+            return response_data, status_code
+
+        return StreamingResponse(response_data, content_type='application/x-ndjson',
+                                 headers=[('X-Accel-Buffering', 'no')])
+
+    except Exception as e:
+        return {'error': f'Export failed: {str(e)}'}, 500
+
+
+@app.route('/api/predict/<roll_no>', methods=('GET', 'POST'))
+async def predict_dropout(request: Request, roll_no: str):
+    """Predict dropout risk for a student"""
+    try:
+        # The budget includes time spent queued for a thread
+        deadline = request_deadline(request)
+
+        # Timed requests predict afresh; the rest are served from the encoded response cache
+        if not timings_requested(request):
+            async def build():
+                return cached_response(request, await run_blocking(prediction_handler.predict_response,
+                                                                   roll_no, deadline))
+
+            validators = await run_blocking(prediction_handler.prediction_validators, roll_no)
+            return await conditional_response(request, validators, build)
+        return await run_blocking(prediction_handler.predict_dropout_handler, roll_no, StageTimer(), deadline)
+
+    except Overloaded:
+        raise
+    except Exception as e:
+        import traceback
+        return {
+            'error': f'Prediction failed: {str(e)}',
+            'traceback': traceback.format_exc()
+        }, 500
+
+
+@app.route('/api/model/info', methods=('GET',))
+async def get_model_info(request: Request):
+    """Get ML model information"""
+    try:
+        return await run_blocking(prediction_handler.get_model_info_handler)
+    except Exception as e:
+        return {'error': f'Server error: {str(e)}'}, 500
+
+
+@app.route('/api/cache/clear', methods=('POST',))
+async def clear_cache(request: Request):
+    """Clear the prediction cache, or one roll number's entry"""
+    try:
+        data = request.get_json() or {}
+        roll_no = data.get('roll_no', None)
+
+        await run_blocking(prediction_service_server.clear_cache, roll_no)
+
+        message = f"Cache cleared for {roll_no}" if roll_no else "All cache cleared"
+
+        return {
+            'success': True,
+            'message': message
+        }, 200
+
+    except Exception as e:
+        return {'error': f'Server error: {str(e)}'}, 500
+
+
+@app.route('/api/jobs', methods=('GET', 'POST'))
+async def jobs(request: Request):
+    """Submit a background job (POST) or list retained jobs (GET)"""
+    try:
+        if request.method == 'POST':
+            return await run_blocking(job_handler.submit_job_handler, request.get_json())
+        return await run_blocking(job_handler.list_jobs_handler)
+    except Exception as e:
+        return {'error': f'Server error: {str(e)}'}, 500
+
+
+@app.route('/api/jobs/<job_id>', methods=('GET', 'DELETE'))
+async def job(request: Request, job_id: str):
+    """Get a job's status and progress (GET) or cancel it (DELETE)"""
+    try:
+        if request.method == 'DELETE':
+            return await run_blocking(job_handler.cancel_job_handler, job_id)
+        return await run_blocking(job_handler.get_job_handler, job_id)
+    except Exception as e:
+        return {'error': f'Server error: {str(e)}'}, 500
+
+
+@app.route('/api/jobs/<job_id>/result', methods=('GET',))
+async def job_result(request: Request, job_id: str):
+    """Stream a finished job's NDJSON result file"""
+    try:
+        response_data, status_code = await run_blocking(job_handler.job_result_handler, job_id)
+        if status_code != 200:
+            return response_data, status_code
+
+        return StreamingResponse(response_data, content_type='application/x-ndjson',
+                                 headers=[('Content-Disposition', f'attachment; filename="{job_id}.ndjson"')])
+
+    except Exception as e:
+        return {'error': f'Server error: {str(e)}'}, 500
+
+
+@app.route('/api/metrics', methods=('GET',))
+async def get_metrics(request: Request):
+    """Expose metrics in Prometheus text format"""
+    return Response(metrics.render().encode('utf-8'), 200, METRICS_CONTENT_TYPE)
+
+
+@app.route('/api/admin/profiles', methods=('GET',))
+async def list_profiles(request: Request):
+    """List request profiles captured by the Flask server (admin only)"""
+    if not admin_authorized(request):
+        return admin_forbidden_response()
+    return admin_handler.list_profiles_handler()
+
+
+@app.route('/api/admin/profiles/<profile_id>', methods=('GET',))
+async def get_profile(request: Request, profile_id: str):
+    """Get one request profile (admin only)"""
+    if not admin_authorized(request):
+        return admin_forbidden_response()
+
+    response_data, status_code = admin_handler.get_profile_handler(profile_id)
+    if status_code != 200 or request.args.get('format') == 'json':
+        return response_data, status_code
+    return Response(response_data['collapsed'].encode('utf-8'), 200, 'text/plain; charset=utf-8')
+
+
+@app.route('/api/admin/memory', methods=('GET',))
+async def get_memory_report(request: Request):
+    """Report approximate retained size per component (admin only)"""
+    if not admin_authorized(request):
+        return admin_forbidden_response()
+    return await run_blocking(admin_handler.memory_report_handler)
+
+
+@app.route('/api/admin/memory/snapshots', methods=('GET', 'POST', 'DELETE'))
+async def memory_snapshots(request: Request):
+    """List, take or drop tracemalloc snapshots (admin only)"""
+    if not admin_authorized(request):
+        return admin_forbidden_response()
+
+    if request.method == 'POST':
+        data = request.get_json() or {}
+        return await run_blocking(admin_handler.take_snapshot_handler, data.get('label'))
+    if request.method == 'DELETE':
+        return await run_blocking(admin_handler.stop_tracing_handler)
+    return admin_handler.list_snapshots_handler()
+
+
+@app.route('/api/admin/memory/snapshots/diff', methods=('GET',))
+async def diff_memory_snapshots(request: Request):
+    """Top allocation sites that grew between two snapshots (admin only)"""
+    if not admin_authorized(request):
+        return admin_forbidden_response()
+
+    try:
+        limit = int(request.args.get('limit', 20))
+    except ValueError:
+        limit = 20
+
+    return await run_blocking(
+        admin_handler.diff_snapshots_handler,
+        request.args.get('from', ''),
+        request.args.get('to'),
+        limit,
+        request.args.get('group_by', 'lineno')
+    )
+
+
+@app.route('/api/admin/workers', methods=('GET',))
+async def get_workers(request: Request):
+    """Report worker health plus the ASGI executor state (admin only)"""
+    if not admin_authorized(request):
+        return admin_forbidden_response()
+
+    response_data, status_code = admin_handler.workers_handler()
+    if status_code == 200:
+        response_data['mode'] = 'asgi'
+        response_data['blocking_executor'] = blocking_executor.stats()
+        response_data['batch_processes'] = batch_pool.processes
+    return response_data, status_code
+
+
+# ============================================================================
+# ERROR RESPONSES
+# ============================================================================
+
+def not_found() -> Response:
+    """404 response"""
+    return jsonify({
+        'error': 'Endpoint not found',
+        'message': 'The requested endpoint does not exist'
+    }, 404)
+
+
+def overloaded(error: Overloaded) -> Response:
+    """503 response for shed predictions"""
+    response = jsonify({
+        'error': 'Server busy',
+        'message': f'Too many predictions in progress; retry after {error.retry_after}s',
+        'retry_after': error.retry_after
+    }, 503)
+    response.headers.append(('Retry-After', str(error.retry_after)))
+    return response
+
+
+def internal_error() -> Response:
+    """500 response"""
+    return jsonify({
+        'error': 'Internal server error',
+        'message': 'An unexpected error occurred on the server'
+    }, 500)
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv=None) -> int:
+    """Serve the ASGI app with the built-in asyncio HTTP server"""
+    from utils.asgi_server import serve
+
+    parser = argparse.ArgumentParser(description='asyncio server for the ASGI variant of the API')
+    parser.add_argument('--host', default=HOST, help='interface to bind')
+    parser.add_argument('--port', type=int, default=PORT, help='port to bind')
+    parser.add_argument('--keepalive', type=float, default=ASGI_KEEPALIVE,
+                        help='seconds an idle keep-alive connection is kept open')
+    parser.add_argument('--access-log', action='store_true', help='log every request')
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print(f"🌐 ASGI server starting on http://{args.host}:{args.port}")
+    print(f"   blocking threads={ASGI_THREADS} queue={ASGI_QUEUE_SIZE} batch processes={ASGI_BATCH_PROCESSES}")
+    print("=" * 60, flush=True)
+
+    asyncio.run(serve(app, args.host, args.port, keepalive=args.keepalive, access_log=args.access_log))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
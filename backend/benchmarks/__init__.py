@@ -0,0 +1,9 @@
+"""
+Benchmarks Package
+==================
+
+This package contains performance benchmarks for the backend hot paths.
+Run the modules from the backend directory, e.g.:
+
+    python -m benchmarks.microbench
+"""
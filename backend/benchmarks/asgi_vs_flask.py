@@ -0,0 +1,253 @@
+"""
+ASGI vs Flask Comparison
+========================
+
+Drives the same request mix at high concurrency against three ways of
+serving the API, each holding a crowd of idle keep-alive connections (open
+dashboards) while the load runs:
+
+    flask-threaded  Werkzeug's threaded server (what `python server.py` runs):
+                    a thread per request, connection closed after
+                    each response
+    flask-prefork   serve.py with one worker: a fixed thread pool, idle
+                    connections parked in a selector
+    asgi            asgi.py on the built-in asyncio server: a coroutine per
+                    connection, blocking work in a bounded thread pool
+
+For each target it reports throughput, latency percentiles, errors, how many
+idle connections survived the run, and the server's RSS and thread count.
+RSS is summed over the server's processes, so pages shared copy-on-write
+(e.g. the model in forked batch workers) are counted once per process.
+
+Usage (from the backend directory):
+    python -m benchmarks.asgi_vs_flask
+    python -m benchmarks.asgi_vs_flask --idle 2000 --concurrency 256 --duration 15
+"""
+
+import argparse
+import http.client
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+# Add the backend directory to Python path
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.harness import RESULTS_DIR, environment_info, write_results
+from benchmarks.load_test import DEFAULT_MIX
+from benchmarks.serve_scaling import free_port, measure, stop_server, wait_until_ready
+
+
+TARGETS = ('flask-threaded', 'flask-prefork', 'asgi')
+
+
+def start_target(target: str, port: int, threads: int) -> subprocess.Popen:
+    """Start one server variant on a local port, with the persistent prediction cache off"""
+    if target == 'flask-threaded':
+        command = [sys.executable, '-W', 'ignore', '-m', 'benchmarks.asgi_vs_flask',
+                   '--serve-flask', str(port)]
+        env = dict(os.environ, PREDICTION_DISK_CACHE='')
+    elif target == 'flask-prefork':
+        command = [sys.executable, '-W', 'ignore', 'serve.py', '--host', '127.0.0.1',
+                   '--port', str(port), '--workers', '1', '--threads', str(threads)]
+        env = dict(os.environ, PREDICTION_DISK_CACHE='')
+    else:
+        command = [sys.executable, '-W', 'ignore', 'asgi.py', '--host', '127.0.0.1', '--port', str(port)]
+        env = dict(os.environ, PREDICTION_DISK_CACHE='', ASGI_THREADS=str(threads))
+
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def serve_flask_threaded(port: int):
+    """Child mode: run the Flask app on Werkzeug's threaded server"""
+    from werkzeug.serving import make_server
+    import server
+
+    make_server('127.0.0.1', port, server.app, threaded=True).serve_forever()
+
+
+def open_idle_connections(port: int, count: int) -> List[http.client.HTTPConnection]:
+    """Open keep-alive connections that each make one request and then idle"""
+    connections = []
+    for _ in range(count):
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        try:
+            connection.request('GET', '/api/health')
+            connection.getresponse().read()
+            connections.append(connection)
+        except OSError:
+            connection.close()
+            break
+    return connections
+
+
+def count_alive(connections: List[http.client.HTTPConnection], sample: int = 100) -> float:
+    """Fraction of a sample of idle connections the server still serves"""
+    if not connections:
+        return 0.0
+    step = max(1, len(connections) // sample)
+    probed = connections[::step]
+    alive = 0
+    for connection in probed:
+        try:
+            # Without auto_open a closed connection fails instead of reconnecting
+            connection.auto_open = 0
+            connection.request('GET', '/api/health')
+            if connection.getresponse().read():
+                alive += 1
+        except (OSError, http.client.HTTPException):
+            pass
+    return alive / len(probed)
+
+
+def process_tree_stats(pid: int) -> Optional[Dict]:
+    """RSS (MB) and thread count of a process and its children (Linux only)"""
+    def read_status(p):
+        stats = {}
+        try:
+            with open(f'/proc/{p}/status') as f:
+                for line in f:
+                    if line.startswith(('VmRSS:', 'Threads:')):
+                        key, value = line.split(':', 1)
+                        stats[key] = int(value.split()[0])
+        except OSError:
+            return None
+        return stats
+
+    def children(p):
+        found = []
+        try:
+            for task in os.listdir(f'/proc/{p}/task'):
+                with open(f'/proc/{p}/task/{task}/children') as f:
+                    found.extend(int(c) for c in f.read().split())
+        except OSError:
+            pass
+        return found
+
+    pids = [pid]
+    index = 0
+    while index < len(pids):
+        pids.extend(children(pids[index]))
+        index += 1
+
+    rss_kb = threads = 0
+    for p in pids:
+        stats = read_status(p)
+        if stats is None:
+            continue
+        rss_kb += stats.get('VmRSS', 0)
+        threads += stats.get('Threads', 0)
+
+    if rss_kb == 0:
+        return None
+    return {'rss_mb': round(rss_kb / 1024.0, 1), 'threads': threads, 'processes': len(pids)}
+
+
+def format_table(rows: List[Dict]) -> str:
+    """Format the comparison as a text table"""
+    header = (f"{'target':<15}  {'req/s':>9}  {'p50 ms':>9}  {'p99 ms':>9}  {'errors':>7}  "
+              f"{'idle open':>9}  {'idle alive':>10}  {'rss MB':>8}  {'threads':>7}")
+    lines = [header, '-' * len(header)]
+    for row in rows:
+        lines.append(
+            f"{row['target']:<15}  {row['throughput_rps']:>9.1f}  {row['p50_ms']:>9.2f}  "
+            f"{row['p99_ms']:>9.2f}  {row['errors']:>7}  {row['idle_opened']:>9}  "
+            f"{row['idle_alive']:>9.0%}  {str(row.get('rss_mb', '-')):>8}  {str(row.get('threads', '-')):>7}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    """Run the comparison"""
+    parser = argparse.ArgumentParser(description='Compare the ASGI and Flask serving paths')
+    parser.add_argument('--targets', default=','.join(TARGETS), help='comma separated targets')
+    parser.add_argument('--idle', type=int, default=1000, help='idle keep-alive connections held open')
+    parser.add_argument('--concurrency', type=int, default=128, help='active client connections')
+    parser.add_argument('--client-processes', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help='processes generating load')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds of load per target')
+    parser.add_argument('--threads', type=int, default=8, help='threads for blocking work (prefork, asgi)')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='request mix as endpoint=weight pairs')
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'asgi_vs_flask.json'),
+                        help='where to write the JSON results')
+    parser.add_argument('--serve-flask', type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve_flask:
+        serve_flask_threaded(args.serve_flask)
+        return 0
+
+    try:
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    except (ImportError, ValueError, OSError):
+        pass
+
+    rows = []
+    print("=" * 60)
+    print(f"⚖️  ASGI vs Flask: idle={args.idle} concurrency={args.concurrency} duration={args.duration}s")
+    print("=" * 60)
+
+    for target in [t.strip() for t in args.targets.split(',') if t.strip()]:
+        if target not in TARGETS:
+            print(f"⚠️  Unknown target {target}")
+            continue
+        if target == 'flask-prefork' and not hasattr(os, 'fork'):
+            print("⚠️  Skipping flask-prefork (requires os.fork)")
+            continue
+
+        port = free_port()
+        process = start_target(target, port, args.threads)
+        idle = []
+        try:
+            if not wait_until_ready(port, 1):
+                print(f"❌ {target}: server did not become ready")
+                continue
+
+            print(f"🔄 {target}: opening {args.idle} idle connections...")
+            idle = open_idle_connections(port, args.idle)
+            print(f"   {len(idle)} open; {args.duration}s of load at concurrency {args.concurrency}...")
+            report = measure(port, args.mix, args.concurrency, args.duration, args.client_processes)
+            resources = process_tree_stats(process.pid) or {}
+            alive = count_alive(idle)
+        finally:
+            for connection in idle:
+                connection.close()
+            stop_server(process)
+
+        overall = report['overall']
+        rows.append(dict(
+            target=target,
+            throughput_rps=overall['throughput_rps'],
+            p50_ms=overall['p50_ms'],
+            p95_ms=overall['p95_ms'],
+            p99_ms=overall['p99_ms'],
+            errors=overall['errors'],
+            idle_opened=len(idle),
+            idle_alive=alive,
+            endpoints=report['endpoints'],
+            **resources
+        ))
+
+    if not rows:
+        return 1
+
+    print("\n" + format_table(rows))
+
+    results = {
+        'meta': dict(environment_info(), idle=args.idle, concurrency=args.concurrency,
+                     duration=args.duration, threads=args.threads, mix=args.mix),
+        'rows': rows
+    }
+    write_results(results, args.output)
+    print(f"\n📁 Results written to {args.output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Synthetic Dataset Module
+========================
+
+Generates synthetic student databases in the same format as
+`database/students_data.json` so benchmarks can run at any cohort size.
+"""
+
+import json
+import random
+from datetime import datetime
+from typing import Dict, Iterator, Tuple
+
+
+BRANCHES = {
+    'CS': 'B.Tech Computer Science',
+    'EC': 'B.Tech Electronics & Communication',
+    'BT': 'B.Tech Biotechnology',
+    'CE': 'B.Tech Civil Engineering',
+    'EE': 'B.Tech Electrical Engineering',
+    'IT': 'B.Tech Information Technology',
+    'CH': 'B.Tech Chemical Engineering',
+    'ME': 'B.Tech Mechanical Engineering',
+}
+
+FIRST_NAMES = [
+    'Aarav', 'Anjali', 'Rahul', 'Priya', 'Vikram', 'Sneha', 'Amit', 'Ishita',
+    'Rohan', 'Kavya', 'Arjun', 'Meera', 'Karan', 'Pooja', 'Siddharth', 'Neha',
+]
+
+LAST_NAMES = [
+    'Sharma', 'Patel', 'Singh', 'Reddy', 'Kumar', 'Bhatia', 'Goel', 'Iyer',
+    'Nair', 'Gupta', 'Mehta', 'Joshi', 'Verma', 'Rao', 'Das', 'Kapoor',
+]
+
+PARENT_EDUCATION = ['Below 10th', '10th Pass', '12th Pass', 'Diploma', 'Graduate', 'Post Graduate', 'Doctorate']
+
+COUNSELOR_REASONS = [None, None, 'Personal', 'Career', 'Academic', 'Stress', 'Financial']
+
+YEAR_STRINGS = {1: '1st Year', 2: '2nd Year', 3: '3rd Year', 4: '4th Year'}
+
+
+def make_roll_number(index: int) -> Tuple[str, str, int]:
+    """
+    Build a unique roll number of the form year+branch+serial (e.g. 2023EC4154)
+
+    Args:
+        index: Zero-based student index
+
+    Returns:
+        Tuple of (roll_no, branch_code, study_year)
+    """
+    branch = list(BRANCHES)[index % len(BRANCHES)]
+    study_year = index // len(BRANCHES) % 4 + 1
+    admission_year = 2025 - study_year
+    return f"{admission_year}{branch}{1000 + index}", branch, study_year
+
+
+def generate_student(index: int, rng: random.Random) -> Dict:
+    """
+    Generate one synthetic student record
+
+    Args:
+        index: Zero-based student index (determines the roll number)
+        rng: Random generator
+
+    Returns:
+        Student record dictionary
+    """
+    roll_no, branch, study_year = make_roll_number(index)
+    income = rng.randrange(100000, 1500000, 1000)
+    cgpa_previous = round(rng.uniform(4.0, 9.8), 1)
+    cgpa_current = round(max(0.0, min(10.0, cgpa_previous + rng.uniform(-2.0, 1.0))), 1)
+    submitted = rng.randint(2, 10)
+    enrolled = rng.randint(4, 7)
+    counselor_visits = rng.choice([0, 0, 0, 1, 2, 3, 5])
+
+    return {
+        'student_id': roll_no,
+        'name': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        'roll_no': roll_no,
+        'course': BRANCHES[branch],
+        'year': study_year,
+        'year_string': YEAR_STRINGS[study_year],
+        'gender': rng.choice(['Male', 'Female']),
+        'age': 17 + study_year + rng.randint(0, 2),
+        'family_income': income,
+        'family_income_formatted': f"₹{income / 100000:.1f} Lakh/year",
+        'parent_education': rng.choice(PARENT_EDUCATION),
+        'distance_from_college': round(rng.uniform(1.0, 60.0), 1),
+        'hostel_day_scholar': rng.choice(['Hostel', 'Day Scholar']),
+        'attendance_percentage': round(rng.uniform(30.0, 99.0), 1),
+        'cgpa_current': cgpa_current,
+        'cgpa_previous': cgpa_previous,
+        'cgpa_semester1': cgpa_previous,
+        'cgpa_semester2': cgpa_current,
+        'units_enrolled_sem1': enrolled,
+        'units_approved_sem1': rng.randint(0, enrolled),
+        'units_enrolled_sem2': enrolled,
+        'units_approved_sem2': rng.randint(0, enrolled),
+        'assignments_submitted': submitted,
+        'assignments_total': 10,
+        'assignment_submission_rate': round(submitted * 10 + rng.uniform(-5.0, 5.0), 1),
+        'library_visits_monthly': rng.randint(0, 8),
+        'lms_last_login_days': rng.choice([0, 1, 2, 3, 7, 10, 15, 30, 45]),
+        'extracurricular_participation': rng.random() < 0.5,
+        'fee_payment_delay_months': rng.choice([0, 0, 0, 1, 2, 3, 4]),
+        'scholarship_holder': rng.random() < 0.3,
+        'tuition_fees_up_to_date': rng.random() < 0.8,
+        'debtor': rng.random() < 0.15,
+        'counselor_visits': counselor_visits,
+        'counselor_visit_reason': rng.choice(COUNSELOR_REASONS) if counselor_visits else None,
+        'actual_dropout_status': 1 if rng.random() < 0.2 else 0,
+    }
+
+
+def iter_students(count: int, seed: int = 42) -> Iterator[Dict]:
+    """
+    Yield `count` synthetic students deterministically
+
+    Args:
+        count: Number of students
+        seed: Random seed
+
+    Yields:
+        Student record dictionaries
+    """
+    rng = random.Random(seed)
+    for index in range(count):
+        yield generate_student(index, rng)
+
+
+def write_dataset(path: str, count: int, seed: int = 42):
+    """
+    Write a synthetic students_data.json file
+
+    Records are streamed to disk one at a time so very large cohorts can be
+    generated without holding them all in memory.
+
+    Args:
+        path: Output file path
+        count: Number of students
+        seed: Random seed
+    """
+    metadata = {
+        'total_students': count,
+        'generated_at': datetime.now().strftime('%Y-%m-%d'),
+        'description': f'Synthetic benchmark data ({count} students, seed {seed})'
+    }
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{\n  "metadata": ')
+        f.write(json.dumps(metadata, ensure_ascii=False))
+        f.write(',\n  "students": {')
+        for index, student in enumerate(iter_students(count, seed)):
+            if index:
+                f.write(',')
+            f.write('\n    ')
+            f.write(json.dumps(student['roll_no']))
+            f.write(': ')
+            f.write(json.dumps(student, ensure_ascii=False))
+        f.write('\n  }\n}\n')
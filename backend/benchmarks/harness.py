@@ -0,0 +1,299 @@
+"""
+Benchmark Harness Module
+========================
+
+This module contains the shared timing, statistics and reporting helpers
+used by the benchmark scripts in this package.
+"""
+
+import gc
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+
+# Percentiles reported for every benchmark
+PERCENTILES = (50, 90, 95, 99)
+
+# Default location for results and the stored baseline
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+BASELINE_PATH = os.path.join(RESULTS_DIR, 'baseline.json')
+
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """
+    Compute a percentile with linear interpolation
+
+    Args:
+        sorted_samples: Samples sorted in ascending order
+        pct: Percentile between 0 and 100
+
+    Returns:
+        Interpolated percentile value
+    """
+    if not sorted_samples:
+        return 0.0
+
+    position = (len(sorted_samples) - 1) * pct / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_samples) - 1)
+    fraction = position - lower
+
+    return sorted_samples[lower] + (sorted_samples[upper] - sorted_samples[lower]) * fraction
+
+
+def summarize(samples: List[float], unit: str = 'us') -> Dict:
+    """
+    Summarize latency samples
+
+    Args:
+        samples: Raw samples (already expressed in `unit`)
+        unit: Unit label for the samples
+
+    Returns:
+        Summary statistics dictionary
+    """
+    ordered = sorted(samples)
+    count = len(ordered)
+    mean = sum(ordered) / count if count else 0.0
+    variance = sum((s - mean) ** 2 for s in ordered) / (count - 1) if count > 1 else 0.0
+
+    summary = {
+        'unit': unit,
+        'samples': count,
+        'min': round(ordered[0], 3) if count else 0.0,
+        'mean': round(mean, 3),
+        'stdev': round(variance ** 0.5, 3),
+        'max': round(ordered[-1], 3) if count else 0.0,
+    }
+
+    for pct in PERCENTILES:
+        summary[f'p{pct}'] = round(percentile(ordered, pct), 3)
+
+    return summary
+
+
+def time_callable(func: Callable, warmup: int = 10, repeat: int = 100, number: int = 1) -> Dict:
+    """
+    Time a callable with warmup and repetitions
+
+    Each sample is the mean duration of `number` back-to-back calls, so very
+    fast functions can be measured above the timer resolution. The garbage
+    collector is disabled while sampling, as `timeit` does.
+
+    Args:
+        func: Zero-argument callable to time
+        warmup: Number of untimed warmup calls
+        repeat: Number of timed samples
+        number: Calls per sample
+
+    Returns:
+        Summary statistics in microseconds
+    """
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            for _ in range(number):
+                func()
+            elapsed = time.perf_counter_ns() - start
+            samples.append(elapsed / number / 1000.0)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return summarize(samples, unit='us')
+
+
+def time_with_budget(func: Callable, budget_seconds: float = 2.0,
+                     min_samples: int = 3, max_samples: int = 200) -> Dict:
+    """
+    Time a callable until a time budget or sample cap is reached
+
+    Useful when a single call may take anywhere from microseconds to
+    seconds (e.g. across dataset sizes). One untimed warmup call is made.
+
+    Args:
+        func: Zero-argument callable to time
+        budget_seconds: Stop sampling once this much time has been spent
+        min_samples: Always take at least this many samples
+        max_samples: Never take more than this many samples
+
+    Returns:
+        Summary statistics in milliseconds
+    """
+    func()
+
+    samples = []
+    spent = 0.0
+    while len(samples) < max_samples and (len(samples) < min_samples or spent < budget_seconds):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        spent += elapsed
+        samples.append(elapsed * 1000.0)
+
+    return summarize(samples, unit='ms')
+
+
+def environment_info() -> Dict:
+    """Describe the machine and interpreter a run was taken on"""
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def write_results(results: Dict, path: str):
+    """
+    Write benchmark results as JSON
+
+    Args:
+        results: Results dictionary
+        path: Output file path
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+def load_results(path: str) -> Optional[Dict]:
+    """
+    Load benchmark results from JSON
+
+    Args:
+        path: Results file path
+
+    Returns:
+        Results dictionary, or None if the file is missing or invalid
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except json.JSONDecodeError:
+        return None
+
+
+def compare_to_baseline(current: Dict, baseline: Dict,
+                        metric: str = 'p50', threshold: float = 0.10) -> List[Dict]:
+    """
+    Compare a run against a stored baseline
+
+    Args:
+        current: Results of the current run
+        baseline: Results of the baseline run
+        metric: Summary statistic to compare (e.g. 'p50', 'p95')
+        threshold: Relative change treated as significant (0.10 = 10%)
+
+    Returns:
+        One comparison row per benchmark present in either run
+    """
+    rows = []
+    current_benchmarks = current.get('benchmarks', {})
+    baseline_benchmarks = baseline.get('benchmarks', {})
+
+    for name in sorted(set(current_benchmarks) | set(baseline_benchmarks)):
+        new = current_benchmarks.get(name)
+        old = baseline_benchmarks.get(name)
+
+        if new is None or old is None:
+            rows.append({
+                'name': name,
+                'status': 'NEW' if old is None else 'MISSING',
+                'baseline': old.get(metric) if old else None,
+                'current': new.get(metric) if new else None,
+                'change': None
+            })
+            continue
+
+        old_value = old.get(metric, 0.0)
+        new_value = new.get(metric, 0.0)
+        change = (new_value - old_value) / old_value if old_value else 0.0
+
+        if change > threshold:
+            status = 'REGRESSION'
+        elif change < -threshold:
+            status = 'IMPROVED'
+        else:
+            status = 'OK'
+
+        rows.append({
+            'name': name,
+            'status': status,
+            'baseline': old_value,
+            'current': new_value,
+            'change': round(change, 4)
+        })
+
+    return rows
+
+
+def format_summary_table(benchmarks: Dict) -> str:
+    """
+    Format benchmark summaries as a text table
+
+    Args:
+        benchmarks: Mapping of benchmark name to summary
+
+    Returns:
+        Printable table
+    """
+    name_width = max([len(name) for name in benchmarks] + [9])
+    header = f"{'benchmark':<{name_width}}  {'p50':>10}  {'p95':>10}  {'p99':>10}  {'max':>10}  unit"
+    lines = [header, '-' * len(header)]
+
+    for name, summary in benchmarks.items():
+        lines.append(
+            f"{name:<{name_width}}  {summary['p50']:>10.2f}  {summary['p95']:>10.2f}  "
+            f"{summary['p99']:>10.2f}  {summary['max']:>10.2f}  {summary['unit']}"
+        )
+
+    return '\n'.join(lines)
+
+
+def format_regression_report(rows: List[Dict], metric: str = 'p50') -> str:
+    """
+    Format baseline comparison rows as a text report
+
+    Args:
+        rows: Output of compare_to_baseline
+        metric: Statistic that was compared
+
+    Returns:
+        Printable report
+    """
+    name_width = max([len(row['name']) for row in rows] + [9])
+    header = f"{'benchmark':<{name_width}}  {'baseline ' + metric:>14}  {'current ' + metric:>14}  {'change':>8}  status"
+    lines = [header, '-' * len(header)]
+
+    for row in rows:
+        baseline = f"{row['baseline']:.2f}" if row['baseline'] is not None else '-'
+        current = f"{row['current']:.2f}" if row['current'] is not None else '-'
+        change = f"{row['change'] * 100:+.1f}%" if row['change'] is not None else '-'
+        lines.append(
+            f"{row['name']:<{name_width}}  {baseline:>14}  {current:>14}  {change:>8}  {row['status']}"
+        )
+
+    regressions = sum(1 for row in rows if row['status'] == 'REGRESSION')
+    improvements = sum(1 for row in rows if row['status'] == 'IMPROVED')
+    lines.append('')
+    lines.append(f"{regressions} regression(s), {improvements} improvement(s)")
+
+    return '\n'.join(lines)
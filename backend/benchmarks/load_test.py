@@ -0,0 +1,536 @@
+"""
+Concurrent Load Generator
+=========================
+
+Drives the API with a configurable number of concurrent clients, request mix
+and duration, and reports throughput and p50/p95/p99/max latency per endpoint.
+
+Targets:
+    --mode inprocess   Flask test client inside this process (no sockets)
+    --mode socket      Serve the app on a local ephemeral port and use HTTP
+    --url URL          Use HTTP against an already running server
+
+Roll numbers are drawn uniformly, from a Zipfian distribution, or replayed
+from a recorded access log (one roll number per line, or `roll_no,count`
+lines to replay a recorded frequency distribution).
+
+Usage (from the backend directory):
+    python -m benchmarks.load_test --concurrency 16 --duration 30
+    python -m benchmarks.load_test --mode socket --distribution zipf --zipf-s 1.2
+    python -m benchmarks.load_test --url http://localhost:8000 --mix student=2,predict=2,search=1,health=1
+    python -m benchmarks.load_test --replay access_log.txt
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import random
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urlparse
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.harness import environment_info, percentile, write_results
+
+
+# Endpoint name -> (HTTP method, path template)
+ENDPOINTS = {
+    'student': ('GET', '/api/student/{roll_no}'),
+    'predict': ('POST', '/api/predict/{roll_no}'),
+    'search': ('GET', '/api/students?search={query}'),
+    'health': ('GET', '/api/health'),
+}
+
+DEFAULT_MIX = 'student=4,predict=3,search=2,health=1'
+
+
+# ============================================================================
+# TRANSPORTS
+# ============================================================================
+
+class InProcessTransport:
+    """Issues requests through the Flask test client"""
+
+    def __init__(self, app):
+        """Create a test client for this worker"""
+        self.client = app.test_client()
+
+    def request(self, method: str, path: str) -> Tuple[int, int]:
+        """
+        Issue a request
+
+        Returns:
+            Tuple of (status_code, response_bytes)
+        """
+        response = self.client.open(path, method=method)
+        return response.status_code, len(response.get_data())
+
+    def close(self):
+        """Nothing to release for the test client"""
+
+
+class HttpTransport:
+    """Issues requests over a keep-alive HTTP connection"""
+
+    def __init__(self, host: str, port: int, timeout: float = 30.0):
+        """Prepare a connection to host:port"""
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.connection = None
+
+    def request(self, method: str, path: str) -> Tuple[int, int]:
+        """
+        Issue a request, reconnecting once if the connection dropped
+
+        Returns:
+            Tuple of (status_code, response_bytes)
+        """
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self.connection.request(method, path, headers={'Content-Length': '0'} if method == 'POST' else {})
+                response = self.connection.getresponse()
+                body = response.read()
+                return response.status, len(body)
+            except (ConnectionError, http.client.HTTPException, OSError):
+                self.close()
+                if attempt == 1:
+                    raise
+
+        return 0, 0
+
+    def close(self):
+        """Close the underlying connection"""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+def start_local_server(app, host: str = '127.0.0.1'):
+    """
+    Serve the app on an ephemeral local port in a background thread
+
+    Args:
+        app: WSGI application
+        host: Interface to bind
+
+    Returns:
+        Tuple of (server, port)
+    """
+    from werkzeug.serving import make_server
+
+    server = make_server(host, 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, server.server_port
+
+
+# ============================================================================
+# ROLL NUMBER DISTRIBUTIONS
+# ============================================================================
+
+class RollNumberSampler:
+    """Draws roll numbers from a uniform, Zipfian or recorded distribution"""
+
+    def __init__(self, roll_numbers: List[str], distribution: str = 'uniform',
+                 zipf_s: float = 1.1, replay: Optional[List[str]] = None,
+                 replay_weights: Optional[List[float]] = None, seed: int = 42):
+        """
+        Initialize the sampler
+
+        Args:
+            roll_numbers: Known roll numbers
+            distribution: 'uniform', 'zipf' or 'replay'
+            zipf_s: Zipf exponent (higher = more skewed)
+            replay: Recorded roll numbers (sequence or distinct keys)
+            replay_weights: Recorded access counts matching `replay`
+            seed: Random seed for reproducible runs
+        """
+        self.distribution = distribution
+        self._sequence = None
+        self._lock = threading.Lock()
+
+        if distribution == 'replay':
+            if not replay:
+                raise ValueError('Replay distribution requires recorded roll numbers')
+            if replay_weights:
+                self.population = replay
+                self.cum_weights = list(itertools.accumulate(replay_weights))
+            else:
+                # Replay the recorded sequence in order, looping at the end
+                self.population = replay
+                self.cum_weights = None
+                self._sequence = itertools.cycle(replay)
+        elif distribution == 'zipf':
+            # Rank students in a random (but seeded) popularity order
+            self.population = list(roll_numbers)
+            random.Random(seed).shuffle(self.population)
+            weights = [1.0 / (rank ** zipf_s) for rank in range(1, len(self.population) + 1)]
+            self.cum_weights = list(itertools.accumulate(weights))
+        else:
+            self.population = list(roll_numbers)
+            self.cum_weights = None
+
+        if not self.population:
+            raise ValueError('No roll numbers available to sample from')
+
+    def sample(self, rng: random.Random) -> str:
+        """Draw one roll number"""
+        if self._sequence is not None:
+            with self._lock:
+                return next(self._sequence)
+        if self.cum_weights is not None:
+            return rng.choices(self.population, cum_weights=self.cum_weights)[0]
+        return rng.choice(self.population)
+
+
+def load_replay_file(path: str) -> Tuple[List[str], Optional[List[float]]]:
+    """
+    Load a recorded roll-number access log
+
+    Each line is either `roll_no` (replayed in order) or `roll_no,count`
+    (replayed as a weighted distribution). Blank lines and lines starting
+    with '#' are ignored.
+
+    Args:
+        path: Path to the recorded access log
+
+    Returns:
+        Tuple of (roll_numbers, weights or None)
+    """
+    roll_numbers = []
+    weights = []
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if ',' in line:
+                roll_no, count = line.split(',', 1)
+                roll_numbers.append(roll_no.strip())
+                weights.append(float(count))
+            else:
+                roll_numbers.append(line)
+
+    if weights and len(weights) != len(roll_numbers):
+        raise ValueError('Replay file mixes weighted and unweighted lines')
+
+    return roll_numbers, (weights or None)
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """
+    Parse a request mix such as 'student=4,predict=3,search=2,health=1'
+
+    Args:
+        mix: Comma separated endpoint=weight pairs
+
+    Returns:
+        Mapping of endpoint name to weight
+    """
+    weights = {}
+    for part in mix.split(','):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}' (choose from {', '.join(ENDPOINTS)})")
+        weights[name] = float(weight) if weight else 1.0
+
+    if not weights or sum(weights.values()) <= 0:
+        raise ValueError('Request mix must contain at least one endpoint with a positive weight')
+
+    return weights
+
+
+# ============================================================================
+# LOAD GENERATOR
+# ============================================================================
+
+class LoadGenerator:
+    """Closed-loop load generator with per-endpoint latency recording"""
+
+    def __init__(self, transport_factory, sampler: RollNumberSampler,
+                 search_queries: List[str], mix: Dict[str, float],
+                 concurrency: int = 8, duration: float = 10.0, seed: int = 42):
+        """
+        Initialize the generator
+
+        Args:
+            transport_factory: Callable returning a new transport per worker
+            sampler: Roll number sampler
+            search_queries: Queries used for the search endpoint
+            mix: Endpoint weights
+            concurrency: Number of concurrent clients
+            duration: Run duration in seconds
+            seed: Base random seed
+        """
+        self.transport_factory = transport_factory
+        self.sampler = sampler
+        self.search_queries = search_queries or ['a']
+        self.endpoint_names = list(mix.keys())
+        self.endpoint_cum_weights = list(itertools.accumulate(mix.values()))
+        self.concurrency = concurrency
+        self.duration = duration
+        self.seed = seed
+
+    def _build_path(self, endpoint: str, rng: random.Random) -> Tuple[str, str]:
+        """Build (method, path) for one request"""
+        method, template = ENDPOINTS[endpoint]
+        if '{roll_no}' in template:
+            return method, template.format(roll_no=quote(self.sampler.sample(rng)))
+        if '{query}' in template:
+            return method, template.format(query=quote(rng.choice(self.search_queries)))
+        return method, template
+
+    def _worker(self, index: int, deadline: float, results: List[Dict]):
+        """Issue requests until the deadline and record latencies locally"""
+        rng = random.Random(self.seed + index)
+        transport = self.transport_factory()
+        latencies = {name: [] for name in self.endpoint_names}
+        errors = {name: 0 for name in self.endpoint_names}
+        statuses = {name: {} for name in self.endpoint_names}
+
+        try:
+            while time.perf_counter() < deadline:
+                endpoint = rng.choices(self.endpoint_names, cum_weights=self.endpoint_cum_weights)[0]
+                method, path = self._build_path(endpoint, rng)
+
+                start = time.perf_counter()
+                try:
+                    status, _ = transport.request(method, path)
+                except Exception:
+                    status = 0
+                elapsed_ms = (time.perf_counter() - start) * 1000.0
+
+                latencies[endpoint].append(elapsed_ms)
+                statuses[endpoint][status] = statuses[endpoint].get(status, 0) + 1
+                if status == 0 or status >= 500:
+                    errors[endpoint] += 1
+        finally:
+            transport.close()
+
+        results[index] = {'latencies': latencies, 'errors': errors, 'statuses': statuses}
+
+    def run(self) -> Dict:
+        """
+        Run the load test
+
+        Returns:
+            Report with throughput and latency percentiles per endpoint
+        """
+        results, elapsed = self.collect()
+        return self._build_report(results, elapsed)
+
+    def collect(self) -> Tuple[List[Dict], float]:
+        """
+        Run the load test and return the raw per-client samples
+
+        Returns:
+            Tuple of (per-client results, elapsed seconds)
+        """
+        results = [None] * self.concurrency
+        start = time.perf_counter()
+        deadline = start + self.duration
+
+        threads = [
+            threading.Thread(target=self._worker, args=(i, deadline, results), daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        elapsed = time.perf_counter() - start
+        return results, elapsed
+
+    def _build_report(self, results: List[Dict], elapsed: float) -> Dict:
+        """Merge per-worker samples into a report"""
+        report = {'elapsed_seconds': round(elapsed, 3), 'endpoints': {}}
+        all_latencies = []
+        total_errors = 0
+
+        for endpoint in self.endpoint_names:
+            samples = []
+            errors = 0
+            statuses = {}
+            for result in results:
+                if result is None:
+                    continue
+                samples.extend(result['latencies'][endpoint])
+                errors += result['errors'][endpoint]
+                for status, count in result['statuses'][endpoint].items():
+                    statuses[str(status)] = statuses.get(str(status), 0) + count
+
+            report['endpoints'][endpoint] = summarize_latencies(samples, errors, elapsed)
+            report['endpoints'][endpoint]['status_codes'] = statuses
+            all_latencies.extend(samples)
+            total_errors += errors
+
+        report['overall'] = summarize_latencies(all_latencies, total_errors, elapsed)
+        return report
+
+
+def summarize_latencies(samples_ms: List[float], errors: int, elapsed: float) -> Dict:
+    """
+    Summarize request latencies for one endpoint
+
+    Args:
+        samples_ms: Latencies in milliseconds
+        errors: Failed request count
+        elapsed: Wall clock duration of the run in seconds
+
+    Returns:
+        Throughput and latency percentile summary
+    """
+    ordered = sorted(samples_ms)
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'throughput_rps': round(len(ordered) / elapsed, 1) if elapsed > 0 else 0.0,
+        'p50_ms': round(percentile(ordered, 50), 3),
+        'p95_ms': round(percentile(ordered, 95), 3),
+        'p99_ms': round(percentile(ordered, 99), 3),
+        'max_ms': round(ordered[-1], 3) if ordered else 0.0,
+    }
+
+
+def format_report(report: Dict) -> str:
+    """Format a load test report as a text table"""
+    header = f"{'endpoint':<10}  {'requests':>9}  {'errors':>7}  {'req/s':>9}  {'p50 ms':>9}  {'p95 ms':>9}  {'p99 ms':>9}  {'max ms':>9}"
+    lines = [header, '-' * len(header)]
+
+    rows = list(report['endpoints'].items()) + [('overall', report['overall'])]
+    for name, stats in rows:
+        lines.append(
+            f"{name:<10}  {stats['requests']:>9}  {stats['errors']:>7}  {stats['throughput_rps']:>9.1f}  "
+            f"{stats['p50_ms']:>9.2f}  {stats['p95_ms']:>9.2f}  {stats['p99_ms']:>9.2f}  {stats['max_ms']:>9.2f}"
+        )
+
+    return '\n'.join(lines)
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def discover_students(transport) -> List[Dict]:
+    """Fetch the student list through the API"""
+    if isinstance(transport, InProcessTransport):
+        response = transport.client.get('/api/students')
+        return response.get_json().get('students', [])
+
+    transport.connection = http.client.HTTPConnection(transport.host, transport.port, timeout=transport.timeout)
+    transport.connection.request('GET', '/api/students')
+    body = transport.connection.getresponse().read()
+    transport.close()
+    return json.loads(body).get('students', [])
+
+
+def build_search_queries(students: List[Dict], count: int = 20, seed: int = 42) -> List[str]:
+    """Derive realistic search queries from student names and roll numbers"""
+    rng = random.Random(seed)
+    queries = []
+    for student in rng.sample(students, min(count, len(students))):
+        name = student.get('name', '')
+        if name:
+            queries.append(name.split()[0][:4].lower())
+        queries.append(student.get('roll_no', '')[:6])
+    return [q for q in queries if q] or ['a']
+
+
+def main(argv=None) -> int:
+    """Run a load test from the command line"""
+    parser = argparse.ArgumentParser(description='Concurrent load generator for the API')
+    parser.add_argument('--mode', choices=['inprocess', 'socket'], default='inprocess',
+                        help='drive the app in-process or over a local socket')
+    parser.add_argument('--url', default=None, help='target an already running server instead')
+    parser.add_argument('--concurrency', type=int, default=8, help='number of concurrent clients')
+    parser.add_argument('--duration', type=float, default=10.0, help='run duration in seconds')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='request mix as endpoint=weight pairs')
+    parser.add_argument('--distribution', choices=['uniform', 'zipf'], default='uniform',
+                        help='roll number access distribution')
+    parser.add_argument('--zipf-s', type=float, default=1.1, help='Zipf exponent')
+    parser.add_argument('--replay', default=None, help='recorded roll-number access log to replay')
+    parser.add_argument('--seed', type=int, default=42, help='random seed')
+    parser.add_argument('--output', default=None, help='write the JSON report to this path')
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url:
+        parsed = urlparse(args.url)
+        host, port = parsed.hostname, parsed.port or 80
+        transport_factory = lambda: HttpTransport(host, port)
+        target = args.url
+    else:
+        # Keep the in-process app out of the persistent prediction cache
+        os.environ['PREDICTION_DISK_CACHE'] = ''
+        import server as backend_server
+        app = backend_server.app
+
+        if args.mode == 'socket':
+            server, port = start_local_server(app)
+            transport_factory = lambda: HttpTransport('127.0.0.1', port)
+            target = f'http://127.0.0.1:{port}'
+        else:
+            transport_factory = lambda: InProcessTransport(app)
+            target = 'in-process test client'
+
+    try:
+        students = discover_students(transport_factory())
+        roll_numbers = [s['roll_no'] for s in students if s.get('roll_no')]
+
+        if args.replay:
+            replay, weights = load_replay_file(args.replay)
+            sampler = RollNumberSampler(roll_numbers, 'replay', replay=replay,
+                                        replay_weights=weights, seed=args.seed)
+            distribution = f'replay ({args.replay})'
+        else:
+            sampler = RollNumberSampler(roll_numbers, args.distribution, zipf_s=args.zipf_s, seed=args.seed)
+            distribution = args.distribution
+
+        generator = LoadGenerator(
+            transport_factory,
+            sampler,
+            build_search_queries(students, seed=args.seed),
+            parse_mix(args.mix),
+            concurrency=args.concurrency,
+            duration=args.duration,
+            seed=args.seed
+        )
+
+        print("=" * 60)
+        print(f"🚦 Load test: {target}")
+        print(f"   concurrency={args.concurrency} duration={args.duration}s mix={args.mix}")
+        print(f"   distribution={distribution} students={len(roll_numbers)}")
+        print("=" * 60)
+
+        report = generator.run()
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    print("\n" + format_report(report))
+
+    if args.output:
+        report['meta'] = dict(environment_info(), target=target, concurrency=args.concurrency,
+                              duration=args.duration, mix=args.mix, distribution=distribution)
+        write_results(report, args.output)
+        print(f"\n📁 Report written to {args.output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""
+Microbenchmark Suite
+====================
+
+Times the backend hot paths in isolation with warmup, repetitions and
+percentile reporting:
+
+    - StudentService: load_students, get_student_by_roll_no, search_students
+    - DropoutPredictor: _prepare_features, predict, _calculate_risk_factors
+    - PredictionSchema.format_response
+    - Flask test-client round trips for every route in server.py
+    - Metrics recording overhead (histogram observe, counter inc)
+    - Response encoding: Flask's default jsonify encoding vs the stdlib and
+      orjson encoders, and gzip, on the prediction and student list payloads
+
+Results are written as JSON and can be compared against a stored baseline.
+
+Usage (from the backend directory):
+    python -m benchmarks.microbench
+    python -m benchmarks.microbench --save-baseline
+    python -m benchmarks.microbench --filter route: --repeat 500
+"""
+
+import argparse
+import os
+import sys
+from typing import Callable, Dict, List, Tuple
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.harness import (
+    BASELINE_PATH,
+    RESULTS_DIR,
+    compare_to_baseline,
+    environment_info,
+    format_regression_report,
+    format_summary_table,
+    load_results,
+    time_callable,
+    write_results,
+)
+
+
+# (name, callable, calls per sample)
+Benchmark = Tuple[str, Callable, int]
+
+
+def student_service_benchmarks() -> List[Benchmark]:
+    """Build benchmarks for StudentService"""
+    from services.student_service.student_service import StudentService
+
+    service = StudentService()
+    students = service.load_students().get('students', {})
+    roll_no = next(iter(students), 'UNKNOWN')
+
+    return [
+        ('student_service.load_students', service.load_students, 1),
+        ('student_service.get_student_by_roll_no', lambda: service.get_student_by_roll_no(roll_no), 1),
+        ('student_service.search_students', lambda: service.search_students('an'), 1),
+    ]
+
+
+def predictor_benchmarks() -> List[Benchmark]:
+    """Build benchmarks for DropoutPredictor and PredictionSchema"""
+    from ml.predict import DropoutPredictor
+    from schemas.prediction_schema.prediction_schema import PredictionSchema
+    from services.student_service.student_service import StudentService
+
+    predictor = DropoutPredictor()
+    if not predictor.is_loaded:
+        print("⚠️  Model not loaded - skipping predictor benchmarks")
+        return []
+
+    students = StudentService().load_students().get('students', {})
+    if not students:
+        print("⚠️  No students in database - skipping predictor benchmarks")
+        return []
+
+    student = next(iter(students.values()))
+    batch = list(students.values())
+    prediction = predictor.predict(student)
+    probability = prediction.get('prediction_details', {}).get('dropout_probability', 0.5)
+
+    return [
+        ('predictor._prepare_features', lambda: predictor._prepare_features(student), 1),
+        ('predictor.predict', lambda: predictor.predict(student), 1),
+        (f'predictor.predict_batch[{len(batch)}]', lambda: predictor.predict_batch(batch), 1),
+        ('predictor._calculate_risk_factors',
+         lambda: predictor._calculate_risk_factors(student, probability), 10),
+        ('prediction_schema.format_response',
+         lambda: PredictionSchema.format_response(prediction), 10),
+    ]
+
+
+def route_benchmarks() -> List[Benchmark]:
+    """Build Flask test-client round trips for every route in server.py"""
+    import server
+
+    client = server.app.test_client()
+    students = server.student_handler.service.load_students().get('students', {})
+    roll_no = next(iter(students), 'UNKNOWN')
+
+    return [
+        ('route:GET /api/health', lambda: client.get('/api/health'), 1),
+        ('route:GET /api/student/<roll_no>', lambda: client.get(f'/api/student/{roll_no}'), 1),
+        ('route:GET /api/students', lambda: client.get('/api/students'), 1),
+        ('route:GET /api/students?search=', lambda: client.get('/api/students?search=an'), 1),
+        ('route:POST /api/predict/<roll_no>', lambda: client.post(f'/api/predict/{roll_no}'), 1),
+        ('route:GET /api/model/info', lambda: client.get('/api/model/info'), 1),
+        ('route:POST /api/predict/batch',
+         lambda: client.post('/api/predict/batch', json={'roll_nos': [roll_no]}), 1),
+        ('route:POST /api/cache/clear', lambda: client.post('/api/cache/clear', json={}), 1),
+    ]
+
+
+def metrics_benchmarks() -> List[Benchmark]:
+    """Build benchmarks for the per-request metrics recording cost"""
+    from utils.metrics import MetricsRegistry
+
+    registry = MetricsRegistry()
+    histogram = registry.histogram('bench_seconds', 'Benchmark histogram', ['route', 'method', 'status'])
+    counter = registry.counter('bench_total', 'Benchmark counter', ['result'])
+    labels = ('/api/student/<roll_no>', 'GET', 200)
+
+    return [
+        ('metrics.histogram.observe', lambda: histogram.observe(0.0042, labels), 1000),
+        ('metrics.counter.inc', lambda: counter.inc(('hit',)), 1000),
+    ]
+
+
+def serialization_benchmarks() -> List[Benchmark]:
+    """Build benchmarks comparing response encoders on real payloads"""
+    import json
+
+    from schemas.prediction_schema.prediction_schema import PredictionSchema
+    from services.prediction_service.prediction_service import PredictionService
+    from services.student_service.student_service import StudentService
+    from utils.serialization import JSONEncoderBackend, gzip_body, orjson
+
+    service = StudentService()
+    students = service.load_students().get('students', {})
+    if not students:
+        print("⚠️  No students in database - skipping serialization benchmarks")
+        return []
+
+    payloads = {'students': {'total': len(students), 'students': service.get_all_students()}}
+    prediction_service = PredictionService()
+    if prediction_service.is_model_loaded():
+        prediction = prediction_service.predict_dropout_risk(next(iter(students.values())))
+        payloads['prediction'] = PredictionSchema.format_response(prediction)
+
+    # What Flask's DefaultJSONProvider does for jsonify() outside debug mode
+    def flask_default(obj):
+        return (json.dumps(obj, default=str, sort_keys=True, ensure_ascii=True,
+                           separators=(',', ':')) + '\n').encode('utf-8')
+
+    encoders = [('flask_default', flask_default), ('stdlib', JSONEncoderBackend('stdlib').dumps_line)]
+    if orjson is not None:
+        encoders.append(('orjson', JSONEncoderBackend('orjson').dumps_line))
+
+    benchmarks = []
+    for payload_name, payload in payloads.items():
+        for encoder_name, encode in encoders:
+            benchmarks.append((f'json.{encoder_name}[{payload_name}]',
+                               lambda encode=encode, payload=payload: encode(payload), 10))
+        body = encoders[-1][1](payload)
+        benchmarks.append((f'gzip[{payload_name} {len(body)}B]', lambda body=body: gzip_body(body), 10))
+    return benchmarks
+
+
+BENCHMARK_GROUPS = [
+    student_service_benchmarks,
+    predictor_benchmarks,
+    route_benchmarks,
+    metrics_benchmarks,
+    serialization_benchmarks,
+]
+
+
+def run_benchmarks(warmup: int, repeat: int, name_filter: str = '') -> Dict:
+    """
+    Run every registered benchmark
+
+    Args:
+        warmup: Untimed warmup calls per benchmark
+        repeat: Timed samples per benchmark
+        name_filter: Only run benchmarks whose name contains this string
+
+    Returns:
+        Results dictionary ready to be written as JSON
+    """
+    results = {
+        'meta': dict(environment_info(), warmup=warmup, repeat=repeat),
+        'benchmarks': {}
+    }
+
+    for build_group in BENCHMARK_GROUPS:
+        for name, func, number in build_group():
+            if name_filter and name_filter not in name:
+                continue
+            print(f"⏱  {name}")
+            results['benchmarks'][name] = time_callable(func, warmup=warmup, repeat=repeat, number=number)
+
+    return results
+
+
+def main(argv=None) -> int:
+    """Run the suite and report against the baseline"""
+    parser = argparse.ArgumentParser(description='Backend hot-path microbenchmarks')
+    parser.add_argument('--warmup', type=int, default=20, help='untimed warmup calls per benchmark')
+    parser.add_argument('--repeat', type=int, default=200, help='timed samples per benchmark')
+    parser.add_argument('--filter', default='', help='only run benchmarks containing this string')
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'latest.json'),
+                        help='where to write the JSON results')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the new baseline')
+    parser.add_argument('--metric', default='p50', help='statistic used for the regression report')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='relative change reported as a regression (0.10 = 10%%)')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='exit with status 1 if any benchmark regressed')
+    args = parser.parse_args(argv)
+
+    # Route timings must not read or fill the persistent prediction cache
+    os.environ['PREDICTION_DISK_CACHE'] = ''
+    results = run_benchmarks(args.warmup, args.repeat, args.filter)
+
+    print("\n" + format_summary_table(results['benchmarks']))
+
+    write_results(results, args.output)
+    print(f"\n📁 Results written to {args.output}")
+
+    if args.save_baseline:
+        write_results(results, args.baseline)
+        print(f"📁 Baseline saved to {args.baseline}")
+        return 0
+
+    baseline = load_results(args.baseline)
+    if baseline is None:
+        print("ℹ️  No baseline found - run with --save-baseline to store one")
+        return 0
+
+    rows = compare_to_baseline(results, baseline, metric=args.metric, threshold=args.threshold)
+    print("\n" + format_regression_report(rows, metric=args.metric))
+
+    if args.fail_on_regression and any(row['status'] == 'REGRESSION' for row in rows):
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Priority Scheduling Benchmark
+=============================
+
+Measures interactive prediction latency while bulk scoring runs alongside
+it, with and without the prediction scheduler:
+
+    unscheduled  each bulk job scores its whole cohort in one model call,
+                 competing with interactive predictions for the CPU
+    scheduled    bulk jobs run through PredictionScheduler: chunks on the
+                 bulk pool that hold back while interactive predictions run
+
+Interactive clients predict a random student, pause (think time) and
+repeat; bulk clients score the whole cohort back to back. For each mode the
+benchmark reports interactive latency percentiles and bulk throughput, so
+the cost of protecting the interactive p99 is visible next to the gain.
+
+Usage (from the backend directory):
+    python -m benchmarks.priority_scheduling
+    python -m benchmarks.priority_scheduling --bulk-clients 4 --duration 20
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import threading
+import time
+from typing import Dict, List
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.harness import RESULTS_DIR, environment_info, percentile, write_results
+
+
+MODES = ('unscheduled', 'scheduled')
+
+
+def run_mode(service, students: List[Dict], mode: str, interactive_clients: int,
+             bulk_clients: int, duration: float, think_time: float) -> Dict:
+    """
+    Run interactive and bulk clients against the service for one mode
+
+    Returns:
+        Interactive latency percentiles (ms) and bulk throughput
+    """
+    from services.prediction_service.prediction_scheduler import PredictionScheduler
+    from config import BULK_CHUNK_SIZE, BULK_MAX_DEFER_MS, BULK_WORKERS
+
+    workers = BULK_WORKERS if mode == 'scheduled' else 0
+    service.scheduler = PredictionScheduler(workers, BULK_CHUNK_SIZE, BULK_MAX_DEFER_MS)
+
+    stop = threading.Event()
+    latencies: List[float] = []
+    bulk_scored = [0]
+    lock = threading.Lock()
+
+    def interactive_client(seed: int):
+        rng = random.Random(seed)
+        while not stop.is_set():
+            start = time.perf_counter()
+            service.predict_dropout_risk(rng.choice(students))
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+            stop.wait(think_time)
+
+    def bulk_client():
+        while not stop.is_set():
+            service.predict_bulk(students)
+            with lock:
+                bulk_scored[0] += len(students)
+
+    threads = [threading.Thread(target=interactive_client, args=(seed,)) for seed in range(interactive_clients)]
+    threads += [threading.Thread(target=bulk_client) for _ in range(bulk_clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    service.scheduler.shutdown()
+
+    samples = sorted(latency * 1000 for latency in latencies)
+    return {
+        'mode': mode,
+        'interactive_requests': len(samples),
+        'interactive_p50_ms': round(percentile(samples, 50), 2),
+        'interactive_p90_ms': round(percentile(samples, 90), 2),
+        'interactive_p99_ms': round(percentile(samples, 99), 2),
+        'interactive_max_ms': round(samples[-1], 2) if samples else 0.0,
+        'bulk_students_per_s': round(bulk_scored[0] / elapsed, 1),
+    }
+
+
+def main(argv=None) -> int:
+    """Run the benchmark from the command line"""
+    parser = argparse.ArgumentParser(description='Interactive latency under bulk load, with and without priorities')
+    parser.add_argument('--interactive-clients', type=int, default=2, help='concurrent interactive clients')
+    parser.add_argument('--bulk-clients', type=int, default=2, help='concurrent bulk jobs')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per mode')
+    parser.add_argument('--think-time', type=float, default=0.05, help='seconds between interactive requests')
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'priority_scheduling.json'),
+                        help='results JSON path')
+    args = parser.parse_args(argv)
+
+    # Every interactive request must run the model, not read the persistent cache
+    os.environ['PREDICTION_DISK_CACHE'] = ''
+    # Model loading prints progress; keep the report readable
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        from services.prediction_service.prediction_service_server import prediction_service_server
+        from services.student_service.student_service_server import student_service_server
+
+    service = prediction_service_server.service
+    if not service.is_model_loaded():
+        print("❌ Model not loaded; train it first (python ml/train.py)")
+        return 1
+    students = list(student_service_server.service.load_students().get('students', {}).values())
+
+    print("=" * 60)
+    print(f"⚖️  {args.interactive_clients} interactive vs {args.bulk_clients} bulk clients "
+          f"({len(students)} students per bulk job), {args.duration:.0f}s per mode")
+    print("=" * 60)
+
+    rows = []
+    for mode in MODES:
+        print(f"\n🔄 {mode}...")
+        rows.append(run_mode(service, students, mode, args.interactive_clients,
+                             args.bulk_clients, args.duration, args.think_time))
+
+    print(f"\n{'mode':<12} {'requests':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'bulk/s':>9}")
+    for row in rows:
+        print(f"{row['mode']:<12} {row['interactive_requests']:>9} {row['interactive_p50_ms']:>8} "
+              f"{row['interactive_p90_ms']:>8} {row['interactive_p99_ms']:>8} {row['interactive_max_ms']:>8} "
+              f"{row['bulk_students_per_s']:>9}")
+
+    write_results({'environment': environment_info(), 'config': vars(args), 'results': rows}, args.output)
+    print(f"\n📁 Results written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
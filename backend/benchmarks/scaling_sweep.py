@@ -0,0 +1,320 @@
+"""
+Dataset-Size Scaling Sweep
+==========================
+
+Generates synthetic student databases from 100 up to 1M students and, for
+each size, measures in a fresh process:
+
+    - startup time (server import + first student store load + model load;
+      the startup warm-up is off so each part is timed on its own)
+    - RSS (total, and the part retained by the student store)
+    - single lookup latency       StudentService.get_student_by_roll_no
+    - search latency              StudentService.search_students
+    - list-endpoint latency       GET /api/students
+    - single prediction latency   DropoutPredictor.predict and POST /api/predict/<roll_no>
+    - batch scoring throughput    PredictionServiceServer.batch_predict
+
+The per-size table is written as CSV, followed by a complexity summary that
+fits a log-log slope to each path and classifies it (O(1), sublinear, O(n),
+superlinear).
+
+Slow paths are sampled under a time budget, so the largest sizes finish in
+bounded time; batch scoring reports how many students it scored.
+
+Usage (from the backend directory):
+    python -m benchmarks.scaling_sweep
+    python -m benchmarks.scaling_sweep --sizes 100,1000,10000 --budget 1
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+# Add the backend directory to Python path
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.datasets import write_dataset
+from benchmarks.harness import RESULTS_DIR, time_with_budget
+from utils.memory import current_rss_mb
+
+
+DEFAULT_SIZES = '100,1000,10000,100000,1000000'
+
+RESULT_MARKER = 'SCALING_RESULT '
+
+COLUMNS = [
+    'size', 'import_s', 'store_load_s', 'model_load_s', 'startup_s', 'rss_mb', 'store_rss_mb',
+    'lookup_p50_ms', 'lookup_p95_ms', 'search_p50_ms', 'search_p95_ms',
+    'list_p50_ms', 'list_p95_ms', 'predict_model_p50_ms', 'predict_route_p50_ms',
+    'predict_route_p95_ms', 'batch_students_per_s', 'batch_scored',
+]
+
+# (path, column, invert) - invert converts a throughput into time per item
+COMPLEXITY_PATHS = [
+    ('StudentService.load_students (startup)', 'store_load_s', False),
+    ('StudentService store memory', 'store_rss_mb', False),
+    ('StudentService.get_student_by_roll_no', 'lookup_p50_ms', False),
+    ('StudentService.search_students', 'search_p50_ms', False),
+    ('GET /api/students', 'list_p50_ms', False),
+    ('DropoutPredictor.predict', 'predict_model_p50_ms', False),
+    ('POST /api/predict/<roll_no>', 'predict_route_p50_ms', False),
+    ('PredictionServiceServer.batch_predict (per student)', 'batch_students_per_s', True),
+]
+
+
+# ============================================================================
+# CHILD PROCESS (one dataset size)
+# ============================================================================
+
+def measure_size(size: int, budget: float, batch_budget: float, seed: int = 42) -> Dict:
+    """
+    Measure every path against the dataset in DATABASE_PATH
+
+    Args:
+        size: Number of students in the dataset (for reporting)
+        budget: Time budget per latency metric in seconds
+        batch_budget: Time budget for batch scoring in seconds
+        seed: Random seed for roll number selection
+
+    Returns:
+        One result row
+    """
+    start = time.perf_counter()
+    import server
+    import_s = time.perf_counter() - start
+
+    rss_before_store = current_rss_mb()
+
+    service = server.student_handler.service
+    start = time.perf_counter()
+    students = service.load_students().get('students', {})
+    store_load_s = time.perf_counter() - start
+
+    rss_after_store = current_rss_mb()
+
+    start = time.perf_counter()
+    server.prediction_service_server.service.ensure_model()
+    model_load_s = time.perf_counter() - start
+
+    rss_mb = current_rss_mb()
+
+    roll_numbers = list(students)
+    rng = random.Random(seed)
+    queries = [roll[:6] for roll in rng.sample(roll_numbers, min(10, len(roll_numbers)))]
+    client = server.app.test_client()
+    predictor = server.prediction_service_server.service.predictor
+
+    lookup = time_with_budget(lambda: service.get_student_by_roll_no(rng.choice(roll_numbers)), budget)
+    search = time_with_budget(lambda: service.search_students(rng.choice(queries)), budget)
+    listing = time_with_budget(lambda: client.get('/api/students'), budget)
+    predict_model = time_with_budget(lambda: predictor.predict(students[rng.choice(roll_numbers)]), budget)
+    predict_route = time_with_budget(lambda: client.post(f'/api/predict/{rng.choice(roll_numbers)}'), budget)
+
+    # Score the cohort in chunks until done or out of budget
+    cohort = iter(students.values())
+    scored = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < batch_budget:
+        chunk = list(itertools.islice(cohort, 100))
+        if not chunk:
+            break
+        server.prediction_service_server.batch_predict(chunk)
+        scored += len(chunk)
+    batch_elapsed = time.perf_counter() - start
+
+    return {
+        'size': size,
+        'import_s': round(import_s, 3),
+        'store_load_s': round(store_load_s, 3),
+        'model_load_s': round(model_load_s, 3),
+        'startup_s': round(import_s + store_load_s + model_load_s, 3),
+        'rss_mb': round(rss_mb, 1),
+        'store_rss_mb': round(max(rss_after_store - rss_before_store, 0.0), 1),
+        'lookup_p50_ms': lookup['p50'],
+        'lookup_p95_ms': lookup['p95'],
+        'search_p50_ms': search['p50'],
+        'search_p95_ms': search['p95'],
+        'list_p50_ms': listing['p50'],
+        'list_p95_ms': listing['p95'],
+        'predict_model_p50_ms': predict_model['p50'],
+        'predict_route_p50_ms': predict_route['p50'],
+        'predict_route_p95_ms': predict_route['p95'],
+        'batch_students_per_s': round(scored / batch_elapsed, 1) if batch_elapsed > 0 else 0.0,
+        'batch_scored': scored,
+    }
+
+
+# ============================================================================
+# PARENT PROCESS (sweep + analysis)
+# ============================================================================
+
+def run_size(size: int, dataset_path: str, budget: float, batch_budget: float,
+             timeout: Optional[float]) -> Optional[Dict]:
+    """Run one size in a fresh interpreter so RSS and startup are isolated"""
+    env = dict(os.environ, DATABASE_PATH=dataset_path, PREDICTION_DISK_CACHE='', STARTUP_WARMUP='false')
+    command = [
+        sys.executable, '-W', 'ignore', '-m', 'benchmarks.scaling_sweep', '--child',
+        '--child-size', str(size), '--budget', str(budget), '--batch-budget', str(batch_budget),
+    ]
+
+    try:
+        completed = subprocess.run(command, cwd=BACKEND_DIR, env=env, capture_output=True,
+                                   text=True, encoding='utf-8', timeout=timeout)
+    except subprocess.TimeoutExpired:
+        print(f"   ⚠️  size {size} timed out after {timeout}s")
+        return None
+
+    for line in completed.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+
+    print(f"   ❌ size {size} failed (exit code {completed.returncode})")
+    print(completed.stderr[-2000:])
+    return None
+
+
+def fit_slope(sizes: List[float], values: List[float]) -> Optional[float]:
+    """Least-squares slope of log(value) against log(size)"""
+    points = [(math.log(s), math.log(v)) for s, v in zip(sizes, values) if s > 0 and v > 0]
+    if len(points) < 2:
+        return None
+
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    if denominator == 0:
+        return None
+
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / denominator
+
+
+def classify_slope(slope: Optional[float]) -> str:
+    """Map a log-log slope onto a complexity class"""
+    if slope is None:
+        return 'n/a'
+    if slope < 0.25:
+        return 'O(1)'
+    if slope < 0.75:
+        return 'sublinear'
+    if slope < 1.25:
+        return 'O(n)'
+    return 'superlinear'
+
+
+def analyze_complexity(rows: List[Dict]) -> List[Dict]:
+    """
+    Fit a complexity class to every measured path
+
+    Args:
+        rows: Per-size result rows
+
+    Returns:
+        One summary row per path
+    """
+    summary = []
+    sizes = [row['size'] for row in rows]
+
+    for path, column, invert in COMPLEXITY_PATHS:
+        values = [row[column] for row in rows]
+        if invert:
+            values = [1000.0 / v if v else 0.0 for v in values]
+        slope = fit_slope(sizes, values)
+        summary.append({
+            'path': path,
+            'metric': f'ms per student ({column})' if invert else column,
+            'slope': round(slope, 2) if slope is not None else None,
+            'complexity': classify_slope(slope),
+        })
+
+    return summary
+
+
+def write_csv(path: str, rows: List[Dict], columns: List[str]):
+    """Write rows to CSV"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def format_table(rows: List[Dict], columns: List[str]) -> str:
+    """Format rows as an aligned text table"""
+    widths = {c: max(len(c), *(len(str(row.get(c))) for row in rows)) for c in columns}
+    lines = ['  '.join(f"{c:>{widths[c]}}" for c in columns)]
+    lines.append('-' * len(lines[0]))
+    for row in rows:
+        lines.append('  '.join(f"{str(row.get(c)):>{widths[c]}}" for c in columns))
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    """Run the sweep from the command line"""
+    parser = argparse.ArgumentParser(description='Dataset-size scaling sweep')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='comma separated cohort sizes')
+    parser.add_argument('--budget', type=float, default=2.0, help='seconds spent sampling each latency metric')
+    parser.add_argument('--batch-budget', type=float, default=10.0, help='seconds spent on batch scoring')
+    parser.add_argument('--timeout', type=float, default=1800.0, help='per-size timeout in seconds')
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'scaling.csv'), help='per-size CSV path')
+    parser.add_argument('--keep-datasets', action='store_true', help='keep the generated dataset files')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--child-size', type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        result = measure_size(args.child_size, args.budget, args.batch_budget)
+        print(RESULT_MARKER + json.dumps(result))
+        return 0
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    dataset_dir = tempfile.mkdtemp(prefix='scaling_sweep_')
+    rows = []
+
+    print("=" * 60)
+    print(f"📈 Scaling sweep over {len(sizes)} dataset sizes")
+    print("=" * 60)
+
+    for size in sizes:
+        dataset_path = os.path.join(dataset_dir, f'students_{size}.json')
+        print(f"\n🔄 {size} students: generating dataset...")
+        write_dataset(dataset_path, size)
+        print(f"   measuring ({os.path.getsize(dataset_path) / 1e6:.1f} MB on disk)...")
+
+        row = run_size(size, dataset_path, args.budget, args.batch_budget, args.timeout)
+        if row is not None:
+            rows.append(row)
+
+        if not args.keep_datasets:
+            os.remove(dataset_path)
+
+    if not args.keep_datasets:
+        os.rmdir(dataset_dir)
+
+    if not rows:
+        print("\n❌ No sizes completed")
+        return 1
+
+    complexity = analyze_complexity(rows)
+    complexity_path = os.path.splitext(args.output)[0] + '_complexity.csv'
+    write_csv(args.output, rows, COLUMNS)
+    write_csv(complexity_path, complexity, ['path', 'metric', 'slope', 'complexity'])
+
+    print("\n" + format_table(rows, COLUMNS))
+    print("\n" + format_table(complexity, ['path', 'metric', 'slope', 'complexity']))
+    print(f"\n📁 Results written to {args.output} and {complexity_path}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""
+Production Server Scaling Benchmark
+===================================
+
+Starts serve.py with an increasing number of worker processes and drives
+each configuration with the same closed-loop HTTP load, reporting throughput,
+latency percentiles, speedup over one worker and parallel efficiency.
+
+The load is generated by several client processes so the client itself is
+not limited to one core. Client and server share the machine, so the
+largest worker count worth measuring is roughly the number of cores minus
+the cores the clients need.
+
+Usage (from the backend directory):
+    python -m benchmarks.serve_scaling
+    python -m benchmarks.serve_scaling --workers 1,2,4,8 --threads 8 --concurrency 64 --duration 15
+"""
+
+import argparse
+import http.client
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+# Add the backend directory to Python path
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.harness import RESULTS_DIR, environment_info, write_results
+from benchmarks.load_test import (
+    DEFAULT_MIX,
+    HttpTransport,
+    LoadGenerator,
+    RollNumberSampler,
+    build_search_queries,
+    discover_students,
+    parse_mix,
+)
+
+
+def default_worker_counts() -> str:
+    """Powers of two up to the number of cores"""
+    cores = os.cpu_count() or 1
+    counts = []
+    count = 1
+    while count < cores:
+        counts.append(count)
+        count *= 2
+    counts.append(cores)
+    return ','.join(str(c) for c in counts)
+
+
+def free_port() -> int:
+    """Find an unused local port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_until_ready(port: int, workers: int, timeout: float = 120.0) -> bool:
+    """Poll /api/ready until the server has loaded and warmed up"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            connection.request('GET', '/api/ready')
+            status = connection.getresponse().status
+            connection.close()
+            if status == 200:
+                # Give the remaining workers a moment to enter their serve loop
+                time.sleep(0.2 * workers)
+                return True
+        except OSError:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def start_server(port: int, workers: int, threads: int) -> subprocess.Popen:
+    """Start serve.py in the background, with the persistent prediction cache off"""
+    command = [
+        sys.executable, '-W', 'ignore', 'serve.py', '--host', '127.0.0.1', '--port', str(port),
+        '--workers', str(workers), '--threads', str(threads),
+    ]
+    env = dict(os.environ, PREDICTION_DISK_CACHE='')
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def stop_server(process: subprocess.Popen, timeout: float = 30.0):
+    """Gracefully stop serve.py, killing it if it does not exit in time"""
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def run_client(port: int, students: List[Dict], mix: str, concurrency: int,
+               duration: float, seed: int):
+    """Run one client process worth of load (executed in a child process)"""
+    roll_numbers = [s['roll_no'] for s in students if s.get('roll_no')]
+    generator = LoadGenerator(
+        lambda: HttpTransport('127.0.0.1', port),
+        RollNumberSampler(roll_numbers, 'uniform', seed=seed),
+        build_search_queries(students, seed=seed),
+        parse_mix(mix),
+        concurrency=concurrency,
+        duration=duration,
+        seed=seed
+    )
+    return generator.collect()
+
+
+def measure(port: int, mix: str, concurrency: int, duration: float,
+            client_processes: int) -> Dict:
+    """
+    Drive a running server with load from several client processes
+
+    Returns:
+        Load test report merged across client processes
+    """
+    students = discover_students(HttpTransport('127.0.0.1', port))
+    processes = max(1, min(client_processes, concurrency))
+    shares = [concurrency // processes + (1 if i < concurrency % processes else 0) for i in range(processes)]
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [
+            pool.submit(run_client, port, students, mix, share, duration, 1000 * index)
+            for index, share in enumerate(shares)
+        ]
+        outcomes = [future.result() for future in futures]
+
+    results = [result for per_client, _ in outcomes for result in per_client]
+    elapsed = max(elapsed for _, elapsed in outcomes)
+
+    # Any generator can merge the samples; only the endpoint names matter
+    merger = LoadGenerator(None, RollNumberSampler(['X'], 'uniform'), [], parse_mix(mix),
+                           concurrency=len(results))
+    return merger._build_report(results, elapsed)
+
+
+def format_table(rows: List[Dict]) -> str:
+    """Format the scaling results as a text table"""
+    header = (f"{'workers':>7}  {'req/s':>9}  {'speedup':>8}  {'efficiency':>10}  "
+              f"{'p50 ms':>9}  {'p95 ms':>9}  {'p99 ms':>9}  {'errors':>7}")
+    lines = [header, '-' * len(header)]
+    for row in rows:
+        lines.append(
+            f"{row['workers']:>7}  {row['throughput_rps']:>9.1f}  {row['speedup']:>7.2f}x  "
+            f"{row['efficiency']:>9.0%}  {row['p50_ms']:>9.2f}  {row['p95_ms']:>9.2f}  "
+            f"{row['p99_ms']:>9.2f}  {row['errors']:>7}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    """Run the worker scaling benchmark"""
+    parser = argparse.ArgumentParser(description='Throughput scaling of serve.py with worker count')
+    parser.add_argument('--workers', default=default_worker_counts(), help='comma separated worker counts')
+    parser.add_argument('--threads', type=int, default=8, help='request threads per worker')
+    parser.add_argument('--concurrency', type=int, default=32, help='concurrent client connections')
+    parser.add_argument('--client-processes', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help='processes generating load')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds of load per configuration')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='request mix as endpoint=weight pairs')
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'serve_scaling.json'),
+                        help='where to write the JSON results')
+    args = parser.parse_args(argv)
+
+    if not hasattr(os, 'fork'):
+        print("❌ serve.py requires os.fork, which this platform does not provide.")
+        return 1
+
+    worker_counts = [int(w) for w in args.workers.split(',') if w.strip()]
+    rows = []
+
+    print("=" * 60)
+    print(f"📈 serve.py scaling: workers={worker_counts} threads={args.threads} "
+          f"concurrency={args.concurrency} cores={os.cpu_count()}")
+    print("=" * 60)
+
+    for workers in worker_counts:
+        port = free_port()
+        process = start_server(port, workers, args.threads)
+        try:
+            if not wait_until_ready(port, workers):
+                print(f"❌ {workers} workers: server did not become ready")
+                continue
+            print(f"🔄 {workers} workers: {args.duration}s of load...")
+            report = measure(port, args.mix, args.concurrency, args.duration, args.client_processes)
+        finally:
+            stop_server(process)
+
+        overall = report['overall']
+        rows.append({
+            'workers': workers,
+            'throughput_rps': overall['throughput_rps'],
+            'p50_ms': overall['p50_ms'],
+            'p95_ms': overall['p95_ms'],
+            'p99_ms': overall['p99_ms'],
+            'errors': overall['errors'],
+            'endpoints': report['endpoints'],
+        })
+
+    if not rows:
+        return 1
+
+    base: Optional[float] = rows[0]['throughput_rps'] / rows[0]['workers'] if rows[0]['throughput_rps'] else None
+    for row in rows:
+        row['speedup'] = round(row['throughput_rps'] / base, 2) if base else 0.0
+        row['efficiency'] = round(row['speedup'] / row['workers'], 3) if base else 0.0
+
+    print("\n" + format_table(rows))
+
+    results = {
+        'meta': dict(environment_info(), threads=args.threads, concurrency=args.concurrency,
+                     duration=args.duration, mix=args.mix, client_processes=args.client_processes),
+        'rows': rows
+    }
+    write_results(results, args.output)
+    print(f"\n📁 Results written to {args.output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+Shared Prediction Cache Benchmark
+=================================
+
+Multi-process load test of the prediction cache as the pre-fork server
+runs it: the parent loads the model, then forks worker processes that
+each serve a stream of prediction lookups (Zipf-distributed roll numbers)
+through PredictionServiceServer.process_prediction_request.
+
+    private   each worker has only its own in-memory cache (as before the
+              shared tier existed): every worker predicts every student
+              it sees at least once
+    shared    workers also read and write the SharedCache created before
+              the fork: a prediction made by one worker is a hit for all
+
+For each mode the benchmark reports the overall hit rate (lookups that did
+not run the model), model calls, throughput and, for the shared table,
+seqlock read retries and writer lock waits.
+
+A final stress phase hammers the shared table directly - all processes
+reading and writing a handful of hot keys with no model work in between -
+to show contention at its worst.
+
+Usage (from the backend directory):
+    python -m benchmarks.shared_cache
+    python -m benchmarks.shared_cache --workers 8 --requests 500
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.harness import RESULTS_DIR, environment_info, write_results
+from benchmarks.load_test import RollNumberSampler
+
+
+MODES = ('private', 'shared')
+
+
+def fork_workers(count: int, body) -> List[Dict]:
+    """Run body(index) in count forked processes and collect their JSON results"""
+    pipes = []
+    for index in range(count):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            code = 0
+            try:
+                result = body(index)
+                with os.fdopen(write_fd, 'w') as f:
+                    json.dump(result, f)
+            except BaseException:
+                code = 1
+            finally:
+                os._exit(code)
+        os.close(write_fd)
+        pipes.append((pid, read_fd))
+
+    results = []
+    for pid, read_fd in pipes:
+        with os.fdopen(read_fd) as f:
+            data = f.read()
+        os.waitpid(pid, 0)
+        if data:
+            results.append(json.loads(data))
+    return results
+
+
+def run_mode(server, students: Dict[str, Dict], version: tuple, mode: str, workers: int,
+             requests: int, zipf_s: float, slots: int) -> Dict:
+    """
+    Serve Zipf-distributed lookups from forked workers for one mode
+
+    Returns:
+        Hit rate, model calls, throughput and contention counts
+    """
+    from utils.shared_cache import SHARED_CACHE_CONTENTION, SharedCache
+
+    server.clear_cache(persistent=False)
+    server.shared_cache = None
+    shared = None
+    if mode == 'shared':
+        shared = SharedCache('predictions', slots)
+        server.attach_shared_cache(shared)
+
+    sampler = RollNumberSampler(list(students), 'zipf', zipf_s)
+    predict = server.service.predict_dropout_risk
+
+    def worker(index: int) -> Dict:
+        calls = [0]
+
+        def counting_predict(student_data, timer=None):
+            calls[0] += 1
+            return predict(student_data, timer)
+
+        server.service.predict_dropout_risk = counting_predict
+        rng = random.Random(index)
+        start = time.perf_counter()
+        for _ in range(requests):
+            server.process_prediction_request(students[sampler.sample(rng)], version)
+        return {
+            'elapsed': time.perf_counter() - start,
+            'model_calls': calls[0],
+            'read_retries': SHARED_CACHE_CONTENTION.get(('predictions', 'read_retry')),
+            'write_waits': SHARED_CACHE_CONTENTION.get(('predictions', 'write_wait')),
+        }
+
+    start = time.perf_counter()
+    results = fork_workers(workers, worker)
+    elapsed = time.perf_counter() - start
+    if shared is not None:
+        server.shared_cache = None
+        shared.close(unlink=True)
+
+    lookups = workers * requests
+    model_calls = sum(result['model_calls'] for result in results)
+    return {
+        'mode': mode,
+        'lookups': lookups,
+        'model_calls': model_calls,
+        'hit_rate': round(1 - model_calls / lookups, 4),
+        'lookups_per_s': round(lookups / elapsed, 1),
+        'read_retries': int(sum(result['read_retries'] for result in results)),
+        'write_waits': int(sum(result['write_waits'] for result in results)),
+    }
+
+
+def run_stress(workers: int, duration: float, hot_keys: int, prediction: Dict) -> Dict:
+    """
+    Hammer a shared table from every worker: 90% reads, 10% writes on a few hot keys
+
+    Returns:
+        Operations per second and contention per thousand operations
+    """
+    from utils.shared_cache import SHARED_CACHE_CONTENTION, SharedCache
+
+    shared = SharedCache('stress', 256)
+    keys = [f'KEY{index}' for index in range(hot_keys)]
+    for key in keys:
+        shared.put(key, 1, prediction)
+
+    def worker(index: int) -> Dict:
+        rng = random.Random(index)
+        operations = 0
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            key = rng.choice(keys)
+            if rng.random() < 0.1:
+                shared.put(key, 1, prediction)
+            else:
+                shared.get(key, 1)
+            operations += 1
+        return {
+            'operations': operations,
+            'read_retries': SHARED_CACHE_CONTENTION.get(('stress', 'read_retry')),
+            'write_waits': SHARED_CACHE_CONTENTION.get(('stress', 'write_wait')),
+        }
+
+    results = fork_workers(workers, worker)
+    shared.close(unlink=True)
+
+    operations = sum(result['operations'] for result in results)
+    retries = sum(result['read_retries'] for result in results)
+    waits = sum(result['write_waits'] for result in results)
+    return {
+        'operations': operations,
+        'operations_per_s': round(operations / duration, 1),
+        'read_retries_per_1k_ops': round(1000 * retries / operations, 3) if operations else 0.0,
+        'write_waits_per_1k_ops': round(1000 * waits / operations, 3) if operations else 0.0,
+    }
+
+
+def main(argv=None) -> int:
+    """Run the benchmark from the command line"""
+    parser = argparse.ArgumentParser(description='Prediction cache hit rate and contention across worker processes')
+    parser.add_argument('--workers', type=int, default=4, help='worker processes')
+    parser.add_argument('--requests', type=int, default=300, help='lookups per worker')
+    parser.add_argument('--zipf-s', type=float, default=1.1, help='Zipf exponent of roll-number popularity')
+    parser.add_argument('--slots', type=int, default=4096, help='shared table slots')
+    parser.add_argument('--stress-duration', type=float, default=3.0, help='seconds of the contention stress phase')
+    parser.add_argument('--hot-keys', type=int, default=8, help='keys hammered in the stress phase')
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'shared_cache.json'),
+                        help='results JSON path')
+    args = parser.parse_args(argv)
+
+    # Model loading prints progress; keep the report readable
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        from services.prediction_service.prediction_service_server import PredictionServiceServer
+        from services.student_service.student_service_server import student_service_server
+        # No persistent tier: it would share predictions between the workers too
+        server = PredictionServiceServer(disk_cache_path='')
+
+    if not server.service.is_model_loaded():
+        print("❌ Model not loaded; train it first (python ml/train.py)")
+        return 1
+    students = student_service_server.service.load_students().get('students', {})
+    version = server.cache_version(student_service_server.service.data_version())
+
+    print("=" * 60)
+    print(f"🧠 {args.workers} workers x {args.requests} lookups over {len(students)} students "
+          f"(zipf s={args.zipf_s})")
+    print("=" * 60)
+
+    rows = []
+    for mode in MODES:
+        print(f"\n🔄 {mode}...")
+        rows.append(run_mode(server, students, version, mode, args.workers, args.requests,
+                             args.zipf_s, args.slots))
+
+    print(f"\n{'mode':<9} {'lookups':>8} {'model calls':>12} {'hit rate':>9} {'lookups/s':>10} "
+          f"{'read retries':>13} {'write waits':>12}")
+    for row in rows:
+        print(f"{row['mode']:<9} {row['lookups']:>8} {row['model_calls']:>12} {row['hit_rate']:>9} "
+              f"{row['lookups_per_s']:>10} {row['read_retries']:>13} {row['write_waits']:>12}")
+
+    print(f"\n🔥 Stress: {args.workers} processes on {args.hot_keys} hot keys for {args.stress_duration:.0f}s...")
+    prediction = server.service.predict_dropout_risk(next(iter(students.values())))
+    stress = run_stress(args.workers, args.stress_duration, args.hot_keys, prediction)
+    print(f"   {stress['operations_per_s']} ops/s, {stress['read_retries_per_1k_ops']} read retries "
+          f"and {stress['write_waits_per_1k_ops']} write waits per 1k ops")
+
+    write_results({'environment': environment_info(), 'config': vars(args),
+                   'results': rows, 'stress': stress}, args.output)
+    print(f"\n📁 Results written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,235 @@
+"""
+Startup Benchmark
+=================
+
+Measures how quickly the app starts and how its first requests compare to
+steady state:
+
+    import      `import server` in fresh interpreters (startup warm-up off),
+                and which heavy libraries that import pulled in; for
+                comparison, the same import followed by loading the store
+                and the model in the foreground (the old eager startup)
+    startup     for each server (flask-threaded, asgi, serve.py), with and
+                without the warm-up inference pass: time from spawning the
+                process until /api/live answers and until /api/ready
+                reports 200
+    first       once ready, the latency of the first /api/predict request
+                against the median of the following ones; every request
+                is for a different student and the persistent prediction
+                cache is off, so all of them run the model
+
+Usage (from the backend directory):
+    python -m benchmarks.startup
+    python -m benchmarks.startup --imports 10 --requests 50
+"""
+
+import argparse
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+# Add the backend directory to Python path
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.harness import RESULTS_DIR, environment_info, write_results
+from benchmarks.serve_scaling import free_port, stop_server
+
+
+TARGETS = ('flask-threaded', 'asgi', 'serve')
+
+HEAVY_MODULES = ('numpy', 'pandas', 'sklearn')
+
+RESULT_MARKER = 'STARTUP_RESULT '
+
+# Run in a fresh interpreter by measure_import
+IMPORT_PROBE = f'''
+import contextlib, io, json, sys, time
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    import server
+import_s = time.perf_counter() - start
+loaded = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+eager = len(sys.argv) > 1
+if eager:
+    with contextlib.redirect_stdout(io.StringIO()):
+        server.student_service_server.service.load_students()
+        server.prediction_service_server.service.ensure_model()
+print({RESULT_MARKER!r} + json.dumps({{
+    'import_s': import_s, 'total_s': time.perf_counter() - start, 'heavy_modules': loaded,
+}}))
+'''
+
+
+def run_probe(eager: bool) -> Optional[Dict]:
+    """Import the app once in a fresh interpreter"""
+    command = [sys.executable, '-W', 'ignore', '-c', IMPORT_PROBE] + (['eager'] if eager else [])
+    env = dict(os.environ, STARTUP_WARMUP='false')
+    completed = subprocess.run(command, cwd=BACKEND_DIR, env=env, capture_output=True,
+                               text=True, encoding='utf-8')
+    for line in completed.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    print(f"   ❌ import probe failed (exit code {completed.returncode})")
+    print(completed.stderr[-2000:])
+    return None
+
+
+def measure_import(runs: int) -> Dict:
+    """
+    Median import time of the app, lazy and followed by an eager load
+
+    Returns:
+        Import and eager startup times, and the heavy modules the import loaded
+    """
+    lazy = [probe for probe in (run_probe(False) for _ in range(runs)) if probe]
+    eager = [probe for probe in (run_probe(True) for _ in range(runs)) if probe]
+    return {
+        'runs': runs,
+        'import_s': round(statistics.median(p['import_s'] for p in lazy), 3) if lazy else None,
+        'heavy_modules_after_import': lazy[0]['heavy_modules'] if lazy else None,
+        'eager_startup_s': round(statistics.median(p['total_s'] for p in eager), 3) if eager else None,
+    }
+
+
+def start_target(target: str, port: int, inference: bool) -> subprocess.Popen:
+    """Start one server variant with every prediction a cache miss"""
+    env = dict(os.environ, PREDICTION_DISK_CACHE='', STARTUP_WARMUP='true',
+               STARTUP_WARMUP_INFERENCE='true' if inference else 'false')
+    if target == 'flask-threaded':
+        command = [sys.executable, '-W', 'ignore', '-m', 'benchmarks.asgi_vs_flask',
+                   '--serve-flask', str(port)]
+    elif target == 'serve':
+        command = [sys.executable, '-W', 'ignore', 'serve.py', '--host', '127.0.0.1',
+                   '--port', str(port), '--workers', '1']
+    else:
+        command = [sys.executable, '-W', 'ignore', 'asgi.py', '--host', '127.0.0.1', '--port', str(port)]
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def get(port: int, path: str) -> Optional[int]:
+    """GET a path on a fresh connection; the status, or None if nothing answered"""
+    try:
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        connection.request('GET', path)
+        response = connection.getresponse()
+        response.read()
+        connection.close()
+        return response.status
+    except OSError:
+        return None
+
+
+def measure_target(target: str, inference: bool, roll_numbers: List[str],
+                   timeout: float = 120.0) -> Optional[Dict]:
+    """
+    Time a server's startup and its first predictions
+
+    Returns:
+        Seconds to live and to ready, and first vs steady-state prediction latency
+    """
+    port = free_port()
+    started = time.perf_counter()
+    process = start_target(target, port, inference)
+    live_s = ready_s = None
+    try:
+        deadline = started + timeout
+        while ready_s is None and time.perf_counter() < deadline:
+            if live_s is None and get(port, '/api/live') == 200:
+                live_s = time.perf_counter() - started
+            if live_s is not None and get(port, '/api/ready') == 200:
+                ready_s = time.perf_counter() - started
+            else:
+                time.sleep(0.01)
+        if ready_s is None:
+            return None
+
+        latencies = []
+        for roll_no in roll_numbers:
+            start = time.perf_counter()
+            get(port, f'/api/predict/{roll_no}')
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        stop_server(process)
+
+    steady = statistics.median(latencies[1:])
+    return {
+        'target': target,
+        'warmup_inference': inference,
+        'live_s': round(live_s, 3),
+        'ready_s': round(ready_s, 3),
+        'first_predict_ms': round(latencies[0], 2),
+        'steady_predict_ms': round(steady, 2),
+        'first_vs_steady': round(latencies[0] / steady, 2) if steady else None,
+    }
+
+
+def format_table(rows: List[Dict]) -> str:
+    """Format the startup rows as a text table"""
+    lines = [f"{'target':<15} {'inference':>9} {'live s':>7} {'ready s':>8} "
+             f"{'first ms':>9} {'steady ms':>10} {'first/steady':>13}"]
+    for row in rows:
+        lines.append(
+            f"{row['target']:<15} {'on' if row['warmup_inference'] else 'off':>9} {row['live_s']:>7} "
+            f"{row['ready_s']:>8} {row['first_predict_ms']:>9} {row['steady_predict_ms']:>10} "
+            f"{row['first_vs_steady']:>12}x"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    """Run the startup benchmark"""
+    parser = argparse.ArgumentParser(description='Import time, time to ready and first-request latency')
+    parser.add_argument('--imports', type=int, default=5, help='fresh interpreters per import measurement')
+    parser.add_argument('--requests', type=int, default=30,
+                        help='predictions per server (distinct students)')
+    parser.add_argument('--targets', default=','.join(TARGETS), help='comma separated servers to start')
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'startup.json'),
+                        help='where to write the JSON results')
+    args = parser.parse_args(argv)
+
+    from services.student_service.student_service import StudentService
+    roll_numbers = list(StudentService().load_students().get('students', {}))[:max(2, args.requests)]
+    if len(roll_numbers) < 2:
+        print("❌ Need at least two students in the database")
+        return 1
+
+    print("=" * 60)
+    print(f"⏱️  Startup: {args.imports} imports, {len(roll_numbers)} predictions per server")
+    print("=" * 60)
+
+    print("\n🔄 Importing server...")
+    imports = measure_import(args.imports)
+    print(f"   import {imports['import_s']}s (heavy modules loaded: "
+          f"{', '.join(imports['heavy_modules_after_import'] or []) or 'none'}), "
+          f"import + store + model in the foreground {imports['eager_startup_s']}s")
+
+    rows = []
+    for target in [t.strip() for t in args.targets.split(',') if t.strip()]:
+        if target == 'serve' and not hasattr(os, 'fork'):
+            continue
+        for inference in (True, False):
+            print(f"🔄 {target} (warm-up inference {'on' if inference else 'off'})...")
+            row = measure_target(target, inference, roll_numbers)
+            if row is None:
+                print(f"   ❌ {target} did not become ready")
+                continue
+            rows.append(row)
+
+    print()
+    print(format_table(rows))
+
+    write_results({'environment': environment_info(), 'config': vars(args),
+                   'import': imports, 'results': rows}, args.output)
+    print(f"\n📁 Results written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
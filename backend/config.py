@@ -11,8 +11,8 @@ from pathlib import Path
 # Base directory
 BASE_DIR = Path(__file__).resolve().parent
 
-# Database configuration
-DATABASE_PATH = BASE_DIR / 'database' / 'students_data.json'
+# Database configuration (DATABASE_PATH env var overrides the bundled dataset)
+DATABASE_PATH = Path(os.environ.get('DATABASE_PATH', BASE_DIR / 'database' / 'students_data.json'))
 
 # ML Model configuration
 ML_MODELS_PATH = BASE_DIR / 'ml' / 'saved_models'
@@ -27,12 +27,89 @@ HOST = '0.0.0.0'
 PORT = 8000
 DEBUG = True
 
+# Production server (serve.py)
+SERVE_WORKERS = int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1))  # worker processes
+SERVE_THREADS = int(os.environ.get('SERVE_THREADS', '8'))                   # request threads per worker
+SERVE_KEEPALIVE = float(os.environ.get('SERVE_KEEPALIVE', '5'))             # idle keep-alive seconds
+WORKER_TIMEOUT = float(os.environ.get('WORKER_TIMEOUT', '30'))              # heartbeat age before a worker is killed
+GRACEFUL_TIMEOUT = float(os.environ.get('GRACEFUL_TIMEOUT', '30'))          # seconds to finish in-flight requests
+
+# ASGI server (asgi.py)
+ASGI_THREADS = int(os.environ.get('ASGI_THREADS', '8'))                     # threads for blocking work
+ASGI_QUEUE_SIZE = int(os.environ.get('ASGI_QUEUE_SIZE', '64'))              # blocking calls allowed to queue
+ASGI_BATCH_PROCESSES = int(os.environ.get('ASGI_BATCH_PROCESSES', '2'))     # processes for batch scoring
+ASGI_KEEPALIVE = float(os.environ.get('ASGI_KEEPALIVE', '75'))              # idle keep-alive seconds
+
+# Startup warm-up (the student store and model load in a background thread; /api/ready gates traffic)
+STARTUP_WARMUP = os.environ.get('STARTUP_WARMUP', 'true').lower() in ('1', 'true', 'yes')  # false: load on first use
+STARTUP_WARMUP_INFERENCE = os.environ.get('STARTUP_WARMUP_INFERENCE', 'true').lower() in ('1', 'true', 'yes')
+STARTUP_WARMUP_BATCH = int(os.environ.get('STARTUP_WARMUP_BATCH', '8'))    # students scored by the warm-up batch
+
+# Shard dispatcher (dispatch.py)
+DISPATCH_SHARDS = int(os.environ.get('DISPATCH_SHARDS', '2'))               # local shard servers to start
+DISPATCH_SHARD_URLS = os.environ.get('DISPATCH_SHARD_URLS', '')             # comma-separated running shards (instead)
+DISPATCH_SHARD_WORKERS = int(os.environ.get('DISPATCH_SHARD_WORKERS', '1')) # serve.py workers per local shard
+DISPATCH_VNODES = int(os.environ.get('DISPATCH_VNODES', '160'))             # ring points per shard
+DISPATCH_THREADS = int(os.environ.get('DISPATCH_THREADS', '32'))            # threads for upstream requests
+DISPATCH_TIMEOUT = float(os.environ.get('DISPATCH_TIMEOUT', '30'))          # seconds per upstream request
+DISPATCH_HEALTH_INTERVAL = float(os.environ.get('DISPATCH_HEALTH_INTERVAL', '2'))  # seconds between shard probes
+
 # CORS configuration
 CORS_ORIGINS = ['http://localhost:5173', 'http://localhost:3000']
 
+# Response encoding
+JSON_ENCODER = os.environ.get('JSON_ENCODER', 'auto')                  # 'auto' (orjson if installed), 'orjson' or 'stdlib'
+GZIP_MIN_SIZE = int(os.environ.get('GZIP_MIN_SIZE', '1024'))           # smallest body to gzip, in bytes (-1 disables)
+GZIP_LEVEL = int(os.environ.get('GZIP_LEVEL', '6'))                    # 1 (fastest) - 9 (smallest)
+RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', '4096'))  # encoded responses kept per cache (0 disables)
+
+# Batch predictions
+BATCH_MAX_STUDENTS = int(os.environ.get('BATCH_MAX_STUDENTS', '500'))  # roll numbers per /api/predict/batch
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', '50'))      # students per chunk in streaming exports
+
+# Prediction cache: fresh for the soft TTL, then served stale (while one
+# background refresh runs) until the hard TTL
+PREDICTION_CACHE_SOFT_TTL = float(os.environ.get('PREDICTION_CACHE_SOFT_TTL', '300'))  # seconds
+PREDICTION_CACHE_HARD_TTL = float(os.environ.get('PREDICTION_CACHE_HARD_TTL', '900'))  # seconds; <= soft disables
+PREDICTION_REFRESH_WORKERS = int(os.environ.get('PREDICTION_REFRESH_WORKERS', '1'))    # background refresh threads
+# Persistent second tier shared by the workers on a host ('' disables)
+PREDICTION_DISK_CACHE = os.environ.get('PREDICTION_DISK_CACHE', str(BASE_DIR / 'cache' / 'predictions.sqlite3'))
+PREDICTION_DISK_CACHE_WARM = os.environ.get('PREDICTION_DISK_CACHE_WARM', 'true').lower() in ('1', 'true', 'yes')
+# Shared memory tier across serve.py workers (0 disables)
+PREDICTION_SHARED_CACHE_SLOTS = int(os.environ.get('PREDICTION_SHARED_CACHE_SLOTS', '4096'))
+PREDICTION_SHARED_CACHE_RECORD_BYTES = int(os.environ.get('PREDICTION_SHARED_CACHE_RECORD_BYTES', '2048'))  # compressed
+
+# Speculative prediction prefetch when a student profile is viewed
+PREFETCH_PREDICTIONS = os.environ.get('PREFETCH_PREDICTIONS', 'true').lower() in ('1', 'true', 'yes')
+PREFETCH_QUEUE_SIZE = int(os.environ.get('PREFETCH_QUEUE_SIZE', '16'))  # prefetches allowed to wait (beyond: dropped)
+PREFETCH_WORKERS = int(os.environ.get('PREFETCH_WORKERS', '1'))         # threads running prefetches
+
+# Admission control for predictions that miss the cache (per process)
+PREDICT_CONCURRENCY = int(os.environ.get('PREDICT_CONCURRENCY', os.cpu_count() or 1))  # predictions computed at once
+PREDICT_QUEUE_SIZE = int(os.environ.get('PREDICT_QUEUE_SIZE', '32'))    # predictions allowed to wait for a slot
+PREDICT_TIMEOUT_MS = float(os.environ.get('PREDICT_TIMEOUT_MS', '2000'))  # latency budget; X-Request-Timeout-Ms can lower it
+
+# Priority scheduling: bulk predictions (batch requests, exports) yield to interactive ones
+BULK_WORKERS = int(os.environ.get('BULK_WORKERS', '2'))              # threads scoring bulk chunks (0: inline, unscheduled)
+BULK_CHUNK_SIZE = int(os.environ.get('BULK_CHUNK_SIZE', '32'))       # students per preemptible chunk
+BULK_MAX_DEFER_MS = float(os.environ.get('BULK_MAX_DEFER_MS', '100'))  # longest a chunk waits for interactive work
+
+# Background jobs (long-running scoring; state and results persist under JOBS_DIR)
+JOBS_DIR = Path(os.environ.get('JOBS_DIR', BASE_DIR / 'jobs'))
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '1'))                # jobs run at once (per process)
+JOB_RETENTION = int(os.environ.get('JOB_RETENTION', '100'))          # finished jobs kept on disk
+
 # Risk thresholds
 HIGH_RISK_THRESHOLD = 70
 MEDIUM_RISK_THRESHOLD = 40
 
 # API configuration
 API_PREFIX = '/api'
+
+# Admin configuration (admin endpoints are disabled while ADMIN_TOKEN is empty)
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+
+# Request profiling
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))  # fraction of /api/predict requests
+PROFILE_RING_SIZE = int(os.environ.get('PROFILE_RING_SIZE', '50'))       # profiles retained in memory
+PROFILE_MODE = os.environ.get('PROFILE_MODE', 'cprofile')                # 'cprofile' or 'sample'
@@ -0,0 +1,930 @@
+"""
+Student Dropout Risk Prediction System - Shard Dispatcher
+=========================================================
+
+Front dispatcher for running the API as several shard servers, each owning
+a slice of the students. Per-student requests are routed by consistent
+hashing of the roll number, so every student is always served by the same
+shard and only that shard's caches (predictions, encoded responses) hold
+it: N shards cache N times as many students as one, and each spends its
+CPU on its own students.
+
+    /api/student/<roll_no>      routed by roll number
+    /api/predict/<roll_no>      routed by roll number
+    /api/dashboard/<roll_no>    routed by roll number
+    POST /api/cache/clear       sent to every shard
+    everything else             round-robin across healthy shards
+
+The dispatcher does not load the model or the student store; it runs on
+the asyncio server from utils.asgi_server and proxies requests over
+keep-alive connections. A shard is any server running this API: by
+default the dispatcher starts DISPATCH_SHARDS local `serve.py` processes
+on the ports after its own, or it can front already running shards on
+other hosts (DISPATCH_SHARD_URLS).
+
+Rebalancing: adding a shard moves only the roll numbers it takes over
+(about 1/N of them) and removing one moves only its own. Local shards
+share the persistent prediction cache (PREDICTION_DISK_CACHE), so a
+student's new owner reads its prediction through from disk rather than
+predicting it again. A shard that stops answering is taken out of routing
+until its readiness probe passes again; its students fail over to the next
+shard on the ring.
+
+Admin endpoints (X-Admin-Token):
+    GET    /api/dispatch/shards          Per-shard load, key share and health
+    POST   /api/dispatch/shards          Add a shard: {"url": "http://host:port"},
+                                         or {} to start another local shard
+    DELETE /api/dispatch/shards/<name>   Take a shard off the ring and drain it
+Metrics (Prometheus): GET /api/dispatch/metrics
+
+Usage:
+    python dispatch.py                                  # 2 local shards
+    python dispatch.py --shards 4 --shard-workers 2
+    python dispatch.py --shard-urls http://10.0.0.5:8000,http://10.0.0.6:8000
+"""
+
+import argparse
+import asyncio
+import collections
+import hmac
+import http.client
+import os
+import re
+import signal
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Add the backend directory to Python path
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BACKEND_DIR)
+
+from config import (
+    ADMIN_TOKEN,
+    ASGI_KEEPALIVE,
+    DISPATCH_HEALTH_INTERVAL,
+    DISPATCH_SHARD_URLS,
+    DISPATCH_SHARD_WORKERS,
+    DISPATCH_SHARDS,
+    DISPATCH_THREADS,
+    DISPATCH_TIMEOUT,
+    DISPATCH_VNODES,
+    GRACEFUL_TIMEOUT,
+    HOST,
+    PORT,
+)
+from utils.consistent_hash import HashRing, normalize_key
+from utils.executors import BoundedExecutor
+from utils.metrics import metrics, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from utils.serialization import json_encoder
+
+
+# ============================================================================
+# METRICS
+# ============================================================================
+
+DISPATCH_REQUESTS = metrics.counter(
+    'dispatch_requests_total',
+    'Requests proxied to shards by shard and status code',
+    ['shard', 'status']
+)
+DISPATCH_DURATION = metrics.histogram(
+    'dispatch_upstream_seconds',
+    'Time until a shard returned response headers, by shard',
+    ['shard']
+)
+DISPATCH_ERRORS = metrics.counter(
+    'dispatch_errors_total',
+    'Failed upstream requests by shard and kind (connect, timeout, protocol)',
+    ['shard', 'kind']
+)
+DISPATCH_FAILOVERS = metrics.counter(
+    'dispatch_failovers_total',
+    'Requests sent to another shard because the preferred one was down or unreachable'
+)
+
+# Requests routed by roll number: /api/<kind>/<roll_no>
+ROLL_ROUTE = re.compile(r'^/api/(student|predict|dashboard)/([^/]+)$')
+
+# Fixed routes that would otherwise match ROLL_ROUTE
+NOT_ROLL_NUMBERS = {('predict', 'batch'), ('predict', 'export')}
+
+# Cache clears are sent to every shard
+CACHE_CLEAR_PATH = '/api/cache/clear'
+
+# Headers that describe one connection rather than the message
+HOP_BY_HOP = {
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailer', 'transfer-encoding', 'upgrade', 'host',
+}
+
+# Largest known-length body read along with the response headers
+INLINE_BODY_BYTES = 256 * 1024
+
+# Chunk size when streaming larger or unknown-length bodies
+STREAM_CHUNK_BYTES = 64 * 1024
+
+# Idle keep-alive connections kept per shard
+MAX_IDLE_CONNECTIONS = 64
+
+# Seconds of recent requests summarized in the load report
+LOAD_WINDOW = 60.0
+
+# Recently routed roll numbers remembered to report how many a rebalance moves
+RECENT_KEYS = 10000
+
+
+def roll_number_for(path: str) -> Optional[str]:
+    """Roll number a request path is routed by, or None for other routes"""
+    found = ROLL_ROUTE.match(path)
+    if found is None or (found.group(1), found.group(2)) in NOT_ROLL_NUMBERS:
+        return None
+    return found.group(2)
+
+
+def cache_clear_roll_number(body: bytes) -> Optional[str]:
+    """Roll number a cache clear is for, or None if it clears every student"""
+    try:
+        payload = json_encoder.loads(body) if body else {}
+    except ValueError:
+        return None
+    roll_no = payload.get('roll_no') if isinstance(payload, dict) else None
+    return str(roll_no) if roll_no else None
+
+
+# ============================================================================
+# SHARDS
+# ============================================================================
+
+class Shard:
+    """One upstream shard server, its keep-alive connections and its load"""
+
+    def __init__(self, name: str, host: str, port: int,
+                 process: Optional[subprocess.Popen] = None, timeout: float = DISPATCH_TIMEOUT):
+        """
+        Initialize shard
+
+        Args:
+            name: Shard name (its identity on the hash ring)
+            host: Shard host
+            port: Shard port
+            process: The shard's process, if the dispatcher started it
+            timeout: Seconds per upstream request
+        """
+        self.name = name
+        self.host = host
+        self.port = port
+        self.process = process
+        self.timeout = timeout
+        self.healthy = True
+        self.draining = False
+
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self._recent = collections.deque(maxlen=4096)    # (finished_at, upstream seconds)
+        self._idle: List[http.client.HTTPConnection] = []
+
+    @property
+    def url(self) -> str:
+        """Base URL of the shard"""
+        return f'http://{self.host}:{self.port}'
+
+    # ------------------------------------------------------------------
+    # Upstream requests (blocking; run in the dispatcher's thread pool)
+    # ------------------------------------------------------------------
+
+    def _connection(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """An idle keep-alive connection, or a new one; and whether it was reused"""
+        try:
+            return self._idle.pop(), True
+        except IndexError:
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout), False
+
+    def send(self, method: str, target: str, headers: Dict[str, str],
+             body: bytes) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse, Optional[bytes]]:
+        """
+        Send a request and read the response head
+
+        A reused connection the shard has meanwhile closed is retried on
+        another connection. Small bodies of known length are read in the
+        same call, saving a round trip through the thread pool.
+
+        Returns:
+            Tuple of (connection, response, body or None if it is to be streamed)
+        """
+        while True:
+            connection, reused = self._connection()
+            try:
+                connection.request(method, target, body=body, headers=headers)
+                response = connection.getresponse()
+                break
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                connection.close()
+                if not reused:
+                    raise
+            except BaseException:
+                connection.close()
+                raise
+
+        length = response.getheader('Content-Length')
+        if length is not None and length.isdigit() and int(length) <= INLINE_BODY_BYTES:
+            try:
+                return connection, response, response.read()
+            except BaseException:
+                connection.close()
+                raise
+        return connection, response, None
+
+    def release(self, connection: http.client.HTTPConnection, response: http.client.HTTPResponse):
+        """Return a connection whose response was fully read to the idle pool"""
+        if response.will_close or self.draining or len(self._idle) >= MAX_IDLE_CONNECTIONS:
+            connection.close()
+        else:
+            self._idle.append(connection)
+
+    def probe(self) -> bool:
+        """Whether the shard answers its readiness probe"""
+        try:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=2)
+            try:
+                connection.request('GET', '/api/ready')
+                return connection.getresponse().status == 200
+            finally:
+                connection.close()
+        except (OSError, http.client.HTTPException):
+            return False
+
+    def close(self):
+        """Close idle connections"""
+        while self._idle:
+            self._idle.pop().close()
+
+    # ------------------------------------------------------------------
+    # Load accounting (event loop thread)
+    # ------------------------------------------------------------------
+
+    def record(self, status: int, seconds: float):
+        """Count a proxied request"""
+        self.requests += 1
+        self._recent.append((time.monotonic(), seconds))
+        DISPATCH_REQUESTS.inc((self.name, str(status)))
+        DISPATCH_DURATION.observe(seconds, (self.name,))
+
+    def fail(self, kind: str):
+        """Count a failed upstream request; an unreachable shard leaves routing"""
+        self.errors += 1
+        DISPATCH_ERRORS.inc((self.name, kind))
+        if kind == 'connect':
+            self.healthy = False
+
+    def load(self) -> Dict:
+        """Request counts, recent rate and upstream latency"""
+        now = time.monotonic()
+        recent = sorted(seconds for finished, seconds in self._recent if now - finished <= LOAD_WINDOW)
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not recent:
+                return None
+            return round(1000 * recent[min(len(recent) - 1, int(fraction * len(recent)))], 2)
+
+        return {
+            'name': self.name,
+            'url': self.url,
+            'pid': self.process.pid if self.process is not None else None,
+            'healthy': self.healthy,
+            'draining': self.draining,
+            'in_flight': self.in_flight,
+            'requests': self.requests,
+            'errors': self.errors,
+            'requests_per_s': round(len(recent) / LOAD_WINDOW, 2),
+            'upstream_p50_ms': percentile(0.5),
+            'upstream_p95_ms': percentile(0.95),
+            'idle_connections': len(self._idle),
+        }
+
+
+def start_local_shard(port: int, workers: int) -> subprocess.Popen:
+    """
+    Start a serve.py shard on localhost
+
+    Shards do not refill their memory cache from the persistent tier at
+    startup: that would load every student's prediction into every shard.
+    They still read it through on a miss, which is what makes a rebalance
+    cheap.
+    """
+    env = dict(os.environ, PREDICTION_DISK_CACHE_WARM='false')
+    command = [
+        sys.executable, '-W', 'ignore', os.path.join(BACKEND_DIR, 'serve.py'),
+        '--host', '127.0.0.1', '--port', str(port), '--workers', str(workers),
+    ]
+    # Own process group, so the shard's workers can be cleaned up even if its master died
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, start_new_session=True)
+
+
+def stop_process(process: subprocess.Popen, timeout: float = GRACEFUL_TIMEOUT):
+    """Gracefully stop a shard, then kill whatever is left of its process group"""
+    if process.poll() is None:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            pass
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    process.wait()
+
+
+# ============================================================================
+# DISPATCHER
+# ============================================================================
+
+class Dispatcher:
+    """Hash ring of shards, request routing and rebalancing"""
+
+    def __init__(self, vnodes: int = DISPATCH_VNODES, threads: int = DISPATCH_THREADS,
+                 timeout: float = DISPATCH_TIMEOUT):
+        """
+        Initialize dispatcher
+
+        Args:
+            vnodes: Ring points per shard
+            threads: Threads for upstream requests
+            timeout: Seconds per upstream request
+        """
+        self.ring = HashRing(vnodes=vnodes)
+        self.shards: Dict[str, Shard] = {}
+        self.timeout = timeout
+        self.executor = BoundedExecutor(threads, threads * 4, name='dispatch')
+        self.rebalances = collections.deque(maxlen=20)
+        self._recent_keys: 'collections.OrderedDict[str, None]' = collections.OrderedDict()
+        self._round_robin = 0
+        self._changes: Optional[asyncio.Lock] = None
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def candidates(self, roll_no: Optional[str]) -> List[Shard]:
+        """
+        Shards to try for a request, in order
+
+        A roll number's owner comes first, followed by the next shards on
+        the ring; other requests rotate through the shards. Shards that
+        failed their last readiness probe are left out unless all have.
+        """
+        if roll_no is not None:
+            key = normalize_key(roll_no)
+            self._recent_keys[key] = None
+            self._recent_keys.move_to_end(key)
+            if len(self._recent_keys) > RECENT_KEYS:
+                self._recent_keys.popitem(last=False)
+            names = self.ring.nodes_for(key, len(self.ring))
+        else:
+            names = self.ring.nodes
+            if names:
+                self._round_robin = (self._round_robin + 1) % len(names)
+                names = names[self._round_robin:] + names[:self._round_robin]
+
+        shards = [self.shards[name] for name in names]
+        return [shard for shard in shards if shard.healthy] or shards
+
+    # ------------------------------------------------------------------
+    # Rebalancing
+    # ------------------------------------------------------------------
+
+    def _lock(self) -> asyncio.Lock:
+        """Lock serializing shard changes (created on the event loop)"""
+        if self._changes is None:
+            self._changes = asyncio.Lock()
+        return self._changes
+
+    def next_name(self) -> str:
+        """Name for a new shard: the lowest unused shard-N"""
+        index = 0
+        while f'shard-{index}' in self.shards:
+            index += 1
+        return f'shard-{index}'
+
+    async def add_shard(self, shard: Shard) -> Dict:
+        """
+        Put a ready shard on the ring
+
+        Returns:
+            Rebalance report: the fraction of the key space and how many
+            recently routed roll numbers moved, and the new shares
+        """
+        async with self._lock():
+            before = self.ring.copy()
+            self.shards[shard.name] = shard
+            self.ring.add(shard.name)
+            return self._rebalanced('add', shard.name, before)
+
+    async def remove_shard(self, name: str) -> Optional[Dict]:
+        """
+        Take a shard off the ring, wait for its in-flight requests and stop it
+
+        Returns:
+            Rebalance report, or None if there is no such shard
+        """
+        async with self._lock():
+            shard = self.shards.get(name)
+            if shard is None:
+                return None
+            before = self.ring.copy()
+            self.ring.remove(name)
+            shard.draining = True
+            report = self._rebalanced('remove', name, before)
+
+            deadline = time.monotonic() + GRACEFUL_TIMEOUT
+            while shard.in_flight and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+            del self.shards[name]
+            shard.close()
+            if shard.process is not None:
+                await self.executor.run(stop_process, shard.process)
+            return report
+
+    def _rebalanced(self, action: str, name: str, before: HashRing) -> Dict:
+        """Record and return the report for a ring change"""
+        moved_keys = sum(1 for key in self._recent_keys if before.node_for(key) != self.ring.node_for(key))
+        report = {
+            'action': action,
+            'shard': name,
+            'at': time.time(),
+            'moved_fraction': before.moved_fraction(self.ring),
+            'moved_recent_keys': moved_keys,
+            'recent_keys': len(self._recent_keys),
+            'shares': self.ring.shares(),
+        }
+        self.rebalances.append(report)
+        print(f"🔀 Rebalanced ({action} {name}): {report['moved_fraction']:.1%} of roll numbers moved, "
+              f"{moved_keys}/{len(self._recent_keys)} recently seen")
+        return report
+
+    # ------------------------------------------------------------------
+    # Shard lifecycle
+    # ------------------------------------------------------------------
+
+    async def wait_until_ready(self, shard: Shard, timeout: float = 120.0) -> bool:
+        """Poll a shard's readiness probe until it reports ready"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if shard.process is not None and shard.process.poll() is not None:
+                return False
+            if await self.executor.run(shard.probe):
+                return True
+            await asyncio.sleep(0.25)
+        return False
+
+    async def start_shard(self, port: int, workers: int, name: Optional[str] = None) -> Optional[Dict]:
+        """
+        Start a local shard, wait for it to load and add it to the ring
+
+        Args:
+            port: Port for the shard
+            workers: serve.py workers
+            name: Shard name (default: the lowest unused shard-N)
+
+        Returns:
+            Rebalance report, or None if the shard did not come up
+        """
+        shard = Shard(name or self.next_name(), '127.0.0.1', port, start_local_shard(port, workers), self.timeout)
+        print(f"🚀 Starting {shard.name} on {shard.url} (pid {shard.process.pid})")
+        if not await self.wait_until_ready(shard):
+            await self.executor.run(stop_process, shard.process)
+            print(f"❌ {shard.name} did not become ready")
+            return None
+        return await self.add_shard(shard)
+
+    async def attach_shard(self, url: str, name: Optional[str] = None) -> Optional[Dict]:
+        """
+        Add an already running shard by URL
+
+        Args:
+            url: Shard base URL
+            name: Shard name (default: the lowest unused shard-N)
+
+        Returns:
+            Rebalance report, or None if the shard does not answer
+        """
+        parts = urlsplit(url if '://' in url else f'http://{url}')
+        shard = Shard(name or self.next_name(), parts.hostname or '127.0.0.1', parts.port or 80,
+                      timeout=self.timeout)
+        if not await self.wait_until_ready(shard, timeout=10.0):
+            return None
+        return await self.add_shard(shard)
+
+    def next_local_port(self, base: int) -> int:
+        """First port from base not used by a local shard"""
+        used = {shard.port for shard in self.shards.values() if shard.process is not None}
+        port = base
+        while port in used:
+            port += 1
+        return port
+
+    async def monitor(self, interval: float = DISPATCH_HEALTH_INTERVAL):
+        """Probe every shard periodically, returning recovered ones to routing"""
+        while True:
+            await asyncio.sleep(interval)
+            for shard in list(self.shards.values()):
+                healthy = await self.executor.run(shard.probe)
+                if healthy != shard.healthy:
+                    print(f"{'✅' if healthy else '⚠️ '} {shard.name} is {'back' if healthy else 'down'}")
+                shard.healthy = healthy
+
+    async def shutdown(self):
+        """Stop local shards"""
+        for shard in list(self.shards.values()):
+            shard.draining = True
+            shard.close()
+            if shard.process is not None:
+                await self.executor.run(stop_process, shard.process)
+        self.shards.clear()
+
+    def report(self) -> Dict:
+        """Per-shard load with each shard's share of the key space"""
+        shares = self.ring.shares()
+        owned = collections.Counter(self.ring.node_for(key) for key in self._recent_keys)
+        shards = []
+        for name, shard in sorted(self.shards.items()):
+            row = shard.load()
+            row['key_share'] = shares.get(name, 0.0)
+            row['recent_keys'] = owned.get(name, 0)
+            shards.append(row)
+        return {
+            'shards': shards,
+            'vnodes': self.ring.vnodes,
+            'requests': sum(shard.requests for shard in self.shards.values()),
+            'failovers': int(DISPATCH_FAILOVERS.get()),
+            'rebalances': list(self.rebalances),
+        }
+
+
+# ============================================================================
+# APPLICATION
+# ============================================================================
+
+class DispatchApp:
+    """ASGI application proxying the API to the shards"""
+
+    def __init__(self, dispatcher: Dispatcher, shards: int = DISPATCH_SHARDS,
+                 shard_urls: Tuple[str, ...] = (), shard_workers: int = DISPATCH_SHARD_WORKERS,
+                 shard_port: int = PORT + 1):
+        """
+        Initialize application
+
+        Args:
+            dispatcher: Dispatcher owning the ring
+            shards: Local shards to start (ignored when shard_urls is given)
+            shard_urls: Running shards to front
+            shard_workers: serve.py workers per local shard
+            shard_port: First port for local shards
+        """
+        self.dispatcher = dispatcher
+        self.initial_shards = shards
+        self.shard_urls = shard_urls
+        self.shard_workers = shard_workers
+        self.shard_port = shard_port
+        self._monitor: Optional[asyncio.Task] = None
+
+    async def __call__(self, scope, receive, send):
+        """ASGI entry point"""
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        """Bring up the shards before accepting requests; stop them on shutdown"""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.dispatcher.executor.start()
+                # Shards load in parallel; names fix their ring positions whatever order they finish in
+                if self.shard_urls:
+                    added = await asyncio.gather(*(
+                        self.dispatcher.attach_shard(url, f'shard-{index}')
+                        for index, url in enumerate(self.shard_urls)
+                    ))
+                else:
+                    added = await asyncio.gather(*(
+                        self.dispatcher.start_shard(self.shard_port + index, self.shard_workers, f'shard-{index}')
+                        for index in range(self.initial_shards)
+                    ))
+                if not any(added):
+                    await send({'type': 'lifespan.startup.failed', 'message': 'No shard became ready'})
+                    return
+                self._monitor = asyncio.create_task(self.dispatcher.monitor())
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self._monitor is not None:
+                    self._monitor.cancel()
+                await self.dispatcher.shutdown()
+                self.dispatcher.executor.shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope, receive, send):
+        """Serve one HTTP request"""
+        body = b''
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body += message.get('body', b'')
+            if not message.get('more_body', False):
+                break
+
+        path = scope['path']
+        if path.startswith('/api/dispatch/'):
+            status, content_type, payload = await self._admin(scope, body)
+            await send({'type': 'http.response.start', 'status': status,
+                        'headers': [(b'content-type', content_type.encode('latin-1'))]})
+            await send({'type': 'http.response.body', 'body': payload})
+            return
+
+        if path == CACHE_CLEAR_PATH and scope['method'] == 'POST':
+            await self._clear_cache(scope, body, send)
+            return
+
+        await self._proxy(scope, body, send, roll_number_for(path))
+
+    # ------------------------------------------------------------------
+    # Proxying
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _upstream_request(scope) -> Tuple[str, str, Dict[str, str]]:
+        """Method, target and forwarded headers of the request to send upstream"""
+        method = scope['method']
+        target = scope['raw_path'].decode('latin-1')
+        if scope.get('query_string'):
+            target += '?' + scope['query_string'].decode('latin-1')
+
+        headers = {}
+        for name, value in scope.get('headers', []):
+            name = name.decode('latin-1').lower()
+            if name not in HOP_BY_HOP:
+                headers[name] = value.decode('latin-1')
+        if scope.get('client'):
+            forwarded = headers.get('x-forwarded-for')
+            headers['x-forwarded-for'] = f"{forwarded}, {scope['client'][0]}" if forwarded else scope['client'][0]
+        return method, target, headers
+
+    async def _proxy(self, scope, body: bytes, send, roll_no: Optional[str]):
+        """Forward a request to the first shard that answers and relay the response"""
+        method, target, headers = self._upstream_request(scope)
+
+        candidates = self.dispatcher.candidates(roll_no)
+        if not candidates:
+            await self._send_json(send, {'error': 'No shards available'}, 503)
+            return
+
+        for attempt, shard in enumerate(candidates):
+            if attempt:
+                DISPATCH_FAILOVERS.inc()
+            shard.in_flight += 1
+            start = time.perf_counter()
+            try:
+                connection, response, payload = await self.dispatcher.executor.run(
+                    shard.send, method, target, headers, body
+                )
+            except ConnectionRefusedError:
+                shard.in_flight -= 1
+                shard.fail('connect')
+                # The shard never saw the request, so any method can go elsewhere
+                continue
+            except (socket.timeout, TimeoutError):
+                shard.in_flight -= 1
+                shard.fail('timeout')
+                await self._send_json(send, {'error': 'Shard timed out', 'shard': shard.name}, 504)
+                return
+            except (OSError, http.client.HTTPException):
+                shard.in_flight -= 1
+                shard.fail('protocol')
+                if method in ('GET', 'HEAD'):
+                    continue
+                await self._send_json(send, {'error': 'Shard failed', 'shard': shard.name}, 502)
+                return
+
+            try:
+                shard.record(response.status, time.perf_counter() - start)
+                await self._relay(shard, connection, response, payload, send)
+            finally:
+                shard.in_flight -= 1
+            return
+
+        await self._send_json(send, {'error': 'No shard could serve the request'}, 502)
+
+    async def _clear_cache(self, scope, body: bytes, send):
+        """
+        Clear the prediction cache on every shard
+
+        A student's entry is not only on its owner: shards hold on to
+        students they owned before a rebalance, and a failover serves (and
+        caches) them on the next shard. Clears are cheap, so even one
+        naming a roll number goes to every shard.
+        """
+        roll_no = cache_clear_roll_number(body)
+        method, target, headers = self._upstream_request(scope)
+        shards = list(self.dispatcher.shards.values())
+        if not shards:
+            await self._send_json(send, {'error': 'No shards available'}, 503)
+            return
+
+        statuses = await asyncio.gather(*(
+            self._send_to(shard, method, target, headers, body) for shard in shards
+        ))
+        results = {shard.name: status for shard, status in zip(shards, statuses)}
+        if all(status == 200 for status in statuses):
+            message = f"Cache cleared for {roll_no}" if roll_no else "All cache cleared"
+            await self._send_json(send, {'success': True, 'message': message, 'shards': results}, 200)
+        else:
+            await self._send_json(send, {'success': False, 'message': 'Cache not cleared on every shard',
+                                         'shards': results}, 502)
+
+    async def _send_to(self, shard: Shard, method: str, target: str, headers: Dict[str, str],
+                       body: bytes) -> Optional[int]:
+        """
+        Send a request to one shard, discarding the response body
+
+        Returns:
+            The shard's status code, or None if it could not be reached
+        """
+        shard.in_flight += 1
+        start = time.perf_counter()
+        try:
+            connection, response, payload = await self.dispatcher.executor.run(
+                shard.send, method, target, headers, body
+            )
+        except ConnectionRefusedError:
+            shard.fail('connect')
+            return None
+        except (socket.timeout, TimeoutError):
+            shard.fail('timeout')
+            return None
+        except (OSError, http.client.HTTPException):
+            shard.fail('protocol')
+            return None
+        finally:
+            shard.in_flight -= 1
+
+        shard.record(response.status, time.perf_counter() - start)
+        if payload is None:
+            connection.close()
+        else:
+            shard.release(connection, response)
+        return response.status
+
+    async def _relay(self, shard: Shard, connection: http.client.HTTPConnection,
+                     response: http.client.HTTPResponse, payload: Optional[bytes], send):
+        """Send a shard's response to the client, streaming bodies that were not read inline"""
+        headers = [
+            (name.lower().encode('latin-1'), value.encode('latin-1'))
+            for name, value in response.getheaders()
+            if name.lower() not in HOP_BY_HOP
+        ]
+        headers.append((b'x-shard', shard.name.encode('latin-1')))
+        await send({'type': 'http.response.start', 'status': response.status, 'headers': headers})
+
+        if payload is not None:
+            shard.release(connection, response)
+            await send({'type': 'http.response.body', 'body': payload})
+            return
+
+        try:
+            while True:
+                chunk = await self.dispatcher.executor.run(response.read1, STREAM_CHUNK_BYTES)
+                if not chunk:
+                    break
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        except BaseException:
+            connection.close()
+            raise
+        shard.release(connection, response)
+        await send({'type': 'http.response.body', 'body': b''})
+
+    @staticmethod
+    async def _send_json(send, data: Dict, status: int):
+        """Send a JSON response generated by the dispatcher itself"""
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(b'content-type', b'application/json')]})
+        await send({'type': 'http.response.body', 'body': json_encoder.dumps_line(data)})
+
+    # ------------------------------------------------------------------
+    # Admin endpoints
+    # ------------------------------------------------------------------
+
+    async def _admin(self, scope, body: bytes) -> Tuple[int, str, bytes]:
+        """
+        Serve a /api/dispatch/ endpoint
+
+        Returns:
+            Tuple of (status, content type, body)
+        """
+        method, path = scope['method'], scope['path']
+        if path == '/api/dispatch/metrics' and method == 'GET':
+            return 200, METRICS_CONTENT_TYPE, metrics.render().encode('utf-8')
+
+        data, status = await self._admin_json(method, path, scope, body)
+        return status, 'application/json', json_encoder.dumps_line(data)
+
+    async def _admin_json(self, method: str, path: str, scope, body: bytes) -> Tuple[Dict, int]:
+        """Serve a JSON admin endpoint"""
+        if not admin_authorized(scope):
+            message = 'Admin token required' if ADMIN_TOKEN else 'Admin endpoints are disabled (ADMIN_TOKEN not configured)'
+            return {'error': 'Forbidden', 'message': message}, 403
+
+        if path == '/api/dispatch/shards':
+            if method == 'GET':
+                return self.dispatcher.report(), 200
+            if method == 'POST':
+                try:
+                    payload = json_encoder.loads(body) if body else {}
+                except ValueError:
+                    payload = None
+                if not isinstance(payload, dict):
+                    return {'error': 'Invalid request', 'message': 'Body must be a JSON object'}, 400
+                if payload.get('url'):
+                    report = await self.dispatcher.attach_shard(str(payload['url']))
+                else:
+                    port = self.dispatcher.next_local_port(self.shard_port)
+                    report = await self.dispatcher.start_shard(port, int(payload.get('workers', self.shard_workers)))
+                if report is None:
+                    return {'error': 'Shard did not become ready'}, 502
+                return report, 201
+            return {'error': 'Method not allowed', 'message': 'Allowed methods: GET, POST'}, 405
+
+        found = re.match(r'^/api/dispatch/shards/([^/]+)$', path)
+        if found is not None:
+            if method != 'DELETE':
+                return {'error': 'Method not allowed', 'message': 'Allowed methods: DELETE'}, 405
+            if len(self.dispatcher.shards) == 1 and found.group(1) in self.dispatcher.shards:
+                return {'error': 'Cannot remove the last shard'}, 409
+            report = await self.dispatcher.remove_shard(found.group(1))
+            if report is None:
+                return {'error': 'Shard not found'}, 404
+            return report, 200
+
+        return {'error': 'Endpoint not found', 'message': 'The requested endpoint does not exist'}, 404
+
+
+def admin_authorized(scope) -> bool:
+    """Check the X-Admin-Token header against the configured admin token"""
+    if not ADMIN_TOKEN:
+        return False
+    token = next((value for name, value in scope.get('headers', []) if name.lower() == b'x-admin-token'), b'')
+    return hmac.compare_digest(token, ADMIN_TOKEN.encode('utf-8'))
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv=None) -> int:
+    """Start the shards and serve the dispatcher"""
+    from utils.asgi_server import serve
+
+    parser = argparse.ArgumentParser(description='Roll-number sharded dispatcher in front of several API servers')
+    parser.add_argument('--host', default=HOST, help='interface to bind')
+    parser.add_argument('--port', type=int, default=PORT, help='port to bind')
+    parser.add_argument('--shards', type=int, default=DISPATCH_SHARDS, help='local shards to start')
+    parser.add_argument('--shard-workers', type=int, default=DISPATCH_SHARD_WORKERS,
+                        help='serve.py workers per local shard')
+    parser.add_argument('--shard-port', type=int, default=None,
+                        help='first port for local shards (default: the port after --port)')
+    parser.add_argument('--shard-urls', default=DISPATCH_SHARD_URLS,
+                        help='comma-separated URLs of running shards (instead of starting local ones)')
+    parser.add_argument('--vnodes', type=int, default=DISPATCH_VNODES, help='ring points per shard')
+    parser.add_argument('--access-log', action='store_true', help='log every request')
+    args = parser.parse_args(argv)
+
+    shard_urls = tuple(url.strip() for url in args.shard_urls.split(',') if url.strip())
+    app = DispatchApp(
+        Dispatcher(vnodes=args.vnodes),
+        shards=args.shards,
+        shard_urls=shard_urls,
+        shard_workers=args.shard_workers,
+        shard_port=args.shard_port or args.port + 1,
+    )
+
+    print("=" * 60)
+    print(f"🔀 Dispatcher starting on http://{args.host}:{args.port}")
+    if shard_urls:
+        print(f"   fronting {len(shard_urls)} shards: {', '.join(shard_urls)}")
+    else:
+        print(f"   starting {args.shards} local shards x {args.shard_workers} workers")
+    print("=" * 60, flush=True)
+
+    asyncio.run(serve(app, args.host, args.port, keepalive=ASGI_KEEPALIVE, access_log=args.access_log))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
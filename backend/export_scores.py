@@ -0,0 +1,67 @@
+"""
+Cohort Risk Score Export
+========================
+
+Scores students in fixed-size chunks and writes NDJSON as each chunk
+completes - the same stream GET /api/predict/export serves, without a
+running server. Memory use stays flat however large the cohort is.
+
+Each line is a JSON object with a "type":
+    result   - one student: roll_no, success, prediction (or error)
+    summary  - last line: count and the risk distribution of the export
+    error    - scoring stopped part way; count says how many were written
+
+Usage (from the backend directory):
+    python export_scores.py > scores.ndjson
+    python export_scores.py --year 2 --course "B.Tech Computer Science" -o cse_year2.ndjson
+    python export_scores.py --roll-prefix 2023EC --chunk-size 200
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def main(argv=None) -> int:
+    """Run the export"""
+    parser = argparse.ArgumentParser(description='Stream dropout risk scores for a cohort as NDJSON')
+    parser.add_argument('--course', help='only students in this course')
+    parser.add_argument('--year', help='only students in this year')
+    parser.add_argument('--roll-prefix', help='only roll numbers starting with this prefix')
+    parser.add_argument('--chunk-size', type=int, default=None, help='students scored per model call')
+    parser.add_argument('-o', '--output', default='-', help='output file (default: stdout)')
+    args = parser.parse_args(argv)
+
+    # Model loading prints progress; keep stdout for the NDJSON stream
+    with contextlib.redirect_stdout(sys.stderr):
+        from routes.prediction_routes.prediction_routes_server import prediction_handler
+
+    filters = {'course': args.course, 'year': args.year, 'roll_prefix': args.roll_prefix}
+    response_data, status_code = prediction_handler.export_predictions_handler(filters, args.chunk_size)
+    if status_code != 200:
+        print(f"❌ {response_data['message']}", file=sys.stderr)
+        return 2
+
+    output = sys.stdout.buffer if args.output == '-' else open(args.output, 'wb')
+    start = time.perf_counter()
+    written = 0
+    try:
+        for chunk in response_data:
+            output.write(chunk)
+            output.flush()
+            written += chunk.count(b'\n')
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+
+    print(f"✅ {written} lines in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,13 +13,18 @@ Usage:
     
     predictor = DropoutPredictor()
     result = predictor.predict(student_data)
+    results = predictor.predict_batch([student_a, student_b])
 """
 
-import pandas as pd
-import numpy as np
+import hashlib
 import pickle
 import os
-from typing import Dict, List, Any, Optional
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
+
+if TYPE_CHECKING:
+    # pandas is imported where frames are built: it is only needed once
+    # a model is loaded, and importing it costs a few hundred milliseconds
+    import pandas as pd
 
 
 # ============================================================================
@@ -57,9 +62,14 @@ class DropoutPredictor:
     Main class for predicting student dropout risk
     """
 
-    def __init__(self, config: Optional[PredictConfig] = None):
+    def __init__(self, config: Optional[PredictConfig] = None, load: bool = True):
         """
         Initialize the predictor by loading model artifacts
+
+        Args:
+            config: Optional paths and thresholds
+            load: Load the artifacts now; pass False to load them later
+                with _load_artifacts (e.g. in a background thread)
         """
         self.config = config or PredictConfig()
         self.model = None
@@ -67,6 +77,8 @@ class DropoutPredictor:
         self.feature_names = None
         self.label_encoders = None
         self.metadata = None
+        self.version = None
+        self.modified_at = None
         self.is_loaded = False
 
         # Print paths for debugging
@@ -76,12 +88,15 @@ class DropoutPredictor:
         print(f"   MODEL_PATH: {self.config.MODEL_PATH}")
 
         # Load model artifacts
-        self._load_artifacts()
+        if load:
+            self._load_artifacts()
 
     def _load_artifacts(self):
         """Load all model artifacts from saved files"""
         try:
             print("\n🔄 Loading model artifacts...")
+            # Content hash of the artifacts the predictions depend on
+            digest = hashlib.blake2b(digest_size=16)
 
             # Check if saved_models directory exists
             if not os.path.exists(self.config.SAVED_MODELS_PATH):
@@ -95,8 +110,7 @@ class DropoutPredictor:
                 self.is_loaded = False
                 return
                 
-            with open(self.config.MODEL_PATH, 'rb') as f:
-                self.model = pickle.load(f)
+            self.model = self._load_pickle(self.config.MODEL_PATH, digest)
             print(f"   ✓ Model loaded from {self.config.MODEL_PATH}")
 
             # Load scaler
@@ -105,8 +119,7 @@ class DropoutPredictor:
                 self.is_loaded = False
                 return
                 
-            with open(self.config.SCALER_PATH, 'rb') as f:
-                self.scaler = pickle.load(f)
+            self.scaler = self._load_pickle(self.config.SCALER_PATH, digest)
             print(f"   ✓ Scaler loaded")
 
             # Load feature names
@@ -115,8 +128,7 @@ class DropoutPredictor:
                 self.is_loaded = False
                 return
                 
-            with open(self.config.FEATURE_NAMES_PATH, 'rb') as f:
-                self.feature_names = pickle.load(f)
+            self.feature_names = self._load_pickle(self.config.FEATURE_NAMES_PATH, digest)
             print(f"   ✓ Feature names loaded ({len(self.feature_names)} features)")
 
             # Load label encoders
@@ -125,8 +137,7 @@ class DropoutPredictor:
                 self.is_loaded = False
                 return
                 
-            with open(self.config.LABEL_ENCODERS_PATH, 'rb') as f:
-                self.label_encoders = pickle.load(f)
+            self.label_encoders = self._load_pickle(self.config.LABEL_ENCODERS_PATH, digest)
             print(f"   ✓ Label encoders loaded")
 
             # Load metadata (optional - won't fail if missing)
@@ -141,6 +152,11 @@ class DropoutPredictor:
             except:
                 self.metadata = {}
 
+            # Identifies the loaded artifacts by content, so rewriting identical
+            # files (a checkout, an image build) keeps the version
+            self.version = digest.hexdigest()
+            self.modified_at = os.stat(self.config.MODEL_PATH).st_mtime
+
             self.is_loaded = True
             print("✅ All model artifacts loaded successfully!\n")
 
@@ -152,6 +168,14 @@ class DropoutPredictor:
             print(f"❌ Error loading model artifacts: {e}")
             self.is_loaded = False
 
+    @staticmethod
+    def _load_pickle(path, digest) -> Any:
+        """Unpickle an artifact, adding its bytes to digest"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest.update(data)
+        return pickle.loads(data)
+
     def _convert_to_numeric(self, value: Any, feature_name: str) -> float:
         """
         Convert a value to numeric format
@@ -206,7 +230,7 @@ class DropoutPredictor:
         # Default
         return 0.0
 
-    def _prepare_features(self, student_data: Dict) -> pd.DataFrame:
+    def _prepare_features(self, student_data: Dict) -> 'pd.DataFrame':
         """
         Prepare student data for prediction
         
@@ -216,7 +240,30 @@ class DropoutPredictor:
         Returns:
             DataFrame with features ready for prediction
         """
-        # Create a DataFrame with a single row
+        return self._scale_features(self._build_feature_frame(student_data))
+
+    def _build_feature_frame(self, student_data: Dict) -> 'pd.DataFrame':
+        """
+        Build the unscaled, numeric feature row for a student
+        
+        Args:
+            student_data: Dictionary containing student information
+            
+        Returns:
+            Single-row DataFrame in training column order
+        """
+        return self._feature_frame([self._feature_row(student_data)])
+
+    def _feature_row(self, student_data: Dict) -> Dict[str, float]:
+        """
+        Map a student record to numeric feature values
+        
+        Args:
+            student_data: Dictionary containing student information
+            
+        Returns:
+            Dictionary of feature name to value
+        """
         features = {}
 
         # Map student_data keys to feature names
@@ -285,30 +332,46 @@ class DropoutPredictor:
             # Convert to numeric
             features[feature] = self._convert_to_numeric(value, feature)
 
-        # Create DataFrame
-        df = pd.DataFrame([features])
-
         # Handle hostel_day_scholar encoding using label encoder if exists
-        if 'hostel_day_scholar' in df.columns and 'hostel_day_scholar' in self.label_encoders:
+        if 'hostel_day_scholar' in features and 'hostel_day_scholar' in self.label_encoders:
             encoder = self.label_encoders['hostel_day_scholar']
             original_value = student_data.get('hostel_day_scholar', 'Day Scholar')
             
             try:
                 if isinstance(original_value, str):
-                    df['hostel_day_scholar'] = encoder.transform([original_value])[0]
+                    features['hostel_day_scholar'] = encoder.transform([original_value])[0]
                 else:
-                    df['hostel_day_scholar'] = float(original_value)
+                    features['hostel_day_scholar'] = float(original_value)
             except:
-                df['hostel_day_scholar'] = 0.0
+                features['hostel_day_scholar'] = 0.0
+
+        return features
+
+    def _feature_frame(self, rows: List[Dict[str, float]]) -> 'pd.DataFrame':
+        """
+        Build an unscaled feature frame from feature rows
+        
+        Args:
+            rows: Feature rows from _feature_row
+            
+        Returns:
+            DataFrame with one row per input, in training column order
+        """
+        import pandas as pd
 
         # Ensure column order matches training
-        df = df[self.feature_names]
+        df = pd.DataFrame(rows, columns=self.feature_names)
 
         # Ensure all values are numeric
         for col in df.columns:
             df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
 
-        # Scale features
+        return df
+
+    def _scale_features(self, df: 'pd.DataFrame') -> 'pd.DataFrame':
+        """Scale a feature frame with the training scaler"""
+        import pandas as pd
+
         df_scaled = pd.DataFrame(
             self.scaler.transform(df),
             columns=self.feature_names
@@ -793,12 +856,13 @@ class DropoutPredictor:
 
         return unique_recommendations[:5]
 
-    def predict(self, student_data: Dict) -> Dict:
+    def predict(self, student_data: Dict, timer=None) -> Dict:
         """
         Predict dropout risk for a student
         
         Args:
             student_data: Dictionary containing student information
+            timer: Optional StageTimer that records per-stage durations
             
         Returns:
             Prediction result dictionary
@@ -811,57 +875,136 @@ class DropoutPredictor:
 
         try:
             # Prepare features
-            features = self._prepare_features(student_data)
+            features = self._build_feature_frame(student_data)
+            if timer is not None:
+                timer.mark('prepare_features')
+
+            features = self._scale_features(features)
+            if timer is not None:
+                timer.mark('scaling')
 
             # Get prediction probability
             proba = self.model.predict_proba(features)[0]
-            dropout_probability = proba[1]  # Probability of class 1 (dropout)
-
-            # Convert to percentage
-            risk_percentage = round(dropout_probability * 100, 1)
-
-            # Get risk level
-            risk_level_info = self._get_risk_level(risk_percentage)
-
-            # Calculate risk factors
-            risk_factors = self._calculate_risk_factors(student_data, dropout_probability)
+            if timer is not None:
+                timer.mark('predict_proba')
 
-            # Get recommendations
-            recommendations = self._get_recommendations(risk_factors, risk_percentage)
+            return self._build_result(student_data, proba, timer)
 
-            # Prepare student info for display
-            student_info = {
-                'name': student_data.get('name', 'Unknown'),
-                'roll_no': student_data.get('roll_no', student_data.get('student_id', 'N/A')),
-                'course': student_data.get('course', 'N/A'),
-                'year': student_data.get('year_string', f"Year {student_data.get('year', 'N/A')}"),
+        except Exception as e:
+            import traceback
+            return {
+                'error': True,
+                'message': f'Prediction failed: {str(e)}',
+                'traceback': traceback.format_exc()
             }
 
-            # Build result
-            result = {
-                'error': False,
-                'student_info': student_info,
-                'risk_level': risk_level_info['level'],
-                'risk_level_info': risk_level_info,
-                'risk_percentage': risk_percentage,
-                'risk_factors': risk_factors,
-                'recommendations': recommendations,
-                'prediction_details': {
-                    'dropout_probability': round(dropout_probability, 4),
-                    'safe_probability': round(proba[0], 4),
-                    'model_confidence': round(max(proba) * 100, 1)
-                }
-            }
+    def predict_batch(self, students: List[Dict]) -> List[Dict]:
+        """
+        Predict dropout risk for several students with one model call
+        
+        Feature rows are built per student, then scaled and scored as a
+        single frame, so the scaler and model run once for the whole batch.
+        
+        Args:
+            students: List of student data dictionaries
+            
+        Returns:
+            One prediction result per student, in input order
+        """
+        if not self.is_loaded:
+            return [{
+                'error': True,
+                'message': 'Model not loaded. Please ensure all model files exist in backend/ml/saved_models/'
+            } for _ in students]
 
-            return result
+        if not students:
+            return []
 
+        try:
+            features = self._scale_features(
+                self._feature_frame([self._feature_row(student) for student in students])
+            )
+            probas = self.model.predict_proba(features)
         except Exception as e:
             import traceback
-            return {
+            failure = {
                 'error': True,
                 'message': f'Prediction failed: {str(e)}',
                 'traceback': traceback.format_exc()
             }
+            return [dict(failure) for _ in students]
+
+        results = []
+        for student_data, proba in zip(students, probas):
+            try:
+                results.append(self._build_result(student_data, proba))
+            except Exception as e:
+                import traceback
+                results.append({
+                    'error': True,
+                    'message': f'Prediction failed: {str(e)}',
+                    'traceback': traceback.format_exc()
+                })
+
+        return results
+
+    def _build_result(self, student_data: Dict, proba, timer=None) -> Dict:
+        """
+        Build the prediction result for one student from class probabilities
+        
+        Args:
+            student_data: Dictionary containing student information
+            proba: Model class probabilities for the student
+            timer: Optional StageTimer that records per-stage durations
+            
+        Returns:
+            Prediction result dictionary
+        """
+        dropout_probability = proba[1]  # Probability of class 1 (dropout)
+
+        # Convert to percentage
+        risk_percentage = round(dropout_probability * 100, 1)
+
+        # Get risk level
+        risk_level_info = self._get_risk_level(risk_percentage)
+
+        # Calculate risk factors
+        risk_factors = self._calculate_risk_factors(student_data, dropout_probability)
+        if timer is not None:
+            timer.mark('risk_factors')
+
+        # Get recommendations
+        recommendations = self._get_recommendations(risk_factors, risk_percentage)
+        if timer is not None:
+            timer.mark('recommendations')
+
+        # Prepare student info for display
+        student_info = {
+            'name': student_data.get('name', 'Unknown'),
+            'roll_no': student_data.get('roll_no', student_data.get('student_id', 'N/A')),
+            'course': student_data.get('course', 'N/A'),
+            'year': student_data.get('year_string', f"Year {student_data.get('year', 'N/A')}"),
+        }
+
+        # Build result
+        result = {
+            'error': False,
+            'student_info': student_info,
+            'risk_level': risk_level_info['level'],
+            'risk_level_info': risk_level_info,
+            'risk_percentage': risk_percentage,
+            'risk_factors': risk_factors,
+            'recommendations': recommendations,
+            'prediction_details': {
+                'dropout_probability': round(dropout_probability, 4),
+                'safe_probability': round(proba[0], 4),
+                'model_confidence': round(max(proba) * 100, 1)
+            }
+        }
+        if timer is not None:
+            timer.mark('build_result')
+
+        return result
 
     def predict_from_roll_no(self, roll_no: str, students_data: Dict) -> Dict:
         """Predict dropout risk using roll number"""
@@ -0,0 +1,5 @@
+"""Admin routes package"""
+
+from .admin_routes_server import admin_handler
+
+__all__ = ['admin_handler']
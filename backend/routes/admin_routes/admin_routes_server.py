@@ -0,0 +1,222 @@
+"""
+Admin Route Handlers
+====================
+
+This module contains handler functions for admin-only routes
+(request profiles, memory accounting, worker status and other diagnostics).
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config import WORKER_TIMEOUT
+from services.job_service.job_service_server import job_service_server
+from services.prediction_service.prediction_service_server import prediction_service_server
+from services.student_service.student_service_server import student_service_server
+from utils import workers
+from utils.memory import memory_tracker
+from utils.profiling import request_profiler
+
+
+class AdminRouteHandler:
+    """Handler class for admin routes"""
+    
+    def __init__(self):
+        """Initialize handler with the request profiler and memory tracker"""
+        self.profiler = request_profiler
+        self.memory = memory_tracker
+    
+    def register_memory_components(self):
+        """
+        Register the application's long-lived components with the memory tracker
+        
+        Called once by each entry point (server.py, asgi.py), so they report
+        the same components. Handlers share the service instances owned by
+        the service servers.
+        """
+        prediction_server = prediction_service_server
+        self.memory.register('student_store', lambda: student_service_server.service._students_cache)
+        self.memory.register('model:dropout_predictor', lambda: prediction_server.service.predictor)
+        self.memory.register('cache:predictions', lambda: prediction_server._prediction_cache)
+        self.memory.register('cache:responses:predictions', lambda: prediction_server.response_cache._entries)
+        self.memory.register('cache:responses:students', lambda: student_service_server.response_cache._entries)
+        self.memory.register('cache:request_profiles', lambda: self.profiler._profiles)
+        self.memory.register('queue:bulk_predictions', prediction_server.service.scheduler.queued_chunks)
+        self.memory.register('queue:prefetch', lambda: prediction_server.prefetcher._queued)
+        self.memory.register('jobs', lambda: job_service_server.service._jobs)
+    
+    def list_profiles_handler(self) -> tuple:
+        """
+        Handle list profiles request
+        
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            profiles = self.profiler.list_profiles()
+            
+            return {
+                'total': len(profiles),
+                'sample_rate': self.profiler.sample_rate,
+                'default_mode': self.profiler.default_mode,
+                'profiles': profiles
+            }, 200
+            
+        except Exception as e:
+            return {'error': f'Server error: {str(e)}'}, 500
+    
+    def get_profile_handler(self, profile_id: str) -> tuple:
+        """
+        Handle get profile request
+        
+        Args:
+            profile_id: Profile identifier
+            
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            profile = self.profiler.get_profile(profile_id)
+            
+            if profile is None:
+                return {'error': 'Profile not found'}, 404
+            
+            return profile, 200
+            
+        except Exception as e:
+            return {'error': f'Server error: {str(e)}'}, 500
+
+    
+    def memory_report_handler(self) -> tuple:
+        """
+        Handle memory report request
+        
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            return self.memory.report(), 200
+            
+        except Exception as e:
+            return {'error': f'Server error: {str(e)}'}, 500
+    
+    def take_snapshot_handler(self, label: str = None) -> tuple:
+        """
+        Handle take tracemalloc snapshot request
+        
+        Args:
+            label: Optional snapshot label
+            
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            return self.memory.take_snapshot(label), 201
+            
+        except Exception as e:
+            return {'error': f'Server error: {str(e)}'}, 500
+    
+    def list_snapshots_handler(self) -> tuple:
+        """
+        Handle list tracemalloc snapshots request
+        
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            snapshots = self.memory.list_snapshots()
+            
+            return {
+                'total': len(snapshots),
+                'snapshots': snapshots
+            }, 200
+            
+        except Exception as e:
+            return {'error': f'Server error: {str(e)}'}, 500
+    
+    def diff_snapshots_handler(self, from_id: str, to_id: str = None,
+                               limit: int = 20, group_by: str = 'lineno') -> tuple:
+        """
+        Handle tracemalloc snapshot diff request
+        
+        Args:
+            from_id: Baseline snapshot id
+            to_id: Later snapshot id (a new snapshot is taken if omitted)
+            limit: Number of allocation sites to return
+            group_by: 'lineno', 'filename' or 'traceback'
+            
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            if not from_id:
+                return {'error': 'Query parameter "from" is required'}, 400
+            
+            diff = self.memory.diff_snapshots(from_id, to_id, limit, group_by)
+            
+            if diff is None:
+                return {'error': 'Snapshot not found'}, 404
+            
+            return diff, 200
+            
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        except Exception as e:
+            return {'error': f'Server error: {str(e)}'}, 500
+    
+    def stop_tracing_handler(self) -> tuple:
+        """
+        Handle stop tracemalloc request
+        
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            self.memory.stop_tracing()
+            
+            return {
+                'success': True,
+                'message': 'tracemalloc stopped and snapshots cleared'
+            }, 200
+            
+        except Exception as e:
+            return {'error': f'Server error: {str(e)}'}, 500
+
+    
+    def workers_handler(self) -> tuple:
+        """
+        Handle worker status request
+        
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            table = workers.worker_table
+            
+            if table is None:
+                return {
+                    'mode': 'single-process',
+                    'served_by': os.getpid(),
+                    'workers': []
+                }, 200
+            
+            rows = table.rows(WORKER_TIMEOUT)
+            
+            return {
+                'mode': 'prefork',
+                'master_pid': table.master_pid,
+                'served_by': os.getpid(),
+                'total': len(rows),
+                'healthy': sum(1 for row in rows if row['status'] == 'healthy'),
+                'workers': rows
+            }, 200
+            
+        except Exception as e:
+            return {'error': f'Server error: {str(e)}'}, 500
+
+
+# Create singleton instance
+admin_handler = AdminRouteHandler()
@@ -0,0 +1,5 @@
+"""Dashboard routes package"""
+
+from .dashboard_routes_server import dashboard_handler
+
+__all__ = ['dashboard_handler']
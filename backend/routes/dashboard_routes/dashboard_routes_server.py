@@ -0,0 +1,95 @@
+"""
+Dashboard Route Handlers
+========================
+
+This module contains handler functions for the dashboard route, which
+returns everything a student page shows - profile and prediction - from a
+single store read.
+"""
+
+from typing import Optional
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from services.student_service.student_service_server import student_service_server
+from services.prediction_service.prediction_service_server import prediction_service_server
+from schemas.student_schema.student_schema import StudentSchema
+from schemas.student_schema.student_schema_server import StudentSchemaServer
+from schemas.prediction_schema.prediction_schema import PredictionSchema
+from schemas.prediction_schema.prediction_schema_server import PredictionSchemaServer
+from utils.admission import Overloaded
+
+
+class DashboardRouteHandler:
+    """Handler class for dashboard routes"""
+    
+    def __init__(self):
+        """Initialize handler with the shared services"""
+        self.student_service = student_service_server.service
+        self.prediction_server = prediction_service_server
+    
+    def get_dashboard_handler(self, roll_no: str, deadline: Optional[float] = None) -> tuple:
+        """
+        Handle dashboard request
+        
+        The student record is read once and used both for the profile and
+        for the prediction, which comes from the prediction cache when a
+        fresh entry exists.
+        
+        Args:
+            roll_no: Student roll number
+            deadline: Optional time.monotonic() by which a prediction that
+                misses the cache must be served
+            
+        Returns:
+            Tuple of (response_data, status_code)
+            
+        Raises:
+            Overloaded: The prediction was shed by admission control
+        """
+        try:
+            version = self.prediction_server.cache_version(self.student_service.data_version())
+            student = self.student_service.get_student_by_roll_no(roll_no)
+            
+            if student is None:
+                return {'error': 'Student not found'}, 404
+            
+            is_valid, error_msg = StudentSchema.validate(student)
+            if not is_valid:
+                return {'error': f'Invalid student data: {error_msg}'}, 500
+            
+            prediction = self.prediction_server.process_prediction_request(student, version, deadline)
+            
+            if prediction.get('error'):
+                return {
+                    'student': StudentSchemaServer.transform_for_api(student),
+                    'prediction': PredictionSchema.format_response(prediction)
+                }, 500
+            
+            enriched = PredictionSchemaServer.enrich_prediction_response(
+                PredictionSchema.format_response(prediction),
+                student
+            )
+            enriched['from_cache'] = prediction.get('from_cache', False)
+            enriched['timestamp'] = prediction.get('timestamp')
+            
+            return {
+                'student': StudentSchemaServer.transform_for_api(student),
+                'prediction': enriched
+            }, 200
+            
+        except Overloaded:
+            raise
+        except Exception as e:
+            import traceback
+            return {
+                'error': f'Dashboard failed: {str(e)}',
+                'traceback': traceback.format_exc()
+            }, 500
+
+
+# Create singleton instance
+dashboard_handler = DashboardRouteHandler()
@@ -0,0 +1,5 @@
+"""Health routes package"""
+
+from .health_routes_server import health_handler
+
+__all__ = ['health_handler']
@@ -0,0 +1,102 @@
+"""
+Health Route Handlers
+=====================
+
+This module contains handler functions for the health routes. Liveness
+and readiness are probed by orchestrators every second per worker, so
+they only read precomputed flags (utils.health.readiness); the full
+service status - model metadata, cache statistics - is served by the
+diagnostics handler, which is meant to be polled rarely.
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from services.student_service.student_service_server import student_service_server
+from services.prediction_service.prediction_service_server import prediction_service_server
+from services.startup_service.startup_service_server import startup_service_server
+from utils.health import readiness
+
+
+class HealthRouteHandler:
+    """Handler class for health routes"""
+    
+    def __init__(self):
+        """Initialize handler with the readiness state and the shared services"""
+        self.readiness = readiness
+        self.student_service = student_service_server.service
+        self.prediction_server = prediction_service_server
+        self.startup = startup_service_server.service
+    
+    def live_handler(self) -> tuple:
+        """
+        Handle liveness probe: the process is up and serving requests
+        
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        return {'status': 'alive'}, 200
+    
+    def ready_handler(self) -> tuple:
+        """
+        Handle readiness probe
+        
+        Returns:
+            Tuple of (response_data, status_code); 503 until every
+            component (model, student store, cache warm-up) is ready
+        """
+        checks = self.readiness.checks()
+        if self.readiness.is_ready():
+            return {'status': 'ready'}, 200
+        return {
+            'status': 'not_ready',
+            'waiting_for': [name for name, check in checks.items() if not check['ready']]
+        }, 503
+    
+    def health_handler(self) -> tuple:
+        """
+        Handle the original health check, now answered from the readiness flags
+        
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        model = self.readiness.checks().get('model')
+        return {
+            'status': 'healthy',
+            'message': 'Server is running',
+            'model_loaded': bool(model and model['ready']),
+            'ready': self.readiness.is_ready()
+        }, 200
+    
+    def diagnostics_handler(self) -> tuple:
+        """
+        Handle diagnostics request: full service status
+        
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            return {
+                'status': 'ready' if self.readiness.is_ready() else 'not_ready',
+                'pid': os.getpid(),
+                'uptime_seconds': self.readiness.uptime(),
+                'checks': self.readiness.checks(),
+                'startup': self.startup.stats(),
+                'service': self.prediction_server.get_service_status(),
+                'prediction_cache': self.prediction_server.get_cache_stats(),
+                'prefetch': self.prediction_server.prefetcher.stats(),
+                'student_store': {
+                    'path': self.student_service.db_path,
+                    'version': self.student_service.data_version(),
+                    'students': len(self.student_service.load_students().get('students', {}))
+                }
+            }, 200
+        except Exception as e:
+            return {'error': f'Server error: {str(e)}'}, 500
+
+
+# Create singleton instance
+health_handler = HealthRouteHandler()
@@ -0,0 +1,5 @@
+"""Job routes package"""
+
+from .job_routes_server import job_handler
+
+__all__ = ['job_handler']
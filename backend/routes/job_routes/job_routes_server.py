@@ -0,0 +1,150 @@
+"""
+Job Route Handlers
+==================
+
+This module contains handler functions for background job routes:
+submitting jobs, polling their progress, cancelling them and downloading
+their results.
+"""
+
+from typing import Iterator
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from services.job_service.job_service import ACTIVE_STATUSES, COMPLETED
+from services.job_service.job_service_server import job_service_server
+from schemas.job_schema import JobSchema
+
+# Bytes read from a result file per streamed chunk
+RESULT_CHUNK_SIZE = 64 * 1024
+
+
+class JobRouteHandler:
+    """Handler class for job routes"""
+    
+    def __init__(self):
+        """Initialize handler with the shared job service"""
+        self.service = job_service_server.service
+    
+    def submit_job_handler(self, payload) -> tuple:
+        """
+        Handle job submission
+        
+        Args:
+            payload: Parsed request body ({"type": ..., "params": {...}})
+            
+        Returns:
+            Tuple of (response_data, status_code); 202 with the queued job
+        """
+        try:
+            is_valid, error_message = JobSchema.validate_submit_request(payload, self.service.job_types)
+            if not is_valid:
+                return {'error': 'Invalid job request', 'message': error_message}, 400
+            
+            job = self.service.submit(payload['type'], payload.get('params', {}))
+            return job.describe(), 202
+            
+        except Exception as e:
+            return {'error': f'Server error: {str(e)}'}, 500
+    
+    def list_jobs_handler(self) -> tuple:
+        """
+        Handle list jobs request
+        
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            jobs = [job.describe() for job in self.service.list_jobs()]
+            return {
+                'total': len(jobs),
+                'job_types': self.service.job_types,
+                'jobs': jobs
+            }, 200
+            
+        except Exception as e:
+            return {'error': f'Server error: {str(e)}'}, 500
+    
+    def get_job_handler(self, job_id: str) -> tuple:
+        """
+        Handle job status request
+        
+        Args:
+            job_id: Job identifier
+            
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            job = self.service.get(job_id)
+            if job is None:
+                return {'error': 'Job not found', 'job_id': job_id}, 404
+            return job.describe(), 200
+            
+        except Exception as e:
+            return {'error': f'Server error: {str(e)}'}, 500
+    
+    def cancel_job_handler(self, job_id: str) -> tuple:
+        """
+        Handle job cancellation
+        
+        Args:
+            job_id: Job identifier
+            
+        Returns:
+            Tuple of (response_data, status_code); 202 while the job stops,
+            409 if it has already finished
+        """
+        try:
+            job = self.service.cancel(job_id)
+            if job is None:
+                return {'error': 'Job not found', 'job_id': job_id}, 404
+            if job.status not in ACTIVE_STATUSES:
+                return {
+                    'error': 'Job already finished',
+                    'message': f'Job {job_id} is {job.status}'
+                }, 409
+            return job.describe(), 202
+            
+        except Exception as e:
+            return {'error': f'Server error: {str(e)}'}, 500
+    
+    def job_result_handler(self, job_id: str) -> tuple:
+        """
+        Handle job result download
+        
+        Args:
+            job_id: Job identifier
+            
+        Returns:
+            Tuple of (response_data, status_code); on success response_data
+            is an iterator over the NDJSON result file
+        """
+        job = self.service.get(job_id)
+        if job is None:
+            return {'error': 'Job not found', 'job_id': job_id}, 404
+        if job.status != COMPLETED or not job.has_result_file or not os.path.exists(job.result_path):
+            return {
+                'error': 'No result file',
+                'message': f'Job {job_id} is {job.status}'
+                           + ('' if job.status != COMPLETED else ' and returns its result inline')
+            }, 409
+        
+        return _read_chunks(job.result_path), 200
+
+
+def _read_chunks(path: str) -> Iterator[bytes]:
+    """Yield a file in fixed-size chunks"""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(RESULT_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+# Create singleton instance
+job_handler = JobRouteHandler()
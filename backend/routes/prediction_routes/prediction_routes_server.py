@@ -7,45 +7,76 @@ These handlers process prediction requests and return responses.
 """
 
 from flask import jsonify, request
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Optional
 import sys
 import os
 
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from services.student_service.student_service import StudentService
-from services.prediction_service.prediction_service import PredictionService
+from services.student_service.student_service_server import student_service_server
+from services.prediction_service.prediction_service_server import prediction_service_server
 from schemas.prediction_schema.prediction_schema import PredictionSchema
+from schemas.prediction_schema.prediction_schema_server import BatchSummary, PredictionSchemaServer
+from config import BATCH_MAX_STUDENTS, EXPORT_CHUNK_SIZE
+from utils.admission import Overloaded, prediction_admission
+from utils.http_cache import Validators
+from utils.metrics import metrics
+from utils.response_cache import CachedResponse, ResponseCache
+from utils.serialization import json_encoder
+
+
+PREDICTION_STAGE_SECONDS = metrics.histogram(
+    'prediction_stage_seconds',
+    'Per-stage prediction latency for requests with timings enabled',
+    ['stage']
+)
 
 
 class PredictionRouteHandler:
     """Handler class for prediction routes"""
     
     def __init__(self):
-        """Initialize handler with services"""
-        self.student_service = StudentService()
-        self.prediction_service = PredictionService()
+        """Initialize handler with the shared services"""
+        self.student_service = student_service_server.service
+        self.prediction_service = prediction_service_server.service
+        self.prediction_server = prediction_service_server
+        self.response_cache = prediction_service_server.response_cache
     
-    def predict_dropout_handler(self, roll_no: str) -> tuple:
+    def predict_dropout_handler(self, roll_no: str, timer=None, deadline: Optional[float] = None) -> tuple:
         """
         Handle dropout prediction request
         
         Args:
             roll_no: Student roll number
+            timer: Optional StageTimer; when given, the prediction is made
+                afresh and per-stage timings are returned under
+                prediction_details.timings
+            deadline: Optional time.monotonic() by which a prediction that
+                misses the cache must be served
             
         Returns:
             Tuple of (response_data, status_code)
+            
+        Raises:
+            Overloaded: The prediction was shed by admission control
         """
         try:
             # Get student data
+            version = self.prediction_server.cache_version(self.student_service.data_version())
             student = self.student_service.get_student_by_roll_no(roll_no)
+            if timer is not None:
+                timer.mark('student_load')
             
             if student is None:
                 return {'error': 'Student not found'}, 404
             
-            # Make prediction
-            prediction = self.prediction_service.predict_dropout_risk(student)
+            # Make prediction (timed requests bypass the prediction cache)
+            if timer is None:
+                prediction = self.prediction_server.process_prediction_request(student, version, deadline)
+            else:
+                with prediction_admission.admit(deadline):
+                    prediction = self.prediction_service.predict_dropout_risk(student, timer)
             
             if prediction.get('error'):
                 return prediction, 500
@@ -53,8 +84,18 @@ class PredictionRouteHandler:
             # Format response
             formatted_response = PredictionSchema.format_response(prediction)
             
+            if timer is not None:
+                timer.mark('format_response')
+                timer.observe_into(PREDICTION_STAGE_SECONDS)
+                formatted_response['prediction_details'] = dict(
+                    formatted_response['prediction_details'],
+                    timings=timer.as_milliseconds()
+                )
+            
             return formatted_response, 200
             
+        except Overloaded:
+            raise
         except Exception as e:
             import traceback
             return {
@@ -62,6 +103,184 @@ class PredictionRouteHandler:
                 'traceback': traceback.format_exc()
             }, 500
     
+    def predict_response(self, roll_no: str, deadline: Optional[float] = None) -> CachedResponse:
+        """
+        Handle dropout prediction request, returning the encoded response
+        
+        Responses are cached as encoded bytes keyed by roll number, model
+        version and store version, and expire with the cached prediction
+        they were built from (or when another worker clears the cache), so a
+        hit skips formatting and encoding (and admission control).
+        
+        Args:
+            roll_no: Student roll number
+            deadline: Optional time.monotonic() by which a miss must be served
+            
+        Returns:
+            Encoded response with its status code
+            
+        Raises:
+            Overloaded: The prediction was shed by admission control
+        """
+        version = self.prediction_server.cache_version(self.student_service.data_version())
+        key = (roll_no, 'prediction', version)
+        self.prediction_server.sync_invalidations()
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        response_data, status_code = self.predict_dropout_handler(roll_no, deadline=deadline)
+        if status_code == 200:
+            return self.response_cache.put(key, response_data,
+                                           expires_at=self.prediction_server.get_cache_expiry(roll_no))
+        return ResponseCache.encode(response_data, status_code)
+    
+    def prediction_validators(self, roll_no: str) -> Optional[Validators]:
+        """
+        Get the HTTP cache validators for a student's prediction
+        
+        Predictions are deterministic for a given model and store version,
+        so conditional requests are answered without predicting (the
+        student is only checked for existence). HTTP caches may reuse the
+        response until the cached prediction expires, and serve it stale
+        while revalidating for as long as the server would.
+        
+        Returns:
+            Validators, or None if no model is loaded or the store cannot be loaded
+        """
+        data_version = self.student_service.data_version()
+        version = self.prediction_server.cache_version(data_version)
+        if data_version is None or version is None:
+            return None
+        
+        last_modified = max(self.student_service.modified_at(), self.prediction_service.model_modified_at())
+        cache_control = f'public, max-age={self.prediction_server.get_cache_max_age(roll_no)}'
+        stale_window = self.prediction_server.get_stale_window()
+        if stale_window:
+            cache_control += f', stale-while-revalidate={stale_window}'
+        return Validators(('prediction', roll_no, version), last_modified, cache_control,
+                          exists=self.student_service.get_student_by_roll_no(roll_no) is not None)
+    
+    def batch_predict_handler(self, payload, score=None) -> tuple:
+        """
+        Handle batch dropout prediction request
+        
+        Students are resolved with one store access, cached predictions are
+        reused and the rest are scored with a single model call.
+        
+        Args:
+            payload: Parsed request body, {"roll_nos": [...]} or
+                {"filter": {"course": ..., "year": ..., "roll_prefix": ...}}
+            score: Optional callable scoring a list of students (see
+                PredictionServiceServer.batch_predict)
+            
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            is_valid, message = PredictionSchema.validate_batch_request(payload, BATCH_MAX_STUDENTS)
+            if not is_valid:
+                return {'error': 'Invalid batch request', 'message': message}, 400
+            
+            version = self.prediction_server.cache_version(self.student_service.data_version())
+            not_found = []
+            if 'roll_nos' in payload:
+                roll_nos = list(dict.fromkeys(payload['roll_nos']))
+                found = self.student_service.get_students_by_roll_nos(roll_nos)
+                students = [found[roll_no] for roll_no in roll_nos if roll_no in found]
+                not_found = [roll_no for roll_no in roll_nos if roll_no not in found]
+            else:
+                students = self.student_service.filter_students(payload['filter'])
+                if len(students) > BATCH_MAX_STUDENTS:
+                    return {
+                        'error': 'Invalid batch request',
+                        'message': f'Filter matches {len(students)} students; at most {BATCH_MAX_STUDENTS} per batch'
+                    }, 400
+            
+            results = []
+            predictions = []
+            for outcome in self.prediction_server.batch_predict(students, score, version):
+                record = PredictionSchemaServer.format_batch_result(outcome)
+                if record['success']:
+                    predictions.append(record['prediction'])
+                results.append(record)
+            
+            response = {
+                'count': len(results),
+                'results': results,
+                'not_found': not_found,
+                'summary': PredictionSchemaServer.aggregate_batch_predictions(predictions)
+            }
+            
+            if results and not predictions:
+                return response, 500
+            return response, 200
+            
+        except Exception as e:
+            import traceback
+            return {
+                'error': f'Batch prediction failed: {str(e)}',
+                'traceback': traceback.format_exc()
+            }, 500
+    
+    def export_predictions_handler(self, filters: Optional[Dict] = None,
+                                   chunk_size: Optional[int] = None, score=None) -> tuple:
+        """
+        Handle streaming export request
+        
+        Args:
+            filters: Optional filter (course, year, roll_prefix); None
+                exports every student
+            chunk_size: Students scored per model call
+            score: Optional callable scoring a list of students
+            
+        Returns:
+            Tuple of (response_data, status_code); on success response_data
+            is an iterator of NDJSON lines, one chunk of students at a time
+        """
+        filters = {key: value for key, value in (filters or {}).items() if value not in (None, '')}
+        unknown = set(filters) - {'course', 'year', 'roll_prefix'}
+        if unknown:
+            return {
+                'error': 'Invalid export request',
+                'message': f"Unknown filter keys: {', '.join(sorted(unknown))}"
+            }, 400
+        
+        chunk_size = EXPORT_CHUNK_SIZE if chunk_size is None else chunk_size
+        if not 1 <= chunk_size <= BATCH_MAX_STUDENTS:
+            return {
+                'error': 'Invalid export request',
+                'message': f'chunk_size must be between 1 and {BATCH_MAX_STUDENTS}'
+            }, 400
+        
+        return self._export_lines(filters, chunk_size, score), 200
+    
+    def _export_lines(self, filters: Dict, chunk_size: int, score=None) -> Iterator[bytes]:
+        """
+        Yield NDJSON for an export: a "result" line per student, emitted a
+        chunk at a time, then a "summary" line (or an "error" line if
+        scoring fails part way)
+        """
+        summary = BatchSummary()
+        count = 0
+        
+        try:
+            students = self.student_service.iter_students(filters)
+            for results in self.prediction_server.stream_predictions(students, chunk_size, score):
+                lines = []
+                for outcome in results:
+                    record = PredictionSchemaServer.format_batch_result(outcome)
+                    if record['success']:
+                        summary.add(record['prediction'])
+                    lines.append(_ndjson_line(dict(type='result', **record)))
+                count += len(results)
+                yield b''.join(lines)
+        except Exception as e:
+            yield _ndjson_line({'type': 'error', 'message': f'Export failed: {str(e)}', 'count': count})
+            return
+        
+        yield _ndjson_line({'type': 'summary', 'count': count, 'summary': summary.as_dict()})
+    
     def get_model_info_handler(self) -> tuple:
         """
         Handle model info request
@@ -77,5 +296,10 @@ class PredictionRouteHandler:
             return {'error': f'Server error: {str(e)}'}, 500
 
 
+def _ndjson_line(record: Dict) -> bytes:
+    """Serialize one NDJSON record"""
+    return json_encoder.dumps_line(record)
+
+
 # Create singleton instance
 prediction_handler = PredictionRouteHandler()
@@ -7,23 +7,29 @@ These handlers process requests and return responses.
 """
 
 from flask import jsonify, request
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import sys
 import os
 
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from services.student_service.student_service import StudentService
+from services.student_service.student_service_server import student_service_server
+from services.prediction_service.prediction_service_server import prediction_service_server
+from config import PREFETCH_PREDICTIONS
 from schemas.student_schema.student_schema import StudentSchema
+from utils.http_cache import Validators
+from utils.response_cache import CachedResponse, ResponseCache
 
 
 class StudentRouteHandler:
     """Handler class for student routes"""
     
     def __init__(self):
-        """Initialize handler with service"""
-        self.service = StudentService()
+        """Initialize handler with the shared student service"""
+        self.service = student_service_server.service
+        self.response_cache = student_service_server.response_cache
+        self.prediction_server = prediction_service_server
     
     def get_student_handler(self, roll_no: str) -> tuple:
         """
@@ -51,6 +57,82 @@ class StudentRouteHandler:
         except Exception as e:
             return {'error': f'Server error: {str(e)}'}, 500
     
+    def get_student_response(self, roll_no: str) -> CachedResponse:
+        """
+        Handle get student request, returning the encoded response
+        
+        Found students are cached as encoded bytes keyed by the store
+        version, so repeat requests skip validation and encoding.
+        
+        Args:
+            roll_no: Student roll number
+            
+        Returns:
+            Encoded response with its status code
+        """
+        key = (roll_no, 'student', self.service.data_version())
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        response_data, status_code = self.get_student_handler(roll_no)
+        if status_code == 200:
+            return self.response_cache.put(key, response_data)
+        return ResponseCache.encode(response_data, status_code)
+    
+    def prefetch_prediction(self, roll_no: str) -> Optional[str]:
+        """
+        Queue a background prediction for a viewed student
+        
+        The UI asks for the prediction right after the profile, so it is
+        usually cached by the time that request arrives. Prefetching is
+        best-effort and never delays the student response: it is skipped
+        until the model has loaded, and never starts loading it.
+        
+        Args:
+            roll_no: Student roll number
+            
+        Returns:
+            Prefetch outcome, or None if prefetching is disabled, the model
+            is not loaded yet or the student does not exist
+        """
+        if not PREFETCH_PREDICTIONS or not self.prediction_server.service.predictor.is_loaded:
+            return None
+        version = self.prediction_server.cache_version(self.service.data_version())
+        student = self.service.get_student_by_roll_no(roll_no)
+        if version is None or student is None:
+            return None
+        return self.prediction_server.prefetch(student, version)
+    
+    def student_validators(self, roll_no: str) -> Optional[Validators]:
+        """
+        Get the HTTP cache validators for a student record
+        
+        Derived from the store version, so conditional requests are
+        answered without building the response; the student is only
+        checked for existence (an unknown roll number is never a 304).
+        
+        Returns:
+            Validators, or None if the store cannot be loaded
+        """
+        data_version = self.service.data_version()
+        if data_version is None:
+            return None
+        return Validators(('student', roll_no, data_version), last_modified=self.service.modified_at(),
+                          exists=self.service.get_student_by_roll_no(roll_no) is not None)
+    
+    def students_validators(self, search_query: Optional[str] = None) -> Optional[Validators]:
+        """
+        Get the HTTP cache validators for the student list or a search
+        
+        Returns:
+            Validators, or None if the store cannot be loaded
+        """
+        data_version = self.service.data_version()
+        if data_version is None:
+            return None
+        return Validators(('students', search_query or '', data_version), last_modified=self.service.modified_at())
+    
     def list_students_handler(self) -> tuple:
         """
         Handle list students request
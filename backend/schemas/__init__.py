@@ -7,5 +7,6 @@ This package contains data validation schemas for the application.
 
 from .student_schema import StudentSchema
 from .prediction_schema import PredictionSchema
+from .job_schema import JobSchema
 
-__all__ = ['StudentSchema', 'PredictionSchema']
+__all__ = ['StudentSchema', 'PredictionSchema', 'JobSchema']
@@ -0,0 +1,5 @@
+"""Job schema package"""
+
+from .job_schema import JobSchema
+
+__all__ = ['JobSchema']
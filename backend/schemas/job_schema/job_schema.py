@@ -0,0 +1,50 @@
+"""
+Job Schema Module
+=================
+
+This module defines data schemas for background job requests.
+"""
+
+from typing import Any, Iterable
+
+
+class JobSchema:
+    """Schema for background job request validation"""
+    
+    FILTER_KEYS = {'course', 'year', 'roll_prefix'}
+    
+    @staticmethod
+    def validate_submit_request(data: Any, job_types: Iterable[str]) -> tuple[bool, str]:
+        """
+        Validate a job submission
+        
+        The body names the job type and optional parameters, e.g.
+        {"type": "score_cohort", "params": {"filter": {"year": 2}}}.
+        
+        Args:
+            data: Parsed request body
+            job_types: Registered job types
+            
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        if not isinstance(data, dict):
+            return False, "Request body must be a JSON object"
+        
+        job_types = sorted(job_types)
+        if data.get('type') not in job_types:
+            return False, f"'type' must be one of: {', '.join(job_types)}"
+        
+        params = data.get('params', {})
+        if not isinstance(params, dict):
+            return False, "'params' must be an object"
+        
+        filters = params.get('filter')
+        if filters is not None:
+            if not isinstance(filters, dict):
+                return False, "'filter' must be an object"
+            unknown = set(filters) - JobSchema.FILTER_KEYS
+            if unknown:
+                return False, f"Unknown filter keys: {', '.join(sorted(unknown))}"
+        
+        return True, ""
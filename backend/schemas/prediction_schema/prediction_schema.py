@@ -84,3 +84,46 @@ class PredictionSchema:
         # For now, we just need student data
         # More validation can be added as needed
         return True, ""
+    
+    @staticmethod
+    def validate_batch_request(data: Any, max_students: int) -> tuple[bool, str]:
+        """
+        Validate a batch prediction request
+        
+        The body must name the students either as a list of roll numbers
+        ({"roll_nos": [...]}) or as a filter ({"filter": {"course": ...,
+        "year": ..., "roll_prefix": ...}}).
+        
+        Args:
+            data: Parsed request body
+            max_students: Largest number of roll numbers accepted
+            
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        if not isinstance(data, dict):
+            return False, "Request body must be a JSON object"
+        
+        roll_nos = data.get('roll_nos')
+        filters = data.get('filter')
+        
+        if (roll_nos is None) == (filters is None):
+            return False, "Provide exactly one of 'roll_nos' or 'filter'"
+        
+        if roll_nos is not None:
+            if not isinstance(roll_nos, list) or not all(isinstance(r, str) and r for r in roll_nos):
+                return False, "'roll_nos' must be a list of roll number strings"
+            if not roll_nos:
+                return False, "'roll_nos' must not be empty"
+            if len(roll_nos) > max_students:
+                return False, f"At most {max_students} roll numbers per batch"
+            return True, ""
+        
+        allowed = {'course', 'year', 'roll_prefix'}
+        if not isinstance(filters, dict) or not filters:
+            return False, "'filter' must be a non-empty object"
+        unknown = set(filters) - allowed
+        if unknown:
+            return False, f"Unknown filter keys: {', '.join(sorted(unknown))}"
+        
+        return True, ""
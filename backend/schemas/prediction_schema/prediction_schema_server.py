@@ -177,6 +177,24 @@ class PredictionSchemaServer:
         }
         return emojis.get(risk_level, '⚪')
     
+    @staticmethod
+    def format_batch_result(outcome: Dict[str, Any]) -> Dict[str, Any]:
+        """Format one batch_predict / stream_predictions result for the API"""
+        prediction = outcome['prediction']
+        if not outcome['success']:
+            return {
+                'roll_no': outcome['roll_no'],
+                'success': False,
+                'error': prediction.get('message', 'Prediction failed')
+            }
+        
+        return {
+            'roll_no': outcome['roll_no'],
+            'success': True,
+            'from_cache': prediction.get('from_cache', False),
+            'prediction': PredictionSchema.format_response(prediction)
+        }
+    
     @staticmethod
     def aggregate_batch_predictions(predictions: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -188,24 +206,56 @@ class PredictionSchemaServer:
         Returns:
             Aggregated statistics
         """
-        total = len(predictions)
-        high_risk = sum(1 for p in predictions if p.get('risk_level') == 'HIGH')
-        medium_risk = sum(1 for p in predictions if p.get('risk_level') == 'MEDIUM')
-        low_risk = sum(1 for p in predictions if p.get('risk_level') == 'LOW')
-        
-        avg_risk = sum(p.get('risk_percentage', 0) for p in predictions) / total if total > 0 else 0
+        summary = BatchSummary()
+        for prediction in predictions:
+            summary.add(prediction)
+        return summary.as_dict()
+
+
+class BatchSummary:
+    """
+    Running risk statistics for a stream of predictions
+    
+    Keeps only counters, so summarizing a cohort of any size takes constant
+    memory. as_dict() has the same shape as aggregate_batch_predictions.
+    """
+    
+    def __init__(self):
+        """Initialize empty counters"""
+        self.total = 0
+        self.high = 0
+        self.medium = 0
+        self.low = 0
+        self.risk_sum = 0
+    
+    def add(self, prediction: Dict[str, Any]):
+        """Count one prediction result"""
+        self.total += 1
+        risk_level = prediction.get('risk_level')
+        if risk_level == 'HIGH':
+            self.high += 1
+        elif risk_level == 'MEDIUM':
+            self.medium += 1
+        elif risk_level == 'LOW':
+            self.low += 1
+        self.risk_sum += prediction.get('risk_percentage', 0)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Aggregated statistics for the predictions counted so far"""
+        total = self.total
+        avg_risk = self.risk_sum / total if total > 0 else 0
         
         return {
             'total_predictions': total,
             'risk_distribution': {
-                'high': high_risk,
-                'medium': medium_risk,
-                'low': low_risk
+                'high': self.high,
+                'medium': self.medium,
+                'low': self.low
             },
             'risk_percentages': {
-                'high': round((high_risk / total * 100), 1) if total > 0 else 0,
-                'medium': round((medium_risk / total * 100), 1) if total > 0 else 0,
-                'low': round((low_risk / total * 100), 1) if total > 0 else 0
+                'high': round((self.high / total * 100), 1) if total > 0 else 0,
+                'medium': round((self.medium / total * 100), 1) if total > 0 else 0,
+                'low': round((self.low / total * 100), 1) if total > 0 else 0
             },
             'average_risk_percentage': round(avg_risk, 1)
         }
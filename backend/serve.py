@@ -0,0 +1,616 @@
+"""
+Student Dropout Risk Prediction System - Production Server
+==========================================================
+
+Pre-fork production entry point. The master process imports the Flask app
+once - loading the ML model and the student store - and then forks worker
+processes that share those pages copy-on-write. Every worker serves the
+shared listening socket with a fixed-size pool of request threads.
+
+Usage:
+    python serve.py
+    python serve.py --workers 4 --threads 8 --port 8000
+
+Signals (sent to the master):
+    SIGTERM, SIGINT  - graceful shutdown (in-flight requests are finished)
+    SIGHUP           - graceful restart: reload the model and student store in
+                       the master, start a new generation of workers, then
+                       retire the old one
+
+Worker health is reported at GET /api/admin/workers. Each worker keeps its
+own metrics registry, so /api/metrics describes the worker that served it.
+Predictions are shared between workers through a shared memory table the
+master creates before forking (PREDICTION_SHARED_CACHE_SLOTS).
+
+Requires os.fork (Linux/macOS). On Windows, use `python server.py`.
+"""
+
+import argparse
+import collections
+import gc
+import os
+import random
+import selectors
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+from config import (
+    GRACEFUL_TIMEOUT,
+    HOST,
+    PORT,
+    PREDICTION_SHARED_CACHE_RECORD_BYTES,
+    PREDICTION_SHARED_CACHE_SLOTS,
+    SERVE_KEEPALIVE,
+    SERVE_THREADS,
+    SERVE_WORKERS,
+    STARTUP_WARMUP_INFERENCE,
+    WORKER_TIMEOUT,
+)
+from utils import workers
+from utils.shared_cache import SharedCache
+from utils.workers import WorkerStatusMiddleware, WorkerStatusTable
+
+
+# ============================================================================
+# WORKER HTTP SERVER
+# ============================================================================
+
+class KeepAliveRequestHandler(WSGIRequestHandler):
+    """
+    Request handler that serves one request per dispatch
+
+    Instead of holding a pool thread for the lifetime of a keep-alive
+    connection, the connection is handed back to the server once the
+    response is sent and dispatched again when the next request arrives.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def handle(self):
+        """Handle the request(s) available on the connection, then park it"""
+        self.close_connection = True
+        while True:
+            try:
+                self.handle_one_request()
+            except (ConnectionError, socket.timeout) as e:
+                self.connection_dropped(e)
+                self.close_connection = True
+
+            if self.close_connection or self.server.shutting_down:
+                self.close_connection = True
+                return
+            if not self._request_pending():
+                return
+
+    def _request_pending(self) -> bool:
+        """Whether the client already sent (pipelined) its next request"""
+        self.connection.setblocking(False)
+        try:
+            return bool(self.rfile.peek(1))
+        except (BlockingIOError, OSError):
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def log_request(self, code='-', size='-'):
+        """Access logging is off unless requested"""
+        if self.server.access_log:
+            super().log_request(code, size)
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """
+    WSGI server that serves a shared listening socket with a thread pool
+
+    New connections are only accepted while a pool thread is free, so a busy
+    worker leaves them in the kernel backlog for an idle sibling. Idle
+    keep-alive connections wait in a selector, not in a thread.
+    """
+
+    multithread = True
+    multiprocess = True
+
+    def __init__(self, host: str, port: int, app, threads: int = 8, fd: int = None,
+                 keepalive: float = 5.0, access_log: bool = False, status_slot: int = None):
+        """
+        Initialize server
+
+        Args:
+            host: Interface the listening socket is bound to
+            port: Port the listening socket is bound to
+            app: WSGI application
+            threads: Number of request threads
+            fd: Already bound and listening socket inherited from the master
+            keepalive: Seconds an idle keep-alive connection is kept open
+            access_log: Log every request
+            status_slot: Row of this worker in the shared status table
+        """
+        super().__init__(host, port, app, handler=KeepAliveRequestHandler, fd=fd)
+        self.socket.setblocking(False)
+        self.threads = threads
+        self.keepalive = keepalive
+        self.access_log = access_log
+        self.status_slot = status_slot
+        self.shutting_down = False
+
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='http-worker')
+        self._busy = 0
+        self._lock = threading.Lock()
+        self._parked = collections.deque()
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+
+    # ------------------------------------------------------------------
+    # Serve loop
+    # ------------------------------------------------------------------
+
+    def serve_forever(self, poll_interval: float = 0.5):
+        """Accept and dispatch connections until shutdown is requested"""
+        selector = selectors.DefaultSelector()
+        selector.register(self._wakeup_r, selectors.EVENT_READ, 'wakeup')
+        listening = False
+        idle = {}  # connection -> (client_address, parked_at)
+
+        try:
+            while not self.shutting_down:
+                with self._lock:
+                    can_accept = self._busy < self.threads
+                if can_accept and not listening:
+                    selector.register(self.socket, selectors.EVENT_READ, 'listen')
+                    listening = True
+                elif not can_accept and listening:
+                    selector.unregister(self.socket)
+                    listening = False
+
+                for key, _ in selector.select(poll_interval):
+                    if key.data == 'wakeup':
+                        self._drain_wakeup()
+                    elif key.data == 'listen':
+                        self._accept()
+                    else:
+                        selector.unregister(key.fileobj)
+                        client_address, _ = idle.pop(key.fileobj)
+                        self._dispatch(key.fileobj, client_address)
+
+                while self._parked:
+                    connection, client_address = self._parked.popleft()
+                    idle[connection] = (client_address, time.monotonic())
+                    selector.register(connection, selectors.EVENT_READ, 'idle')
+
+                expired = [c for c, (_, parked_at) in idle.items()
+                           if time.monotonic() - parked_at > self.keepalive]
+                for connection in expired:
+                    selector.unregister(connection)
+                    del idle[connection]
+                    self.shutdown_request(connection)
+
+                self._report(len(idle))
+        finally:
+            selector.close()
+            self._drain(idle)
+
+    def request_shutdown(self):
+        """Stop accepting connections; safe to call from a signal handler"""
+        self.shutting_down = True
+        self._wake()
+
+    def _accept(self):
+        """Accept one connection if another worker did not take it first"""
+        try:
+            connection, client_address = self.socket.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            return
+        connection.setblocking(True)
+        self._dispatch(connection, client_address)
+
+    def _dispatch(self, connection, client_address):
+        """Hand a readable connection to the thread pool"""
+        with self._lock:
+            self._busy += 1
+        self._executor.submit(self._process, connection, client_address)
+
+    def _process(self, connection, client_address):
+        """Serve a connection in a pool thread"""
+        keep_alive = False
+        try:
+            handler = self.RequestHandlerClass(connection, client_address, self)
+            keep_alive = not handler.close_connection
+        except Exception:
+            self.handle_error(connection, client_address)
+        finally:
+            if keep_alive and not self.shutting_down:
+                self._parked.append((connection, client_address))
+            else:
+                self.shutdown_request(connection)
+            with self._lock:
+                self._busy -= 1
+            self._wake()
+
+    def _wake(self):
+        """Interrupt the selector"""
+        try:
+            self._wakeup_w.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass
+
+    def _drain_wakeup(self):
+        """Consume wakeup bytes"""
+        try:
+            while self._wakeup_r.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _report(self, idle_connections: int):
+        """Publish the heartbeat to the shared status table"""
+        table = workers.worker_table
+        if table is not None and self.status_slot is not None:
+            table.heartbeat(self.status_slot)
+            table.set(self.status_slot, 'connections_idle', idle_connections)
+
+    def _drain(self, idle: dict):
+        """Finish in-flight requests and close idle connections"""
+        for connection in idle:
+            self.shutdown_request(connection)
+        self._executor.shutdown(wait=True)
+        while self._parked:
+            connection, _ = self._parked.popleft()
+            self.shutdown_request(connection)
+        self._wakeup_r.close()
+        self._wakeup_w.close()
+        self.server_close()
+
+
+# ============================================================================
+# MASTER PROCESS
+# ============================================================================
+
+def log(message: str):
+    """Print a master/worker log line"""
+    print(f"[{os.getpid()}] {message}", flush=True)
+
+
+def create_listener(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Bind the listening socket shared by all workers"""
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    listener = socket.socket(family, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((host, port))
+    listener.listen(backlog)
+    listener.set_inheritable(True)
+    return listener
+
+
+class Master:
+    """Pre-forks workers, supervises them and handles restarts"""
+
+    def __init__(self, host: str, port: int, workers_count: int, threads: int,
+                 keepalive: float, worker_timeout: float, graceful_timeout: float,
+                 access_log: bool = False):
+        """
+        Initialize master
+
+        Args:
+            host: Interface to bind
+            port: Port to bind
+            workers_count: Number of worker processes
+            threads: Request threads per worker
+            keepalive: Idle keep-alive timeout in seconds
+            worker_timeout: Heartbeat age after which a worker is killed
+            graceful_timeout: Seconds a stopping worker may take to finish requests
+            access_log: Log every request
+        """
+        self.host = host
+        self.port = port
+        self.workers_count = workers_count
+        self.threads = threads
+        self.keepalive = keepalive
+        self.worker_timeout = worker_timeout
+        self.graceful_timeout = graceful_timeout
+        self.access_log = access_log
+
+        self.app = None
+        self.listener = None
+        self.table = None
+        self.generation = 0
+        self.children = {}   # pid -> (slot, generation)
+        self.retiring = {}   # pid -> SIGTERM deadline
+        self.stopping = False
+        self._signals = collections.deque()
+        self._wakeup_r = self._wakeup_w = None
+        self.shared_cache = None
+
+    # ------------------------------------------------------------------
+    # Startup
+    # ------------------------------------------------------------------
+
+    def preload(self):
+        """Import the app, loading the model and student store into the master"""
+        start = time.perf_counter()
+        import server
+        # Workers inherit the loaded model, store and warmed cache; no thread
+        # may be running at fork, so the warm-up must finish here
+        server.startup_service_server.finish()
+        self.app = server.app
+        log(f"✅ Application preloaded in {time.perf_counter() - start:.2f}s")
+
+    def reload(self):
+        """Refresh the model and student store before forking a new generation"""
+        import server
+        server.prediction_service_server.service.load_model()
+        server.prediction_service_server.clear_cache(persistent=False)
+        server.student_service_server.service.load_students()
+        log("🔄 Model and student store reloaded")
+
+    def run(self) -> int:
+        """Run the master until shutdown"""
+        self.preload()
+        self.listener = create_listener(self.host, self.port)
+
+        # Slots for two overlapping generations during a graceful restart
+        self.table = WorkerStatusTable(slots=self.workers_count * 2)
+        workers.worker_table = self.table
+        self.app.wsgi_app = WorkerStatusMiddleware(self.app.wsgi_app)
+
+        # One prediction cache for every worker (and generation) on the host
+        if PREDICTION_SHARED_CACHE_SLOTS > 0:
+            import server
+            self.shared_cache = SharedCache('predictions', PREDICTION_SHARED_CACHE_SLOTS,
+                                            PREDICTION_SHARED_CACHE_RECORD_BYTES)
+            server.prediction_service_server.attach_shared_cache(self.shared_cache)
+            log(f"🧠 Shared prediction cache: {self.shared_cache.slots} slots "
+                f"({self.shared_cache.size_bytes / 2**20:.1f} MiB)")
+
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_r, False)
+        os.set_blocking(self._wakeup_w, False)
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGCHLD):
+            signal.signal(signum, self._on_signal)
+
+        # Keep preloaded objects out of the collector so workers don't
+        # touch (and copy) their pages during garbage collection
+        gc.collect()
+        gc.freeze()
+
+        log(f"🌐 Serving on http://{self.host}:{self.port} with "
+            f"{self.workers_count} workers x {self.threads} threads")
+        self.generation = 1
+        for _ in range(self.workers_count):
+            self.spawn_worker()
+
+        while not self.stopping:
+            self._wait_for_event(1.0)
+            self._handle_signals()
+            self._reap()
+            self._check_workers()
+
+        self._shutdown()
+        return 0
+
+    # ------------------------------------------------------------------
+    # Worker lifecycle
+    # ------------------------------------------------------------------
+
+    def spawn_worker(self):
+        """Fork one worker of the current generation"""
+        slot = self.table.claim(0, self.generation, self.threads)
+        if slot is None:
+            log("⚠️  Worker status table is full; not spawning")
+            return
+
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                self._worker_main(slot)
+            except BaseException as e:
+                log(f"❌ Worker crashed: {e}")
+                code = 1
+            finally:
+                os._exit(code)
+
+        self.table.set(slot, 'pid', pid)
+        self.children[pid] = (slot, self.generation)
+
+    def _worker_main(self, slot: int):
+        """Body of a worker process"""
+        for signum in (signal.SIGINT, signal.SIGHUP):
+            signal.signal(signum, signal.SIG_IGN)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        os.close(self._wakeup_r)
+        os.close(self._wakeup_w)
+        random.seed()
+
+        workers.worker_slot = slot
+        self.table.set(slot, 'pid', os.getpid())
+
+        if STARTUP_WARMUP_INFERENCE:
+            # Fault in this process's copy-on-write pages of the model
+            # before taking requests, not during the first one
+            import server
+            server.startup_service_server.warm_inference()
+
+        http_server = PooledWSGIServer(
+            self.host, self.port, self.app, threads=self.threads, fd=self.listener.fileno(),
+            keepalive=self.keepalive, access_log=self.access_log, status_slot=slot
+        )
+        signal.signal(signal.SIGTERM, lambda signum, frame: http_server.request_shutdown())
+        log(f"👷 Worker started (slot {slot}, generation {self.generation})")
+        http_server.serve_forever()
+
+        # Background jobs run on this worker's threads and die with it;
+        # stop them so none is left reported as running
+        from services.job_service.job_service_server import job_service_server
+        job_service_server.service.shutdown()
+
+    def _reap(self):
+        """Collect exited workers and replace unexpected exits"""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+            slot, generation = self.children.pop(pid, (None, None))
+            if slot is None:
+                continue
+            self.table.release(slot)
+            expected = self.retiring.pop(pid, None) is not None or self.stopping
+
+            if not expected:
+                log(f"⚠️  Worker {pid} exited unexpectedly (status {status}); respawning")
+                time.sleep(0.1)
+                if generation == self.generation:
+                    self.spawn_worker()
+
+    def _check_workers(self):
+        """Kill unresponsive workers and retiring workers past their deadline"""
+        now = time.monotonic()
+        for pid, deadline in list(self.retiring.items()):
+            if now > deadline:
+                log(f"⏱  Worker {pid} did not stop in {self.graceful_timeout}s; killing")
+                self._kill(pid, signal.SIGKILL)
+
+        for pid, (slot, _) in list(self.children.items()):
+            if pid in self.retiring:
+                continue
+            age = self.table.heartbeat_age(slot)
+            if age is not None and age > self.worker_timeout:
+                log(f"⏱  Worker {pid} missed heartbeats for {age:.0f}s; killing")
+                self._kill(pid, signal.SIGKILL)
+
+    def retire(self, pids):
+        """Ask workers to finish in-flight requests and exit"""
+        deadline = time.monotonic() + self.graceful_timeout
+        for pid in pids:
+            self.retiring[pid] = deadline
+            self._kill(pid, signal.SIGTERM)
+
+    def graceful_restart(self):
+        """Start a new generation, wait until it serves, then retire the old one"""
+        log("🔁 Graceful restart")
+        try:
+            self.reload()
+        except Exception as e:
+            log(f"❌ Reload failed, keeping current workers: {e}")
+            return
+
+        gc.collect()
+        gc.freeze()
+
+        old = [pid for pid, (_, generation) in self.children.items() if generation == self.generation]
+        self.generation += 1
+        for _ in range(self.workers_count):
+            self.spawn_worker()
+
+        # Wait (bounded) until the new workers report a heartbeat
+        new_slots = [slot for slot, generation in self.children.values() if generation == self.generation]
+        deadline = time.monotonic() + self.graceful_timeout
+        while time.monotonic() < deadline:
+            if all(self.table.heartbeat_age(slot) is not None for slot in new_slots):
+                break
+            time.sleep(0.05)
+
+        self.retire(old)
+
+    # ------------------------------------------------------------------
+    # Signals and shutdown
+    # ------------------------------------------------------------------
+
+    def _on_signal(self, signum, frame):
+        """Queue a signal for the main loop"""
+        self._signals.append(signum)
+        try:
+            os.write(self._wakeup_w, b'\0')
+        except OSError:
+            pass
+
+    def _wait_for_event(self, timeout: float):
+        """Sleep until a signal arrives or the timeout passes"""
+        with selectors.DefaultSelector() as selector:
+            selector.register(self._wakeup_r, selectors.EVENT_READ)
+            selector.select(timeout)
+        try:
+            while os.read(self._wakeup_r, 4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _handle_signals(self):
+        """Act on queued signals"""
+        while self._signals:
+            signum = self._signals.popleft()
+            if signum in (signal.SIGTERM, signal.SIGINT):
+                log("🛑 Shutting down")
+                self.stopping = True
+            elif signum == signal.SIGHUP:
+                self.graceful_restart()
+
+    def _shutdown(self):
+        """Stop all workers, waiting up to the graceful timeout"""
+        self.retire(list(self.children))
+        while self.children:
+            self._reap()
+            self._check_workers()
+            time.sleep(0.05)
+        self.listener.close()
+        if self.shared_cache is not None:
+            self.shared_cache.close(unlink=True)
+        log("👋 Stopped")
+
+    def _kill(self, pid: int, signum: int):
+        """Send a signal to a worker that may already have exited"""
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv=None) -> int:
+    """Start the production server"""
+    parser = argparse.ArgumentParser(description='Pre-fork production server')
+    parser.add_argument('--host', default=HOST, help='interface to bind')
+    parser.add_argument('--port', type=int, default=PORT, help='port to bind')
+    parser.add_argument('--workers', type=int, default=SERVE_WORKERS, help='worker processes')
+    parser.add_argument('--threads', type=int, default=SERVE_THREADS, help='request threads per worker')
+    parser.add_argument('--keepalive', type=float, default=SERVE_KEEPALIVE,
+                        help='seconds an idle keep-alive connection is kept open')
+    parser.add_argument('--worker-timeout', type=float, default=WORKER_TIMEOUT,
+                        help='kill workers whose heartbeat is older than this many seconds')
+    parser.add_argument('--graceful-timeout', type=float, default=GRACEFUL_TIMEOUT,
+                        help='seconds stopping workers get to finish in-flight requests')
+    parser.add_argument('--access-log', action='store_true', help='log every request')
+    args = parser.parse_args(argv)
+
+    if not hasattr(os, 'fork'):
+        print("❌ serve.py requires os.fork, which this platform does not provide.")
+        print("   Use `python server.py` instead.")
+        return 1
+
+    master = Master(
+        args.host, args.port, max(args.workers, 1), max(args.threads, 1),
+        args.keepalive, args.worker_timeout, args.graceful_timeout, args.access_log
+    )
+    return master.run()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
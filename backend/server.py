@@ -7,16 +7,35 @@ Student Dropout Risk Prediction System.
 
 Endpoints:
     GET  /api/health              - Health check
+    GET  /api/live                - Liveness probe
+    GET  /api/ready               - Readiness probe (503 until loaded and warm)
+    GET  /api/diagnostics         - Full service status (model, caches, store)
     GET  /api/student/<roll_no>   - Get student data
-    POST /api/predict/<roll_no>   - Get dropout prediction
+    GET  /api/predict/<roll_no>   - Get dropout prediction (also POST)
+    POST /api/predict/batch       - Dropout predictions for many students
+    GET  /api/predict/export      - Stream predictions for a cohort as NDJSON
     GET  /api/students            - List all students
+    GET  /api/dashboard/<roll_no> - Student profile and prediction in one call
+    POST /api/jobs                - Submit a background job (also GET to list)
+    GET  /api/jobs/<job_id>       - Job progress, throughput and ETA (DELETE cancels)
+    GET  /api/jobs/<job_id>/result - Download a finished job's NDJSON result
+    GET  /api/metrics             - Prometheus metrics
+    GET  /api/admin/profiles      - Retained request profiles (admin)
+    GET  /api/admin/memory        - Per-component memory report (admin)
+    GET  /api/admin/workers       - Per-worker health (admin)
+
+Production serving (pre-fork workers): python serve.py
+asyncio variant of the same routes:     python asgi.py
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, make_response, request
 from flask_cors import CORS
+import hmac
 import json
 import os
 import sys
+import time
+from typing import Callable, Optional
 
 # Add the backend directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -26,10 +45,22 @@ from routes.student_routes.student_routes_server import student_handler
 from routes.prediction_routes.prediction_routes_server import prediction_handler
 from services.student_service.student_service_server import student_service_server
 from services.prediction_service.prediction_service_server import prediction_service_server
-from config import CORS_ORIGINS
+from routes.admin_routes.admin_routes_server import admin_handler
+from routes.dashboard_routes.dashboard_routes_server import dashboard_handler
+from routes.job_routes.job_routes_server import job_handler
+from routes.health_routes.health_routes_server import health_handler
+from services.startup_service.startup_service_server import startup_service_server
+from config import ADMIN_TOKEN, CORS_ORIGINS
+from utils.metrics import metrics, StageTimer, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from utils.admission import Overloaded, prediction_admission
+from utils.http_cache import Validators, gzip_etag
+from utils.profiling import request_profiler
+from utils.response_cache import CachedResponse
+from utils.serialization import FastJSONProvider, accepts_gzip, gzip_body, gzip_stream, should_compress
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 CORS(app, origins=CORS_ORIGINS)
 
 # ============================================================================
@@ -40,19 +71,192 @@ print("\n" + "="*60)
 print("🚀 Starting Student Dropout Prediction System")
 print("="*60)
 
-# Check if ML model is loaded
-model_status = prediction_service_server.get_service_status()
-
-if model_status.get('model_loaded'):
-    print("\n✅ ML Model loaded successfully!")
-    print("   System ready to make predictions.")
-else:
-    print("\n⚠️  WARNING: ML Model not loaded!")
-    print("   The system will run but predictions may not work correctly.")
-    print("   Please ensure model files exist in backend/ml/saved_models/")
+# The student store, the model (and with it scikit-learn) and the prediction
+# cache load in a background warm-up; /api/ready answers 503 until it is done
+print("\n⏳ Loading the student store and ML model in the background...")
+print("   GET /api/ready reports when the system is ready to make predictions.")
+startup_service_server.start()
 
 print("\n" + "="*60 + "\n")
 
+# ============================================================================
+# MEMORY ACCOUNTING
+# ============================================================================
+
+admin_handler.register_memory_components()
+
+# ============================================================================
+# REQUEST METRICS
+# ============================================================================
+
+REQUEST_DURATION = metrics.histogram(
+    'http_request_duration_seconds',
+    'HTTP request latency by route, method and status code',
+    ['route', 'method', 'status']
+)
+REQUESTS_IN_FLIGHT = metrics.gauge(
+    'http_requests_in_flight',
+    'HTTP requests currently being served'
+)
+
+
+@app.before_request
+def start_request_timer():
+    """Record the request start time and count it as in flight"""
+    request.environ['metrics.start'] = time.perf_counter()
+    REQUESTS_IN_FLIGHT.inc()
+
+
+@app.after_request
+def record_request_metrics(response):
+    """Record request latency by route template, method and status"""
+    start = request.environ.get('metrics.start')
+    if start is not None:
+        rule = request.url_rule
+        REQUEST_DURATION.observe(
+            time.perf_counter() - start,
+            (rule.rule if rule is not None else '<unmatched>', request.method, response.status_code)
+        )
+    return response
+
+
+@app.teardown_request
+def finish_request_metrics(error):
+    """Release the in-flight slot once the request is done"""
+    if 'metrics.start' in request.environ:
+        REQUESTS_IN_FLIGHT.dec()
+
+# ============================================================================
+# REQUEST PROFILING
+# ============================================================================
+
+PROFILED_SAMPLE_ROUTE = '/api/predict/<roll_no>'
+
+
+def admin_authorized() -> bool:
+    """Check the X-Admin-Token header against the configured admin token"""
+    if not ADMIN_TOKEN:
+        return False
+    token = request.headers.get('X-Admin-Token', '')
+    return hmac.compare_digest(token.encode('utf-8'), ADMIN_TOKEN.encode('utf-8'))
+
+
+@app.before_request
+def start_request_profile():
+    """Profile admin requests sending X-Profile, or a sample of prediction traffic"""
+    trigger = None
+    if request.headers.get('X-Profile') and admin_authorized():
+        trigger = 'header'
+    elif request.url_rule is not None and request.url_rule.rule == PROFILED_SAMPLE_ROUTE \
+            and request_profiler.should_sample():
+        trigger = 'sampled'
+    
+    if trigger is not None:
+        session = request_profiler.start(request.headers.get('X-Profile-Mode'))
+        if session is not None:
+            request.environ['profile.session'] = (session, trigger)
+
+
+@app.after_request
+def finish_request_profile(response):
+    """Store the profile and tell the caller where to fetch it"""
+    active = request.environ.pop('profile.session', None)
+    if active is not None:
+        session, trigger = active
+        profile = request_profiler.finish(
+            session, request.path, request.method, trigger, response.status_code
+        )
+        response.headers['X-Profile-Id'] = profile['id']
+    return response
+
+
+@app.teardown_request
+def abandon_request_profile(error):
+    """Stop a profile that was never finished (e.g. the response failed)"""
+    active = request.environ.pop('profile.session', None)
+    if active is not None:
+        session, trigger = active
+        request_profiler.finish(session, request.path, request.method, trigger)
+
+# ============================================================================
+# RESPONSE ENCODING
+# ============================================================================
+
+# Registered after the metrics and profiling hooks so it runs before them
+# (Flask runs after_request hooks in reverse) and its cost is measured
+@app.after_request
+def compress_response(response):
+    """gzip-encode compressible bodies above GZIP_MIN_SIZE when the client accepts it"""
+    if response.status_code < 200 or response.status_code in (204, 304) or response.direct_passthrough:
+        return response
+    
+    size = None if response.is_streamed else response.content_length
+    headers = {name.lower(): value for name, value in response.headers.items()}
+    if not should_compress(response.content_type, size, headers):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    if not accepts_gzip(request.headers.get('Accept-Encoding')):
+        return response
+    
+    if response.is_streamed:
+        response.response = gzip_stream(response.response)
+        response.headers.pop('Content-Length', None)
+    else:
+        response.set_data(gzip_body(response.get_data()))
+    response.headers['Content-Encoding'] = 'gzip'
+    if 'ETag' in response.headers:
+        response.headers['ETag'] = gzip_etag(response.headers['ETag'])
+    return response
+
+
+def cached_response(entry: CachedResponse) -> Response:
+    """
+    Build a response from encoded bytes, using the cached gzip variant
+    when the client accepts it so nothing is re-encoded per request
+    """
+    gzipped = entry.gzipped() if accepts_gzip(request.headers.get('Accept-Encoding')) else None
+    if gzipped is None:
+        # compress_response still sets Vary for the plain body
+        return Response(entry.body, status=entry.status, mimetype='application/json')
+    
+    response = Response(gzipped, status=entry.status, mimetype='application/json')
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def conditional_response(validators: Optional[Validators], build: Callable[[], Response]) -> Response:
+    """
+    Answer a conditional GET from its validators, or build the response
+    
+    A client whose copy is current gets 304 Not Modified before any work
+    is done; otherwise successful responses carry ETag, Last-Modified and
+    Cache-Control.
+    
+    Args:
+        validators: Validators for the resource, or None to skip HTTP caching
+        build: Builds the full response
+    """
+    if validators is None:
+        return build()
+    
+    if_none_match = request.headers.get('If-None-Match')
+    if request.method == 'GET' and validators.not_modified(if_none_match, request.headers.get('If-Modified-Since')):
+        response = Response(status=304)
+        response.headers.pop('Content-Type', None)
+        response.vary.add('Accept-Encoding')
+        # Echo the ETag of the variant the client revalidated
+        gzipped = bool(if_none_match) and gzip_etag(validators.etag) in if_none_match
+        response.headers.extend(validators.headers('gzip' if gzipped else None))
+        return response
+    
+    response = build()
+    if response.status_code == 200:
+        response.headers.extend(validators.headers(response.headers.get('Content-Encoding')))
+    return response
+
+
 # ============================================================================
 # API ROUTES
 # ============================================================================
@@ -60,28 +264,50 @@ print("\n" + "="*60 + "\n")
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """
-    Health check endpoint
+    Health check endpoint (answered from precomputed readiness flags)
     
     Returns:
         JSON with server status and model loading status
     """
-    try:
-        service_status = prediction_service_server.get_service_status()
-        
-        return jsonify({
-            'status': 'healthy',
-            'message': 'Server is running',
-            'model_loaded': service_status.get('model_loaded', False),
-            'service_info': {
-                'cache_size': service_status.get('cache_size', 0),
-                'model_type': service_status.get('model_info', {}).get('model_type', 'Unknown')
-            }
-        }), 200
-    except Exception as e:
-        return jsonify({
-            'status': 'error',
-            'message': f'Health check failed: {str(e)}'
-        }), 500
+    response_data, status_code = health_handler.health_handler()
+    return jsonify(response_data), status_code
+
+
+@app.route('/api/live', methods=['GET'])
+def liveness():
+    """
+    Liveness probe: the process is serving requests
+    
+    Returns:
+        JSON status, always 200
+    """
+    response_data, status_code = health_handler.live_handler()
+    return jsonify(response_data), status_code
+
+
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """
+    Readiness probe: the model and student store are loaded and caches warm
+    
+    Returns:
+        JSON status; 503 with the components still loading until ready
+    """
+    response_data, status_code = health_handler.ready_handler()
+    return jsonify(response_data), status_code
+
+
+@app.route('/api/diagnostics', methods=['GET'])
+def diagnostics():
+    """
+    Full service status: readiness details, model metadata, cache and
+    store statistics (for dashboards and people; probes use /api/ready)
+    
+    Returns:
+        JSON diagnostics
+    """
+    response_data, status_code = health_handler.diagnostics_handler()
+    return jsonify(response_data), status_code
 
 
 @app.route('/api/student/<roll_no>', methods=['GET'])
@@ -92,14 +318,46 @@ def get_student(roll_no):
     Args:
         roll_no: Student roll number
         
+    Query Parameters:
+        prefetch: 0 to skip the background prediction prefetch (only made
+            when the full record is sent, not for a 304)
+        
     Returns:
         JSON with student data
     """
     try:
-        # Use the student handler
-        response_data, status_code = student_handler.get_student_handler(roll_no)
+        prefetch = request.method == 'GET' and request.args.get('prefetch') != '0'
+        
+        def build():
+            # Use the student handler (served from the encoded response cache)
+            encoded = student_handler.get_student_response(roll_no)
+            if prefetch and encoded.status == 200:
+                student_handler.prefetch_prediction(roll_no)
+            return cached_response(encoded)
+        
+        return conditional_response(student_handler.student_validators(roll_no), build)
+        
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
+
+@app.route('/api/dashboard/<roll_no>', methods=['GET'])
+def get_dashboard(roll_no):
+    """
+    Get a student's profile and dropout prediction in one call
+    
+    Args:
+        roll_no: Student roll number
+        
+    Returns:
+        JSON with the student profile and the enriched prediction
+    """
+    try:
+        response_data, status_code = dashboard_handler.get_dashboard_handler(roll_no, request_deadline())
         return jsonify(response_data), status_code
         
+    except Overloaded:
+        raise
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
@@ -119,20 +377,38 @@ def list_students():
         # Check if search query is provided
         search_query = request.args.get('search', None)
         
-        if search_query:
-            # Use search handler
-            response_data, status_code = student_handler.search_students_handler(search_query)
-        else:
-            # Use list handler
-            response_data, status_code = student_handler.list_students_handler()
+        def build():
+            if search_query:
+                # Use search handler
+                response_data, status_code = student_handler.search_students_handler(search_query)
+            else:
+                # Use list handler
+                response_data, status_code = student_handler.list_students_handler()
+            
+            return make_response(jsonify(response_data), status_code)
         
-        return jsonify(response_data), status_code
+        return conditional_response(student_handler.students_validators(search_query), build)
         
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
 
-@app.route('/api/predict/<roll_no>', methods=['POST'])
+def request_deadline() -> float:
+    """Deadline for prediction work; X-Request-Timeout-Ms can shorten the default budget"""
+    try:
+        budget_ms = float(request.headers.get('X-Request-Timeout-Ms', ''))
+    except ValueError:
+        budget_ms = None
+    return prediction_admission.deadline(budget_ms)
+
+
+def timings_requested() -> bool:
+    """Check whether the client opted into per-stage prediction timings"""
+    flag = request.headers.get('X-Prediction-Timings') or request.args.get('timings')
+    return flag is not None and flag.lower() in ('1', 'true', 'yes')
+
+
+@app.route('/api/predict/<roll_no>', methods=['GET', 'POST'])
 def predict_dropout(roll_no):
     """
     Predict dropout risk for a student
@@ -140,14 +416,30 @@ def predict_dropout(roll_no):
     Args:
         roll_no: Student roll number
         
+    Query Parameters / Headers:
+        timings=1 or X-Prediction-Timings: 1 - include per-stage timings
+        If-None-Match / If-Modified-Since - 304 when the prediction is unchanged (GET)
+        X-Request-Timeout-Ms - latency budget; 503 with Retry-After when it cannot be met
+        
     Returns:
         JSON with prediction results
     """
     try:
+        deadline = request_deadline()
+        
+        # Timed requests predict afresh; the rest are served from the encoded response cache
+        if not timings_requested():
+            return conditional_response(
+                prediction_handler.prediction_validators(roll_no),
+                lambda: cached_response(prediction_handler.predict_response(roll_no, deadline))
+            )
+        
         # Use the prediction handler
-        response_data, status_code = prediction_handler.predict_dropout_handler(roll_no)
+        response_data, status_code = prediction_handler.predict_dropout_handler(roll_no, StageTimer(), deadline)
         return jsonify(response_data), status_code
         
+    except Overloaded:
+        raise
     except Exception as e:
         import traceback
         return jsonify({
@@ -156,6 +448,60 @@ def predict_dropout(roll_no):
         }), 500
 
 
+@app.route('/api/predict/batch', methods=['POST'])
+def predict_dropout_batch():
+    """
+    Predict dropout risk for many students in one request
+    
+    Request Body:
+        roll_nos: List of roll numbers, or
+        filter: Object with any of course, year and roll_prefix
+        
+    Returns:
+        JSON with per-student results, unknown roll numbers and a
+        risk summary for the batch
+    """
+    try:
+        payload = request.get_json(silent=True)
+        response_data, status_code = prediction_handler.batch_predict_handler(payload)
+        return jsonify(response_data), status_code
+        
+    except Exception as e:
+        import traceback
+        return jsonify({
+            'error': f'Batch prediction failed: {str(e)}',
+            'traceback': traceback.format_exc()
+        }), 500
+
+
+@app.route('/api/predict/export', methods=['GET'])
+def export_predictions():
+    """
+    Stream dropout predictions for a cohort as NDJSON
+    
+    Query Parameters:
+        course, year, roll_prefix: Optional filters (default: all students)
+        chunk_size: Students scored per model call
+        
+    Returns:
+        application/x-ndjson stream: one "result" line per student, then a
+        "summary" line
+    """
+    try:
+        filters = {key: request.args.get(key) for key in ('course', 'year', 'roll_prefix')}
+        chunk_size = request.args.get('chunk_size', type=int)
+        
+        response_data, status_code = prediction_handler.export_predictions_handler(filters, chunk_size)
+        if status_code != 200:
+            return jsonify(response_data), status_code
+        
+        return Response(response_data, mimetype='application/x-ndjson',
+                        headers={'X-Accel-Buffering': 'no'})
+        
+    except Exception as e:
+        return jsonify({'error': f'Export failed: {str(e)}'}), 500
+
+
 @app.route('/api/model/info', methods=['GET'])
 def get_model_info():
     """
@@ -200,6 +546,245 @@ def clear_cache():
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
 
+# ============================================================================
+# BACKGROUND JOBS
+# ============================================================================
+
+@app.route('/api/jobs', methods=['GET', 'POST'])
+def jobs():
+    """
+    Submit a background job (POST) or list retained jobs (GET)
+    
+    Request Body (POST):
+        type: Job type (score_cohort or evaluate_model)
+        params: Optional object; filter narrows the students scored
+        
+    Returns:
+        JSON with the queued job (202) or the job list
+    """
+    try:
+        if request.method == 'POST':
+            response_data, status_code = job_handler.submit_job_handler(request.get_json(silent=True))
+        else:
+            response_data, status_code = job_handler.list_jobs_handler()
+        return jsonify(response_data), status_code
+        
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET', 'DELETE'])
+def job(job_id):
+    """
+    Get a job's status and progress (GET) or cancel it (DELETE)
+    
+    Args:
+        job_id: Job identifier
+        
+    Returns:
+        JSON with status, progress, throughput, ETA and result
+    """
+    try:
+        if request.method == 'DELETE':
+            response_data, status_code = job_handler.cancel_job_handler(job_id)
+        else:
+            response_data, status_code = job_handler.get_job_handler(job_id)
+        return jsonify(response_data), status_code
+        
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    """
+    Download a finished job's result file
+    
+    Args:
+        job_id: Job identifier
+        
+    Returns:
+        application/x-ndjson result shaped like /api/predict/export
+    """
+    try:
+        response_data, status_code = job_handler.job_result_handler(job_id)
+        if status_code != 200:
+            return jsonify(response_data), status_code
+        
+        return Response(response_data, mimetype='application/x-ndjson',
+                        headers={'Content-Disposition': f'attachment; filename="{job_id}.ndjson"'})
+        
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Expose metrics in Prometheus text format
+    
+    Returns:
+        Prometheus exposition text
+    """
+    return Response(metrics.render(), status=200, content_type=METRICS_CONTENT_TYPE)
+
+
+def admin_forbidden_response():
+    """Response for requests to admin endpoints without a valid token"""
+    message = 'Admin token required' if ADMIN_TOKEN else 'Admin endpoints are disabled (ADMIN_TOKEN not configured)'
+    return jsonify({'error': 'Forbidden', 'message': message}), 403
+
+
+@app.route('/api/admin/profiles', methods=['GET'])
+def list_profiles():
+    """
+    List retained request profiles (admin only)
+    
+    Returns:
+        JSON with profile summaries, newest first
+    """
+    if not admin_authorized():
+        return admin_forbidden_response()
+    
+    try:
+        response_data, status_code = admin_handler.list_profiles_handler()
+        return jsonify(response_data), status_code
+        
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
+
+@app.route('/api/admin/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """
+    Get one request profile (admin only)
+    
+    Args:
+        profile_id: Profile identifier
+        
+    Query Parameters:
+        format: 'collapsed' (default, flamegraph-ready text) or 'json'
+        
+    Returns:
+        Collapsed stacks as text, or the full profile as JSON
+    """
+    if not admin_authorized():
+        return admin_forbidden_response()
+    
+    try:
+        response_data, status_code = admin_handler.get_profile_handler(profile_id)
+        
+        if status_code != 200 or request.args.get('format') == 'json':
+            return jsonify(response_data), status_code
+        
+        return Response(response_data['collapsed'], status=200, content_type='text/plain; charset=utf-8')
+        
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
+
+@app.route('/api/admin/memory', methods=['GET'])
+def get_memory_report():
+    """
+    Report approximate retained size per component (admin only)
+    
+    Returns:
+        JSON with process RSS, per-component sizes and tracemalloc status
+    """
+    if not admin_authorized():
+        return admin_forbidden_response()
+    
+    try:
+        response_data, status_code = admin_handler.memory_report_handler()
+        return jsonify(response_data), status_code
+        
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
+
+@app.route('/api/admin/memory/snapshots', methods=['GET', 'POST', 'DELETE'])
+def memory_snapshots():
+    """
+    Manage tracemalloc snapshots (admin only)
+    
+    GET lists retained snapshots, POST takes a new one (starting tracemalloc
+    on first use) and DELETE stops tracemalloc and drops all snapshots.
+    
+    Request Body (POST, optional):
+        {
+            "label": "before-load-test"
+        }
+        
+    Returns:
+        JSON with snapshot summaries
+    """
+    if not admin_authorized():
+        return admin_forbidden_response()
+    
+    try:
+        if request.method == 'POST':
+            data = request.get_json(silent=True) or {}
+            response_data, status_code = admin_handler.take_snapshot_handler(data.get('label'))
+        elif request.method == 'DELETE':
+            response_data, status_code = admin_handler.stop_tracing_handler()
+        else:
+            response_data, status_code = admin_handler.list_snapshots_handler()
+        
+        return jsonify(response_data), status_code
+        
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
+
+@app.route('/api/admin/memory/snapshots/diff', methods=['GET'])
+def diff_memory_snapshots():
+    """
+    Top allocation sites that grew between two snapshots (admin only)
+    
+    Query Parameters:
+        from: Baseline snapshot id (required)
+        to: Later snapshot id (default: take a new snapshot now)
+        limit: Number of allocation sites (default: 20)
+        group_by: 'lineno' (default), 'filename' or 'traceback'
+        
+    Returns:
+        JSON with the top allocation sites by size growth
+    """
+    if not admin_authorized():
+        return admin_forbidden_response()
+    
+    try:
+        response_data, status_code = admin_handler.diff_snapshots_handler(
+            request.args.get('from', ''),
+            request.args.get('to'),
+            request.args.get('limit', 20, type=int),
+            request.args.get('group_by', 'lineno')
+        )
+        return jsonify(response_data), status_code
+        
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
+
+@app.route('/api/admin/workers', methods=['GET'])
+def get_workers():
+    """
+    Report per-worker health when running under serve.py (admin only)
+    
+    Returns:
+        JSON with one status row per worker process
+    """
+    if not admin_authorized():
+        return admin_forbidden_response()
+    
+    try:
+        response_data, status_code = admin_handler.workers_handler()
+        return jsonify(response_data), status_code
+        
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
+
 # ============================================================================
 # ERROR HANDLERS
 # ============================================================================
@@ -222,6 +807,19 @@ def internal_error(error):
     }), 500
 
 
+@app.errorhandler(Overloaded)
+def overloaded(error):
+    """Shed predictions get a fast 503 telling the client when to retry"""
+    response = jsonify({
+        'error': 'Server busy',
+        'message': f'Too many predictions in progress; retry after {error.retry_after}s',
+        'retry_after': error.retry_after
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
 @app.errorhandler(400)
 def bad_request(error):
     """Handle 400 errors"""
@@ -241,12 +839,26 @@ if __name__ == '__main__':
     print("="*60)
     print("\nAvailable endpoints:")
     print("  GET  /api/health              - Health check")
+    print("  GET  /api/live                - Liveness probe")
+    print("  GET  /api/ready               - Readiness probe")
+    print("  GET  /api/diagnostics         - Full service status")
     print("  GET  /api/student/<roll_no>   - Get student data")
     print("  GET  /api/students            - List all students")
     print("  GET  /api/students?search=... - Search students")
-    print("  POST /api/predict/<roll_no>   - Get dropout prediction")
+    print("  GET  /api/dashboard/<roll_no> - Student profile + prediction")
+    print("  GET  /api/predict/<roll_no>   - Get dropout prediction (also POST)")
+    print("  POST /api/predict/batch       - Batch dropout predictions")
+    print("  GET  /api/predict/export      - Stream cohort predictions (NDJSON)")
+    print("  POST /api/jobs                - Submit a background job")
+    print("  GET  /api/jobs/<job_id>       - Job progress (DELETE cancels)")
+    print("  GET  /api/jobs/<job_id>/result - Download a job's result")
     print("  GET  /api/model/info          - Get model information")
     print("  POST /api/cache/clear         - Clear prediction cache")
+    print("  GET  /api/metrics             - Prometheus metrics")
+    print("  GET  /api/admin/profiles      - Request profiles (admin)")
+    print("  GET  /api/admin/memory        - Memory report (admin)")
+    print("  GET  /api/admin/workers       - Worker health (admin)")
+    print("\n  Production: python serve.py --workers N --threads M")
     print("\n" + "="*60 + "\n")
     
     app.run(host='0.0.0.0', port=8000, debug=True)
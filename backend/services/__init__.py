@@ -7,5 +7,7 @@ This package contains business logic services for the application.
 
 from .student_service import StudentService
 from .prediction_service import PredictionService
+from .job_service import JobService
+from .startup_service import StartupWarmup
 
-__all__ = ['StudentService', 'PredictionService']
+__all__ = ['StudentService', 'PredictionService', 'JobService', 'StartupWarmup']
@@ -0,0 +1,5 @@
+"""Job service package"""
+
+from .job_service import JobService
+
+__all__ = ['JobService']
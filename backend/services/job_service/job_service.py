@@ -0,0 +1,515 @@
+"""
+Job Service Module
+==================
+
+This module provides a local background job queue. Jobs run on a thread
+pool of JOB_WORKERS threads instead of tying up an HTTP worker, report
+progress as they go, and persist their state under JOBS_DIR, so finished
+jobs and their results survive a restart.
+
+A job type is a function called with the Job and its parameters. It
+reports progress with job.set_total() / job.advance(), writes large output
+to job.result_path and returns a JSON-serializable result summary.
+advance() raises JobCancelled once the job is cancelled, so cancellation
+takes effect at the next progress report.
+
+Job state is a plain JSON file per job (<id>.json). Every process sharing
+JOBS_DIR - e.g. the other serve.py workers - can therefore report a job's
+progress, and cancel it through a marker file (<id>.cancel). A job whose
+process died before it finished is reported as failed. Pids are reused
+(a restarted container's processes get the same small pids), so a job
+records its process's token - the boot id and the process's start time -
+as well as its pid, and only counts as live while both still match.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from config import JOB_RETENTION, JOB_WORKERS, JOBS_DIR
+from utils.metrics import metrics
+
+
+JOBS_FINISHED = metrics.counter(
+    'jobs_finished_total',
+    'Background jobs finished, by type and final status',
+    ['type', 'status']
+)
+JOB_DURATION_SECONDS = metrics.histogram(
+    'job_duration_seconds',
+    'Background job run time, by type',
+    ['type'],
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+# Job ids are uuid4 hex strings; anything else never reaches the filesystem
+JOB_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+# Progress is written to disk at most this often (seconds)
+SAVE_INTERVAL = 1.0
+
+# Longest shutdown() waits for running jobs to stop (seconds)
+SHUTDOWN_TIMEOUT = 5.0
+
+INTERRUPTED = 'Interrupted: the server stopped before the job finished'
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it has been cancelled"""
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    """ISO 8601 local time for a time.time() value"""
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp is not None else None
+
+
+def _process_token(pid: int) -> Optional[str]:
+    """
+    Identity of a running process that a later process with the same pid does not share
+    
+    Returns:
+        The boot id and the process's start time, or None where /proc
+        cannot tell (not Linux, or no such process)
+    """
+    try:
+        with open('/proc/sys/kernel/random/boot_id', 'r', encoding='utf-8') as f:
+            boot_id = f.read().strip()
+        with open(f'/proc/{pid}/stat', 'r', encoding='utf-8') as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # Fields after the (command name) start at field 3; the start time is field 22
+    return f"{boot_id}:{stat.rsplit(')', 1)[1].split()[19]}"
+
+
+# (pid, token) of this process, recomputed after a fork
+_own_token = (None, None)
+
+
+def _current_process_token() -> str:
+    """Token of this process (random where /proc is not available)"""
+    global _own_token
+    pid = os.getpid()
+    if _own_token[0] != pid:
+        _own_token = (pid, _process_token(pid) or uuid.uuid4().hex)
+    return _own_token[1]
+
+
+def _process_alive(pid: int, token: Optional[str]) -> bool:
+    """Check whether the process that recorded this pid and token is still running"""
+    if pid == os.getpid():
+        return token is None or token == _current_process_token()
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    except OSError:
+        return False
+    if token is None:
+        # Written before jobs recorded tokens; the pid is all there is to go on
+        return True
+    current = _process_token(pid)
+    return current is None or current == token
+
+
+class Job:
+    """One background job: parameters, status, progress and result"""
+
+    def __init__(self, job_id: str, job_type: str, params: Dict, directory: str):
+        """
+        Create a queued job
+
+        Args:
+            job_id: Unique id (uuid4 hex)
+            job_type: Registered job type
+            params: Job parameters
+            directory: Directory holding the job's state and result files
+        """
+        self.id = job_id
+        self.type = job_type
+        self.params = params
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.done = 0
+        self.total: Optional[int] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.has_result_file = False
+        self.pid = os.getpid()
+        self.process_token: Optional[str] = _current_process_token()
+        self._directory = directory
+        self._cancel = threading.Event()
+        self._last_saved = 0.0
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+
+    @property
+    def state_path(self) -> str:
+        """Path of the job's state file"""
+        return os.path.join(self._directory, f'{self.id}.json')
+
+    @property
+    def result_path(self) -> str:
+        """Path a job may write its result file to"""
+        return os.path.join(self._directory, f'{self.id}.ndjson')
+
+    @property
+    def cancel_path(self) -> str:
+        """Path of the cancellation marker used across processes"""
+        return os.path.join(self._directory, f'{self.id}.cancel')
+
+    def save(self):
+        """Write the state file atomically"""
+        temp_path = f'{self.state_path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(temp_path, self.state_path)
+        self._last_saved = time.monotonic()
+
+    def to_dict(self) -> Dict:
+        """Persisted form of the job"""
+        return {
+            'id': self.id,
+            'type': self.type,
+            'params': self.params,
+            'status': self.status,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'done': self.done,
+            'total': self.total,
+            'result': self.result,
+            'error': self.error,
+            'has_result_file': self.has_result_file,
+            'cancel_requested': self.cancel_requested(),
+            'pid': self.pid,
+            'process_token': self.process_token,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, directory: str) -> 'Job':
+        """Rebuild a job from its state file"""
+        job = cls(data['id'], data['type'], data.get('params', {}), directory)
+        for field in ('status', 'created_at', 'started_at', 'finished_at', 'done', 'total',
+                      'result', 'error', 'has_result_file', 'pid'):
+            setattr(job, field, data.get(field, getattr(job, field)))
+        job.process_token = data.get('process_token')
+        if data.get('cancel_requested'):
+            job._cancel.set()
+        return job
+
+    def owned(self) -> bool:
+        """Whether this process runs the job (not an earlier process that had the same pid)"""
+        return self.pid == os.getpid() and self.process_token == _current_process_token()
+
+    # ------------------------------------------------------------------
+    # Progress (called from the job function)
+    # ------------------------------------------------------------------
+
+    def set_total(self, total: int):
+        """Set the number of items the job will process"""
+        self.total = total
+        self.save()
+
+    def advance(self, count: int = 1):
+        """
+        Record processed items
+
+        Raises:
+            JobCancelled: The job has been cancelled
+        """
+        self.done += count
+        if time.monotonic() - self._last_saved >= SAVE_INTERVAL:
+            self.save()
+        if self.cancel_requested():
+            raise JobCancelled()
+
+    # ------------------------------------------------------------------
+    # Cancellation
+    # ------------------------------------------------------------------
+
+    def cancel_requested(self) -> bool:
+        """Check whether cancellation was requested, by this or another process"""
+        return self._cancel.is_set() or os.path.exists(self.cancel_path)
+
+    def request_cancel(self):
+        """Ask the job to stop; takes effect at its next progress report"""
+        self._cancel.set()
+        with open(self.cancel_path, 'w'):
+            pass
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def describe(self) -> Dict:
+        """
+        API view of the job
+
+        Returns:
+            Status, progress, throughput (items/s), ETA (seconds) and result
+        """
+        throughput = None
+        eta = None
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+            if elapsed > 0 and self.done:
+                throughput = round(self.done / elapsed, 2)
+                if self.status == RUNNING and self.total is not None:
+                    eta = round(max(0, self.total - self.done) / throughput, 1)
+
+        return {
+            'id': self.id,
+            'type': self.type,
+            'params': self.params,
+            'status': self.status,
+            'cancel_requested': self.status in ACTIVE_STATUSES and self.cancel_requested(),
+            'created_at': _isoformat(self.created_at),
+            'started_at': _isoformat(self.started_at),
+            'finished_at': _isoformat(self.finished_at),
+            'progress': {
+                'done': self.done,
+                'total': self.total,
+                'percent': round(100 * self.done / self.total, 1) if self.total else None,
+            },
+            'throughput_per_s': throughput,
+            'eta_seconds': eta,
+            'result': self.result,
+            'error': self.error,
+            'has_result_file': self.has_result_file,
+        }
+
+
+class JobService:
+    """Local job queue with a thread pool and on-disk state"""
+
+    def __init__(self, directory: str = str(JOBS_DIR), workers: int = JOB_WORKERS,
+                 retention: int = JOB_RETENTION):
+        """
+        Initialize job service and load jobs persisted by earlier runs
+
+        Args:
+            directory: Directory for job state and result files
+            workers: Threads running jobs
+            retention: Finished jobs kept before the oldest are deleted
+        """
+        self.directory = directory
+        self.workers = max(1, workers)
+        self.retention = retention
+        self._types: Dict[str, Callable[[Job, Dict], Any]] = {}
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._stopping = False
+        self._load()
+
+    def register(self, job_type: str, func: Callable[[Job, Dict], Any]):
+        """Register a job type"""
+        self._types[job_type] = func
+
+    @property
+    def job_types(self) -> List[str]:
+        """Registered job types"""
+        return sorted(self._types)
+
+    def submit(self, job_type: str, params: Optional[Dict] = None) -> Job:
+        """
+        Queue a job
+
+        Args:
+            job_type: Registered job type
+            params: Job parameters
+
+        Returns:
+            The queued job
+        """
+        if job_type not in self._types:
+            raise ValueError(f'Unknown job type {job_type!r}')
+
+        job = Job(uuid.uuid4().hex, job_type, params or {}, self.directory)
+        job.save()
+        with self._lock:
+            self._jobs[job.id] = job
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='job')
+        self._pool.submit(self._run, job)
+        self._prune()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Look up a job
+
+        Jobs run by this process come from memory; others are read from
+        their state file, so progress is visible across processes. A job
+        left queued or running by a process that has since exited (e.g. a
+        serve.py worker killed before it could record a final status) is
+        marked failed.
+        """
+        if not JOB_ID_PATTERN.match(job_id or ''):
+            return None
+        job = self._jobs.get(job_id)
+        if job is not None and job.owned():
+            return job
+        job = self._read(os.path.join(self.directory, f'{job_id}.json'))
+        if job is not None and job.status in ACTIVE_STATUSES and not _process_alive(job.pid, job.process_token):
+            job.error = INTERRUPTED
+            self._finish(job, FAILED)
+        return job
+
+    def list_jobs(self) -> List[Job]:
+        """All retained jobs, newest first"""
+        jobs = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                job = self.get(name[:-len('.json')])
+                if job is not None:
+                    jobs.append(job)
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a queued or running job
+
+        Returns:
+            The job, or None if it does not exist
+        """
+        job = self.get(job_id)
+        if job is None or job.status not in ACTIVE_STATUSES:
+            return job
+        job.request_cancel()
+        return job
+
+    def _run(self, job: Job):
+        """Run one job on a pool thread and record how it ended"""
+        if job.cancel_requested():
+            self._finish_cancelled(job)
+            return
+
+        job.status = RUNNING
+        job.started_at = time.time()
+        job.save()
+        print(f"🔄 Job {job.id} ({job.type}) started")
+
+        try:
+            job.result = self._types[job.type](job, job.params)
+            job.has_result_file = os.path.exists(job.result_path)
+            self._finish(job, COMPLETED)
+        except JobCancelled:
+            self._finish_cancelled(job)
+        except Exception as e:
+            job.error = str(e)
+            self._finish(job, FAILED)
+
+    def _finish_cancelled(self, job: Job):
+        """Record a stopped job: cancelled, or failed if stopped by shutdown()"""
+        if self._stopping:
+            job.error = INTERRUPTED
+            self._finish(job, FAILED)
+        else:
+            self._finish(job, CANCELLED)
+
+    def shutdown(self, timeout: float = SHUTDOWN_TIMEOUT):
+        """
+        Stop this process's jobs before it exits
+
+        Running jobs are stopped at their next progress report and queued
+        ones are dropped; all of them are recorded as failed (interrupted),
+        so no job is left reported as running by a process that is gone.
+
+        Args:
+            timeout: Seconds to wait for running jobs to stop
+        """
+        self._stopping = True
+        own = [job for job in list(self._jobs.values())
+               if job.owned() and job.status in ACTIVE_STATUSES]
+        for job in own:
+            job._cancel.set()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+        deadline = time.monotonic() + timeout
+        while any(job.status == RUNNING for job in own) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        for job in own:
+            if job.status in ACTIVE_STATUSES:
+                job.error = INTERRUPTED
+                self._finish(job, FAILED)
+
+    def _finish(self, job: Job, status: str):
+        """Record a final status, dropping partial output of unfinished jobs"""
+        job.status = status
+        job.finished_at = time.time()
+        if status != COMPLETED and os.path.exists(job.result_path):
+            os.remove(job.result_path)
+            job.has_result_file = False
+        job.save()
+        if os.path.exists(job.cancel_path):
+            os.remove(job.cancel_path)
+
+        JOBS_FINISHED.inc((job.type, status))
+        if job.started_at is not None:
+            JOB_DURATION_SECONDS.observe(job.finished_at - job.started_at, (job.type,))
+        icon = '✅' if status == COMPLETED else '⚠️'
+        print(f"{icon} Job {job.id} ({job.type}) {status}")
+
+    def _read(self, path: str) -> Optional[Job]:
+        """Load a job from its state file"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return Job.from_dict(json.load(f), self.directory)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _load(self):
+        """Load persisted jobs, failing those whose process is gone"""
+        os.makedirs(self.directory, exist_ok=True)
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            job = self._read(os.path.join(self.directory, name))
+            if job is None:
+                continue
+            if job.status in ACTIVE_STATUSES and not _process_alive(job.pid, job.process_token):
+                job.error = INTERRUPTED
+                self._finish(job, FAILED)
+            self._jobs[job.id] = job
+
+    def _prune(self):
+        """Delete the oldest finished jobs beyond the retention limit"""
+        with self._lock:
+            finished = [job for job in self._jobs.values() if job.status not in ACTIVE_STATUSES]
+            excess = len(finished) - self.retention
+            if excess <= 0:
+                return
+            for job in sorted(finished, key=lambda job: job.created_at)[:excess]:
+                del self._jobs[job.id]
+                for path in (job.state_path, job.result_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    def stats(self) -> Dict:
+        """Job counts by status for jobs known to this process"""
+        counts: Dict[str, int] = {}
+        for job in list(self._jobs.values()):
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return counts
@@ -0,0 +1,152 @@
+"""
+Job Service Server Module
+=========================
+
+This module registers the application's background job types on the
+shared JobService:
+
+    score_cohort    - score every student matching a filter; the scored
+                      cohort is written to an NDJSON result file shaped
+                      like /api/predict/export
+    evaluate_model  - score every labelled student (actual_dropout_status)
+                      and compare predictions with outcomes: accuracy,
+                      precision, recall, F1, ROC AUC, confusion matrix and
+                      observed dropout rate per risk level
+
+Both score through PredictionServiceServer.stream_predictions, so their
+chunks run as bulk work behind interactive predictions.
+"""
+
+from typing import Dict, List
+
+from config import EXPORT_CHUNK_SIZE
+from schemas.prediction_schema.prediction_schema_server import BatchSummary, PredictionSchemaServer
+from services.prediction_service.prediction_service_server import prediction_service_server
+from services.student_service.student_service_server import student_service_server
+from utils.metrics import metrics
+from utils.serialization import json_encoder
+from .job_service import ACTIVE_STATUSES, Job, JobService
+
+# Predicted probability at or above which a student counts as a predicted dropout
+DROPOUT_THRESHOLD = 0.5
+
+
+class JobServiceServer:
+    """Server-side wrapper registering job types on the job service"""
+
+    def __init__(self):
+        """Initialize job service with the application's job types"""
+        self.service = JobService()
+        self.student_service = student_service_server.service
+        self.prediction_server = prediction_service_server
+        self.service.register('score_cohort', self.score_cohort)
+        self.service.register('evaluate_model', self.evaluate_model)
+
+    def score_cohort(self, job: Job, params: Dict) -> Dict:
+        """
+        Score a cohort into the job's result file
+
+        Args:
+            job: Running job
+            params: Optional 'filter' (course, year, roll_prefix)
+
+        Returns:
+            Student count and risk summary
+        """
+        students = list(self.student_service.iter_students(params.get('filter')))
+        job.set_total(len(students))
+        summary = BatchSummary()
+        count = 0
+
+        with open(job.result_path, 'wb') as f:
+            for results in self.prediction_server.stream_predictions(students, EXPORT_CHUNK_SIZE):
+                for outcome in results:
+                    record = PredictionSchemaServer.format_batch_result(outcome)
+                    if record['success']:
+                        summary.add(record['prediction'])
+                    f.write(json_encoder.dumps_line(dict(type='result', **record)))
+                count += len(results)
+                job.advance(len(results))
+            f.write(json_encoder.dumps_line({'type': 'summary', 'count': count, 'summary': summary.as_dict()}))
+
+        return {'count': count, 'summary': summary.as_dict()}
+
+    def evaluate_model(self, job: Job, params: Dict) -> Dict:
+        """
+        Evaluate the loaded model against recorded outcomes
+
+        Args:
+            job: Running job
+            params: Optional 'filter' (course, year, roll_prefix)
+
+        Returns:
+            Classification metrics for the labelled students
+        """
+        from sklearn.metrics import confusion_matrix, f1_score, precision_score, recall_score, roc_auc_score
+
+        students = [
+            student for student in self.student_service.iter_students(params.get('filter'))
+            if student.get('actual_dropout_status') in (0, 1)
+        ]
+        if not students:
+            raise ValueError('No students with a recorded dropout outcome match the filter')
+        job.set_total(len(students))
+
+        labels: List[int] = []
+        probabilities: List[float] = []
+        by_risk: Dict[str, List[int]] = {}
+        failed = 0
+        offset = 0
+        for results in self.prediction_server.stream_predictions(students, EXPORT_CHUNK_SIZE):
+            for student, outcome in zip(students[offset:offset + len(results)], results):
+                if not outcome['success']:
+                    failed += 1
+                    continue
+                prediction = outcome['prediction']
+                actual = int(student['actual_dropout_status'])
+                labels.append(actual)
+                probabilities.append(prediction['prediction_details']['dropout_probability'])
+                by_risk.setdefault(prediction['risk_level'], []).append(actual)
+            offset += len(results)
+            job.advance(len(results))
+
+        if not labels:
+            raise ValueError('Every prediction failed')
+        predicted = [int(probability >= DROPOUT_THRESHOLD) for probability in probabilities]
+        matrix = confusion_matrix(labels, predicted, labels=[0, 1])
+        metadata = self.prediction_server.service.get_model_info().get('metadata', {})
+
+        return {
+            'model_version': self.prediction_server.service.model_version(),
+            'evaluated': len(labels),
+            'failed': failed,
+            'threshold': DROPOUT_THRESHOLD,
+            'accuracy': round(sum(p == a for p, a in zip(predicted, labels)) / len(labels), 4),
+            'precision': round(float(precision_score(labels, predicted, zero_division=0)), 4),
+            'recall': round(float(recall_score(labels, predicted, zero_division=0)), 4),
+            'f1': round(float(f1_score(labels, predicted, zero_division=0)), 4),
+            'roc_auc': round(float(roc_auc_score(labels, probabilities)), 4) if len(set(labels)) == 2 else None,
+            'confusion_matrix': {
+                'true_negative': int(matrix[0][0]),
+                'false_positive': int(matrix[0][1]),
+                'false_negative': int(matrix[1][0]),
+                'true_positive': int(matrix[1][1])
+            },
+            'dropout_rate_by_risk_level': {
+                level: {'students': len(actuals), 'dropout_rate': round(sum(actuals) / len(actuals), 4)}
+                for level, actuals in sorted(by_risk.items())
+            },
+            'reported_accuracy': metadata.get('accuracy')
+        }
+
+
+# Create singleton instance
+job_service_server = JobServiceServer()
+
+metrics.gauge(
+    'jobs_active',
+    'Background jobs queued or running in this process',
+    function=lambda: {(): sum(
+        count for status, count in job_service_server.service.stats().items() if status in ACTIVE_STATUSES
+    )}
+)
@@ -0,0 +1,112 @@
+"""
+Prediction Prefetcher Module
+============================
+
+This module runs speculative predictions in the background. Viewing a
+student profile is almost always followed by a prediction for the same
+student, so the student route queues one here and the prediction is
+usually cached before the follow-up request arrives.
+
+Prefetches are strictly best-effort:
+
+    - at most PREFETCH_QUEUE_SIZE wait; beyond that new ones are dropped
+    - a roll number already queued is not queued again
+    - they run on PREFETCH_WORKERS threads and score through the bulk
+      class of the prediction scheduler, behind interactive predictions
+
+Outcomes are exported as prediction_prefetch_total{outcome}; the server
+records whether each prefetched prediction was used or wasted.
+
+Usage:
+    prefetcher = PredictionPrefetcher()
+    outcome = prefetcher.submit(roll_no, lambda: prefetch_one(student))
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Optional, Set
+
+from config import PREFETCH_QUEUE_SIZE, PREFETCH_WORKERS
+from utils.metrics import metrics
+
+
+PREFETCH_OUTCOMES = metrics.counter(
+    'prediction_prefetch_total',
+    'Speculative prediction prefetches by outcome '
+    '(queued, cached, busy, queue_full, duplicate, completed, failed, used, wasted)',
+    ['outcome']
+)
+
+
+class PredictionPrefetcher:
+    """Bounded, deduplicating background queue for speculative predictions"""
+
+    def __init__(self, workers: int = PREFETCH_WORKERS, max_queue: int = PREFETCH_QUEUE_SIZE):
+        """
+        Initialize prefetcher
+
+        Args:
+            workers: Threads running prefetches
+            max_queue: Prefetches allowed to wait; 0 disables prefetching
+        """
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self._queued: Set[Hashable] = set()
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def submit(self, key: Hashable, task: Callable[[], str]) -> str:
+        """
+        Queue a prefetch
+
+        Args:
+            key: Deduplication key (the roll number)
+            task: Runs the prefetch and returns its outcome
+
+        Returns:
+            'queued', or why it was not: 'queue_full' or 'duplicate'
+        """
+        with self._lock:
+            if key in self._queued:
+                outcome = 'duplicate'
+            elif len(self._queued) >= self.max_queue:
+                outcome = 'queue_full'
+            else:
+                self._queued.add(key)
+                if self._pool is None:
+                    # Created on first use, after serve.py has forked its workers
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='prefetch')
+                self._pool.submit(self._run, key, task)
+                outcome = 'queued'
+        self.record(outcome)
+        return outcome
+
+    def _run(self, key: Hashable, task: Callable[[], str]):
+        """Run one prefetch on a pool thread"""
+        try:
+            outcome = task()
+        except Exception as e:
+            outcome = 'failed'
+            print(f"⚠️  Prefetch failed for {key}: {str(e)}")
+        finally:
+            with self._lock:
+                self._queued.discard(key)
+        self.record(outcome)
+
+    @staticmethod
+    def record(outcome: str, amount: int = 1):
+        """Count a prefetch outcome"""
+        PREFETCH_OUTCOMES.inc((outcome,), amount)
+
+    def stats(self) -> Dict:
+        """Queue depth and outcome counts"""
+        outcomes = ('queued', 'cached', 'busy', 'queue_full', 'duplicate', 'completed', 'failed', 'used', 'wasted')
+        counts = {outcome: int(PREFETCH_OUTCOMES.get((outcome,))) for outcome in outcomes}
+        completed = counts['completed']
+        return {
+            'workers': self.workers,
+            'max_queue': self.max_queue,
+            'queue_depth': len(self._queued),
+            'outcomes': counts,
+            'hit_ratio': round(counts['used'] / completed, 4) if completed else 0.0,
+        }
@@ -0,0 +1,173 @@
+"""
+Prediction Scheduler Module
+===========================
+
+This module schedules prediction work in two priority classes:
+
+    interactive  - single-student predictions a counselor is waiting on;
+                   they run immediately on the request thread
+    bulk         - batch requests and exports; split into chunks of
+                   BULK_CHUNK_SIZE students and scored on a pool of
+                   BULK_WORKERS threads
+
+Chunks are the preemption points: before scoring a chunk, a bulk worker
+waits while any interactive prediction is in flight, so a lookup never
+queues behind a whole cohort - at most behind the chunks already running.
+To keep bulk work progressing under constant interactive load, a chunk
+waits at most BULK_MAX_DEFER_MS before running anyway.
+
+Per-class latency is exported as prediction_scheduler_latency_seconds.
+
+Usage:
+    scheduler = PredictionScheduler()
+
+    with scheduler.interactive():
+        prediction = predictor.predict(student)
+
+    predictions = scheduler.run_bulk(predictor.predict_batch, students)
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+from config import BULK_CHUNK_SIZE, BULK_MAX_DEFER_MS, BULK_WORKERS
+from utils.metrics import metrics
+
+
+SCHEDULER_LATENCY_SECONDS = metrics.histogram(
+    'prediction_scheduler_latency_seconds',
+    'Prediction latency by priority class (bulk: per chunk, from submission to completion)',
+    ['class'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+SCHEDULER_YIELDS = metrics.counter(
+    'prediction_scheduler_yields_total',
+    'Bulk chunks held back while interactive predictions were running'
+)
+
+INTERACTIVE = 'interactive'
+BULK = 'bulk'
+
+
+class PredictionScheduler:
+    """Two-class scheduler: interactive predictions first, bulk work in chunks"""
+
+    def __init__(self, workers: int = BULK_WORKERS, chunk_size: int = BULK_CHUNK_SIZE,
+                 max_defer_ms: float = BULK_MAX_DEFER_MS):
+        """
+        Initialize scheduler
+
+        Args:
+            workers: Threads scoring bulk chunks (0 runs bulk work inline,
+                without chunking or yielding)
+            chunk_size: Students per bulk chunk
+            max_defer_ms: Longest a chunk waits for interactive work to drain
+        """
+        self.workers = max(0, workers)
+        self.chunk_size = max(1, chunk_size)
+        self.max_defer = max_defer_ms / 1000
+        self.interactive_active = 0
+        self.bulk_queued = 0
+        # Chunks waiting for a bulk worker, by id (for memory accounting)
+        self._queued_chunks: Dict[int, List[Dict]] = {}
+        self._cond = threading.Condition()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    @contextmanager
+    def interactive(self) -> Iterator[None]:
+        """Mark an interactive prediction as running; bulk chunks hold back meanwhile"""
+        with self._cond:
+            self.interactive_active += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            SCHEDULER_LATENCY_SECONDS.observe(time.perf_counter() - start, (INTERACTIVE,))
+            with self._cond:
+                self.interactive_active -= 1
+                if not self.interactive_active:
+                    self._cond.notify_all()
+
+    def run_bulk(self, score: Callable[[List[Dict]], List[Dict]], students: List[Dict]) -> List[Dict]:
+        """
+        Score students as bulk work and wait for the results
+
+        Args:
+            score: Callable scoring a list of students, in order
+            students: Students to score
+
+        Returns:
+            score()'s results for every student, in input order
+        """
+        if not students:
+            return []
+        if not self.workers:
+            start = time.perf_counter()
+            results = score(students)
+            SCHEDULER_LATENCY_SECONDS.observe(time.perf_counter() - start, (BULK,))
+            return results
+
+        pool = self._get_pool()
+        futures = []
+        for offset in range(0, len(students), self.chunk_size):
+            chunk = students[offset:offset + self.chunk_size]
+            with self._cond:
+                self.bulk_queued += 1
+                self._queued_chunks[id(chunk)] = chunk
+            futures.append(pool.submit(self._run_chunk, score, chunk, time.perf_counter()))
+
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Create the bulk pool on first use (after serve.py has forked its workers)"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='bulk')
+        return self._pool
+
+    def _run_chunk(self, score: Callable[[List[Dict]], List[Dict]], chunk: List[Dict],
+                   submitted: float) -> List[Dict]:
+        """Yield to interactive work, then score one chunk"""
+        with self._cond:
+            self.bulk_queued -= 1
+            self._queued_chunks.pop(id(chunk), None)
+            if self.interactive_active:
+                SCHEDULER_YIELDS.inc()
+                deadline = time.monotonic() + self.max_defer
+                while self.interactive_active:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+        try:
+            return score(chunk)
+        finally:
+            SCHEDULER_LATENCY_SECONDS.observe(time.perf_counter() - submitted, (BULK,))
+
+    def queued_chunks(self) -> List[List[Dict]]:
+        """Chunks waiting for a bulk worker"""
+        with self._cond:
+            return list(self._queued_chunks.values())
+
+    def stats(self) -> Dict:
+        """Pool size, queued bulk chunks and running interactive predictions"""
+        return {
+            'bulk_workers': self.workers,
+            'bulk_chunk_size': self.chunk_size,
+            'bulk_queued': self.bulk_queued,
+            'interactive_active': self.interactive_active,
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Stop the bulk pool"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
@@ -7,46 +7,169 @@ This module provides business logic for prediction-related operations.
 
 import sys
 import os
-from typing import Dict, Optional
+import threading
+import time
+from typing import Callable, Dict, List, Optional
 
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from ml.predict import DropoutPredictor
+from .prediction_scheduler import PredictionScheduler
+from utils.health import readiness
+from utils.metrics import metrics
+
+
+MODEL_INFERENCE_SECONDS = metrics.histogram(
+    'model_inference_seconds',
+    'Time spent in DropoutPredictor.predict'
+)
+BATCH_INFERENCE_SECONDS = metrics.histogram(
+    'model_batch_inference_seconds',
+    'Time spent in DropoutPredictor.predict_batch'
+)
+MODEL_LOAD_SECONDS = metrics.histogram(
+    'model_load_seconds',
+    'Time spent loading the model artifacts'
+)
+BATCH_SIZE = metrics.histogram(
+    'model_batch_size',
+    'Students scored per DropoutPredictor.predict_batch call',
+    buckets=(1, 5, 10, 25, 50, 100, 200, 500, 1000)
+)
 
 
 class PredictionService:
     """Service class for prediction operations"""
     
     def __init__(self):
-        """Initialize prediction service"""
-        self.predictor = DropoutPredictor()
+        """Initialize prediction service (the model is loaded on first use)"""
+        self.predictor = DropoutPredictor(load=False)
+        self._load_lock = threading.Lock()
+        self._load_attempted = False
+        readiness.set('model', False, 'Not loaded yet')
+        # Interactive predictions run first; bulk work runs in chunks that yield to them
+        self.scheduler = PredictionScheduler()
+    
+    def ensure_model(self) -> bool:
+        """
+        Load the model on first use
+        
+        The model is loaded once per process - by the startup warm-up or by
+        whichever caller needs it first; callers arriving meanwhile wait for
+        that load rather than starting their own. A failed load is not
+        retried here (load_model reloads explicitly).
+        
+        Returns:
+            Whether the model is loaded
+        """
+        if not self._load_attempted:
+            with self._load_lock:
+                if not self._load_attempted:
+                    self._load()
+        return self.predictor.is_loaded
+    
+    def load_model(self) -> bool:
+        """
+        (Re)load the model artifacts from disk
+        
+        Returns:
+            Whether the model is loaded
+        """
+        with self._load_lock:
+            self._load()
+        return self.predictor.is_loaded
     
-    def predict_dropout_risk(self, student_data: Dict) -> Dict:
+    def _load(self):
+        """Load the artifacts and publish the result to the readiness probe (lock held)"""
+        readiness.set('model', False, 'Loading')
+        start = time.perf_counter()
+        self.predictor._load_artifacts()
+        MODEL_LOAD_SECONDS.observe(time.perf_counter() - start)
+        self._load_attempted = True
+        readiness.set('model', self.predictor.is_loaded,
+                      None if self.predictor.is_loaded else 'Model artifacts not loaded')
+    
+    def predict_dropout_risk(self, student_data: Dict, timer=None) -> Dict:
         """
         Predict dropout risk for a student
         
         Args:
             student_data: Dictionary containing student information
+            timer: Optional StageTimer that records per-stage durations
             
         Returns:
             Prediction result dictionary
         """
-        if not self.predictor.is_loaded:
+        if not self.ensure_model():
             return {
                 'error': True,
                 'message': 'ML model not loaded. Please check model files.'
             }
         
-        return self.predictor.predict(student_data)
+        with self.scheduler.interactive():
+            start = time.perf_counter()
+            prediction = self.predictor.predict(student_data, timer)
+            MODEL_INFERENCE_SECONDS.observe(time.perf_counter() - start)
+        
+        return prediction
+    
+    def predict_batch(self, students: List[Dict]) -> List[Dict]:
+        """
+        Predict dropout risk for several students with one model call
+        
+        Args:
+            students: List of student data dictionaries
+            
+        Returns:
+            One prediction result per student, in input order
+        """
+        if not self.ensure_model():
+            return [{
+                'error': True,
+                'message': 'ML model not loaded. Please check model files.'
+            } for _ in students]
+        
+        start = time.perf_counter()
+        predictions = self.predictor.predict_batch(students)
+        BATCH_INFERENCE_SECONDS.observe(time.perf_counter() - start)
+        BATCH_SIZE.observe(len(students))
+        
+        return predictions
+    
+    def predict_bulk(self, students: List[Dict],
+                     score: Optional[Callable[[List[Dict]], List[Dict]]] = None) -> List[Dict]:
+        """
+        Predict dropout risk for many students as low-priority bulk work
+        
+        Students are scored in chunks on the scheduler's bulk pool, and
+        each chunk waits for running interactive predictions first.
+        
+        Args:
+            students: List of student data dictionaries
+            score: Optional callable scoring one chunk, in order
+                (defaults to predict_batch)
+            
+        Returns:
+            One prediction result per student, in input order
+        """
+        return self.scheduler.run_bulk(score or self.predict_batch, students)
     
     def is_model_loaded(self) -> bool:
-        """Check if ML model is loaded"""
-        return self.predictor.is_loaded
+        """Check if ML model is loaded (loading it on first use)"""
+        return self.ensure_model()
+    
+    def model_version(self) -> Optional[str]:
+        """Version of the loaded model artifacts, or None if not loaded"""
+        return self.predictor.version if self.ensure_model() else None
+    
+    def model_modified_at(self) -> Optional[float]:
+        """Modification time of the loaded model file, or None if not loaded"""
+        return self.predictor.modified_at if self.ensure_model() else None
     
     def get_model_info(self) -> Dict:
         """Get information about the loaded model"""
-        if not self.predictor.is_loaded:
+        if not self.ensure_model():
             return {
                 'loaded': False,
                 'message': 'Model not loaded'
@@ -6,40 +6,159 @@ This module provides server-side logic for prediction service operations.
 It handles request processing, caching, and additional business logic.
 """
 
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
 from datetime import datetime
 from .prediction_service import PredictionService
+from .prediction_prefetcher import PredictionPrefetcher
+from config import (
+    PREDICTION_CACHE_HARD_TTL,
+    PREDICTION_CACHE_SOFT_TTL,
+    PREDICTION_DISK_CACHE,
+    PREDICTION_DISK_CACHE_WARM,
+    PREDICTION_REFRESH_WORKERS,
+)
+from utils.admission import SHED_REQUESTS, Overloaded, prediction_admission
+from utils.disk_cache import DiskCache
+from utils.health import readiness
+from utils.shared_cache import SharedCache
+from utils.metrics import metrics
+from utils.response_cache import ResponseCache
+from utils.singleflight import FlightTimeout, SingleFlight
+
+
+CACHE_REQUESTS = metrics.counter(
+    'prediction_cache_requests_total',
+    'Prediction cache lookups by result (hit, stale, expired, miss)',
+    ['result']
+)
+CACHE_REFRESHES = metrics.counter(
+    'prediction_cache_refreshes_total',
+    'Background refreshes of stale cached predictions, by outcome',
+    ['outcome']
+)
+DISK_CACHE_REQUESTS = metrics.counter(
+    'prediction_disk_cache_requests_total',
+    'Persistent prediction cache operations by result (hit, miss, write, error)',
+    ['result']
+)
+DISK_CACHE_WARMED = metrics.counter(
+    'prediction_disk_cache_warmed_total',
+    'Predictions loaded from the persistent cache by startup warm-up'
+)
+EXPORTED_PREDICTIONS = metrics.counter(
+    'prediction_export_students_total',
+    'Students scored by streaming exports'
+)
+
+# Cache lookup results
+FRESH = 'fresh'
+STALE = 'stale'
+
+# Admission budget of a background refresh (seconds): it only takes a slot
+# that frees up almost at once, so it is shed before interactive predictions
+REFRESH_BUDGET = 0.05
 
 
 class PredictionServiceServer:
     """Server-side wrapper for prediction service"""
     
-    def __init__(self):
-        """Initialize service server"""
+    def __init__(self, soft_ttl: float = PREDICTION_CACHE_SOFT_TTL,
+                 hard_ttl: float = PREDICTION_CACHE_HARD_TTL,
+                 refresh_workers: int = PREDICTION_REFRESH_WORKERS,
+                 disk_cache_path: str = PREDICTION_DISK_CACHE):
+        """
+        Initialize service server
+        
+        Args:
+            soft_ttl: Seconds a cached prediction is fresh
+            hard_ttl: Seconds a cached prediction may still be served stale
+                while it is refreshed in the background (<= soft_ttl
+                disables stale serving)
+            refresh_workers: Threads running background refreshes
+            disk_cache_path: sqlite file for the persistent tier ('' disables)
+        """
         self.service = PredictionService()
         self._prediction_cache = {}
-        self._cache_ttl = 300  # 5 minutes cache
+        self._cache_ttl = soft_ttl
+        self._cache_hard_ttl = max(soft_ttl, hard_ttl)
+        # Concurrent misses for one student share a single model call
+        self._flights = SingleFlight('predictions')
+        self._refresh_workers = max(1, refresh_workers)
+        self._refresh_pool: Optional[ThreadPoolExecutor] = None
+        self._refresh_pool_lock = threading.Lock()
+        # Refreshes submitted but not finished (a flight only exists once one starts)
+        self._pending_refresh = set()
+        self._pending_refresh_lock = threading.Lock()
+        self.prefetcher = PredictionPrefetcher()
+        # Shared memory tier across pre-forked workers (attached by serve.py before forking)
+        self.shared_cache: Optional[SharedCache] = None
+        # Shared cache invalidations already applied to this worker's own copies
+        self._shared_invalidations = 0
+        # Persistent tier: read through on memory misses, written through on every prediction
+        self.disk_cache = self._open_disk_cache(disk_cache_path)
+        self._warm_thread: Optional[threading.Thread] = None
+        # Encoded prediction responses; entries expire with the cached prediction
+        self.response_cache = ResponseCache('predictions')
     
-    def process_prediction_request(self, student_data: Dict) -> Dict:
+    def process_prediction_request(self, student_data: Dict, version: Optional[tuple] = None,
+                                   deadline: Optional[float] = None) -> Dict:
         """
         Process prediction request with caching and logging
         
+        Fresh cache hits are returned directly. Stale hits (past the soft
+        TTL, within the hard TTL) are returned too, while one background
+        refresh recomputes them. Misses are coalesced per student: one
+        caller waits for an admission slot and runs the model, concurrent
+        callers for the same student wait for its result.
+        
         Args:
             student_data: Student data for prediction
+            version: Optional (model version, data version) the student data
+                was read under; a cached prediction made under a different
+                version is treated as expired
+            deadline: Optional time.monotonic() by which a miss must be served
             
         Returns:
             Prediction result
+            
+        Raises:
+            Overloaded: The prediction was shed by admission control, or
+                the deadline passed while waiting for another caller's
         """
         roll_no = student_data.get('roll_no', student_data.get('student_id'))
         
         # Check cache
-        cached_result = self._get_from_cache(roll_no)
+        cached_result, state = self._lookup(roll_no, version)
         if cached_result:
-            cached_result['from_cache'] = True
-            return cached_result
+            if state == STALE:
+                self._schedule_refresh(roll_no, student_data, version)
+            self._claim_prefetch(roll_no)
+            return dict(cached_result, from_cache=True)
+        
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            prediction, shared = self._flights.do(
+                (roll_no, version), lambda: self._predict_and_cache(roll_no, student_data, version, deadline),
+                timeout
+            )
+        except FlightTimeout:
+            # Shed while waiting for another caller's prediction, not by the limiter itself
+            SHED_REQUESTS.inc((prediction_admission.name, 'flight_timeout'))
+            raise Overloaded('flight_timeout', 1)
         
-        # Make prediction
-        prediction = self.service.predict_dropout_risk(student_data)
+        # Followers get their own copy of the leader's result
+        return dict(prediction) if shared else prediction
+    
+    def _predict_and_cache(self, roll_no: str, student_data: Dict, version: Optional[tuple] = None,
+                           deadline: Optional[float] = None) -> Dict:
+        """Run the model for one student behind admission control and cache the result"""
+        with prediction_admission.admit(deadline):
+            prediction = self.service.predict_dropout_risk(student_data)
         
         # Add metadata
         prediction['timestamp'] = datetime.now().isoformat()
@@ -47,44 +166,468 @@ class PredictionServiceServer:
         
         # Cache result
         if not prediction.get('error'):
-            self._add_to_cache(roll_no, prediction)
+            self._add_to_cache(roll_no, prediction, version)
         
         return prediction
     
-    def _get_from_cache(self, roll_no: str) -> Optional[Dict]:
-        """Get prediction from cache if available and not expired"""
-        if roll_no not in self._prediction_cache:
+    def _schedule_refresh(self, roll_no: str, student_data: Dict, version: Optional[tuple] = None):
+        """Recompute a stale prediction in the background, unless already queued or under way"""
+        key = (roll_no, version)
+        with self._pending_refresh_lock:
+            if key in self._pending_refresh or self._flights.in_flight(key):
+                return
+            self._pending_refresh.add(key)
+        try:
+            self._get_refresh_pool().submit(self._refresh, roll_no, student_data, version)
+        except BaseException:
+            with self._pending_refresh_lock:
+                self._pending_refresh.discard(key)
+            raise
+    
+    def _get_refresh_pool(self) -> ThreadPoolExecutor:
+        """Create the refresh pool on first use (after serve.py has forked its workers)"""
+        if self._refresh_pool is None:
+            with self._refresh_pool_lock:
+                if self._refresh_pool is None:
+                    self._refresh_pool = ThreadPoolExecutor(max_workers=self._refresh_workers,
+                                                            thread_name_prefix='prediction-refresh')
+        return self._refresh_pool
+    
+    def _refresh(self, roll_no: str, student_data: Dict, version: Optional[tuple] = None):
+        """
+        Background refresh; on failure the stale entry stays until the hard TTL
+        
+        Skipped if a request refreshed the entry while this one queued. The
+        prediction gets a short admission budget, so under load it is shed
+        rather than take a slot an interactive prediction is waiting for.
+        """
+        try:
+            _, state = self._lookup(roll_no, version, record=False)
+            if state == FRESH:
+                CACHE_REFRESHES.inc(('coalesced',))
+                return
+            deadline = time.monotonic() + REFRESH_BUDGET
+            _, shared = self._flights.do(
+                (roll_no, version), lambda: self._predict_and_cache(roll_no, student_data, version, deadline)
+            )
+            CACHE_REFRESHES.inc(('coalesced' if shared else 'refreshed',))
+        except Overloaded:
+            CACHE_REFRESHES.inc(('shed',))
+        except Exception as e:
+            CACHE_REFRESHES.inc(('failed',))
+            print(f"⚠️  Background refresh failed for {roll_no}: {str(e)}")
+        finally:
+            with self._pending_refresh_lock:
+                self._pending_refresh.discard((roll_no, version))
+    
+    def prefetch(self, student_data: Dict, version: Optional[tuple] = None) -> str:
+        """
+        Speculatively predict a student in the background
+        
+        Skipped when the prediction is already cached fresh or being
+        computed, or when predictions are queueing for admission or bulk
+        chunks are waiting for a bulk worker (the speculative work would
+        only add to the backlog).
+        
+        Prefetches coalesce among themselves only: an interactive request
+        never waits for one, since a prefetch queues behind bulk work (it
+        runs its own prediction instead).
+        
+        Args:
+            student_data: Student data for prediction
+            version: Optional (model version, data version), as for
+                process_prediction_request
+            
+        Returns:
+            Outcome: 'queued', 'cached', 'busy', 'queue_full' or 'duplicate'
+        """
+        roll_no = student_data.get('roll_no', student_data.get('student_id'))
+        
+        cached_data = self._prediction_cache.get(roll_no)
+        if (cached_data is not None and cached_data.get('version') == version and
+                datetime.now().timestamp() - cached_data.get('cache_time', 0) <= self._cache_ttl) or \
+                self._flights.in_flight((roll_no, version)):
+            self.prefetcher.record('cached')
+            return 'cached'
+        if prediction_admission.waiting or self.service.scheduler.bulk_queued:
+            self.prefetcher.record('busy')
+            return 'busy'
+        
+        return self.prefetcher.submit(roll_no, lambda: self._run_prefetch(roll_no, student_data, version))
+    
+    def _run_prefetch(self, roll_no: str, student_data: Dict, version: Optional[tuple] = None) -> str:
+        """Score one prefetched student as bulk work and cache it, marked as prefetched"""
+        def predict():
+            started = datetime.now().timestamp()
+            prediction = self.service.predict_bulk([student_data])[0]
+            prediction['timestamp'] = datetime.now().isoformat()
+            prediction['from_cache'] = False
+            if prediction.get('error'):
+                raise RuntimeError(prediction.get('message', 'Prediction failed'))
+            # A request may have predicted it meanwhile; keep that entry
+            cached_data = self._prediction_cache.get(roll_no)
+            if cached_data is not None and cached_data.get('version') == version and \
+                    cached_data.get('cache_time', 0) >= started:
+                return None
+            self._add_to_cache(roll_no, prediction, version, prefetched=True)
+            return prediction
+        
+        # Keyed apart from interactive flights, which must not queue behind bulk work
+        prediction, shared = self._flights.do(('prefetch', roll_no, version), predict)
+        return 'cached' if shared or prediction is None else 'completed'
+    
+    def _claim_prefetch(self, roll_no: str):
+        """Count a request served by a prefetched prediction (once per prefetch)"""
+        cached_data = self._prediction_cache.get(roll_no)
+        if cached_data is not None and cached_data.pop('prefetched', False):
+            self.prefetcher.record('used')
+    
+    def _discard_prefetch(self, cached_data: Optional[Dict]):
+        """Count a prefetched prediction dropped or gone stale before any request used it"""
+        if cached_data is not None and cached_data.pop('prefetched', False):
+            self.prefetcher.record('wasted')
+    
+    def _lookup(self, roll_no: str, version: Optional[tuple] = None,
+                record: bool = True) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        Look up a cached prediction
+        
+        Args:
+            roll_no: Student roll number
+            version: Optional (model version, data version) the entry must be made under
+            record: Count the lookup in prediction_cache_requests_total
+                (internal checks leave it out)
+        
+        Returns:
+            Tuple of (prediction, FRESH or STALE), or (None, None) if nothing
+            usable is cached (missing, past the hard TTL or made under
+            another version)
+        """
+        self.sync_invalidations()
+        cached_data = self._prediction_cache.get(roll_no)
+        if cached_data is None or (version is not None and cached_data.get('version') != version):
+            # Another worker, or this host before a restart, may have made it
+            cached_data = self._read_through(roll_no, version) or cached_data
+        if cached_data is None:
+            if record:
+                CACHE_REQUESTS.inc(('miss',))
+            return None, None
+        
+        age = datetime.now().timestamp() - cached_data.get('cache_time', 0)
+        
+        # Past the hard TTL, or made from an older model or store
+        if age > self._cache_hard_ttl or (version is not None and cached_data.get('version') != version):
+            self._discard_prefetch(self._prediction_cache.pop(roll_no, None))
+            if record:
+                CACHE_REQUESTS.inc(('expired',))
+            return None, None
+        
+        if age > self._cache_ttl and self.shared_cache is not None and version is not None:
+            # Another worker may have refreshed it already
+            fresher = self._read_shared(roll_no, version)
+            if fresher is not None and fresher['cache_time'] > cached_data.get('cache_time', 0):
+                self._discard_prefetch(cached_data)
+                cached_data = fresher
+                age = datetime.now().timestamp() - cached_data['cache_time']
+        
+        if age > self._cache_ttl:
+            self._discard_prefetch(cached_data)
+            if record:
+                CACHE_REQUESTS.inc(('stale',))
+            return cached_data.get('prediction'), STALE
+        
+        if record:
+            CACHE_REQUESTS.inc(('hit',))
+        return cached_data.get('prediction'), FRESH
+    
+    def _get_from_cache(self, roll_no: str, version: Optional[tuple] = None) -> Optional[Dict]:
+        """Get prediction from cache if available, fresh and made under version"""
+        prediction, state = self._lookup(roll_no, version)
+        return prediction if state == FRESH else None
+    
+    def _add_to_cache(self, roll_no: str, prediction: Dict, version: Optional[tuple] = None,
+                      prefetched: bool = False, persist: bool = True):
+        """
+        Add prediction to cache (prefetched entries are tracked until first used)
+        
+        Predictions made under a known version are also written to the
+        persistent tier, unless persist is False (the caller batches them).
+        The cache keeps its own copy, so callers may modify the prediction
+        they return.
+        """
+        self._discard_prefetch(self._prediction_cache.get(roll_no))
+        entry = {
+            'prediction': dict(prediction),
+            'cache_time': datetime.now().timestamp(),
+            'version': version
+        }
+        if prefetched:
+            entry['prefetched'] = True
+        self._prediction_cache[roll_no] = entry
+        if persist:
+            self._persist([(roll_no, entry)])
+    
+    # ------------------------------------------------------------------
+    # Shared memory and persistent tiers
+    # ------------------------------------------------------------------
+    
+    def attach_shared_cache(self, cache: SharedCache):
+        """
+        Share predictions with the other worker processes through cache
+        
+        Called by serve.py in the master before forking; the predictions
+        already in memory (e.g. warmed from disk) are copied in.
+        """
+        self.shared_cache = cache
+        self._shared_invalidations = cache.invalidations
+        cache.put_many(
+            (roll_no, entry['version'], entry['prediction'], entry['cache_time'])
+            for roll_no, entry in list(self._prediction_cache.items()) if entry['version'] is not None
+        )
+    
+    def sync_invalidations(self):
+        """
+        Drop this worker's copies of predictions if another worker cleared any
+        
+        A clear in one worker only reaches the others through the shared
+        table, so each worker checks its invalidation count before using
+        its in-memory predictions or encoded responses. It cannot tell which
+        roll numbers were cleared, so it drops them all; the ones still in
+        the shared table are read back on their next lookup.
+        """
+        if self.shared_cache is None:
+            return
+        invalidations = self.shared_cache.invalidations
+        if invalidations != self._shared_invalidations:
+            self._shared_invalidations = invalidations
+            self._clear_local()
+    
+    @staticmethod
+    def _open_disk_cache(path: str) -> Optional[DiskCache]:
+        """Open the persistent tier; predictions keep working in memory if it cannot be opened"""
+        if not path:
+            return None
+        try:
+            return DiskCache(path)
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️  Persistent prediction cache disabled ({path}): {str(e)}")
+            return None
+    
+    def _persist(self, entries: list):
+        """Write (roll_no, cache entry) pairs made under a known version to the shared and persistent tiers"""
+        rows = [
+            (roll_no, entry['version'], entry['prediction'], entry['cache_time'])
+            for roll_no, entry in entries if entry['version'] is not None
+        ]
+        if not rows:
+            return
+        if self.shared_cache is not None:
+            self.shared_cache.put_many(rows)
+        if self.disk_cache is None:
+            return
+        try:
+            self.disk_cache.put_many(rows)
+            DISK_CACHE_REQUESTS.inc(('write',), len(rows))
+        except sqlite3.Error as e:
+            DISK_CACHE_REQUESTS.inc(('error',))
+            print(f"⚠️  Persistent prediction cache write failed: {str(e)}")
+    
+    def _read_through(self, roll_no: str, version: Optional[tuple]) -> Optional[Dict]:
+        """Load a prediction made under version from the shared or persistent tier into memory"""
+        if version is None:
+            return None
+        return self._read_shared(roll_no, version) or self._read_disk(roll_no, version)
+    
+    def _read_shared(self, roll_no: str, version: tuple) -> Optional[Dict]:
+        """Load a prediction another worker made from the shared memory tier"""
+        if self.shared_cache is None:
+            return None
+        found = self.shared_cache.get(roll_no, version)
+        if found is None or datetime.now().timestamp() - found[1] > self._cache_hard_ttl:
+            return None
+        prediction, stored_at = found
+        entry = {'prediction': prediction, 'cache_time': stored_at, 'version': version}
+        self._prediction_cache[roll_no] = entry
+        return entry
+    
+    def _read_disk(self, roll_no: str, version: tuple) -> Optional[Dict]:
+        """Load a prediction from the persistent tier into memory (and the shared tier)"""
+        if self.disk_cache is None:
+            return None
+        try:
+            found = self.disk_cache.get(roll_no, version)
+        except sqlite3.Error:
+            DISK_CACHE_REQUESTS.inc(('error',))
+            return None
+        if found is None or datetime.now().timestamp() - found[1] > self._cache_hard_ttl:
+            DISK_CACHE_REQUESTS.inc(('miss',))
             return None
         
-        cached_data = self._prediction_cache[roll_no]
-        cache_time = cached_data.get('cache_time', 0)
+        DISK_CACHE_REQUESTS.inc(('hit',))
+        prediction, stored_at = found
+        entry = {'prediction': prediction, 'cache_time': stored_at, 'version': version}
+        self._prediction_cache[roll_no] = entry
+        if self.shared_cache is not None:
+            self.shared_cache.put(roll_no, version, prediction, stored_at)
+        return entry
+    
+    def start_warmup(self, version: Optional[tuple]) -> Optional[threading.Thread]:
+        """
+        Warm the in-memory cache from the persistent tier in a background thread
         
-        # Check if cache is expired
-        if (datetime.now().timestamp() - cache_time) > self._cache_ttl:
-            del self._prediction_cache[roll_no]
+        Args:
+            version: Current (model version, data version); only
+                predictions made under it are loaded
+            
+        Returns:
+            The warm-up thread, or None if warm-up is disabled or there is
+            nothing to warm from
+        """
+        if not PREDICTION_DISK_CACHE_WARM or self.disk_cache is None or version is None:
             return None
+        readiness.set('prediction_cache', False, 'Warming from disk')
+        self._warm_thread = threading.Thread(target=self._warm, args=(version,),
+                                             name='prediction-cache-warmup', daemon=True)
+        self._warm_thread.start()
+        return self._warm_thread
+    
+    def wait_for_warmup(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the warm-up started by start_warmup
         
-        return cached_data.get('prediction')
+        Returns:
+            True if no warm-up is running any more
+        """
+        if self._warm_thread is not None:
+            self._warm_thread.join(timeout)
+            return not self._warm_thread.is_alive()
+        return True
     
-    def _add_to_cache(self, roll_no: str, prediction: Dict):
-        """Add prediction to cache"""
-        self._prediction_cache[roll_no] = {
-            'prediction': prediction,
-            'cache_time': datetime.now().timestamp()
-        }
+    def _warm(self, version: tuple):
+        """Load current-version predictions within the hard TTL; drop rows of any version past it"""
+        start = time.perf_counter()
+        cutoff = datetime.now().timestamp() - self._cache_hard_ttl
+        loaded = 0
+        try:
+            self.disk_cache.purge(cutoff)
+            for roll_no, prediction, stored_at in self.disk_cache.scan(version, cutoff):
+                # Entries made since startup are newer than the persisted ones
+                self._prediction_cache.setdefault(
+                    roll_no, {'prediction': prediction, 'cache_time': stored_at, 'version': version}
+                )
+                loaded += 1
+        except sqlite3.Error as e:
+            DISK_CACHE_REQUESTS.inc(('error',))
+            print(f"⚠️  Prediction cache warm-up failed: {str(e)}")
+            return
+        finally:
+            # A failed warm-up only means colder caches; it must not hold back readiness
+            readiness.set('prediction_cache', True)
+        DISK_CACHE_WARMED.inc(amount=loaded)
+        print(f"🔥 Warmed {loaded} cached predictions from disk in {time.perf_counter() - start:.2f}s")
+    
+    def cache_version(self, data_version) -> Optional[tuple]:
+        """
+        Version tag for cached predictions
+        
+        Args:
+            data_version: Student store version the student was read under
+            
+        Returns:
+            (model version, data version), or None if no model is loaded
+        """
+        model_version = self.service.model_version()
+        return None if model_version is None else (model_version, data_version)
     
-    def clear_cache(self, roll_no: Optional[str] = None):
+    def clear_cache(self, roll_no: Optional[str] = None, persistent: bool = True):
         """
         Clear prediction cache
         
         Args:
             roll_no: Specific roll number to clear, or None to clear all
+            persistent: Also clear the persistent tier (a model reload
+                leaves it: rows made under another version are never read)
         """
+        if self.shared_cache is not None:
+            if roll_no:
+                self.shared_cache.delete(roll_no)
+            else:
+                self.shared_cache.clear()
+        
+        if persistent and self.disk_cache is not None:
+            try:
+                self.disk_cache.delete(roll_no)
+            except sqlite3.Error:
+                DISK_CACHE_REQUESTS.inc(('error',))
+        
+        # Last, so a concurrent lookup cannot read a cleared entry back from another tier
+        self._clear_local(roll_no)
+    
+    def _clear_local(self, roll_no: Optional[str] = None):
+        """Clear this worker's in-memory predictions and encoded responses"""
         if roll_no:
-            if roll_no in self._prediction_cache:
-                del self._prediction_cache[roll_no]
+            self._discard_prefetch(self._prediction_cache.pop(roll_no, None))
         else:
+            for cached_data in list(self._prediction_cache.values()):
+                self._discard_prefetch(cached_data)
             self._prediction_cache.clear()
+        self.response_cache.invalidate(roll_no)
+    
+    def get_cache_expiry(self, roll_no: str) -> Optional[float]:
+        """
+        Get when a cached prediction stops being fresh
+        
+        Returns:
+            Expiry (end of the soft TTL) as a time.time() value, or None if
+            nothing is cached
+        """
+        cached_data = self._prediction_cache.get(roll_no)
+        if cached_data is None:
+            return None
+        return cached_data.get('cache_time', 0) + self._cache_ttl
+    
+    def get_cache_max_age(self, roll_no: str) -> int:
+        """
+        Get how long a prediction may be reused by HTTP caches
+        
+        Returns:
+            Seconds until the cached prediction expires, or the full cache
+            TTL if nothing is cached (the next prediction starts a new one)
+        """
+        expiry = self.get_cache_expiry(roll_no)
+        if expiry is None:
+            return int(self._cache_ttl)
+        return max(0, int(expiry - datetime.now().timestamp()))
+    
+    def get_stale_window(self) -> int:
+        """
+        Get how long past expiry a cached prediction may still be served
+        
+        Returns:
+            Seconds between the soft and hard TTL (0 if stale serving is off)
+        """
+        return int(self._cache_hard_ttl - self._cache_ttl)
+    
+    def get_cache_stats(self) -> Dict:
+        """
+        Get prediction cache statistics
+        
+        Returns:
+            Hit, stale, miss and expiry counts with the resulting hit ratio
+            (stale hits are served from cache, so they count as hits)
+        """
+        stale = CACHE_REQUESTS.get(('stale',))
+        hits = CACHE_REQUESTS.get(('hit',)) + stale
+        misses = CACHE_REQUESTS.get(('miss',)) + CACHE_REQUESTS.get(('expired',))
+        lookups = hits + misses
+        
+        return {
+            'hits': int(hits),
+            'stale_hits': int(stale),
+            'misses': int(misses),
+            'hit_ratio': round(hits / lookups, 4) if lookups else 0.0,
+            'size': len(self._prediction_cache)
+        }
     
     def get_service_status(self) -> Dict:
         """
@@ -97,38 +640,149 @@ class PredictionServiceServer:
             'model_loaded': self.service.is_model_loaded(),
             'cache_size': len(self._prediction_cache),
             'cache_ttl': self._cache_ttl,
+            'cache_hard_ttl': self._cache_hard_ttl,
+            'shared_cache_slots': self.shared_cache.slots if self.shared_cache is not None else None,
+            'disk_cache': self.disk_cache.path if self.disk_cache is not None else None,
             'model_info': self.service.get_model_info()
         }
     
-    def batch_predict(self, students_data: list[Dict]) -> list[Dict]:
+    def batch_predict(self, students_data: list[Dict],
+                      score: Optional[Callable[[list[Dict]], list[Dict]]] = None,
+                      version: Optional[tuple] = None) -> list[Dict]:
         """
         Process batch prediction requests
         
+        Fresh cached predictions are reused; the remaining students are scored
+        as bulk work (in chunks that yield to interactive predictions) and
+        added to the cache.
+        
         Args:
             students_data: List of student data dictionaries
+            score: Optional callable scoring a chunk of students, in order
+                (defaults to PredictionService.predict_batch)
+            version: Optional (model version, data version), as for
+                process_prediction_request
             
         Returns:
-            List of prediction results
+            List of prediction results, in input order
+        """
+        predictions: list[Optional[Dict]] = [None] * len(students_data)
+        misses = []
+        
+        for index, student_data in enumerate(students_data):
+            roll_no = student_data.get('roll_no', student_data.get('student_id'))
+            cached_result = self._get_from_cache(roll_no, version)
+            if cached_result:
+                predictions[index] = dict(cached_result, from_cache=True)
+            else:
+                misses.append(index)
+        
+        if misses:
+            try:
+                scored = self.service.predict_bulk([students_data[index] for index in misses], score)
+            except Exception as e:
+                scored = [{'error': True, 'message': f'Prediction failed: {str(e)}'} for _ in misses]
+            
+            timestamp = datetime.now().isoformat()
+            cached = []
+            for index, prediction in zip(misses, scored):
+                prediction['timestamp'] = timestamp
+                prediction['from_cache'] = False
+                if not prediction.get('error'):
+                    student_data = students_data[index]
+                    roll_no = student_data.get('roll_no', student_data.get('student_id'))
+                    self._add_to_cache(roll_no, prediction, version, persist=False)
+                    cached.append((roll_no, self._prediction_cache[roll_no]))
+                predictions[index] = prediction
+            
+            # One transaction for the whole batch
+            self._persist(cached)
+        
+        return [
+            {
+                'roll_no': student_data.get('roll_no'),
+                'prediction': prediction,
+                'success': not prediction.get('error', False)
+            }
+            for student_data, prediction in zip(students_data, predictions)
+        ]
+
+    def stream_predictions(self, students: Iterable[Dict], chunk_size: int = 100,
+                           score: Optional[Callable[[list[Dict]], list[Dict]]] = None) -> Iterator[list[Dict]]:
         """
-        results = []
+        Score students in fixed-size chunks, yielding each chunk as it completes
         
-        for student_data in students_data:
+        Only one chunk is held at a time, so memory stays flat however many
+        students are exported. Exports bypass the prediction cache: caching
+        a whole cohort would defeat the point of streaming it. Chunks are
+        scored as bulk work, behind interactive predictions.
+        
+        Args:
+            students: Iterable of student data dictionaries
+            chunk_size: Students per yielded chunk
+            score: Optional callable scoring a list of students, in order
+                (defaults to PredictionService.predict_batch)
+            
+        Yields:
+            Lists of results shaped like batch_predict's, one per chunk
+        """
+        iterator = iter(students)
+        
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return
+            
             try:
-                prediction = self.process_prediction_request(student_data)
+                predictions = self.service.predict_bulk(chunk, score)
+            except Exception as e:
+                predictions = [{'error': True, 'message': f'Prediction failed: {str(e)}'} for _ in chunk]
+            
+            timestamp = datetime.now().isoformat()
+            results = []
+            for student_data, prediction in zip(chunk, predictions):
+                prediction['timestamp'] = timestamp
+                prediction['from_cache'] = False
                 results.append({
                     'roll_no': student_data.get('roll_no'),
                     'prediction': prediction,
                     'success': not prediction.get('error', False)
                 })
-            except Exception as e:
-                results.append({
-                    'roll_no': student_data.get('roll_no'),
-                    'error': str(e),
-                    'success': False
-                })
-        
-        return results
+            
+            EXPORTED_PREDICTIONS.inc(amount=len(chunk))
+            yield results
 
 
 # Create singleton instance
 prediction_service_server = PredictionServiceServer()
+
+metrics.gauge(
+    'prediction_cache_hit_ratio',
+    'Fraction of prediction cache lookups served from cache',
+    function=lambda: {(): prediction_service_server.get_cache_stats()['hit_ratio']}
+)
+metrics.gauge(
+    'prediction_scheduler_bulk_queued',
+    'Bulk prediction chunks waiting for a bulk worker',
+    function=lambda: {(): prediction_service_server.service.scheduler.bulk_queued}
+)
+metrics.gauge(
+    'prediction_scheduler_interactive_active',
+    'Interactive predictions running (bulk chunks hold back while nonzero)',
+    function=lambda: {(): prediction_service_server.service.scheduler.interactive_active}
+)
+metrics.gauge(
+    'prediction_prefetch_hit_ratio',
+    'Fraction of completed prefetches later used by a prediction request',
+    function=lambda: {(): prediction_service_server.prefetcher.stats()['hit_ratio']}
+)
+metrics.gauge(
+    'prediction_prefetch_queue_depth',
+    'Prefetches queued or running',
+    function=lambda: {(): len(prediction_service_server.prefetcher._queued)}
+)
+metrics.gauge(
+    'prediction_cache_entries',
+    'Number of predictions currently cached',
+    function=lambda: {(): len(prediction_service_server._prediction_cache)}
+)
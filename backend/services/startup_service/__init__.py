@@ -0,0 +1,5 @@
+"""Startup service package"""
+
+from .startup_service import StartupWarmup
+
+__all__ = ['StartupWarmup']
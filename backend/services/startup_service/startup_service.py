@@ -0,0 +1,111 @@
+"""
+Startup Service Module
+======================
+
+This module provides StartupWarmup, which runs the expensive parts of
+starting the application - loading the student store and the model, a
+warm-up inference pass, refilling caches - as named steps on a background
+thread. Importing the app stays cheap, the server can accept connections
+(and answer liveness probes) at once, and readiness reports 503 until the
+steps have run.
+
+Steps run in order. A failing step is recorded and the remaining steps
+still run: each component reports its own readiness (a model that failed
+to load keeps /api/ready at 503), so the warm-up only has to say when it
+is done.
+
+Usage:
+    warmup = StartupWarmup()
+    warmup.add_step('model', service.ensure_model)
+    warmup.start()          # background thread
+    warmup.wait()           # e.g. before forking workers
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.health import readiness
+
+
+PENDING = 'pending'
+RUNNING = 'running'
+FINISHED = 'finished'
+
+
+class StartupWarmup:
+    """Ordered startup steps run once on a background thread"""
+
+    def __init__(self):
+        """Initialize with no steps"""
+        self._steps: List[Tuple[str, Callable[[], object]]] = []
+        self._results: Dict[str, Dict] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.state = PENDING
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def add_step(self, name: str, func: Callable[[], object]):
+        """
+        Add a step
+
+        Args:
+            name: Step name (reported in stats and metrics)
+            func: Callable run on the warm-up thread
+        """
+        self._steps.append((name, func))
+
+    def start(self) -> threading.Thread:
+        """Run the steps on a background thread (once; later calls return the same thread)"""
+        with self._lock:
+            if self._thread is None:
+                readiness.set('startup', False, 'Warming up')
+                self._thread = threading.Thread(target=self.run, name='startup-warmup', daemon=True)
+                self._thread.start()
+            return self._thread
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the steps started by start()
+
+        Returns:
+            True if the warm-up has finished
+        """
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.state == FINISHED
+
+    def run(self):
+        """Run every step in order, recording how long each took"""
+        self.state = RUNNING
+        self.started_at = time.time()
+        for name, func in self._steps:
+            start = time.perf_counter()
+            error = None
+            try:
+                func()
+            except Exception as e:
+                error = str(e)
+                print(f"⚠️  Startup step '{name}' failed: {error}")
+            self._results[name] = {'seconds': round(time.perf_counter() - start, 4), 'error': error}
+        self.finished_at = time.time()
+        self.state = FINISHED
+        readiness.set('startup', True)
+        print(f"✅ Startup warm-up finished in {self.finished_at - self.started_at:.2f}s")
+
+    def step_seconds(self) -> Dict[str, float]:
+        """Seconds each finished step took"""
+        return {name: result['seconds'] for name, result in self._results.items()}
+
+    def stats(self) -> Dict:
+        """State, per-step timings and total warm-up time"""
+        total = None
+        if self.finished_at is not None:
+            total = round(self.finished_at - self.started_at, 4)
+        return {
+            'state': self.state,
+            'steps': [dict(self._results.get(name, {}), name=name) for name, _ in self._steps],
+            'total_seconds': total,
+        }
@@ -0,0 +1,106 @@
+"""
+Startup Service Server Module
+=============================
+
+This module defines the application's startup warm-up on a StartupWarmup:
+
+    student_store     - read and parse the student store
+    model             - load the model artifacts (unpickling the model is
+                        what imports scikit-learn)
+    inference         - score one student, then a small batch, and format
+                        and encode the result, so the first real request
+                        does not pay for first-call costs (lazy imports,
+                        allocator and code-path warm-up) and its latency
+                        matches steady state (STARTUP_WARMUP_INFERENCE)
+    prediction_cache  - refill the in-memory prediction cache from the
+                        persistent tier (PREDICTION_DISK_CACHE_WARM)
+
+server.py starts the warm-up when it is imported (unless STARTUP_WARMUP
+is off, in which case everything loads on first use); asgi.py starts it
+from its lifespan handler and serve.py waits for it before forking.
+"""
+
+from typing import Optional
+
+from config import STARTUP_WARMUP, STARTUP_WARMUP_BATCH, STARTUP_WARMUP_INFERENCE
+from schemas.prediction_schema.prediction_schema import PredictionSchema
+from services.prediction_service.prediction_service_server import prediction_service_server
+from services.student_service.student_service_server import student_service_server
+from utils.metrics import metrics
+from utils.serialization import json_encoder
+from .startup_service import StartupWarmup
+
+
+class StartupServiceServer:
+    """Server class for the startup warm-up"""
+
+    def __init__(self):
+        """Initialize the warm-up with the application's steps"""
+        self.service = StartupWarmup()
+        self.student_service = student_service_server.service
+        self.prediction_server = prediction_service_server
+
+        self.service.add_step('student_store', self.student_service.load_students)
+        self.service.add_step('model', self._load_model)
+        if STARTUP_WARMUP_INFERENCE:
+            self.service.add_step('inference', self.warm_inference)
+        self.service.add_step('prediction_cache', self._warm_prediction_cache)
+
+    def start(self):
+        """Start the warm-up in the background, unless STARTUP_WARMUP is off"""
+        if STARTUP_WARMUP:
+            self.service.start()
+
+    def finish(self, timeout: Optional[float] = None) -> bool:
+        """
+        Run the warm-up to completion, starting it if needed
+
+        Returns:
+            True if the warm-up has finished
+        """
+        self.service.start()
+        return self.service.wait(timeout)
+
+    def _load_model(self):
+        """Load the model, warning if it cannot be"""
+        if not self.prediction_server.service.ensure_model():
+            print("\n⚠️  WARNING: ML Model not loaded!")
+            print("   The system will run but predictions may not work correctly.")
+            print("   Please ensure model files exist in backend/ml/saved_models/")
+
+    def warm_inference(self) -> int:
+        """
+        Run predictions through the model without touching any cache
+
+        Returns:
+            Number of students scored
+        """
+        service = self.prediction_server.service
+        if not service.ensure_model():
+            return 0
+        students = list(self.student_service.load_students().get('students', {}).values())
+        if not students:
+            return 0
+
+        prediction = service.predict_dropout_risk(students[0])
+        json_encoder.dumps(PredictionSchema.format_response(prediction))
+        batch = students[:max(1, STARTUP_WARMUP_BATCH)]
+        service.predict_batch(batch)
+        return 1 + len(batch)
+
+    def _warm_prediction_cache(self):
+        """Refill the prediction cache from the persistent tier"""
+        version = self.prediction_server.cache_version(self.student_service.data_version())
+        self.prediction_server.start_warmup(version)
+        self.prediction_server.wait_for_warmup()
+
+
+# Create singleton instance
+startup_service_server = StartupServiceServer()
+
+metrics.gauge(
+    'startup_step_seconds',
+    'Time each startup warm-up step took',
+    ['step'],
+    function=lambda: {(name,): seconds for name, seconds in startup_service_server.service.step_seconds().items()}
+)
@@ -5,9 +5,22 @@ Student Service Module
 This module provides business logic for student-related operations.
 """
 
+import hashlib
 import json
 import os
-from typing import Dict, List, Optional
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+from config import DATABASE_PATH
+from utils.health import readiness
+from utils.metrics import metrics
+
+
+STORE_LOAD_SECONDS = metrics.histogram(
+    'student_store_load_seconds',
+    'Time spent loading the student store from disk'
+)
 
 
 class StudentService:
@@ -16,26 +29,75 @@ class StudentService:
     def __init__(self, db_path: Optional[str] = None):
         """Initialize student service"""
         if db_path is None:
-            db_path = os.path.join(
-                os.path.dirname(__file__), 
-                '..', '..', 
-                'database', 
-                'students_data.json'
-            )
+            db_path = str(DATABASE_PATH)
         self.db_path = db_path
         self._students_cache = None
+        # (mtime_ns, size) the cache was read at: the cheap check for a changed file
+        self._file_stat = None
+        # Content hash of the file: the version the store is identified by
+        self._cache_version = None
+        self._modified_at = None
+        self._load_lock = threading.Lock()
+        readiness.set('student_store', False, 'Not loaded yet')
     
     def load_students(self) -> Dict:
-        """Load student data from JSON file"""
+        """
+        Load student data from JSON file
+        
+        The parsed data is kept in memory and only re-read when the file's
+        modification time or size changes, so repeated calls cost one stat().
+        Its version is a hash of the file's contents, so a rewrite with the
+        same bytes (e.g. a deploy) keeps the version.
+        """
         try:
-            with open(self.db_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            stat = os.stat(self.db_path)
+        except OSError:
+            readiness.set('student_store', False, 'Store file not found')
+            return {'students': {}, 'metadata': {}}
+        
+        file_stat = (stat.st_mtime_ns, stat.st_size)
+        if self._students_cache is not None and self._file_stat == file_stat:
+            return self._students_cache
+        
+        with self._load_lock:
+            # Another thread may have loaded this version while we waited
+            if self._students_cache is not None and self._file_stat == file_stat:
+                return self._students_cache
+            
+            start = time.perf_counter()
+            try:
+                with open(self.db_path, 'rb') as f:
+                    raw = f.read()
+                data = json.loads(raw.decode('utf-8'))
                 self._students_cache = data
+                self._cache_version = hashlib.blake2b(raw, digest_size=16).hexdigest()
+                self._file_stat = file_stat
+                self._modified_at = stat.st_mtime
+                readiness.set('student_store', True)
                 return data
-        except FileNotFoundError:
-            return {'students': {}, 'metadata': {}}
-        except json.JSONDecodeError:
-            return {'students': {}, 'metadata': {}}
+            except FileNotFoundError:
+                readiness.set('student_store', False, 'Store file not found')
+                return {'students': {}, 'metadata': {}}
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                readiness.set('student_store', False, 'Store file is not valid JSON')
+                return {'students': {}, 'metadata': {}}
+            finally:
+                STORE_LOAD_SECONDS.observe(time.perf_counter() - start)
+    
+    def data_version(self) -> Optional[str]:
+        """
+        Version of the student store currently on disk
+        
+        Returns:
+            Content hash of the store file, or None if the store cannot be loaded
+        """
+        self.load_students()
+        return self._cache_version
+    
+    def modified_at(self) -> Optional[float]:
+        """Modification time of the loaded store file, or None if the store cannot be loaded"""
+        self.load_students()
+        return self._modified_at
     
     def get_student_by_roll_no(self, roll_no: str) -> Optional[Dict]:
         """Get student by roll number"""
@@ -43,6 +105,59 @@ class StudentService:
         students = students_data.get('students', {})
         return students.get(roll_no)
     
+    def get_students_by_roll_nos(self, roll_nos: List[str]) -> Dict[str, Dict]:
+        """
+        Get several students with a single store access
+        
+        Args:
+            roll_nos: Roll numbers to look up
+            
+        Returns:
+            Dictionary of roll number to student data; unknown roll numbers
+            are left out
+        """
+        students = self.load_students().get('students', {})
+        return {
+            roll_no: students[roll_no]
+            for roll_no in roll_nos
+            if roll_no in students
+        }
+    
+    def filter_students(self, filters: Dict) -> List[Dict]:
+        """
+        Get the full records of all students matching a filter
+        
+        Args:
+            filters: Any of course, year and roll_prefix; a student must
+                match all of the given keys
+            
+        Returns:
+            Matching student data, in store order
+        """
+        return list(self.iter_students(filters))
+    
+    def iter_students(self, filters: Optional[Dict] = None) -> Iterator[Dict]:
+        """
+        Yield the full records of students matching a filter, lazily
+        
+        Args:
+            filters: Optional filter as for filter_students
+            
+        Yields:
+            Matching student data, in store order
+        """
+        students = self.load_students().get('students', {})
+        filters = filters or {}
+        course = filters.get('course')
+        year = filters.get('year')
+        roll_prefix = filters.get('roll_prefix')
+        
+        for roll_no, data in students.items():
+            if (course is None or data.get('course') == course) and \
+               (year is None or str(data.get('year')) == str(year)) and \
+               (roll_prefix is None or roll_no.startswith(roll_prefix)):
+                yield data
+    
     def get_all_students(self) -> List[Dict]:
         """Get all students"""
         students_data = self.load_students()
@@ -8,6 +8,7 @@ It acts as a bridge between routes and the core service logic.
 
 from typing import Dict, List, Optional
 from .student_service import StudentService
+from utils.response_cache import ResponseCache
 
 
 class StudentServiceServer:
@@ -16,6 +17,8 @@ class StudentServiceServer:
     def __init__(self):
         """Initialize service server"""
         self.service = StudentService()
+        # Encoded student responses, keyed by the store version they came from
+        self.response_cache = ResponseCache('students')
     
     def process_student_request(self, roll_no: str) -> Dict:
         """
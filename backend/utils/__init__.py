@@ -14,6 +14,7 @@ from .helpers import (
     get_risk_emoji,
     validate_roll_number
 )
+from .metrics import metrics
 
 __all__ = [
     'load_json_file',
@@ -22,5 +23,6 @@ __all__ = [
     'format_percentage',
     'get_risk_color',
     'get_risk_emoji',
-    'validate_roll_number'
+    'validate_roll_number',
+    'metrics'
 ]
@@ -0,0 +1,195 @@
+"""
+Admission Control Module
+========================
+
+This module provides the concurrency limiter in front of prediction work.
+At most max_concurrent predictions run at once; up to max_queue more wait
+their turn, and everything beyond that is shed immediately instead of
+queueing until every request is slow.
+
+Each request brings a deadline. A request is shed on arrival when its
+expected queue wait (queue position x average service time) plus its own
+service time would already overrun it, and while waiting once there is no
+longer time to serve it. Shedding raises Overloaded with a Retry-After
+estimate, which routes turn into 503.
+
+Only work that misses the caches goes through the limiter; cache hits,
+304s and health checks never wait behind model inference.
+
+Usage:
+    from utils.admission import Overloaded, prediction_admission
+
+    try:
+        with prediction_admission.admit(deadline):
+            prediction = service.predict_dropout_risk(student)
+    except Overloaded as e:
+        return {'error': 'Server busy', 'retry_after': e.retry_after}, 503
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from config import PREDICT_CONCURRENCY, PREDICT_QUEUE_SIZE, PREDICT_TIMEOUT_MS
+from utils.metrics import metrics
+
+
+SHED_REQUESTS = metrics.counter(
+    'admission_shed_total',
+    'Requests rejected by admission control, by limiter and reason',
+    ['limiter', 'reason']
+)
+QUEUE_WAIT_SECONDS = metrics.histogram(
+    'admission_queue_wait_seconds',
+    'Time admitted requests waited for a slot, by limiter',
+    ['limiter']
+)
+
+# Every limiter, for the in-flight and queue depth gauges
+_limiters = []
+
+# Weight of the newest service time in the running average
+EWMA_ALPHA = 0.2
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed; retry_after is in whole seconds"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f'Request shed ({reason}); retry after {retry_after}s')
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Concurrency limiter with a bounded wait queue and deadline-aware shedding"""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, timeout: float):
+        """
+        Initialize limiter
+
+        Args:
+            name: Limiter name used in metrics
+            max_concurrent: Requests served at once
+            max_queue: Requests allowed to wait for a slot
+            timeout: Default budget in seconds for requests without a deadline
+        """
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self._service_time = 0.0  # running average, seconds
+        self._cond = threading.Condition()
+        _limiters.append(self)
+
+    def deadline(self, budget_ms: Optional[float] = None) -> float:
+        """
+        Absolute deadline (time.monotonic()) for a request starting now
+
+        Args:
+            budget_ms: Client-requested budget; can only shorten the default
+        """
+        budget = self.timeout
+        if budget_ms is not None and budget_ms > 0:
+            budget = min(budget, budget_ms / 1000)
+        return time.monotonic() + budget
+
+    @contextmanager
+    def admit(self, deadline: Optional[float] = None) -> Iterator[None]:
+        """
+        Hold a slot for the duration of the block
+
+        Args:
+            deadline: time.monotonic() by which the request should be served
+                (defaults to now plus the limiter's timeout)
+
+        Raises:
+            Overloaded: The queue is full or the deadline cannot be met
+        """
+        self._acquire(deadline if deadline is not None else time.monotonic() + self.timeout)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._release(time.perf_counter() - start)
+
+    def _acquire(self, deadline: float):
+        """Take a slot, waiting in the queue if needed"""
+        arrived = time.monotonic()
+        with self._cond:
+            if self.active < self.max_concurrent and not self.waiting:
+                self.active += 1
+                return
+
+            if self.waiting >= self.max_queue:
+                self._shed('queue_full')
+            # Latest start that still finishes in time
+            start_by = deadline - self._service_time
+            if arrived + self._expected_wait(self.waiting + 1) > start_by:
+                self._shed('deadline')
+
+            self.waiting += 1
+            try:
+                while self.active >= self.max_concurrent:
+                    remaining = start_by - time.monotonic()
+                    if remaining <= 0:
+                        self._shed('timeout')
+                    self._cond.wait(remaining)
+                self.active += 1
+            finally:
+                self.waiting -= 1
+
+        QUEUE_WAIT_SECONDS.observe(time.monotonic() - arrived, (self.name,))
+
+    def _release(self, service_time: float):
+        """Free a slot and fold its service time into the average"""
+        with self._cond:
+            self.active -= 1
+            if self._service_time:
+                self._service_time += EWMA_ALPHA * (service_time - self._service_time)
+            else:
+                self._service_time = service_time
+            self._cond.notify()
+
+    def _expected_wait(self, position: int) -> float:
+        """Seconds until the request at this queue position gets a slot"""
+        return math.ceil(position / self.max_concurrent) * self._service_time
+
+    def _shed(self, reason: str):
+        """Count and raise a rejection (called with the lock held)"""
+        SHED_REQUESTS.inc((self.name, reason))
+        retry_after = max(1, math.ceil(self._expected_wait(self.waiting + 1)))
+        raise Overloaded(reason, retry_after)
+
+    def stats(self) -> Dict:
+        """Slots, queue and average service time"""
+        return {
+            'max_concurrent': self.max_concurrent,
+            'max_queue': self.max_queue,
+            'active': self.active,
+            'waiting': self.waiting,
+            'service_time_ms': round(self._service_time * 1000, 3),
+        }
+
+
+metrics.gauge(
+    'admission_in_flight',
+    'Requests holding an admission slot, by limiter',
+    ['limiter'],
+    function=lambda: {(limiter.name,): limiter.active for limiter in _limiters}
+)
+metrics.gauge(
+    'admission_queue_depth',
+    'Requests waiting for an admission slot, by limiter',
+    ['limiter'],
+    function=lambda: {(limiter.name,): limiter.waiting for limiter in _limiters}
+)
+
+# Predictions that miss the cache (single predictions and dashboards)
+prediction_admission = AdmissionController(
+    'predict', PREDICT_CONCURRENCY, PREDICT_QUEUE_SIZE, PREDICT_TIMEOUT_MS / 1000
+)
@@ -0,0 +1,395 @@
+"""
+ASGI Server Module
+==================
+
+A small HTTP/1.1 server for ASGI applications, built on asyncio streams so it
+needs nothing outside the standard library. Every connection is a coroutine,
+so idle keep-alive connections cost a few kilobytes rather than a thread.
+
+Supported:
+    - ASGI 3 `http` and `lifespan` scopes
+    - keep-alive, Content-Length request bodies, chunked streaming responses
+    - graceful shutdown on SIGTERM/SIGINT (in-flight requests are finished)
+
+Not supported: HTTP/2, WebSockets, chunked request bodies, TLS.
+
+Usage:
+    from utils.asgi_server import serve
+    asyncio.run(serve(app, '0.0.0.0', 8000))
+"""
+
+import asyncio
+import signal
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+
+MAX_HEAD_BYTES = 64 * 1024
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+
+class HTTPError(Exception):
+    """Malformed or unsupported request"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _reason(status: int) -> str:
+    """Reason phrase for a status code"""
+    try:
+        return HTTPStatus(status).phrase
+    except ValueError:
+        return ''
+
+
+def parse_request_head(head: bytes) -> Tuple[str, str, str, List[Tuple[bytes, bytes]]]:
+    """
+    Parse the request line and headers
+
+    Args:
+        head: Raw bytes up to and including the blank line
+
+    Returns:
+        Tuple of (method, target, http_version, headers); header names are lower-cased
+    """
+    lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, target, version = lines[0].split(' ')
+    except ValueError:
+        raise HTTPError(400, 'Malformed request line')
+    if not version.startswith('HTTP/1.'):
+        raise HTTPError(505, 'HTTP version not supported')
+
+    headers = []
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, sep, value = line.partition(':')
+        if not sep:
+            raise HTTPError(400, 'Malformed header line')
+        headers.append((name.strip().lower().encode('latin-1'), value.strip().encode('latin-1')))
+
+    return method.upper(), target, version[5:], headers
+
+
+class ASGIServer:
+    """Serves one ASGI application over HTTP/1.1"""
+
+    def __init__(self, app, host: str = '127.0.0.1', port: int = 8000,
+                 keepalive: float = 75.0, backlog: int = 2048, access_log: bool = False):
+        """
+        Initialize server
+
+        Args:
+            app: ASGI 3 application
+            host: Interface to bind
+            port: Port to bind
+            keepalive: Seconds an idle keep-alive connection is kept open
+            backlog: Listen backlog
+            access_log: Print one line per request
+        """
+        self.app = app
+        self.host = host
+        self.port = port
+        self.keepalive = keepalive
+        self.backlog = backlog
+        self.access_log = access_log
+
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.connections = set()
+        self.requests_in_flight = 0
+        self.shutting_down = False
+        self._lifespan_queue: Optional[asyncio.Queue] = None
+        self._lifespan_task: Optional[asyncio.Task] = None
+        self._lifespan_events: Dict[str, asyncio.Future] = {}
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def serve(self, graceful_timeout: float = 30.0):
+        """Run until SIGTERM/SIGINT, then shut down gracefully"""
+        await self.startup()
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(signum, stop.set)
+            except (NotImplementedError, RuntimeError):
+                # Signal handlers are unavailable on Windows event loops
+                pass
+
+        try:
+            await stop.wait()
+        finally:
+            await self.shutdown(graceful_timeout)
+
+    async def startup(self):
+        """Run lifespan startup and start listening"""
+        await self._lifespan('startup')
+        self.server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port,
+            backlog=self.backlog, limit=MAX_HEAD_BYTES, reuse_address=True
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def shutdown(self, graceful_timeout: float = 30.0):
+        """Stop accepting, let in-flight requests finish, then run lifespan shutdown"""
+        self.shutting_down = True
+        if self.server is not None:
+            self.server.close()
+
+        deadline = asyncio.get_running_loop().time() + graceful_timeout
+        while self.requests_in_flight and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.05)
+
+        # Idle keep-alive connections are simply dropped
+        for task in list(self.connections):
+            task.cancel()
+        if self.connections:
+            await asyncio.gather(*self.connections, return_exceptions=True)
+        if self.server is not None:
+            await self.server.wait_closed()
+
+        await self._lifespan('shutdown')
+
+    async def _lifespan(self, phase: str):
+        """Send a lifespan event if the application supports the protocol"""
+        loop = asyncio.get_running_loop()
+        if self._lifespan_task is None:
+            if phase == 'shutdown':
+                return
+            self._lifespan_queue = asyncio.Queue()
+            self._lifespan_events = {'startup': loop.create_future(), 'shutdown': loop.create_future()}
+
+            async def receive():
+                return await self._lifespan_queue.get()
+
+            async def send(message):
+                name = message['type'].split('.')[1]
+                future = self._lifespan_events.get(name)
+                if future is not None and not future.done():
+                    if message['type'].endswith('.failed'):
+                        future.set_exception(RuntimeError(message.get('message', 'lifespan failed')))
+                    else:
+                        future.set_result(True)
+
+            scope = {'type': 'lifespan', 'asgi': {'version': '3.0', 'spec_version': '2.0'}}
+            self._lifespan_task = loop.create_task(self._run_lifespan(scope, receive, send))
+
+        await self._lifespan_queue.put({'type': f'lifespan.{phase}'})
+        done, _ = await asyncio.wait(
+            [self._lifespan_events[phase], self._lifespan_task], return_when=asyncio.FIRST_COMPLETED
+        )
+        if self._lifespan_events[phase] in done:
+            self._lifespan_events[phase].result()
+
+    async def _run_lifespan(self, scope, receive, send):
+        """Run the application's lifespan handler; apps without one are fine"""
+        try:
+            await self.app(scope, receive, send)
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # Connections
+    # ------------------------------------------------------------------
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until it closes"""
+        task = asyncio.current_task()
+        self.connections.add(task)
+        client = writer.get_extra_info('peername')
+        server = writer.get_extra_info('sockname')
+
+        try:
+            keep_alive = True
+            while keep_alive and not self.shutting_down:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), self.keepalive)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self._write_error(writer, 431, 'Request header fields too large')
+                    return
+
+                try:
+                    method, target, version, headers = parse_request_head(head)
+                    body = await self._read_body(reader, headers)
+                except HTTPError as e:
+                    await self._write_error(writer, e.status, str(e))
+                    return
+
+                keep_alive = self._wants_keep_alive(version, headers)
+                scope = self._build_scope(method, target, version, headers, client, server)
+                self.requests_in_flight += 1
+                try:
+                    keep_alive = await self._run_request(scope, body, reader, writer, keep_alive)
+                finally:
+                    self.requests_in_flight -= 1
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.connections.discard(task)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+
+    async def _read_body(self, reader: asyncio.StreamReader, headers) -> bytes:
+        """Read a Content-Length request body"""
+        values = dict(headers)
+        if b'chunked' in values.get(b'transfer-encoding', b'').lower():
+            raise HTTPError(501, 'Chunked request bodies are not supported')
+        try:
+            length = int(values.get(b'content-length', b'0'))
+        except ValueError:
+            raise HTTPError(400, 'Invalid Content-Length')
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, 'Request body too large')
+        if length <= 0:
+            return b''
+        try:
+            return await reader.readexactly(length)
+        except asyncio.IncompleteReadError:
+            raise HTTPError(400, 'Incomplete request body')
+
+    @staticmethod
+    def _wants_keep_alive(version: str, headers) -> bool:
+        """HTTP/1.1 keeps connections open unless asked not to; HTTP/1.0 the reverse"""
+        connection = dict(headers).get(b'connection', b'').lower()
+        if version == '1.0':
+            return b'keep-alive' in connection
+        return b'close' not in connection
+
+    def _build_scope(self, method, target, version, headers, client, server) -> Dict:
+        """Build the ASGI http scope"""
+        path, _, query = target.partition('?')
+        return {
+            'type': 'http',
+            'asgi': {'version': '3.0', 'spec_version': '2.3'},
+            'http_version': version,
+            'method': method,
+            'scheme': 'http',
+            'path': unquote(path),
+            'raw_path': path.encode('latin-1'),
+            'query_string': query.encode('latin-1'),
+            'root_path': '',
+            'headers': headers,
+            'client': tuple(client[:2]) if client else None,
+            'server': tuple(server[:2]) if server else None,
+        }
+
+    async def _run_request(self, scope, body: bytes, reader, writer, keep_alive: bool) -> bool:
+        """
+        Run the application for one request and write its response
+
+        Returns:
+            Whether the connection can be reused
+        """
+        state = {'started': False, 'chunked': False, 'finished': False, 'status': 0}
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+            # Nothing more to read; wait until the client goes away
+            while not reader.at_eof() and not state['finished']:
+                await asyncio.sleep(1.0)
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                state['started'] = True
+                state['status'] = message['status']
+                state['headers'] = [(bytes(k).lower(), bytes(v)) for k, v in message.get('headers', [])]
+                return
+            if message['type'] != 'http.response.body' or state['finished']:
+                return
+
+            chunk = message.get('body', b'')
+            more = message.get('more_body', False)
+
+            if state['started'] is True:
+                state['started'] = 'sent'
+                headers = state['headers']
+                names = {name for name, _ in headers}
+                if b'content-length' not in names:
+                    if more:
+                        headers.append((b'transfer-encoding', b'chunked'))
+                        state['chunked'] = True
+                    else:
+                        headers.append((b'content-length', str(len(chunk)).encode()))
+                headers.append((b'connection', b'keep-alive' if keep_alive else b'close'))
+                writer.write(self._encode_head(scope['http_version'], state['status'], headers))
+
+            if state['chunked']:
+                if chunk:
+                    writer.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+                if not more:
+                    writer.write(b'0\r\n\r\n')
+            elif chunk:
+                writer.write(chunk)
+
+            if not more:
+                state['finished'] = True
+            await writer.drain()
+
+        try:
+            await self.app(scope, receive, send)
+        except Exception:
+            if not state['started']:
+                await self._write_error(writer, 500, 'Internal server error')
+            return False
+
+        if self.access_log:
+            print(f"{scope['client'][0] if scope['client'] else '-'} "
+                  f"\"{scope['method']} {scope['path']}\" {state['status']}", flush=True)
+
+        if not state['finished']:
+            # The application ended without completing its response
+            return False
+        return keep_alive and not self.shutting_down
+
+    @staticmethod
+    def _encode_head(version: str, status: int, headers) -> bytes:
+        """Serialize the status line and headers"""
+        lines = [f'HTTP/{version} {status} {_reason(status)}'.encode('latin-1')]
+        lines.extend(name + b': ' + value for name, value in headers)
+        return b'\r\n'.join(lines) + b'\r\n\r\n'
+
+    async def _write_error(self, writer: asyncio.StreamWriter, status: int, message: str):
+        """Write a plain-text error response and close"""
+        body = message.encode('utf-8')
+        writer.write(self._encode_head('1.1', status, [
+            (b'content-type', b'text/plain; charset=utf-8'),
+            (b'content-length', str(len(body)).encode()),
+            (b'connection', b'close'),
+        ]) + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+async def serve(app, host: str = '127.0.0.1', port: int = 8000, keepalive: float = 75.0,
+                graceful_timeout: float = 30.0, access_log: bool = False):
+    """
+    Serve an ASGI application until SIGTERM/SIGINT
+
+    Args:
+        app: ASGI 3 application
+        host: Interface to bind
+        port: Port to bind
+        keepalive: Seconds an idle keep-alive connection is kept open
+        graceful_timeout: Seconds in-flight requests get to finish on shutdown
+        access_log: Print one line per request
+    """
+    server = ASGIServer(app, host, port, keepalive=keepalive, access_log=access_log)
+    await server.serve(graceful_timeout)
@@ -0,0 +1,160 @@
+"""
+Consistent Hash Module
+======================
+
+This module provides HashRing, which maps keys (roll numbers) to nodes
+(shards) so that adding or removing a node only moves the keys that node
+gains or loses - about 1/N of them - instead of reshuffling everything as
+`hash(key) % N` would.
+
+Every node is placed on a 64-bit ring at `vnodes` pseudo-random points; a
+key belongs to the first point at or after its own hash. Many points per
+node keep the shares even (within a few percent at the default 160).
+
+Keys are hashed whole. Roll numbers have the form year + branch + serial
+(2023EC4154); hashing only a prefix would send a whole year or branch to
+one node, so the full, normalized roll number is used.
+
+Usage:
+    ring = HashRing(['shard-0', 'shard-1'])
+    ring.node_for('2023EC4154')          # 'shard-1'
+    ring.nodes_for('2023EC4154', 2)      # preference list for failover
+    ring.add('shard-2')                  # moves ~1/3 of the keys
+"""
+
+import bisect
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+# Points per node on the ring
+DEFAULT_VNODES = 160
+
+RING_SIZE = 1 << 64
+
+
+def _hash(value: str) -> int:
+    """64-bit position of a string on the ring"""
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def normalize_key(key: str) -> str:
+    """Canonical form of a roll number (routes and the store treat case alike)"""
+    return key.strip().upper()
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes"""
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = DEFAULT_VNODES):
+        """
+        Initialize ring
+
+        Args:
+            nodes: Initial node names
+            vnodes: Points per node; more points give more even shares
+        """
+        self.vnodes = max(1, vnodes)
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        self._nodes: Dict[str, List[int]] = {}
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> List[str]:
+        """Node names, in the order they were added"""
+        return list(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node: str) -> bool:
+        return node in self._nodes
+
+    def add(self, node: str):
+        """Place a node on the ring (no-op if present)"""
+        if node in self._nodes:
+            return
+        points = []
+        for index in range(self.vnodes):
+            point = _hash(f'{node}#{index}')
+            position = bisect.bisect_left(self._points, point)
+            # A collision between 64-bit points is vanishingly rare; skip it
+            if position < len(self._points) and self._points[position] == point:
+                continue
+            self._points.insert(position, point)
+            self._owners.insert(position, node)
+            points.append(point)
+        self._nodes[node] = points
+
+    def remove(self, node: str):
+        """Take a node off the ring; its keys fall to the next points"""
+        points = self._nodes.pop(node, None)
+        if points is None:
+            return
+        keep = [(point, owner) for point, owner in zip(self._points, self._owners) if owner != node]
+        self._points = [point for point, _ in keep]
+        self._owners = [owner for _, owner in keep]
+
+    def node_for(self, key: str) -> Optional[str]:
+        """Node owning a key, or None if the ring is empty"""
+        if not self._points:
+            return None
+        position = bisect.bisect_left(self._points, _hash(normalize_key(key)))
+        return self._owners[position % len(self._points)]
+
+    def nodes_for(self, key: str, count: int) -> List[str]:
+        """
+        Preference list for a key: its owner, then the next distinct nodes
+        clockwise (where its requests go if the owner is down)
+        """
+        if not self._points:
+            return []
+        count = min(count, len(self._nodes))
+        position = bisect.bisect_left(self._points, _hash(normalize_key(key)))
+        found: List[str] = []
+        for offset in range(len(self._points)):
+            owner = self._owners[(position + offset) % len(self._points)]
+            if owner not in found:
+                found.append(owner)
+                if len(found) == count:
+                    break
+        return found
+
+    def shares(self) -> Dict[str, float]:
+        """Fraction of the key space each node owns"""
+        shares = {node: 0.0 for node in self._nodes}
+        if not self._points:
+            return shares
+        previous = self._points[-1] - RING_SIZE
+        for point, owner in zip(self._points, self._owners):
+            shares[owner] += (point - previous) / RING_SIZE
+            previous = point
+        return {node: round(share, 4) for node, share in shares.items()}
+
+    def moved_fraction(self, other: 'HashRing') -> float:
+        """Fraction of the key space owned by a different node in another ring"""
+        boundaries = sorted(set(self._points) | set(other._points))
+        if not boundaries or not self._points or not other._points:
+            return 1.0 if (self._points or other._points) else 0.0
+        moved = 0
+        previous = boundaries[-1] - RING_SIZE
+        for point in boundaries:
+            # Every key in (previous, point] has the same owner in both rings
+            if self._owner_at(point) != other._owner_at(point):
+                moved += point - previous
+            previous = point
+        return round(moved / RING_SIZE, 4)
+
+    def _owner_at(self, position: int) -> str:
+        """Owner of a ring position"""
+        index = bisect.bisect_left(self._points, position)
+        return self._owners[index % len(self._points)]
+
+    def copy(self) -> 'HashRing':
+        """Independent copy (for computing a rebalance before applying it)"""
+        ring = HashRing(vnodes=self.vnodes)
+        ring._points = list(self._points)
+        ring._owners = list(self._owners)
+        ring._nodes = {node: list(points) for node, points in self._nodes.items()}
+        return ring
@@ -0,0 +1,164 @@
+"""
+Disk Cache Module
+=================
+
+This module provides DiskCache, a persistent key-value tier on stdlib
+sqlite3. Every worker process on a host opens the same database file, so
+an entry written by one worker is visible to the others, and entries
+survive restarts and deploys.
+
+Rows are keyed by key and version: a value (JSON), the version it was
+computed under and when it was stored. Processes on different versions
+(the old and new generations during a serve.py restart, shards running
+different models) keep separate rows instead of overwriting each other's,
+and a retrained model or an edited store never reads old values back.
+purge() drops rows by age only, so rows of a version that is still running
+elsewhere, or that a rollback returns to, survive a restart.
+
+The database runs in WAL mode: readers never block the writer, and a
+write costs an append to the log rather than a rewrite of the file.
+Connections are per thread and per process (sqlite connections must not
+cross a fork).
+
+Usage:
+    cache = DiskCache('/var/cache/app/predictions.sqlite3')
+    cache.put(roll_no, version, prediction)
+    found = cache.get(roll_no, version)     # (value, stored_at) or None
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Hashable, Iterable, Iterator, Optional, Tuple
+
+from utils.serialization import json_encoder
+
+# Seconds a connection waits for another process's write lock
+BUSY_TIMEOUT = 5.0
+
+# Bumped when the table layout changes; older tables are dropped (it is a cache)
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key       TEXT NOT NULL,
+    version   TEXT NOT NULL,
+    value     BLOB NOT NULL,
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (key, version)
+)
+"""
+
+
+class DiskCache:
+    """sqlite-backed persistent cache shared by the processes on a host"""
+
+    def __init__(self, path: str):
+        """
+        Initialize cache, creating the database if needed
+
+        Args:
+            path: Database file
+        """
+        self.path = str(path)
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = self._connection()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            if conn.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+                conn.execute('DROP TABLE IF EXISTS entries')
+                conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            conn.execute(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection (reopened after a fork)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _version(version: Hashable) -> str:
+        """Text form of a version for comparison in SQL"""
+        return repr(version)
+
+    def get(self, key: str, version: Hashable) -> Optional[Tuple[Any, float]]:
+        """
+        Look up a key
+
+        Returns:
+            Tuple of (value, stored_at as time.time()), or None if the key
+            is missing or was stored under another version
+        """
+        row = self._connection().execute(
+            'SELECT value, stored_at FROM entries WHERE key = ? AND version = ?',
+            (key, self._version(version))
+        ).fetchone()
+        if row is None:
+            return None
+        return json_encoder.loads(row[0]), row[1]
+
+    def put(self, key: str, version: Hashable, value: Any, stored_at: Optional[float] = None):
+        """Store a value, replacing the key's previous row for that version"""
+        self.put_many([(key, version, value, stored_at)])
+
+    def put_many(self, items: Iterable[Tuple[str, Hashable, Any, Optional[float]]]):
+        """Store (key, version, value, stored_at) rows in one transaction"""
+        now = time.time()
+        rows = [
+            (key, self._version(version), json_encoder.dumps(value), now if stored_at is None else stored_at)
+            for key, version, value, stored_at in items
+        ]
+        if not rows:
+            return
+        conn = self._connection()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.executemany('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)', rows)
+
+    def scan(self, version: Hashable, since: float = 0.0) -> Iterator[Tuple[str, Any, float]]:
+        """
+        Yield every entry stored under a version at or after since
+
+        Yields:
+            Tuples of (key, value, stored_at)
+        """
+        cursor = self._connection().execute(
+            'SELECT key, value, stored_at FROM entries WHERE version = ? AND stored_at >= ?',
+            (self._version(version), since)
+        )
+        for key, value, stored_at in cursor:
+            yield key, json_encoder.loads(value), stored_at
+
+    def delete(self, key: Optional[str] = None):
+        """Delete one key (every version), or every entry"""
+        conn = self._connection()
+        with conn:
+            if key is None:
+                conn.execute('DELETE FROM entries')
+            else:
+                conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+
+    def purge(self, before: float) -> int:
+        """
+        Delete entries (of any version) stored before a time
+
+        Args:
+            before: Entries stored before this time.time() are deleted
+
+        Returns:
+            Number of entries deleted
+        """
+        conn = self._connection()
+        with conn:
+            return conn.execute('DELETE FROM entries WHERE stored_at < ?', (before,)).rowcount
+
+    def __len__(self) -> int:
+        """Number of stored entries (any version)"""
+        return self._connection().execute('SELECT COUNT(*) FROM entries').fetchone()[0]
@@ -0,0 +1,154 @@
+"""
+Executors Module
+================
+
+This module provides the executors async code uses to run blocking and
+CPU-bound work without stalling the event loop:
+
+    BoundedExecutor   - thread pool for blocking calls (model inference,
+                        store reloads); callers beyond the pool plus its
+                        queue wait on a semaphore instead of piling up
+    BatchProcessPool  - process pool for CPU-bound batch jobs; workers are
+                        forked where possible so they inherit the loaded model
+
+Usage:
+    blocking = BoundedExecutor(threads=8, queue_size=64)
+    result = await blocking.run(handler.get_student_handler, roll_no)
+
+    batch = BatchProcessPool(processes=4)
+    results = await batch.run(score_students, students)    # from the loop
+    results = batch.call(score_students, students)         # from a thread
+"""
+
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+
+class BoundedExecutor:
+    """Thread pool with a bounded number of submitted calls"""
+
+    def __init__(self, threads: int = 8, queue_size: int = 64, name: str = 'blocking'):
+        """
+        Initialize executor
+
+        Args:
+            threads: Worker threads
+            queue_size: Calls allowed to wait for a thread; further callers
+                wait (asynchronously) before submitting
+            name: Thread name prefix
+        """
+        self.threads = threads
+        self.queue_size = queue_size
+        self.name = name
+        self.in_use = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def start(self):
+        """Create the pool (call from the event loop thread)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix=self.name)
+            self._slots = asyncio.Semaphore(self.threads + self.queue_size)
+
+    async def run(self, func: Callable, *args, **kwargs):
+        """
+        Run a blocking callable in the pool
+
+        Returns:
+            The callable's return value
+        """
+        self.start()
+        async with self._slots:
+            self.in_use += 1
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+            finally:
+                self.in_use -= 1
+
+    def stats(self) -> Dict:
+        """Pool size and current usage"""
+        return {
+            'threads': self.threads,
+            'capacity': self.threads + self.queue_size,
+            'in_use': self.in_use,
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Stop the pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+class BatchProcessPool:
+    """Process pool for CPU-bound batch jobs, started on first use"""
+
+    def __init__(self, processes: int = 2):
+        """
+        Initialize pool
+
+        Args:
+            processes: Worker processes
+        """
+        self.processes = processes
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _ensure_started(self) -> ProcessPoolExecutor:
+        """Create the pool, preferring fork so workers share the loaded model"""
+        if self._executor is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+            self._executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=context)
+        return self._executor
+
+    def start(self):
+        """
+        Fork the workers now
+
+        Call before any other threads are started: forking a process that
+        runs threads can leave locks held in the child.
+        """
+        self._ensure_started().submit(int).result()
+
+    async def run(self, func: Callable, *args):
+        """
+        Run a picklable, module-level callable in a worker process
+
+        Returns:
+            The callable's return value
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._ensure_started(), functools.partial(func, *args))
+
+    def call(self, func: Callable, *args):
+        """
+        Run a callable in a worker process and wait for it (from a thread)
+
+        Returns:
+            The callable's return value
+        """
+        return self._ensure_started().submit(func, *args).result()
+
+    def submit_each(self, func: Callable, *args) -> List[Future]:
+        """
+        Submit a callable once per worker process
+
+        Each idle worker takes one call, so a callable that takes a while
+        (loading the model) runs in every worker. Meant for warming the
+        workers up; a quick callable may run twice in one worker instead.
+
+        Returns:
+            One future per call
+        """
+        executor = self._ensure_started()
+        return [executor.submit(func, *args) for _ in range(self.processes)]
+
+    def shutdown(self, wait: bool = True):
+        """Stop the pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,74 @@
+"""
+Health Module
+=============
+
+This module tracks whether this process is ready to serve, as flags the
+components set themselves when their state changes (the model service
+after loading the model, the student store after reading its file, the
+prediction cache warm-up when it finishes). Probes only read the flags,
+so liveness and readiness checks cost O(1) however often they run.
+
+    GET /api/live          process is up and answering (always 200)
+    GET /api/ready         200 once every component is ready, else 503
+    GET /api/diagnostics   full service status (model metadata, caches);
+                           for people and dashboards, not for probes
+
+Usage:
+    readiness.set('model', predictor.is_loaded, 'model files not found')
+    if readiness.is_ready(): ...
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+from utils.metrics import metrics
+
+
+class Readiness:
+    """Per-component readiness flags with a precomputed overall state"""
+
+    def __init__(self):
+        """Initialize with no components (not ready until one reports)"""
+        self.started_at = time.time()
+        self._checks: Dict[str, Dict] = {}
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def set(self, component: str, ready: bool, detail: Optional[str] = None):
+        """
+        Record a component's state
+
+        Args:
+            component: Component name (model, student_store, prediction_cache, ...)
+            ready: Whether the component can serve
+            detail: Optional reason, shown while the component is not ready
+        """
+        with self._lock:
+            checks = dict(self._checks)
+            checks[component] = {'ready': bool(ready), 'detail': detail, 'since': time.time()}
+            # Readers get either the old or the new dict, never a partial update
+            self._checks = checks
+            self._ready = all(check['ready'] for check in checks.values())
+
+    def is_ready(self) -> bool:
+        """Whether every component is ready"""
+        return self._ready
+
+    def checks(self) -> Dict[str, Dict]:
+        """Current state of each component"""
+        return self._checks
+
+    def uptime(self) -> float:
+        """Seconds since the process started"""
+        return round(time.time() - self.started_at, 3)
+
+
+# Process-wide readiness state
+readiness = Readiness()
+
+metrics.gauge(
+    'ready',
+    'Whether this process reports ready (1) or not (0)',
+    function=lambda: {(): 1.0 if readiness.is_ready() else 0.0}
+)
@@ -0,0 +1,119 @@
+"""
+HTTP Cache Validators Module
+============================
+
+This module provides the ETag / Last-Modified validators used to answer
+conditional requests with 304 Not Modified.
+
+A response body here is fully determined by the versions it was built from
+(student store version, model version, JSON encoder), so a strong ETag can
+be derived from those versions alone. A client revalidating an unchanged
+resource is answered before the student is looked up, the prediction is
+made or anything is encoded.
+
+gzip-encoded bodies carry the ETag with a "-gzip" suffix, since a strong
+ETag must change with the bytes; both forms match on revalidation.
+
+Usage:
+    validators = Validators(('student', roll_no, data_version), last_modified=mtime)
+
+    if validators.not_modified(request.headers.get('If-None-Match'),
+                               request.headers.get('If-Modified-Since')):
+        return 304 with validators.headers()
+"""
+
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Hashable, List, Optional, Tuple
+
+from utils.serialization import json_encoder
+
+
+GZIP_SUFFIX = '-gzip'
+
+# Student records may change whenever the store is edited: cache, but revalidate
+REVALIDATE = 'public, no-cache'
+
+
+def entity_tag(parts: Tuple[Hashable, ...]) -> str:
+    """Strong ETag for a body built from parts (plus the JSON encoder in use)"""
+    digest = hashlib.blake2b(repr((json_encoder.backend,) + tuple(parts)).encode('utf-8'),
+                             digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def gzip_etag(etag: str) -> str:
+    """ETag for the gzip-encoded variant of a body (weak ETags are unchanged)"""
+    if etag.startswith('W/') or not etag.endswith('"') or etag.endswith(GZIP_SUFFIX + '"'):
+        return etag
+    return etag[:-1] + GZIP_SUFFIX + '"'
+
+
+def _opaque_tag(etag: str) -> str:
+    """ETag stripped of its weak marker and gzip suffix, for comparison"""
+    etag = etag.strip()
+    if etag.startswith('W/'):
+        etag = etag[2:]
+    if etag.endswith(GZIP_SUFFIX + '"'):
+        etag = etag[:-len(GZIP_SUFFIX) - 1] + '"'
+    return etag
+
+
+class Validators:
+    """ETag, Last-Modified and Cache-Control for one resource"""
+
+    __slots__ = ('etag', 'last_modified', 'cache_control', 'exists')
+
+    def __init__(self, parts: Tuple[Hashable, ...], last_modified: Optional[float] = None,
+                 cache_control: str = REVALIDATE, exists: bool = True):
+        """
+        Create validators
+
+        Args:
+            parts: Everything the body depends on (resource kind, key, versions)
+            last_modified: Optional time.time() the resource last changed
+            cache_control: Cache-Control header value
+            exists: Whether the resource exists; a missing one is never
+                answered with 304, whatever the request's validators
+        """
+        self.etag = entity_tag(parts)
+        self.last_modified = int(last_modified) if last_modified is not None else None
+        self.cache_control = cache_control
+        self.exists = exists
+
+    def not_modified(self, if_none_match: Optional[str], if_modified_since: Optional[str]) -> bool:
+        """
+        Evaluate conditional request headers (RFC 9110 section 13.2.2)
+
+        If-None-Match takes precedence; If-Modified-Since is only used
+        without it.
+
+        Returns:
+            True when the client's copy is current and 304 can be sent
+        """
+        # `If-None-Match: *` and a late If-Modified-Since would otherwise
+        # turn a 404 into a 304
+        if not self.exists:
+            return False
+
+        if if_none_match is not None:
+            if if_none_match.strip() == '*':
+                return True
+            etag = _opaque_tag(self.etag)
+            return any(_opaque_tag(tag) == etag for tag in if_none_match.split(','))
+
+        if if_modified_since is None or self.last_modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return self.last_modified <= since
+
+    def headers(self, content_encoding: Optional[str] = None) -> List[Tuple[str, str]]:
+        """Response headers carrying the validators"""
+        etag = gzip_etag(self.etag) if content_encoding == 'gzip' else self.etag
+        headers = [('ETag', etag), ('Cache-Control', self.cache_control)]
+        if self.last_modified is not None:
+            headers.append(('Last-Modified', formatdate(self.last_modified, usegmt=True)))
+        return headers
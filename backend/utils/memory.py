@@ -0,0 +1,328 @@
+"""
+Memory Accounting Module
+========================
+
+This module reports the approximate retained size of the application's
+long-lived components (student stores, models, caches, queues) and wraps
+`tracemalloc` so snapshots can be taken and diffed at runtime.
+
+Usage:
+    from utils.memory import memory_tracker
+
+    memory_tracker.register('cache:predictions', lambda: service._prediction_cache)
+    report = memory_tracker.report()
+
+    first = memory_tracker.take_snapshot('before')
+    ...
+    second = memory_tracker.take_snapshot('after')
+    top = memory_tracker.diff_snapshots(first['id'], second['id'])
+"""
+
+import sys
+import threading
+import tracemalloc
+import types
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Objects that are shared infrastructure rather than owned data
+_SKIP_TYPES = (
+    types.ModuleType,
+    type,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    types.CodeType,
+    types.FrameType,
+    threading.Thread,
+)
+
+_ATOMIC_TYPES = (str, bytes, bytearray, int, float, bool, complex, type(None))
+
+MB = 1024.0 * 1024.0
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    return peak / MB if sys.platform == 'darwin' else peak / 1024.0
+
+
+def _children(obj: Any) -> List[Any]:
+    """Objects directly referenced by a container or instance"""
+    if isinstance(obj, dict):
+        items = list(obj.items())
+        return [value for pair in items for value in pair]
+    if isinstance(obj, (list, tuple, set, frozenset, deque)):
+        return list(obj)
+
+    children = []
+    attributes = getattr(obj, '__dict__', None)
+    if isinstance(attributes, dict):
+        children.append(attributes)
+    for slot in getattr(type(obj), '__slots__', ()):
+        if isinstance(slot, str) and hasattr(obj, slot):
+            children.append(getattr(obj, slot))
+
+    # Extension types (e.g. sklearn's Cython Tree) hold their data outside
+    # __dict__ but expose it through the pickle protocol
+    if attributes is None and not children and hasattr(obj, '__getstate__'):
+        try:
+            state = obj.__getstate__()
+        except Exception:
+            state = None
+        if state is not None:
+            children.append(state)
+    return children
+
+
+def deep_sizeof(root: Any, max_objects: int = 10_000_000) -> Tuple[int, int]:
+    """
+    Approximate the retained size of an object graph
+
+    Objects are counted once even if referenced several times. NumPy arrays
+    and pandas objects are sized by their buffers and not traversed.
+
+    Args:
+        root: Object to size
+        max_objects: Stop after visiting this many objects
+
+    Returns:
+        Tuple of (size_in_bytes, objects_visited)
+    """
+    # Holding a reference keeps temporary objects (e.g. __getstate__ results)
+    # alive, so their ids cannot be reused while the walk is in progress
+    seen = {}
+    stack = [root]
+    total = 0
+
+    while stack and len(seen) < max_objects:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SKIP_TYPES):
+            continue
+        seen[id(obj)] = obj
+
+        module = type(obj).__module__ or ''
+        if module.startswith('pandas') and hasattr(obj, 'memory_usage'):
+            usage = obj.memory_usage(deep=True)
+            total += int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+            continue
+
+        # sys.getsizeof includes the data buffer only for arrays that own it
+        total += sys.getsizeof(obj, 0)
+        if module == 'numpy':
+            if getattr(obj, 'base', None) is not None:
+                total += int(getattr(obj, 'nbytes', 0))
+            continue
+        if isinstance(obj, _ATOMIC_TYPES):
+            continue
+
+        try:
+            stack.extend(_children(obj))
+        except RuntimeError:
+            # Container changed size while being read by another thread
+            continue
+
+    return total, len(seen)
+
+
+class MemoryTracker:
+    """Per-component memory accounting and tracemalloc snapshots"""
+
+    def __init__(self, max_snapshots: int = 10):
+        """
+        Initialize tracker
+
+        Args:
+            max_snapshots: Maximum number of tracemalloc snapshots retained
+        """
+        self._components: Dict[str, Callable[[], Any]] = OrderedDict()
+        self._snapshots: Dict[str, Dict] = OrderedDict()
+        self._max_snapshots = max_snapshots
+        self._snapshot_counter = 0
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Component accounting
+    # ------------------------------------------------------------------
+
+    def register(self, name: str, getter: Callable[[], Any]):
+        """
+        Register a component to account for
+
+        Args:
+            name: Component name, e.g. 'cache:predictions'
+            getter: Callable returning the object graph owned by the component
+        """
+        self._components[name] = getter
+
+    def unregister(self, name: str):
+        """Stop accounting for a component"""
+        self._components.pop(name, None)
+
+    def report(self) -> Dict:
+        """
+        Measure every registered component
+
+        Components are sized independently, so objects shared between
+        two components are counted in both.
+
+        Returns:
+            Dictionary with per-component sizes and process-level figures
+        """
+        components = []
+        for name, getter in list(self._components.items()):
+            try:
+                size, objects = deep_sizeof(getter())
+                components.append({
+                    'name': name,
+                    'bytes': size,
+                    'mb': round(size / MB, 3),
+                    'objects': objects
+                })
+            except Exception as e:
+                components.append({'name': name, 'error': str(e)})
+
+        components.sort(key=lambda c: c.get('bytes', 0), reverse=True)
+
+        tracing = tracemalloc.is_tracing()
+        traced_current, traced_peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+
+        return {
+            'rss_mb': round(current_rss_mb(), 1),
+            'components': components,
+            'accounted_mb': round(sum(c.get('bytes', 0) for c in components) / MB, 3),
+            'tracemalloc': {
+                'tracing': tracing,
+                'traced_current_mb': round(traced_current / MB, 3),
+                'traced_peak_mb': round(traced_peak / MB, 3),
+                'snapshots': len(self._snapshots)
+            }
+        }
+
+    # ------------------------------------------------------------------
+    # tracemalloc snapshots
+    # ------------------------------------------------------------------
+
+    def take_snapshot(self, label: Optional[str] = None, frames: int = 25) -> Dict:
+        """
+        Take a tracemalloc snapshot, starting tracing if needed
+
+        Only allocations made after tracing starts are visible, so the
+        first snapshot is usually the baseline to diff later ones against.
+
+        Args:
+            label: Optional human-readable label
+            frames: Traceback depth recorded when tracing is started here
+
+        Returns:
+            Snapshot summary
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        ))
+
+        with self._lock:
+            self._snapshot_counter += 1
+            snapshot_id = str(self._snapshot_counter)
+            entry = {
+                'id': snapshot_id,
+                'label': label or f'snapshot-{snapshot_id}',
+                'created_at': datetime.now().isoformat(),
+                'traced_mb': round(sum(stat.size for stat in snapshot.statistics('filename')) / MB, 3),
+                'snapshot': snapshot
+            }
+            self._snapshots[snapshot_id] = entry
+            while len(self._snapshots) > self._max_snapshots:
+                self._snapshots.popitem(last=False)
+
+        return self._summary(entry)
+
+    def list_snapshots(self) -> List[Dict]:
+        """Summaries of retained snapshots, oldest first"""
+        with self._lock:
+            return [self._summary(entry) for entry in self._snapshots.values()]
+
+    def diff_snapshots(self, from_id: str, to_id: Optional[str] = None,
+                       limit: int = 20, group_by: str = 'lineno') -> Optional[Dict]:
+        """
+        Top allocation sites that grew between two snapshots
+
+        Args:
+            from_id: Baseline snapshot id
+            to_id: Later snapshot id (a new snapshot is taken if omitted)
+            limit: Number of allocation sites to return
+            group_by: 'lineno', 'filename' or 'traceback'
+
+        Returns:
+            Diff report, or None if a snapshot id is unknown
+        """
+        if group_by not in ('lineno', 'filename', 'traceback'):
+            raise ValueError("group_by must be 'lineno', 'filename' or 'traceback'")
+
+        if to_id is None:
+            to_id = self.take_snapshot('diff-target')['id']
+
+        with self._lock:
+            start = self._snapshots.get(from_id)
+            end = self._snapshots.get(to_id)
+        if start is None or end is None:
+            return None
+
+        stats = end['snapshot'].compare_to(start['snapshot'], group_by)
+        top = []
+        for stat in stats[:limit]:
+            frames = [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback]
+            top.append({
+                'location': frames[0] if frames else '<unknown>',
+                'traceback': frames if group_by == 'traceback' else None,
+                'size_diff_kb': round(stat.size_diff / 1024.0, 2),
+                'size_kb': round(stat.size / 1024.0, 2),
+                'count_diff': stat.count_diff,
+                'count': stat.count
+            })
+
+        return {
+            'from': self._summary(start),
+            'to': self._summary(end),
+            'group_by': group_by,
+            'total_diff_kb': round(sum(stat.size_diff for stat in stats) / 1024.0, 2),
+            'top': top
+        }
+
+    def stop_tracing(self):
+        """Stop tracemalloc and drop all snapshots"""
+        with self._lock:
+            self._snapshots.clear()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @staticmethod
+    def _summary(entry: Dict) -> Dict:
+        """Snapshot metadata without the snapshot object"""
+        return {key: value for key, value in entry.items() if key != 'snapshot'}
+
+
+# Create singleton instance
+memory_tracker = MemoryTracker()
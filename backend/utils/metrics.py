@@ -0,0 +1,295 @@
+"""
+Metrics Module
+==============
+
+This module provides lightweight, thread-safe counters, gauges and
+histograms, and renders them in the Prometheus text exposition format.
+
+Usage:
+    from utils.metrics import metrics
+
+    REQUESTS = metrics.counter('requests_total', 'Requests served', ['route'])
+    REQUESTS.inc(('/api/health',))
+
+    LATENCY = metrics.histogram('latency_seconds', 'Request latency', ['route'])
+    LATENCY.observe(0.0123, ('/api/health',))
+
+    text = metrics.render()
+
+    timer = StageTimer()
+    features = prepare(student)
+    timer.mark('prepare_features')
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# Default latency buckets in seconds (0.5 ms .. 10 s)
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape_label_value(value) -> str:
+    """Escape a label value for the exposition format"""
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: str = '') -> str:
+    """Format a label set as {name="value",...}"""
+    parts = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value"""
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonically increasing counter"""
+
+    type_name = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Initialize counter"""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Tuple = (), amount: float = 1.0):
+        """Increment the counter for a label set"""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def get(self, labels: Tuple = ()) -> float:
+        """Current value for a label set"""
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """Return (name, labels, value) samples"""
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, _format_labels(self.labelnames, labels), value) for labels, value in items]
+
+
+class Gauge:
+    """Value that can go up and down, or be computed at scrape time"""
+
+    type_name = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 function: Optional[Callable[[], Dict[Tuple, float]]] = None):
+        """
+        Initialize gauge
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Label names
+            function: Optional callback returning {labels: value} at scrape time
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.function = function
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, labels: Tuple = ()):
+        """Set the gauge for a label set"""
+        self._values[labels] = value
+
+    def inc(self, labels: Tuple = (), amount: float = 1.0):
+        """Increment the gauge"""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, labels: Tuple = (), amount: float = 1.0):
+        """Decrement the gauge"""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) - amount
+
+    def get(self, labels: Tuple = ()) -> float:
+        """Current value for a label set"""
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """Return (name, labels, value) samples"""
+        if self.function is not None:
+            try:
+                items = list(self.function().items())
+            except Exception:
+                items = []
+        else:
+            with self._lock:
+                items = list(self._values.items())
+        return [(self.name, _format_labels(self.labelnames, labels), value) for labels, value in items]
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Initialize histogram"""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: Tuple = ()):
+        """Record one observation for a label set"""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0] * (len(self.buckets) + 2)
+            row[index] += 1
+            row[-1] += value
+
+    def snapshot(self, labels: Tuple = ()) -> Dict:
+        """
+        Summarize one label set
+
+        Returns:
+            Dictionary with count, sum and cumulative bucket counts
+        """
+        with self._lock:
+            row = list(self._values.get(labels, [0] * (len(self.buckets) + 2)))
+        cumulative = []
+        running = 0
+        for count in row[:-1]:
+            running += count
+            cumulative.append(running)
+        return {
+            'count': running,
+            'sum': row[-1],
+            'buckets': dict(zip([*self.buckets, float('inf')], cumulative))
+        }
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """Return (name, labels, value) samples"""
+        with self._lock:
+            items = [(labels, list(row)) for labels, row in self._values.items()]
+
+        samples = []
+        for labels, row in items:
+            running = 0
+            for bound, count in zip([*self.buckets, float('inf')], row[:-1]):
+                running += count
+                le = f'le="{_format_value(bound)}"'
+                samples.append((f'{self.name}_bucket', _format_labels(self.labelnames, labels, le), running))
+            base = _format_labels(self.labelnames, labels)
+            samples.append((f'{self.name}_sum', base, row[-1]))
+            samples.append((f'{self.name}_count', base, running))
+        return samples
+
+
+class StageTimer:
+    """Records high-resolution durations of consecutive processing stages"""
+
+    def __init__(self):
+        """Start the clock"""
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.stages: Dict[str, float] = {}
+
+    def mark(self, stage: str):
+        """Attribute the time since the previous mark to `stage`"""
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + (now - self._last)
+        self._last = now
+
+    def total(self) -> float:
+        """Seconds elapsed since the timer started up to the last mark"""
+        return self._last - self.started
+
+    def as_milliseconds(self) -> Dict[str, float]:
+        """Stage durations in milliseconds, plus the total"""
+        timings = {stage: round(seconds * 1000.0, 3) for stage, seconds in self.stages.items()}
+        timings['total'] = round(self.total() * 1000.0, 3)
+        return timings
+
+    def observe_into(self, histogram: 'Histogram'):
+        """Feed every stage duration into a histogram labelled by stage"""
+        for stage, seconds in self.stages.items():
+            histogram.observe(seconds, (stage,))
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        """Initialize registry"""
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        """Register a metric, returning the existing one if already defined"""
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter"""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+              function: Optional[Callable[[], Dict[Tuple, float]]] = None) -> Gauge:
+        """Get or create a gauge"""
+        return self._register(Gauge(name, documentation, labelnames, function))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram"""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str):
+        """Look up a registered metric by name"""
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format
+
+        Returns:
+            Exposition text
+        """
+        with self._lock:
+            registered = sorted(self._metrics.values(), key=lambda m: m.name)
+
+        lines = []
+        for metric in registered:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type_name}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{labels} {_format_value(value)}')
+
+        return '\n'.join(lines) + '\n'
+
+
+# Create singleton instance
+metrics = MetricsRegistry()
@@ -0,0 +1,330 @@
+"""
+Profiling Module
+================
+
+This module provides on-demand request profiling. A request can be profiled
+with cProfile (deterministic) or with a stack sampler (statistical), and the
+result is stored in a bounded ring buffer in collapsed-stack format, ready
+for flamegraph.pl, speedscope or inferno:
+
+    module:function:line;module:function:line;... <weight>
+
+Usage:
+    from utils.profiling import request_profiler
+
+    session = request_profiler.start('cprofile')
+    ...  # handle the request
+    profile = request_profiler.finish(session, path='/api/predict/X', method='POST', trigger='header')
+"""
+
+import cProfile
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from config import PROFILE_MODE, PROFILE_RING_SIZE, PROFILE_SAMPLE_RATE
+
+
+PROFILE_MODES = ('cprofile', 'sample')
+
+# Collapsed-stack weights are integer microseconds for cProfile profiles
+MICROSECONDS = 1_000_000
+
+
+def _frame_label(filename: str, line: int, function: str) -> str:
+    """Build a readable, flamegraph-safe label for a code location"""
+    if filename == '~':
+        # Built-in functions are reported as ('~', 0, '<built-in method ...>')
+        return function.replace(';', ',').replace(' ', '_')
+    module = os.path.splitext(os.path.basename(filename))[0]
+    return f"{module}:{function}:{line}".replace(';', ',').replace(' ', '_')
+
+
+def collapse_cprofile(stats: pstats.Stats, max_depth: int = 64, min_fraction: float = 1e-4) -> str:
+    """
+    Convert cProfile statistics into collapsed stacks
+
+    cProfile records caller -> callee edges rather than full stacks, so
+    stacks are reconstructed by walking from the root functions and
+    splitting each function's own time across its call paths in proportion
+    to the cumulative time each caller spent in it.
+
+    Args:
+        stats: pstats.Stats for one profiled request
+        max_depth: Maximum reconstructed stack depth
+        min_fraction: Paths carrying less than this fraction of a function's time are dropped
+
+    Returns:
+        Collapsed-stack text with integer microsecond weights
+    """
+    raw = stats.stats
+    children: Dict[tuple, Dict[tuple, float]] = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, caller_stats in callers.items():
+            # caller_stats = (primitive calls, calls, tottime, cumtime) on this edge
+            children.setdefault(caller, {})[func] = caller_stats[3]
+
+    roots = [func for func, entry in raw.items() if not entry[4]]
+    collapsed: Dict[str, float] = {}
+
+    def walk(func, fraction: float, stack: List[str], on_stack: set):
+        _, _, tottime, cumtime, _ = raw[func]
+        label = _frame_label(*func)
+        path = stack + [label]
+        own = tottime * fraction
+        if own > 0:
+            key = ';'.join(path)
+            collapsed[key] = collapsed.get(key, 0.0) + own
+
+        if len(path) >= max_depth or cumtime <= 0:
+            return
+
+        for child, edge_cumtime in children.get(func, {}).items():
+            if child in on_stack or child not in raw:
+                continue
+            child_cumtime = raw[child][3]
+            if child_cumtime <= 0:
+                continue
+            child_fraction = fraction * min(edge_cumtime / child_cumtime, 1.0)
+            if child_fraction < min_fraction:
+                continue
+            on_stack.add(child)
+            walk(child, child_fraction, path, on_stack)
+            on_stack.discard(child)
+
+    for root in roots:
+        walk(root, 1.0, [], {root})
+
+    lines = [
+        f"{stack} {int(round(seconds * MICROSECONDS))}"
+        for stack, seconds in sorted(collapsed.items())
+        if seconds * MICROSECONDS >= 1
+    ]
+    return '\n'.join(lines) + ('\n' if lines else '')
+
+
+def top_functions(stats: pstats.Stats, limit: int = 15) -> List[Dict]:
+    """
+    Summarize the most expensive functions of a cProfile run
+
+    Args:
+        stats: pstats.Stats for one profiled request
+        limit: Number of functions to return
+
+    Returns:
+        Functions ordered by own time
+    """
+    rows = []
+    for func, (primitive_calls, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            'function': _frame_label(*func),
+            'calls': calls,
+            'tottime_ms': round(tottime * 1000.0, 3),
+            'cumtime_ms': round(cumtime * 1000.0, 3)
+        })
+
+    rows.sort(key=lambda row: row['tottime_ms'], reverse=True)
+    return rows[:limit]
+
+
+class StackSampler:
+    """Samples the stack of one thread at a fixed interval"""
+
+    def __init__(self, thread_id: int, interval: float = 0.001):
+        """
+        Initialize sampler
+
+        Args:
+            thread_id: Identifier of the thread to sample
+            interval: Seconds between samples
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        """Start sampling in a background thread"""
+        self._thread.start()
+
+    def stop(self) -> Dict[str, int]:
+        """Stop sampling and return collapsed stack counts"""
+        self._stop.set()
+        self._thread.join()
+        return self.counts
+
+    def _run(self):
+        """Sampling loop"""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                code = frame.f_code
+                labels.append(_frame_label(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            key = ';'.join(reversed(labels))
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+
+class ProfileSession:
+    """An in-progress profile of one request"""
+
+    def __init__(self, mode: str):
+        """Start profiling the current thread"""
+        self.mode = mode
+        self.started = time.perf_counter()
+        self.profiler = None
+        self.sampler = None
+
+        if mode == 'sample':
+            self.sampler = StackSampler(threading.get_ident())
+            self.sampler.start()
+        else:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def stop(self) -> Dict:
+        """
+        Stop profiling
+
+        Returns:
+            Dictionary with duration, collapsed stacks and (for cProfile) top functions
+        """
+        duration = time.perf_counter() - self.started
+
+        if self.sampler is not None:
+            counts = self.sampler.stop()
+            collapsed = ''.join(f"{stack} {count}\n" for stack, count in sorted(counts.items()))
+            return {
+                'duration_ms': round(duration * 1000.0, 3),
+                'collapsed': collapsed,
+                'weight_unit': 'samples',
+                'top_functions': []
+            }
+
+        self.profiler.disable()
+        stats = pstats.Stats(self.profiler)
+        return {
+            'duration_ms': round(duration * 1000.0, 3),
+            'collapsed': collapse_cprofile(stats),
+            'weight_unit': 'microseconds',
+            'top_functions': top_functions(stats)
+        }
+
+
+class RequestProfiler:
+    """Profiles selected requests and keeps the results in a ring buffer"""
+
+    def __init__(self, capacity: int = 50, sample_rate: float = 0.0, default_mode: str = 'cprofile'):
+        """
+        Initialize request profiler
+
+        Args:
+            capacity: Maximum number of profiles retained
+            sample_rate: Fraction (0-1) of eligible requests profiled automatically
+            default_mode: 'cprofile' or 'sample'
+        """
+        self.sample_rate = sample_rate
+        self.default_mode = default_mode if default_mode in PROFILE_MODES else 'cprofile'
+        self._profiles = deque(maxlen=max(capacity, 1))
+        self._lock = threading.Lock()
+        # cProfile can only profile one request per thread at a time
+        self._active = threading.local()
+
+    def should_sample(self) -> bool:
+        """Decide whether an eligible request is sampled for profiling"""
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start(self, mode: Optional[str] = None) -> Optional[ProfileSession]:
+        """
+        Start profiling the current request
+
+        Args:
+            mode: 'cprofile' or 'sample' (defaults to the configured mode)
+
+        Returns:
+            Session, or None if the thread is already being profiled
+        """
+        if getattr(self._active, 'session', None) is not None:
+            return None
+
+        try:
+            session = ProfileSession(mode if mode in PROFILE_MODES else self.default_mode)
+        except ValueError:
+            # Another profiler (e.g. a debugger) is already active
+            return None
+
+        self._active.session = session
+        return session
+
+    def finish(self, session: ProfileSession, path: str, method: str, trigger: str,
+               status: Optional[int] = None) -> Dict:
+        """
+        Stop a session and store its profile
+
+        Args:
+            session: Session returned by start()
+            path: Request path
+            method: HTTP method
+            trigger: 'header' or 'sampled'
+            status: Response status code
+
+        Returns:
+            Stored profile summary (without the collapsed stacks)
+        """
+        self._active.session = None
+        result = session.stop()
+
+        profile = {
+            'id': uuid.uuid4().hex[:12],
+            'created_at': datetime.now().isoformat(),
+            'path': path,
+            'method': method,
+            'status': status,
+            'trigger': trigger,
+            'mode': session.mode,
+            **result
+        }
+
+        with self._lock:
+            self._profiles.append(profile)
+
+        return self._summary(profile)
+
+    def list_profiles(self) -> List[Dict]:
+        """Summaries of retained profiles, newest first"""
+        with self._lock:
+            profiles = list(self._profiles)
+        return [self._summary(profile) for profile in reversed(profiles)]
+
+    def get_profile(self, profile_id: str) -> Optional[Dict]:
+        """Look up a retained profile by id"""
+        with self._lock:
+            for profile in self._profiles:
+                if profile['id'] == profile_id:
+                    return profile
+        return None
+
+    def clear(self):
+        """Drop all retained profiles"""
+        with self._lock:
+            self._profiles.clear()
+
+    @staticmethod
+    def _summary(profile: Dict) -> Dict:
+        """Profile metadata without the (large) stack payload"""
+        return {key: value for key, value in profile.items() if key not in ('collapsed', 'top_functions')}
+
+
+# Create singleton instance
+request_profiler = RequestProfiler(PROFILE_RING_SIZE, PROFILE_SAMPLE_RATE, PROFILE_MODE)
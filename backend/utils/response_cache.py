@@ -0,0 +1,168 @@
+"""
+Response Cache Module
+=====================
+
+This module provides a cache of already-encoded response bodies, so a hit
+skips schema formatting and JSON encoding entirely: it costs one dict
+lookup, and the cached bytes are written as they are.
+
+Keys start with the roll number and include the versions the body was built
+from (model version, student data version). A new model or a changed store
+therefore never serves an old body, and invalidate(roll_no) drops every
+body derived from one student. The gzip variant of a body is built on the
+first request that accepts it and kept with the entry.
+
+Usage:
+    cache = ResponseCache('students')
+
+    key = (roll_no, 'student', data_version)
+    entry = cache.get(key)
+    if entry is None:
+        data, status = handler.get_student_handler(roll_no)
+        entry = cache.put(key, data) if status == 200 else cache.encode(data, status)
+"""
+
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from config import GZIP_MIN_SIZE, RESPONSE_CACHE_SIZE
+from utils.metrics import metrics
+from utils.serialization import gzip_body, json_encoder
+
+
+RESPONSE_CACHE_REQUESTS = metrics.counter(
+    'response_cache_requests_total',
+    'Encoded response cache lookups by cache and result',
+    ['cache', 'result']
+)
+
+# Every cache instance, for the entries gauge
+_caches = []
+
+
+def _cache_sizes() -> Dict[Tuple, float]:
+    """Entries per cache, for the response_cache_entries gauge"""
+    return {(cache.name,): len(cache) for cache in _caches}
+
+
+metrics.gauge(
+    'response_cache_entries',
+    'Encoded responses currently cached, by cache',
+    ['cache'],
+    function=_cache_sizes
+)
+
+
+class CachedResponse:
+    """An encoded JSON response body with its status and lazy gzip variant"""
+
+    __slots__ = ('body', 'status', 'expires_at', '_gzipped')
+
+    def __init__(self, body: bytes, status: int = 200, expires_at: Optional[float] = None):
+        """
+        Create an entry
+
+        Args:
+            body: Encoded JSON body
+            status: HTTP status code
+            expires_at: Optional time.time() after which the entry is stale
+        """
+        self.body = body
+        self.status = status
+        self.expires_at = expires_at
+        self._gzipped = None
+
+    def gzipped(self) -> Optional[bytes]:
+        """gzip-encoded body, or None when the body is below GZIP_MIN_SIZE"""
+        if GZIP_MIN_SIZE < 0 or len(self.body) < GZIP_MIN_SIZE:
+            return None
+        if self._gzipped is None:
+            self._gzipped = gzip_body(self.body)
+        return self._gzipped
+
+
+class ResponseCache:
+    """Bounded cache of encoded responses keyed by (roll_no, ...) tuples"""
+
+    def __init__(self, name: str, max_entries: int = RESPONSE_CACHE_SIZE):
+        """
+        Initialize cache
+
+        Args:
+            name: Cache name used in metrics and memory reports
+            max_entries: Entries kept before the oldest are evicted
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple, CachedResponse] = {}
+        self._lock = threading.Lock()
+        _caches.append(self)
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[CachedResponse]:
+        """Look up an entry, dropping it if it has expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            RESPONSE_CACHE_REQUESTS.inc((self.name, 'miss'))
+            return None
+        if entry.expires_at is not None and time.time() > entry.expires_at:
+            self._entries.pop(key, None)
+            RESPONSE_CACHE_REQUESTS.inc((self.name, 'expired'))
+            return None
+        RESPONSE_CACHE_REQUESTS.inc((self.name, 'hit'))
+        return entry
+
+    @staticmethod
+    def encode(data: Any, status: int = 200, expires_at: Optional[float] = None) -> CachedResponse:
+        """Encode a response without caching it"""
+        return CachedResponse(json_encoder.dumps_line(data), status, expires_at)
+
+    def put(self, key: Tuple[Hashable, ...], data: Any, status: int = 200,
+            expires_at: Optional[float] = None) -> CachedResponse:
+        """
+        Encode and cache a response
+
+        Returns:
+            The new entry
+        """
+        entry = self.encode(data, status, expires_at)
+        if self.max_entries <= 0:
+            return entry
+        with self._lock:
+            # Evict in insertion order; lookups stay lock-free
+            while len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)), None)
+            self._entries[key] = entry
+        return entry
+
+    def invalidate(self, roll_no: Optional[str] = None):
+        """
+        Drop cached responses
+
+        Args:
+            roll_no: Drop only entries for this roll number, or None for all
+        """
+        with self._lock:
+            if roll_no is None:
+                self._entries.clear()
+            else:
+                # list() snapshots the keys in one step; get() may pop concurrently
+                for key in [key for key in list(self._entries) if key[0] == roll_no]:
+                    self._entries.pop(key, None)
+
+    def get_stats(self) -> Dict:
+        """Entry count, encoded bytes and hit ratio"""
+        entries = list(self._entries.values())
+        hits = RESPONSE_CACHE_REQUESTS.get((self.name, 'hit'))
+        misses = (RESPONSE_CACHE_REQUESTS.get((self.name, 'miss')) +
+                  RESPONSE_CACHE_REQUESTS.get((self.name, 'expired')))
+        lookups = hits + misses
+        return {
+            'size': len(entries),
+            'bytes': sum(len(e.body) + len(e._gzipped or b'') for e in entries),
+            'hit_ratio': round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        """Number of cached responses"""
+        return len(self._entries)
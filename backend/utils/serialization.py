@@ -0,0 +1,211 @@
+"""
+Serialization Module
+====================
+
+This module provides the JSON encoders and gzip helpers used for API
+responses:
+
+    JSONEncoderBackend  - encodes response bodies to UTF-8 JSON bytes with
+                          sorted keys; 'orjson' when installed, otherwise
+                          the stdlib encoder with compact separators
+    FastJSONProvider    - Flask JSON provider, so jsonify() uses the encoder
+    gzip negotiation    - accepts_gzip(), gzip_body() and gzip_stream() for
+                          bodies above GZIP_MIN_SIZE
+
+The backend is chosen with JSON_ENCODER ('auto', 'orjson' or 'stdlib').
+
+Usage:
+    from utils.serialization import json_encoder
+
+    body = json_encoder.dumps({'risk_level': 'HIGH'})    # b'{"risk_level":"HIGH"}'
+"""
+
+import dataclasses
+import decimal
+import gzip
+import json
+import uuid
+import zlib
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from flask.json.provider import JSONProvider
+
+from config import GZIP_LEVEL, GZIP_MIN_SIZE, JSON_ENCODER
+from utils.metrics import metrics
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+COMPRESSED_RESPONSES = metrics.counter(
+    'http_responses_compressed_total',
+    'Responses sent gzip-encoded'
+)
+COMPRESSION_BYTES = metrics.counter(
+    'http_compression_bytes_total',
+    'Response body bytes before (in) and after (out) gzip encoding',
+    ['stage']
+)
+
+# Media types worth compressing; images and archives are already compressed
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/')
+
+
+def _default(obj: Any):
+    """Encode the types Flask's default provider handles beyond plain JSON"""
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    # numpy scalars and arrays (e.g. model probabilities)
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+class JSONEncoderBackend:
+    """JSON encoder producing compact UTF-8 bytes with sorted keys"""
+
+    BACKENDS = ('orjson', 'stdlib')
+
+    def __init__(self, backend: str = 'auto'):
+        """
+        Initialize encoder
+
+        Args:
+            backend: 'orjson', 'stdlib' or 'auto' (orjson if installed)
+        """
+        if backend == 'auto':
+            backend = 'orjson' if orjson is not None else 'stdlib'
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown JSON encoder {backend!r}; expected one of {', '.join(self.BACKENDS)}")
+        if backend == 'orjson' and orjson is None:
+            raise ValueError("JSON encoder 'orjson' requested but orjson is not installed")
+
+        self.backend = backend
+        if backend == 'orjson':
+            options = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            self._dumps: Callable[[Any], bytes] = lambda obj: orjson.dumps(obj, default=_default, option=options)
+            self._dumps_line: Callable[[Any], bytes] = lambda obj: orjson.dumps(
+                obj, default=_default, option=options | orjson.OPT_APPEND_NEWLINE)
+            self.loads = orjson.loads
+        else:
+            encoder = json.JSONEncoder(default=_default, sort_keys=True, ensure_ascii=False,
+                                       separators=(',', ':'))
+            self._dumps = lambda obj: encoder.encode(obj).encode('utf-8')
+            self._dumps_line = lambda obj: (encoder.encode(obj) + '\n').encode('utf-8')
+            self.loads = json.loads
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode an object as compact JSON bytes"""
+        return self._dumps(obj)
+
+    def dumps_line(self, obj: Any) -> bytes:
+        """Encode an object as one newline-terminated line (jsonify, NDJSON)"""
+        return self._dumps_line(obj)
+
+
+json_encoder = JSONEncoderBackend(JSON_ENCODER)
+
+
+class FastJSONProvider(JSONProvider):
+    """Flask JSON provider backed by json_encoder"""
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize to a str (used by flask.json.dumps)"""
+        return json_encoder.dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        """Deserialize request bodies"""
+        return json_encoder.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        """Build a JSON response from bytes, skipping the str round trip"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(json_encoder.dumps_line(obj), mimetype=self.mimetype)
+
+
+# ============================================================================
+# GZIP NEGOTIATION
+# ============================================================================
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Check whether an Accept-Encoding header allows gzip (q > 0)"""
+    if not accept_encoding:
+        return False
+    for item in accept_encoding.split(','):
+        coding, _, params = item.strip().partition(';')
+        if coding.strip().lower() not in ('gzip', '*'):
+            continue
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def should_compress(content_type: Optional[str], size: Optional[int], headers: Dict[str, str]) -> bool:
+    """
+    Decide whether a response body should be gzip-encoded
+
+    Args:
+        content_type: Response Content-Type
+        size: Body length in bytes, or None for streamed bodies
+        headers: Lowercased response headers
+
+    Returns:
+        True for compressible types above GZIP_MIN_SIZE (or streamed) that
+        are not already encoded
+    """
+    if GZIP_MIN_SIZE < 0 or 'content-encoding' in headers:
+        return False
+    if not content_type or not content_type.startswith(COMPRESSIBLE_TYPES):
+        return False
+    return size is None or size >= GZIP_MIN_SIZE
+
+
+def gzip_body(body: bytes) -> bytes:
+    """gzip-encode a complete body"""
+    compressed = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    COMPRESSED_RESPONSES.inc()
+    COMPRESSION_BYTES.inc(('in',), len(body))
+    COMPRESSION_BYTES.inc(('out',), len(compressed))
+    return compressed
+
+
+def gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    gzip-encode a streamed body chunk by chunk
+
+    Each chunk is flushed, so the client can decode it as soon as it
+    arrives instead of waiting for the compressor's buffer to fill.
+    """
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+    COMPRESSED_RESPONSES.inc()
+    try:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            COMPRESSION_BYTES.inc(('in',), len(chunk))
+            COMPRESSION_BYTES.inc(('out',), len(data))
+            yield data
+        tail = compressor.flush()
+        COMPRESSION_BYTES.inc(('out',), len(tail))
+        yield tail
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
@@ -0,0 +1,331 @@
+"""
+Shared Memory Cache Module
+==========================
+
+This module provides SharedCache, a fixed-size hash table in
+multiprocessing.shared_memory. The pre-fork server creates it in the
+master before forking, so every worker maps the same pages: a value one
+worker stores is a hit for all the others, and the table costs its size
+once per host rather than once per worker.
+
+Layout: a small header, then `slots` fixed-size slots in buckets of
+PROBE_WINDOW. A key hashes to a bucket and may live in any of its slots;
+when all are taken, the least recently stored one is evicted. Each slot holds
+
+    seq | key hash | generation | version hash | stored_at | length | payload
+
+where payload is the value as zlib-compressed JSON (values that do not fit
+in record_bytes are not stored).
+
+Concurrency:
+    - writers take one of LOCK_STRIPES process-shared locks (by bucket)
+      and choose the slot while holding it, so two writers never claim
+      the same slot or store one key twice; writers to different stripes
+      never wait for each other
+    - a lock a killed process left held is waited for LOCK_TIMEOUT at
+      most: the write is then skipped (counted as a lock_timeout)
+    - readers take no lock: each slot is a seqlock. The writer makes seq
+      odd, writes, then makes it even again; a reader copies the slot and
+      retries if seq was odd or changed while it read
+    - clear() bumps the header generation instead of touching every slot
+    - clear() and delete() also bump the header's invalidation count, so
+      processes keeping their own copies of values can tell when to drop them
+
+Retries and lock waits are exported as contention metrics.
+
+Usage:
+    cache = SharedCache('predictions', slots=4096)   # master, before fork
+    cache.put(roll_no, version, prediction)
+    found = cache.get(roll_no, version)              # (value, stored_at) or None
+"""
+
+import hashlib
+import multiprocessing
+import struct
+import time
+import zlib
+from multiprocessing import shared_memory
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+from utils.metrics import metrics
+from utils.serialization import json_encoder
+
+
+SHARED_CACHE_REQUESTS = metrics.counter(
+    'shared_cache_requests_total',
+    'Shared memory cache lookups by cache and result (hit, miss)',
+    ['cache', 'result']
+)
+SHARED_CACHE_CONTENTION = metrics.counter(
+    'shared_cache_contention_total',
+    'Shared memory cache contention by cache and kind '
+    '(read_retry: seqlock reader retried, write_wait: writer waited for its stripe lock, '
+    'lock_timeout: a lock was still held after LOCK_TIMEOUT)',
+    ['cache', 'kind']
+)
+SHARED_CACHE_WRITES = metrics.counter(
+    'shared_cache_writes_total',
+    'Shared memory cache stores by cache and result (stored, evicted, oversize)',
+    ['cache', 'result']
+)
+
+# Slots per bucket (a key may occupy any slot of its bucket)
+PROBE_WINDOW = 4
+
+# Process-shared writer locks
+LOCK_STRIPES = 64
+
+# Longest a writer waits for a lock (seconds); a worker killed while holding
+# one (serve.py's heartbeat kill) never releases it
+LOCK_TIMEOUT = 0.1
+
+# Reader attempts before treating a busy slot as a miss
+MAX_READ_RETRIES = 16
+
+# zlib level for stored values (speed over ratio)
+COMPRESS_LEVEL = 1
+
+_HEADER = struct.Struct('<QQ')            # generation, invalidations
+_SLOT = struct.Struct('<QQQQdI')          # seq, key hash, generation, version hash, stored_at, length
+_SEQ = struct.Struct('<Q')
+
+
+def _hash(value: Any) -> int:
+    """Nonzero 64-bit hash of a key or version (0 marks an empty slot)"""
+    digest = hashlib.blake2b(repr(value).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') or 1
+
+
+class SharedCache:
+    """Fixed-slot hash table in shared memory with seqlocked slots and striped writer locks"""
+
+    def __init__(self, name: str, slots: int, record_bytes: int = 2048):
+        """
+        Create the table (call before forking the processes that share it)
+
+        Args:
+            name: Cache name used in metrics
+            slots: Number of slots (rounded down to whole buckets)
+            record_bytes: Largest compressed value a slot holds
+        """
+        self.name = name
+        self.buckets = max(1, slots // PROBE_WINDOW)
+        self.slots = self.buckets * PROBE_WINDOW
+        self.record_bytes = record_bytes
+        self.slot_size = _SLOT.size + record_bytes
+        # A new segment is zero-filled: generation 0, no invalidations, every slot free
+        self._memory = shared_memory.SharedMemory(create=True, size=_HEADER.size + self.slots * self.slot_size)
+        self._buf = self._memory.buf
+        self._locks = [multiprocessing.Lock() for _ in range(LOCK_STRIPES)]
+        self._clear_lock = multiprocessing.Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        """Size of the shared segment"""
+        return self._memory.size
+
+    def _offset(self, slot: int) -> int:
+        """Byte offset of a slot"""
+        return _HEADER.size + slot * self.slot_size
+
+    def _bucket(self, key_hash: int) -> int:
+        """Bucket a key lives in"""
+        return key_hash % self.buckets
+
+    def _acquire(self, lock) -> bool:
+        """
+        Take a process-shared lock, giving up after LOCK_TIMEOUT
+
+        Returns:
+            True if the lock is held
+        """
+        if lock.acquire(block=False):
+            return True
+        SHARED_CACHE_CONTENTION.inc((self.name, 'write_wait'))
+        if lock.acquire(timeout=LOCK_TIMEOUT):
+            return True
+        SHARED_CACHE_CONTENTION.inc((self.name, 'lock_timeout'))
+        return False
+
+    def _generation(self) -> int:
+        """Current table generation (bumped by clear)"""
+        return _HEADER.unpack_from(self._buf, 0)[0]
+
+    @property
+    def invalidations(self) -> int:
+        """Number of clear() and delete() calls made by any process"""
+        return _HEADER.unpack_from(self._buf, 0)[1]
+
+    def _read(self, slot: int) -> Optional[Tuple[int, int, int, int, float, bytes]]:
+        """
+        Consistent copy of a slot
+
+        Returns:
+            (seq, key hash, generation, version hash, stored_at, payload),
+            or None if the slot kept changing under the reader
+        """
+        offset = self._offset(slot)
+        for _ in range(MAX_READ_RETRIES):
+            seq, key_hash, generation, version_hash, stored_at, length = _SLOT.unpack_from(self._buf, offset)
+            if not seq & 1:
+                start = offset + _SLOT.size
+                payload = bytes(self._buf[start:start + min(length, self.record_bytes)])
+                if _SEQ.unpack_from(self._buf, offset)[0] == seq:
+                    return seq, key_hash, generation, version_hash, stored_at, payload
+            SHARED_CACHE_CONTENTION.inc((self.name, 'read_retry'))
+            time.sleep(0)
+        return None
+
+    def get(self, key: str, version: Hashable) -> Optional[Tuple[Any, float]]:
+        """
+        Look up a key
+
+        Returns:
+            Tuple of (value, stored_at as time.time()), or None if the key
+            is missing, was stored under another version or before clear()
+        """
+        key_hash = _hash(key)
+        version_hash = _hash(version)
+        generation = self._generation()
+        first = self._bucket(key_hash) * PROBE_WINDOW
+
+        for slot in range(first, first + PROBE_WINDOW):
+            found = self._read(slot)
+            if found is None or found[1] != key_hash:
+                continue
+            _, _, slot_generation, slot_version, stored_at, payload = found
+            if slot_generation == generation and slot_version == version_hash:
+                SHARED_CACHE_REQUESTS.inc((self.name, 'hit'))
+                return json_encoder.loads(zlib.decompress(payload)), stored_at
+            break
+
+        SHARED_CACHE_REQUESTS.inc((self.name, 'miss'))
+        return None
+
+    def put(self, key: str, version: Hashable, value: Any, stored_at: Optional[float] = None) -> bool:
+        """
+        Store a value, replacing the key's previous slot
+
+        Returns:
+            True if stored, False if the compressed value does not fit a slot
+            or the bucket's lock could not be taken
+        """
+        payload = zlib.compress(json_encoder.dumps(value), COMPRESS_LEVEL)
+        if len(payload) > self.record_bytes:
+            SHARED_CACHE_WRITES.inc((self.name, 'oversize'))
+            return False
+
+        key_hash = _hash(key)
+        lock = self._locks[self._bucket(key_hash) % LOCK_STRIPES]
+        if not self._acquire(lock):
+            return False
+        try:
+            generation = self._generation()
+            slot, evicted = self._choose_slot(key_hash, generation)
+            offset = self._offset(slot)
+            seq = _SEQ.unpack_from(self._buf, offset)[0]
+            _SEQ.pack_into(self._buf, offset, seq + 1)
+            start = offset + _SLOT.size
+            self._buf[start:start + len(payload)] = payload
+            _SLOT.pack_into(self._buf, offset, seq + 1, key_hash, generation, _hash(version),
+                            time.time() if stored_at is None else stored_at, len(payload))
+            _SEQ.pack_into(self._buf, offset, seq + 2)
+        finally:
+            lock.release()
+
+        SHARED_CACHE_WRITES.inc((self.name, 'evicted' if evicted else 'stored'))
+        return True
+
+    def put_many(self, items: Iterable[Tuple[str, Hashable, Any, Optional[float]]]):
+        """Store (key, version, value, stored_at) items"""
+        for key, version, value, stored_at in items:
+            self.put(key, version, value, stored_at)
+
+    def _choose_slot(self, key_hash: int, generation: int) -> Tuple[int, bool]:
+        """
+        Slot to store a key in: its current slot, else a free one, else the
+        least recently stored in its bucket (call with the bucket's lock held)
+
+        Returns:
+            Tuple of (slot, whether a live entry is evicted)
+        """
+        first = self._bucket(key_hash) * PROBE_WINDOW
+        oldest_slot, oldest_time = first, float('inf')
+        free_slot = None
+        for slot in range(first, first + PROBE_WINDOW):
+            _, slot_key, slot_generation, _, stored_at, _ = _SLOT.unpack_from(self._buf, self._offset(slot))
+            if slot_key == key_hash:
+                return slot, False
+            if slot_key == 0 or slot_generation != generation:
+                if free_slot is None:
+                    free_slot = slot
+            elif stored_at < oldest_time:
+                oldest_slot, oldest_time = slot, stored_at
+        if free_slot is not None:
+            return free_slot, False
+        return oldest_slot, True
+
+    def delete(self, key: str):
+        """
+        Remove a key
+
+        An invalidation must not be lost, so if a lock cannot be taken (its
+        holder is gone) the key is removed without it.
+        """
+        key_hash = _hash(key)
+        bucket = self._bucket(key_hash)
+        lock = self._locks[bucket % LOCK_STRIPES]
+        locked = self._acquire(lock)
+        try:
+            for slot in range(bucket * PROBE_WINDOW, (bucket + 1) * PROBE_WINDOW):
+                offset = self._offset(slot)
+                seq, slot_key = _SLOT.unpack_from(self._buf, offset)[:2]
+                if slot_key == key_hash:
+                    _SEQ.pack_into(self._buf, offset, seq + 1)
+                    _SLOT.pack_into(self._buf, offset, seq + 1, 0, 0, 0, 0.0, 0)
+                    _SEQ.pack_into(self._buf, offset, seq + 2)
+        finally:
+            if locked:
+                lock.release()
+        self._bump_header(0)
+
+    def clear(self):
+        """Invalidate every entry"""
+        self._bump_header(1)
+
+    def _bump_header(self, generations: int):
+        """Count an invalidation, advancing the generation by generations (1 for clear, 0 for delete)"""
+        locked = self._acquire(self._clear_lock)
+        try:
+            generation, invalidations = _HEADER.unpack_from(self._buf, 0)
+            _HEADER.pack_into(self._buf, 0, generation + generations, invalidations + 1)
+        finally:
+            if locked:
+                self._clear_lock.release()
+
+    def stats(self) -> Dict:
+        """Size, occupancy and this process's hit and contention counts"""
+        generation = self._generation()
+        used = 0
+        for slot in range(self.slots):
+            _, key_hash, slot_generation = _SLOT.unpack_from(self._buf, self._offset(slot))[:3]
+            used += key_hash != 0 and slot_generation == generation
+        hits = SHARED_CACHE_REQUESTS.get((self.name, 'hit'))
+        lookups = hits + SHARED_CACHE_REQUESTS.get((self.name, 'miss'))
+        return {
+            'slots': self.slots,
+            'used': used,
+            'size_bytes': self.size_bytes,
+            'hit_ratio': round(hits / lookups, 4) if lookups else 0.0,
+            'read_retries': int(SHARED_CACHE_CONTENTION.get((self.name, 'read_retry'))),
+            'write_waits': int(SHARED_CACHE_CONTENTION.get((self.name, 'write_wait'))),
+            'lock_timeouts': int(SHARED_CACHE_CONTENTION.get((self.name, 'lock_timeout'))),
+            'evictions': int(SHARED_CACHE_WRITES.get((self.name, 'evicted'))),
+        }
+
+    def close(self, unlink: bool = False):
+        """Unmap the table; the creating process also unlinks it"""
+        self._buf = None
+        self._memory.close()
+        if unlink:
+            self._memory.unlink()
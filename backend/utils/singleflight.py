@@ -0,0 +1,108 @@
+"""
+Request Coalescing Module
+=========================
+
+This module provides SingleFlight, which runs at most one computation per
+key at a time. Callers that ask for a key while its computation is in
+flight wait for it and share its result (or its exception) instead of
+starting their own - so when a popular cache entry expires, one request
+recomputes it while the rest wait.
+
+Usage:
+    flights = SingleFlight('predictions')
+
+    prediction, shared = flights.do(roll_no, lambda: predict(student))
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from utils.metrics import metrics
+
+
+COALESCED_CALLS = metrics.counter(
+    'singleflight_coalesced_total',
+    'Calls that waited for an in-flight computation instead of running their own, by group',
+    ['group']
+)
+
+
+class FlightTimeout(Exception):
+    """Raised when a follower stops waiting for an in-flight computation"""
+
+
+class _Call:
+    """One in-flight computation and its outcome"""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Per-key deduplication of concurrent computations"""
+
+    def __init__(self, name: str):
+        """
+        Initialize group
+
+        Args:
+            name: Group name used in metrics
+        """
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], Any],
+           timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        Run func for key, or wait for the run already in flight
+
+        Args:
+            key: Computation key
+            func: Computation to run if none is in flight
+            timeout: Longest a follower waits, in seconds (None: no limit)
+
+        Returns:
+            Tuple of (result, shared); shared is True for followers, which
+            must not mutate the result
+
+        Raises:
+            FlightTimeout: A follower waited longer than timeout
+            Exception: Whatever func raised, for the leader and its followers
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            COALESCED_CALLS.inc((self.name,))
+            if not call.done.wait(timeout):
+                raise FlightTimeout(f'Timed out waiting for {key!r}')
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Check whether a computation for key is running"""
+        return key in self._calls
+
+    def __len__(self) -> int:
+        """Number of computations in flight"""
+        return len(self._calls)
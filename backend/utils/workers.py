@@ -0,0 +1,192 @@
+"""
+Worker Status Module
+====================
+
+This module provides the per-worker status table used by the pre-fork
+production server (serve.py). The table lives in shared memory created by
+the master before forking, so every worker can report its own health and
+any worker can answer a request for the status of all of them.
+
+Usage:
+    from utils import workers
+
+    workers.worker_table = WorkerStatusTable(slots=8)   # master, before fork
+    slot = workers.worker_table.claim(pid, generation, threads)
+    workers.worker_slot = slot                          # in the worker
+    app.wsgi_app = WorkerStatusMiddleware(app.wsgi_app)
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from werkzeug.wsgi import ClosingIterator
+
+
+FIELDS = (
+    'pid',
+    'generation',
+    'threads',
+    'started_at',
+    'heartbeat_at',
+    'requests_total',
+    'requests_in_flight',
+    'errors_total',
+    'connections_idle',
+)
+
+_INDEX = {name: index for index, name in enumerate(FIELDS)}
+
+# Set by serve.py: the shared table (master and workers) and this worker's slot
+worker_table = None
+worker_slot: Optional[int] = None
+
+
+class WorkerStatusTable:
+    """Fixed-size table of worker status rows in shared memory"""
+
+    def __init__(self, slots: int):
+        """
+        Initialize table
+
+        Args:
+            slots: Maximum number of workers tracked at once (old and new
+                generations overlap during a graceful restart)
+        """
+        self.slots = slots
+        self.master_pid = os.getpid()
+        self._values = multiprocessing.RawArray('d', slots * len(FIELDS))
+        # Only the owning worker writes a row, so a process-local lock is enough
+        self._lock = threading.Lock()
+
+    def _offset(self, slot: int, field: str) -> int:
+        """Index of a field in the flat array"""
+        return slot * len(FIELDS) + _INDEX[field]
+
+    def get(self, slot: int, field: str) -> float:
+        """Read one field"""
+        return self._values[self._offset(slot, field)]
+
+    def set(self, slot: int, field: str, value: float):
+        """Write one field"""
+        self._values[self._offset(slot, field)] = value
+
+    def add(self, slot: int, field: str, amount: float = 1.0):
+        """Increment one field"""
+        offset = self._offset(slot, field)
+        with self._lock:
+            self._values[offset] += amount
+
+    def claim(self, pid: int, generation: int, threads: int) -> Optional[int]:
+        """
+        Reserve a free row for a new worker
+
+        Args:
+            pid: Worker process id (0 while the worker is being forked)
+            generation: Restart generation the worker belongs to
+            threads: Request threads in the worker
+
+        Returns:
+            Slot index, or None if the table is full
+        """
+        for slot in range(self.slots):
+            if self.get(slot, 'started_at') == 0:
+                for field in FIELDS:
+                    self.set(slot, field, 0.0)
+                self.set(slot, 'pid', pid)
+                self.set(slot, 'generation', generation)
+                self.set(slot, 'threads', threads)
+                self.set(slot, 'started_at', time.time())
+                return slot
+        return None
+
+    def release(self, slot: int):
+        """Free a row after its worker exited"""
+        for field in FIELDS:
+            self.set(slot, field, 0.0)
+
+    def heartbeat(self, slot: int):
+        """Record that the worker's serve loop is alive"""
+        self.set(slot, 'heartbeat_at', time.time())
+
+    def heartbeat_age(self, slot: int) -> Optional[float]:
+        """Seconds since the last heartbeat, or None if the worker never reported"""
+        last = self.get(slot, 'heartbeat_at')
+        return time.time() - last if last else None
+
+    def rows(self, timeout: float = 30.0) -> List[Dict]:
+        """
+        Status of every live worker
+
+        Args:
+            timeout: Heartbeat age after which a worker is reported unhealthy
+
+        Returns:
+            One dictionary per occupied slot
+        """
+        now = time.time()
+        rows = []
+        for slot in range(self.slots):
+            started_at = self.get(slot, 'started_at')
+            if not started_at:
+                continue
+
+            heartbeat_at = self.get(slot, 'heartbeat_at')
+            heartbeat_age = now - heartbeat_at if heartbeat_at else None
+            if heartbeat_age is None:
+                status = 'starting'
+            elif heartbeat_age > timeout:
+                status = 'unresponsive'
+            else:
+                status = 'healthy'
+
+            rows.append({
+                'slot': slot,
+                'pid': int(self.get(slot, 'pid')),
+                'generation': int(self.get(slot, 'generation')),
+                'status': status,
+                'threads': int(self.get(slot, 'threads')),
+                'uptime_seconds': round(now - started_at, 1),
+                'heartbeat_age_seconds': round(heartbeat_age, 3) if heartbeat_age is not None else None,
+                'requests_total': int(self.get(slot, 'requests_total')),
+                'requests_in_flight': int(self.get(slot, 'requests_in_flight')),
+                'errors_total': int(self.get(slot, 'errors_total')),
+                'connections_idle': int(self.get(slot, 'connections_idle')),
+            })
+        return rows
+
+
+class WorkerStatusMiddleware:
+    """WSGI middleware that counts requests into the current worker's row"""
+
+    def __init__(self, app):
+        """Wrap a WSGI application"""
+        self.app = app
+
+    def __call__(self, environ, start_response):
+        table, slot = worker_table, worker_slot
+        if table is None or slot is None:
+            return self.app(environ, start_response)
+
+        def counting_start_response(status, headers, exc_info=None):
+            if status[:1] == '5':
+                table.add(slot, 'errors_total')
+            return start_response(status, headers, exc_info)
+
+        table.add(slot, 'requests_in_flight')
+        try:
+            app_iter = self.app(environ, counting_start_response)
+        except BaseException:
+            self._finished(table, slot)
+            raise
+
+        # Streamed responses stay in flight until the server closes the iterable
+        return ClosingIterator(app_iter, lambda: self._finished(table, slot))
+
+    @staticmethod
+    def _finished(table: WorkerStatusTable, slot: int):
+        """Move a request from in-flight to served"""
+        table.add(slot, 'requests_in_flight', -1)
+        table.add(slot, 'requests_total')
@@ -7,12 +7,13 @@ import RiskAlertCard from '../components/RiskAlertCard';
 import RiskFactorsCard from '../components/RiskFactorsCard';
 import RecommendationsCard from '../components/RecommendationsCard';
 import Loader from '../components/Loader';
-import { getStudentData, getPrediction } from '../services/api';
+import { getDashboard, getPrediction } from '../services/api';
 import '../styles/global.css';
 
 const Home = () => {
   const [studentData, setStudentData] = useState(null);
   const [predictionData, setPredictionData] = useState(null);
+  const [prefetchedPrediction, setPrefetchedPrediction] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
 
@@ -20,10 +21,13 @@ const Home = () => {
     setLoading(true);
     setError(null);
     setPredictionData(null);
+    setPrefetchedPrediction(null);
     
     try {
-      const data = await getStudentData(rollNo);
-      setStudentData(data);
+      // One request returns both the profile and the prediction
+      const data = await getDashboard(rollNo);
+      setStudentData(data.student);
+      setPrefetchedPrediction(data.prediction);
     } catch (err) {
       setError(err.message || 'Failed to fetch student data');
       setStudentData(null);
@@ -35,6 +39,11 @@ const Home = () => {
   const handlePredict = async () => {
     if (!studentData) return;
     
+    if (prefetchedPrediction) {
+      setPredictionData(prefetchedPrediction);
+      return;
+    }
+    
     setLoading(true);
     setError(null);
     
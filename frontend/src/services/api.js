@@ -14,12 +14,8 @@ export const getStudentData = async (rollNo) => {
 
 export const getPrediction = async (rollNo) => {
   try {
-    const response = await fetch(`${API_URL}/api/predict/${rollNo}`, {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-      },
-    });
+    // GET so the browser cache can revalidate with If-None-Match
+    const response = await fetch(`${API_URL}/api/predict/${rollNo}`);
     if (!response.ok) {
       const errorData = await response.json();
       throw new Error(errorData.message || 'Prediction failed');
@@ -29,3 +25,31 @@ export const getPrediction = async (rollNo) => {
     throw error;
   }
 };
+
+// Flatten the grouped profile returned by /api/dashboard into the flat
+// shape the profile cards read (same fields as /api/student/<roll_no>)
+const flattenStudent = ({ profile, academic, engagement, financial, support, ...rest }) => ({
+  ...rest,
+  ...profile,
+  ...academic,
+  ...engagement,
+  ...financial,
+  ...support,
+});
+
+export const getDashboard = async (rollNo) => {
+  try {
+    const response = await fetch(`${API_URL}/api/dashboard/${rollNo}`);
+    const data = await response.json();
+    if (!data.student) {
+      throw new Error(response.status === 404 ? 'Student not found' : data.error || 'Failed to fetch student data');
+    }
+    return {
+      student: flattenStudent(data.student),
+      // null when the model failed; the page falls back to getPrediction
+      prediction: response.ok ? data.prediction : null,
+    };
+  } catch (error) {
+    throw error;
+  }
+};